@@ -0,0 +1,231 @@
+"""Benchmark per-request overhead of the HTTP middleware stack.
+
+Compares the pure ASGI middleware in ``proxbox_api.app.middleware`` with
+``BaseHTTPMiddleware`` equivalents of the same logic (the previous
+implementation) on a trivial endpoint, so the numbers isolate middleware cost.
+"""
+
+# ruff: noqa: E402
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+_DB_DIR = tempfile.mkdtemp(prefix="proxbox-bench-middleware-")
+os.environ["PROXBOX_DATABASE_PATH"] = str(Path(_DB_DIR) / "bench.db")
+os.environ.setdefault("PROXBOX_LOG_LEVEL", "ERROR")
+
+from sqlmodel import Session, SQLModel, create_engine
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from proxbox_api.app import middleware as asgi_middleware
+from proxbox_api.auth import check_auth_header_with_session, get_session_factory
+from proxbox_api.database import ApiKey, get_session
+
+API_KEY = "bench-middleware-api-key-0000000000000000000"
+
+ASGIApp = Callable[[dict, Callable[[], Awaitable[dict]], Callable[[dict], Awaitable[None]]], Any]
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app: Any, requests_per_minute: int = 60) -> None:
+        super().__init__(app)
+        self._limiter = asgi_middleware.RateLimitMiddleware(app, requests_per_minute)
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        path = request.url.path
+        if path.startswith("/static/") or path in asgi_middleware.AUTH_EXEMPT_PATHS:
+            return await call_next(request)
+        now = time.time()
+        ip = asgi_middleware.resolve_client_ip(request)
+        self._limiter._clean_old_requests(ip, now)
+        if len(self._limiter._requests[ip]) >= self._limiter.requests_per_minute:
+            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded."})
+        self._limiter._requests[ip].append(now)
+        return await call_next(request)
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+        for name, value in asgi_middleware._SECURITY_HEADERS:
+            response.headers[name] = value
+        response.headers["Content-Security-Policy"] = asgi_middleware._DEFAULT_CSP
+        return response
+
+
+class LegacyAPIKeyAuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        api_key = request.headers.get("X-Proxbox-API-Key")
+        client_ip = asgi_middleware.resolve_client_ip(request)
+        with get_session_factory(request.app)() as session:
+            authorized, error_message = await asyncio.to_thread(
+                check_auth_header_with_session, session, api_key, client_ip
+            )
+        if not authorized:
+            return JSONResponse(status_code=401, content={"detail": error_message})
+        return await call_next(request)
+
+
+async def _json_endpoint(scope: dict, receive: Any, send: Any) -> None:
+    await JSONResponse({"status": "ok"})(scope, receive, send)
+
+
+async def _stream_endpoint(scope: dict, receive: Any, send: Any) -> None:
+    async def events():
+        for index in range(100):
+            yield f"data: {index}\n\n"
+
+    await StreamingResponse(events(), media_type="text/event-stream")(scope, receive, send)
+
+
+def _build_stack(endpoint: ASGIApp, *, legacy: bool, with_auth: bool) -> ASGIApp:
+    if legacy:
+        app: ASGIApp = LegacySecurityHeadersMiddleware(endpoint)
+        if with_auth:
+            app = LegacyAPIKeyAuthMiddleware(app)
+        return LegacyRateLimitMiddleware(app, requests_per_minute=10**9)
+    app = asgi_middleware.SecurityHeadersMiddleware(endpoint)
+    if with_auth:
+        app = asgi_middleware.APIKeyAuthMiddleware(app)
+    return asgi_middleware.RateLimitMiddleware(app, requests_per_minute=10**9)
+
+
+class _HostApp:
+    """Stands in for ``scope["app"]`` so the auth middleware finds the bench database."""
+
+    def __init__(self, engine: Any) -> None:
+        def _session():
+            with Session(engine) as session:
+                yield session
+
+        self.dependency_overrides = {get_session: _session}
+
+
+async def _call(app: ASGIApp, host_app: _HostApp, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"x-proxbox-api-key", API_KEY.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+        "app": host_app,
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    chunks = 0
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal chunks
+        if message["type"] == "http.response.body":
+            chunks += 1
+            if not message.get("more_body", False):
+                disconnected.set()
+
+    await app(scope, receive, send)
+    return chunks
+
+
+async def _measure_us(app: ASGIApp, host_app: _HostApp, path: str, requests: int) -> float:
+    for _ in range(min(50, requests)):
+        await _call(app, host_app, path)
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _call(app, host_app, path)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+@contextmanager
+def _bench_engine():
+    engine = create_engine(f"sqlite:///{Path(_DB_DIR) / 'keys.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        ApiKey.store_key(session, API_KEY, label="bench-middleware")
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+async def _run(requests: int) -> list[dict[str, Any]]:
+    scenarios = (
+        ("json, headers + rate limit", _json_endpoint, False),
+        ("json, full stack with auth", _json_endpoint, True),
+        ("SSE 100 events, headers + rate limit", _stream_endpoint, False),
+    )
+    rows = []
+    with _bench_engine() as engine:
+        host_app = _HostApp(engine)
+        for label, endpoint, with_auth in scenarios:
+            legacy = _build_stack(endpoint, legacy=True, with_auth=with_auth)
+            current = _build_stack(endpoint, legacy=False, with_auth=with_auth)
+            legacy_us = await _measure_us(legacy, host_app, "/bench", requests)
+            current_us = await _measure_us(current, host_app, "/bench", requests)
+            rows.append(
+                {
+                    "scenario": label,
+                    "legacy_us": legacy_us,
+                    "asgi_us": current_us,
+                    "speedup": legacy_us / current_us if current_us else None,
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    """Run the benchmark and print a Markdown timing table."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = asyncio.run(_run(args.requests))
+
+    print("# HTTP Middleware Overhead")
+    print()
+    print(f"Median of {args.requests} requests per stack.")
+    print()
+    print("| Scenario | BaseHTTPMiddleware us | Pure ASGI us | Speedup |")
+    print("| --- | ---: | ---: | ---: |")
+    for row in rows:
+        print(
+            f"| {row['scenario']} | {row['legacy_us']:.1f} | {row['asgi_us']:.1f} | "
+            f"{row['speedup']:.2f}x |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""Benchmark the end-to-end sync pipeline against seeded Proxmox and NetBox stand-ins."""
+
+# ruff: noqa: E402
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# The database path is read at import time, so isolate the benchmark before
+# proxbox_api is imported. Rate limiting would otherwise throttle large runs.
+_DB_DIR = tempfile.mkdtemp(prefix="proxbox-bench-sync-")
+os.environ["PROXBOX_DATABASE_PATH"] = str(Path(_DB_DIR) / "bench.db")
+os.environ.setdefault("PROXBOX_RATE_LIMIT", "999999")
+os.environ.setdefault("PROXBOX_ALLOW_PLAINTEXT_CREDENTIALS", "1")
+os.environ.setdefault("PROXBOX_LOG_LEVEL", "ERROR")
+
+from httpx import ASGITransport, AsyncClient
+from netbox_sdk.facade import Api
+from netbox_sdk.schema import build_schema_index
+from proxmox_sdk import ProxmoxSDK
+from sqlmodel import Session, SQLModel, select
+
+import proxbox_api.session.proxmox as proxmox_session_module
+from benchmarks.sync.fake_netbox import FakeNetBoxApiClient, FakeNetBoxStore
+from benchmarks.sync.proxmox_backend import RequestStats, SeededProxmoxBackend
+from benchmarks.sync.topology import SeededCluster, TopologySize, build_sync_topology
+from proxbox_api.constants import NETBOX_SCHEMA_VERSION
+from proxbox_api.database import ApiKey, ProxmoxEndpoint, engine
+from proxbox_api.main import app
+from proxbox_api.netbox_rest import _reset_netbox_globals
+from proxbox_api.services.custom_fields import invalidate_custom_fields_cache
+from proxbox_api.services.sync.sync_state_reader import reset_sidecar_reader_availability_cache
+from proxbox_api.session.netbox import get_netbox_async_session, get_netbox_session
+from proxbox_api.settings_client import invalidate_settings_cache
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+API_KEY = "bench-sync-api-key-000000000000000000000000"
+
+# Phases run in order against one NetBox store per repetition: the first four
+# populate an empty NetBox, the final full update re-syncs the populated state.
+# The VM phase uses the SSE route because ``/virtual-machines/{id}`` shadows the
+# plain ``/create`` path for HTTP callers.
+PHASES: tuple[tuple[str, str], ...] = (
+    ("virtual_machines", "/virtualization/virtual-machines/create/stream"),
+    ("virtual_disks", "/virtualization/virtual-machines/virtual-disks/create"),
+    ("interfaces", "/virtualization/virtual-machines/interfaces/create"),
+    ("ip_addresses", "/virtualization/virtual-machines/interfaces/ip-address/create"),
+    ("full_update", "/full-update"),
+)
+
+
+def main() -> None:
+    """Run the benchmark, print a Markdown table and optionally gate on a baseline."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clusters", nargs="+", type=int, default=[1])
+    parser.add_argument("--nodes-per-cluster", type=int, default=2)
+    parser.add_argument("--vms-per-node", nargs="+", type=int, default=[10, 50])
+    parser.add_argument("--nics-per-vm", type=int, default=2)
+    parser.add_argument("--disks-per-vm", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Untimed passes run first so lazy imports and schema loads are excluded.",
+    )
+    parser.add_argument(
+        "--proxmox-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated per-request Proxmox latency.",
+    )
+    parser.add_argument(
+        "--netbox-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated per-request NetBox latency.",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare against the stored baseline and exit non-zero on regression.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Overwrite the stored baseline with this run.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative wall-time regression before --compare fails.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON.")
+    parser.add_argument("--output", type=Path, help="Also write the raw report to this file.")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    sizes = [
+        TopologySize(
+            clusters=clusters,
+            nodes_per_cluster=args.nodes_per_cluster,
+            vms_per_node=vms_per_node,
+            nics_per_vm=args.nics_per_vm,
+            disks_per_vm=args.disks_per_vm,
+        )
+        for clusters in args.clusters
+        for vms_per_node in args.vms_per_node
+    ]
+    _prepare_database()
+    report = asyncio.run(_run_all(sizes, args))
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        _print_markdown(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+    if args.compare:
+        regressions = compare_with_baseline(report, args.baseline, tolerance=args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"- {line}")
+            raise SystemExit(1)
+        print("\nNo regressions against baseline.")
+
+
+def _prepare_database() -> None:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        ApiKey.store_key(session, API_KEY, label="bench-sync")
+
+
+def _register_endpoints(clusters: list[SeededCluster]) -> None:
+    with Session(engine) as session:
+        for existing in session.exec(select(ProxmoxEndpoint)).all():
+            session.delete(existing)
+        session.commit()
+        for index, cluster in enumerate(clusters):
+            session.add(
+                ProxmoxEndpoint(
+                    name=cluster.name,
+                    ip_address=f"198.51.100.{index + 1}",
+                    domain=cluster.host,
+                    port=8006,
+                    username="root@pam",
+                    password="bench",
+                    verify_ssl=False,
+                )
+            )
+        session.commit()
+
+
+def _seed_netbox_endpoints(store: FakeNetBoxStore, clusters: list[SeededCluster]) -> None:
+    """Mirror the plugin-side ProxmoxEndpoint rows every real deployment carries."""
+
+    for index, cluster in enumerate(clusters):
+        store.create(
+            "/api/plugins/proxbox/endpoints/proxmox/",
+            {
+                "name": cluster.name,
+                "domain": cluster.host,
+                "ip_address": {"address": f"198.51.100.{index + 1}/32"},
+                "port": 8006,
+            },
+        )
+
+
+def _reset_caches() -> None:
+    _reset_netbox_globals()
+    invalidate_custom_fields_cache()
+    invalidate_settings_cache()
+    reset_sidecar_reader_availability_cache()
+
+
+async def _run_all(sizes: list[TopologySize], args: argparse.Namespace) -> dict[str, Any]:
+    rows = []
+    for size in sizes:
+        rows.append(await _run_size(size, args))
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "proxmox_latency_ms": args.proxmox_latency_ms,
+        "netbox_latency_ms": args.netbox_latency_ms,
+        "results": rows,
+    }
+
+
+async def _run_size(size: TopologySize, args: argparse.Namespace) -> dict[str, Any]:
+    clusters = build_sync_topology(size)
+    _register_endpoints(clusters)
+    proxmox_stats = RequestStats()
+    netbox_stats = RequestStats()
+    fallback_paths: set[str] = set()
+    phase_samples: dict[str, list[dict[str, Any]]] = {name: [] for name, _ in PHASES}
+    netbox_objects: dict[str, int] = {}
+
+    warmup = max(0, args.warmup)
+    for iteration in range(warmup + max(1, args.repeat)):
+        _reset_caches()
+        backends = {
+            host: SeededProxmoxBackend(cluster, proxmox_stats, latency_ms=args.proxmox_latency_ms)
+            for cluster in clusters
+            for host in (cluster.host, cluster.name)
+        }
+        for index, cluster in enumerate(clusters):
+            backends[f"198.51.100.{index + 1}"] = backends[cluster.host]
+        store = FakeNetBoxStore()
+        _seed_netbox_endpoints(store, clusters)
+        netbox_api = Api(
+            client=FakeNetBoxApiClient(store, netbox_stats, latency_ms=args.netbox_latency_ms),
+            schema=build_schema_index(version=NETBOX_SCHEMA_VERSION),
+        )
+        with _patched_proxmox_api(backends), _netbox_overrides(netbox_api):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport,
+                base_url="http://bench",
+                headers={"X-Proxbox-API-Key": API_KEY},
+                timeout=None,
+            ) as client:
+                for phase, path in PHASES:
+                    sample = await _measure_phase(client, path, proxmox_stats, netbox_stats)
+                    if iteration >= warmup:
+                        phase_samples[phase].append(sample)
+        for backend in backends.values():
+            fallback_paths.update(backend.fallback_paths)
+        netbox_objects = store.object_counts()
+
+    return {
+        "size": size.label(),
+        "vms": size.total_vms,
+        "phases": {phase: _summarize(samples) for phase, samples in phase_samples.items()},
+        "netbox_objects": netbox_objects,
+        "unseeded_proxmox_paths": sorted(fallback_paths),
+    }
+
+
+class _patched_proxmox_api:
+    """Route ``ProxmoxAPI(host)`` to the seeded backend registered for ``host``."""
+
+    def __init__(self, backends: dict[str, SeededProxmoxBackend]) -> None:
+        self._backends = backends
+        self._original = proxmox_session_module.ProxmoxAPI
+
+    def __enter__(self) -> None:
+        backends = self._backends
+
+        def _factory(host: str, backend: str | None = None, **kwargs: object) -> ProxmoxSDK:
+            return ProxmoxSDK(host=host, _backend=backends[host])
+
+        proxmox_session_module.ProxmoxAPI = _factory
+
+    def __exit__(self, *exc: object) -> None:
+        proxmox_session_module.ProxmoxAPI = self._original
+
+
+class _netbox_overrides:
+    """Serve every NetBox dependency from the in-memory fake."""
+
+    def __init__(self, api: Api) -> None:
+        self._api = api
+
+    def __enter__(self) -> None:
+        app.dependency_overrides[get_netbox_session] = lambda: self._api
+        app.dependency_overrides[get_netbox_async_session] = lambda: self._api
+
+    def __exit__(self, *exc: object) -> None:
+        app.dependency_overrides.pop(get_netbox_session, None)
+        app.dependency_overrides.pop(get_netbox_async_session, None)
+
+
+async def _measure_phase(
+    client: AsyncClient,
+    path: str,
+    proxmox_stats: RequestStats,
+    netbox_stats: RequestStats,
+) -> dict[str, Any]:
+    proxmox_stats.reset()
+    netbox_stats.reset()
+    started = time.perf_counter()
+    response = await client.get(path)
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    if response.status_code >= 400:
+        raise SystemExit(f"{path} failed with HTTP {response.status_code}: {response.text[:500]}")
+    if path.endswith("/stream"):
+        _raise_for_stream_failure(path, response.text)
+    return {
+        "wall_ms": wall_ms,
+        "peak_rss_mb": _peak_rss_mb(),
+        "proxmox_requests": dict(proxmox_stats.counts),
+        "netbox_requests": dict(netbox_stats.counts),
+        "latencies_ms": proxmox_stats.latencies_ms + netbox_stats.latencies_ms,
+    }
+
+
+def _raise_for_stream_failure(path: str, body: str) -> None:
+    """Fail the run when the SSE ``complete`` frame reports ``ok: false``."""
+
+    event = None
+    for line in body.splitlines():
+        if line.startswith("event:"):
+            event = line.partition(":")[2].strip()
+        elif line.startswith("data:") and event == "complete":
+            payload = json.loads(line.partition(":")[2])
+            if not payload.get("ok", False):
+                raise SystemExit(f"{path} reported failure: {payload}")
+            return
+    raise SystemExit(f"{path} stream ended without a complete event")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _p95(values: list[float]) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=20, method="inclusive")[18]
+
+
+def _summarize(samples: list[dict[str, Any]]) -> dict[str, Any]:
+    wall_times = [sample["wall_ms"] for sample in samples]
+    latencies = [value for sample in samples for value in sample["latencies_ms"]]
+    last = samples[-1]
+    return {
+        "wall_ms_median": round(statistics.median(wall_times), 3),
+        "wall_ms_p95": round(_p95(wall_times), 3),
+        "request_latency_ms_p95": round(_p95(latencies), 3),
+        "peak_rss_mb": round(max(sample["peak_rss_mb"] for sample in samples), 1),
+        "proxmox_request_total": sum(last["proxmox_requests"].values()),
+        "netbox_request_total": sum(last["netbox_requests"].values()),
+        "proxmox_requests": dict(sorted(last["proxmox_requests"].items())),
+        "netbox_requests": dict(sorted(last["netbox_requests"].items())),
+    }
+
+
+def compare_with_baseline(
+    report: dict[str, Any],
+    baseline_path: Path,
+    *,
+    tolerance: float,
+) -> list[str]:
+    """Return human-readable regressions of ``report`` against the stored baseline.
+
+    Request counts are deterministic and must not grow. Wall time is noisy, so
+    it only fails when the median exceeds the baseline by more than
+    ``tolerance``. Sizes or phases missing from the baseline are ignored.
+    """
+
+    if not baseline_path.exists():
+        return [f"baseline file {baseline_path} does not exist"]
+    baseline = json.loads(baseline_path.read_text())
+    baseline_rows = {row["size"]: row for row in baseline.get("results", [])}
+    regressions: list[str] = []
+    for row in report["results"]:
+        expected_row = baseline_rows.get(row["size"])
+        if expected_row is None:
+            continue
+        for phase, current in row["phases"].items():
+            expected = expected_row["phases"].get(phase)
+            if expected is None:
+                continue
+            for key in ("proxmox_request_total", "netbox_request_total"):
+                if current[key] > expected[key]:
+                    regressions.append(
+                        f"{row['size']} {phase}: {key} {expected[key]} -> {current[key]}"
+                    )
+            limit = expected["wall_ms_median"] * (1.0 + tolerance)
+            if current["wall_ms_median"] > limit:
+                regressions.append(
+                    f"{row['size']} {phase}: wall_ms_median "
+                    f"{expected['wall_ms_median']:.1f} -> {current['wall_ms_median']:.1f}"
+                )
+    return regressions
+
+
+def _print_markdown(report: dict[str, Any]) -> None:
+    print(
+        "| Size | VMs | Phase | Wall median ms | Wall p95 ms | Request p95 ms "
+        "| Proxmox req | NetBox req | Peak RSS MB |"
+    )
+    print("| --- | ---: | --- | ---: | ---: | ---: | ---: | ---: | ---: |")
+    for row in report["results"]:
+        for phase, stats in row["phases"].items():
+            print(
+                f"| {row['size']} | {row['vms']} | {phase} | {stats['wall_ms_median']:.1f} "
+                f"| {stats['wall_ms_p95']:.1f} | {stats['request_latency_ms_p95']:.2f} "
+                f"| {stats['proxmox_request_total']} | {stats['netbox_request_total']} "
+                f"| {stats['peak_rss_mb']:.1f} |"
+            )
+    for row in report["results"]:
+        if row["unseeded_proxmox_paths"]:
+            print(
+                f"\n{row['size']}: Proxmox paths served by the schema mock: "
+                + ", ".join(row["unseeded_proxmox_paths"])
+            )
+
+
+if __name__ == "__main__":
+    main()
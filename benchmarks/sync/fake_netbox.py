@@ -0,0 +1,360 @@
+"""In-process NetBox REST stand-in used by the end-to-end sync benchmark.
+
+The fake implements just enough of the NetBox REST contract for the sync
+pipeline: paginated list responses with an absolute ``next`` link, field and
+``*_id`` / ``cf_*`` / ``tag`` filters with the common lookup suffixes, single
+and bulk POST/PATCH/DELETE, nested foreign-key expansion, and ``/api/status/``.
+It plugs in below ``netbox_rest`` by overriding ``NetBoxApiClient.request`` so
+retries, GET caching and pagination validation in proxbox-api stay on the
+measured path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from collections.abc import Iterable
+from copy import deepcopy
+from typing import Any
+from urllib.parse import urlencode
+
+from netbox_sdk.client import ApiResponse, NetBoxApiClient
+from netbox_sdk.config import Config
+
+from benchmarks.sync.proxmox_backend import RequestStats
+
+BASE_URL = "http://netbox.bench.invalid"
+NETBOX_VERSION = "4.5.7"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+_DETAIL_PATH = re.compile(r"^(?P<list>/api/.+/)(?P<id>\d+)/$")
+_PAGINATION_KEYS = frozenset({"limit", "offset"})
+_IGNORED_QUERY_KEYS = frozenset({"brief", "ordering", "fields", "exclude", "omit", "include"})
+
+# Integer foreign keys are expanded into nested objects like NetBox does. Only
+# integer values are expanded, so choice fields sharing a name (``type`` on an
+# interface, ``role`` on an IP address) keep their plain string values.
+_FOREIGN_KEYS: dict[str, str] = {
+    "cluster": "/api/virtualization/clusters/",
+    "group": "/api/virtualization/cluster-groups/",
+    "site": "/api/dcim/sites/",
+    "tenant": "/api/tenancy/tenants/",
+    "platform": "/api/dcim/platforms/",
+    "role": "/api/dcim/device-roles/",
+    "device": "/api/dcim/devices/",
+    "device_type": "/api/dcim/device-types/",
+    "manufacturer": "/api/dcim/manufacturers/",
+    "virtual_machine": "/api/virtualization/virtual-machines/",
+    "vrf": "/api/ipam/vrfs/",
+    "vlan": "/api/ipam/vlans/",
+    "untagged_vlan": "/api/ipam/vlans/",
+    "primary_ip": "/api/ipam/ip-addresses/",
+    "primary_ip4": "/api/ipam/ip-addresses/",
+    "primary_ip6": "/api/ipam/ip-addresses/",
+}
+_SAME_COLLECTION_KEYS = frozenset({"parent", "bridge"})
+_ASSIGNED_OBJECT_PATHS: dict[str, str] = {
+    "virtualization.vminterface": "/api/virtualization/interfaces/",
+    "dcim.interface": "/api/dcim/interfaces/",
+}
+
+
+def _as_list(value: Any) -> list[Any]:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _scalar_matches(actual: Any, expected: str) -> bool:
+    if isinstance(actual, dict):
+        return any(
+            str(actual.get(key)) == expected
+            for key in ("id", "value", "slug", "name")
+            if actual.get(key) is not None
+        )
+    if isinstance(actual, bool):
+        return expected.lower() in {"true", "1"} if actual else expected.lower() in {"false", "0"}
+    if actual is None:
+        return expected.lower() in {"null", "none", ""}
+    return str(actual) == expected
+
+
+def _id_of(value: Any) -> Any:
+    return value.get("id") if isinstance(value, dict) else value
+
+
+class FakeNetBoxStore:
+    """Collections of NetBox records keyed by normalized list path."""
+
+    def __init__(self) -> None:
+        self.collections: dict[str, dict[int, dict[str, Any]]] = {}
+        self._next_id = 1
+
+    def collection(self, list_path: str) -> dict[int, dict[str, Any]]:
+        return self.collections.setdefault(list_path, {})
+
+    def object_counts(self) -> dict[str, int]:
+        """Return the number of stored records per collection path."""
+
+        return {path: len(rows) for path, rows in sorted(self.collections.items()) if rows}
+
+    def create(self, list_path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        record_id = self._next_id
+        self._next_id += 1
+        record = {"id": record_id, "custom_fields": {}, "tags": []}
+        self._apply(list_path, record, payload)
+        self.collection(list_path)[record_id] = record
+        return record
+
+    def update(self, list_path: str, record_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+        record = self.collection(list_path).get(record_id)
+        if record is None:
+            raise KeyError(record_id)
+        self._apply(list_path, record, payload)
+        return record
+
+    def delete(self, list_path: str, record_id: int) -> bool:
+        return self.collection(list_path).pop(record_id, None) is not None
+
+    def _apply(self, list_path: str, record: dict[str, Any], payload: dict[str, Any]) -> None:
+        for key, value in payload.items():
+            if key == "id":
+                continue
+            if key == "custom_fields" and isinstance(value, dict):
+                record.setdefault("custom_fields", {}).update(value)
+            elif key == "tags":
+                record["tags"] = self._expand_tags(value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                target = _FOREIGN_KEYS.get(key)
+                if target is None and key in _SAME_COLLECTION_KEYS:
+                    target = list_path
+                record[key] = self._nested(target, value) if target else value
+            else:
+                record[key] = value
+        record["url"] = f"{BASE_URL}{list_path}{record['id']}/"
+        record["display"] = str(
+            record.get("name") or record.get("address") or record.get("slug") or record["id"]
+        )
+        self._expand_assigned_object(record)
+
+    def _nested(self, list_path: str, record_id: int) -> dict[str, Any]:
+        target = self.collection(list_path).get(record_id) or {}
+        nested: dict[str, Any] = {"id": record_id, "url": f"{BASE_URL}{list_path}{record_id}/"}
+        for key in ("name", "slug", "display", "address", "virtual_machine"):
+            if key in target:
+                nested[key] = target[key]
+        return nested
+
+    def _expand_tags(self, tags: Any) -> list[dict[str, Any]]:
+        tag_rows = self.collection("/api/extras/tags/")
+        expanded: list[dict[str, Any]] = []
+        for tag in tags or []:
+            match: dict[str, Any] | None = None
+            if isinstance(tag, int):
+                match = tag_rows.get(tag)
+            elif isinstance(tag, dict):
+                if tag.get("id") is not None:
+                    match = tag_rows.get(int(tag["id"]))
+                match = match or next(
+                    (
+                        row
+                        for row in tag_rows.values()
+                        if row.get("slug") == tag.get("slug")
+                        or (tag.get("name") and row.get("name") == tag.get("name"))
+                    ),
+                    None,
+                )
+                match = match or tag
+            if match is not None:
+                expanded.append(
+                    {key: match.get(key) for key in ("id", "name", "slug", "color") if key in match}
+                )
+        return expanded
+
+    def _expand_assigned_object(self, record: dict[str, Any]) -> None:
+        object_type = record.get("assigned_object_type")
+        object_id = record.get("assigned_object_id")
+        target = _ASSIGNED_OBJECT_PATHS.get(str(object_type))
+        if target and isinstance(object_id, int):
+            record["assigned_object"] = self._nested(target, object_id)
+        elif "assigned_object_id" in record and object_id is None:
+            record["assigned_object"] = None
+
+    def filter(self, list_path: str, query: dict[str, Any]) -> list[dict[str, Any]]:
+        rows: Iterable[dict[str, Any]] = self.collection(list_path).values()
+        for key, raw in query.items():
+            if key in _PAGINATION_KEYS or key in _IGNORED_QUERY_KEYS:
+                continue
+            expected = [str(value) for value in _as_list(raw)]
+            rows = [row for row in rows if self._matches(list_path, row, key, expected)]
+        return sorted(rows, key=lambda row: row["id"])
+
+    def _matches(  # noqa: C901
+        self,
+        list_path: str,
+        row: dict[str, Any],
+        key: str,
+        expected: list[str],
+    ) -> bool:
+        if key == "q":
+            needle = expected[0].lower()
+            return needle in str(row.get("name") or row.get("address") or "").lower()
+        if key == "tag":
+            slugs = {str(tag.get("slug")) for tag in row.get("tags") or []}
+            return all(value in slugs for value in expected)
+        negate = key.endswith("__n")
+        field, _, lookup = key.removesuffix("__n").partition("__")
+        if field.startswith("cf_"):
+            actual = (row.get("custom_fields") or {}).get(field[3:])
+        else:
+            actual = self._field_value(list_path, row, field)
+        if lookup == "isnull":
+            result = (actual is None) == (expected[0].lower() == "true")
+        elif lookup == "ic":
+            result = any(value.lower() in str(actual or "").lower() for value in expected)
+        elif lookup in {"ie", "iexact"}:
+            result = any(value.lower() == str(actual or "").lower() for value in expected)
+        elif isinstance(actual, list):
+            result = any(_scalar_matches(item, value) for item in actual for value in expected)
+        else:
+            result = any(_scalar_matches(actual, value) for value in expected)
+        return not result if negate else result
+
+    def _field_value(self, list_path: str, row: dict[str, Any], field: str) -> Any:
+        if field in row:
+            return row[field]
+        if field.endswith("_id"):
+            base = field[:-3]
+            if base in row:
+                return _id_of(row[base])
+            if base in {"vminterface", "interface"}:
+                return row.get("assigned_object_id")
+            if base == "virtual_machine" and list_path == "/api/ipam/ip-addresses/":
+                return self._assigned_virtual_machine_id(row)
+        if field == "virtual_machine" and list_path == "/api/ipam/ip-addresses/":
+            return self._assigned_virtual_machine_id(row)
+        return None
+
+    def _assigned_virtual_machine_id(self, row: dict[str, Any]) -> Any:
+        if row.get("assigned_object_type") != "virtualization.vminterface":
+            return None
+        interface = self.collection("/api/virtualization/interfaces/").get(
+            row.get("assigned_object_id") or 0
+        )
+        return _id_of(interface.get("virtual_machine")) if interface else None
+
+
+class FakeNetBoxApiClient(NetBoxApiClient):
+    """``NetBoxApiClient`` whose transport is the in-memory :class:`FakeNetBoxStore`."""
+
+    def __init__(
+        self,
+        store: FakeNetBoxStore,
+        stats: RequestStats,
+        *,
+        latency_ms: float = 0.0,
+    ) -> None:
+        super().__init__(
+            Config(base_url=BASE_URL, token_version="v1", token_secret="0" * 40, timeout=30.0)
+        )
+        self.store = store
+        self.stats = stats
+        self._latency_s = latency_ms / 1000.0
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        query: dict[str, Any] | None = None,
+        payload: dict[str, Any] | list[Any] | None = None,
+        headers: dict[str, str] | None = None,
+        expect_json: bool = True,
+    ) -> ApiResponse:
+        started = time.perf_counter()
+        method_upper = method.upper()
+        normalized = "/" + path.strip("/") + "/"
+        detail = _DETAIL_PATH.match(normalized)
+        list_path = detail.group("list") if detail else normalized
+        template = f"{list_path}{{id}}/" if detail else list_path
+        try:
+            if self._latency_s:
+                await asyncio.sleep(self._latency_s)
+            status, body = self._dispatch(
+                method_upper,
+                list_path,
+                int(detail.group("id")) if detail else None,
+                dict(query or {}),
+                payload,
+            )
+        finally:
+            self.stats.record(
+                f"{method_upper} {template}", (time.perf_counter() - started) * 1000.0
+            )
+        text = "" if body is None else json.dumps(body)
+        return ApiResponse(status=status, text=text, headers={"Content-Type": "application/json"})
+
+    def _dispatch(  # noqa: C901
+        self,
+        method: str,
+        list_path: str,
+        record_id: int | None,
+        query: dict[str, Any],
+        payload: dict[str, Any] | list[Any] | None,
+    ) -> tuple[int, Any]:
+        if list_path == "/api/status/":
+            return 200, {"netbox-version": NETBOX_VERSION, "plugins": {"netbox_proxbox": "0.0.0"}}
+        store = self.store
+        if method == "GET":
+            if record_id is not None:
+                record = store.collection(list_path).get(record_id)
+                return (200, deepcopy(record)) if record else (404, {"detail": "Not found."})
+            return 200, self._page(list_path, query)
+        if method == "POST":
+            if isinstance(payload, list):
+                return 201, [deepcopy(store.create(list_path, item)) for item in payload]
+            return 201, deepcopy(store.create(list_path, dict(payload or {})))
+        if method in {"PATCH", "PUT"}:
+            try:
+                if record_id is not None:
+                    return 200, deepcopy(store.update(list_path, record_id, dict(payload or {})))
+                return 200, [
+                    deepcopy(store.update(list_path, int(item["id"]), item))
+                    for item in payload or []
+                ]
+            except KeyError:
+                return 404, {"detail": "Not found."}
+        if method == "DELETE":
+            if record_id is not None:
+                deleted = store.delete(list_path, record_id)
+                return (204, None) if deleted else (404, {"detail": "Not found."})
+            for item in payload or []:
+                store.delete(list_path, int(item["id"]))
+            return 204, None
+        return 405, {"detail": f'Method "{method}" not allowed.'}
+
+    def _page(self, list_path: str, query: dict[str, Any]) -> dict[str, Any]:
+        rows = self.store.filter(list_path, query)
+        limit = int(_as_list(query.get("limit", DEFAULT_PAGE_SIZE))[0] or MAX_PAGE_SIZE)
+        limit = min(limit, MAX_PAGE_SIZE)
+        offset = int(_as_list(query.get("offset", 0))[0] or 0)
+        page = rows[offset : offset + limit]
+        next_url = None
+        if offset + len(page) < len(rows):
+            next_query = [
+                (key, value)
+                for key, raw in query.items()
+                if key not in _PAGINATION_KEYS
+                for value in _as_list(raw)
+            ]
+            next_query += [("limit", limit), ("offset", offset + len(page))]
+            next_url = f"{BASE_URL}{list_path}?{urlencode(next_query)}"
+        return {
+            "count": len(rows),
+            "next": next_url,
+            "previous": None,
+            "results": deepcopy(page),
+        }
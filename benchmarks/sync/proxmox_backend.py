@@ -0,0 +1,111 @@
+"""Seeded proxmox-mock backend that records per-endpoint request statistics."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import defaultdict
+from copy import deepcopy
+from typing import Any
+
+from proxmox_sdk.sdk.backends.mock import MockBackend
+from proxmox_sdk.sdk.exceptions import ResourceException
+
+from benchmarks.sync.topology import API_PREFIX, SeededCluster
+
+_NUMERIC_SEGMENT = re.compile(r"^\d+$")
+
+
+def endpoint_template(path: str, nodes: frozenset[str] = frozenset()) -> str:
+    """Collapse node names and numeric ids so counts group by endpoint shape."""
+
+    parts = []
+    for segment in path.strip("/").split("/"):
+        if segment in nodes:
+            parts.append("{node}")
+        elif _NUMERIC_SEGMENT.match(segment):
+            parts.append("{id}")
+        else:
+            parts.append(segment)
+    return "/" + "/".join(parts)
+
+
+class RequestStats:
+    """Per-endpoint request counters and latency samples shared by the fakes."""
+
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = defaultdict(int)
+        self.latencies_ms: list[float] = []
+
+    def record(self, key: str, elapsed_ms: float) -> None:
+        self.counts[key] += 1
+        self.latencies_ms.append(elapsed_ms)
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.latencies_ms.clear()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class SeededProxmoxBackend(MockBackend):
+    """``MockBackend`` that answers seeded paths first and counts every call.
+
+    Seeded route values may be callables receiving the query params, which is
+    how list endpoints such as ``/cluster/resources?type=vm`` and the paged
+    ``/nodes/{node}/tasks`` are served. ``None`` values emulate a Proxmox error
+    (for example a stopped guest without a running agent). Unseeded paths fall
+    back to the schema-driven mock and are remembered in ``fallback_paths`` so
+    the topology can be extended when the sync grows new reads.
+    """
+
+    def __init__(
+        self,
+        cluster: SeededCluster,
+        stats: RequestStats,
+        *,
+        latency_ms: float = 0.0,
+    ) -> None:
+        super().__init__(api_path_prefix=API_PREFIX)
+        self._cluster = cluster
+        self._routes = cluster.routes
+        self._stats = stats
+        self._latency_s = latency_ms / 1000.0
+        self._nodes = frozenset(cluster.nodes)
+        self.fallback_paths: set[str] = set()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> Any:
+        started = time.perf_counter()
+        method_upper = method.upper()
+        route_path = path[len(API_PREFIX) :] if path.startswith(API_PREFIX) else path
+        route_path = "/" + route_path.strip("/")
+        try:
+            if self._latency_s:
+                await asyncio.sleep(self._latency_s)
+            if method_upper == "GET" and route_path in self._routes:
+                value = self._routes[route_path]
+                if callable(value):
+                    value = value(dict(params or {}))
+                if value is None:
+                    raise ResourceException(
+                        status_code=500,
+                        status_message="Internal Server Error",
+                        content="QEMU guest agent is not running",
+                    )
+                return deepcopy(value)
+            if method_upper == "GET":
+                self.fallback_paths.add(route_path)
+            return await super().request(method, path, params=params, data=data)
+        finally:
+            key = f"{method_upper} {endpoint_template(route_path, self._nodes)}"
+            self._stats.record(key, (time.perf_counter() - started) * 1000.0)
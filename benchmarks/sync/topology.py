@@ -0,0 +1,401 @@
+"""Deterministic Proxmox topology used to seed the end-to-end sync benchmark."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+API_PREFIX = "/api2/json"
+BACKUP_STORAGE = "pbs-backup"
+BASE_CTIME = 1_767_225_600  # 2026-01-01T00:00:00Z
+
+RouteValue = Any | Callable[[dict[str, Any]], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class TopologySize:
+    """Shape of the synthetic inventory seeded into the Proxmox stand-in."""
+
+    clusters: int = 1
+    nodes_per_cluster: int = 2
+    vms_per_node: int = 10
+    nics_per_vm: int = 2
+    disks_per_vm: int = 2
+    backups_per_vm: int = 1
+    snapshots_per_vm: int = 1
+    tasks_per_vm: int = 2
+
+    @property
+    def total_vms(self) -> int:
+        """Return the number of guests across every cluster."""
+
+        return self.clusters * self.nodes_per_cluster * self.vms_per_node
+
+    def label(self) -> str:
+        """Return a stable key used to match benchmark rows against the baseline."""
+
+        return (
+            f"c{self.clusters}-n{self.nodes_per_cluster}-v{self.vms_per_node}"
+            f"-nic{self.nics_per_vm}-d{self.disks_per_vm}"
+        )
+
+
+@dataclass(slots=True)
+class SeededCluster:
+    """Routes served by one seeded Proxmox endpoint, keyed by API path."""
+
+    name: str
+    host: str
+    nodes: list[str]
+    vm_count: int
+    routes: dict[str, RouteValue] = field(default_factory=dict)
+
+
+def build_sync_topology(size: TopologySize) -> list[SeededCluster]:
+    """Build every seeded cluster for ``size`` without touching any backend."""
+
+    clusters: list[SeededCluster] = []
+    vmid_base = 1000
+    for cluster_index in range(size.clusters):
+        cluster = _build_cluster(cluster_index, size, vmid_base=vmid_base)
+        vmid_base += size.nodes_per_cluster * size.vms_per_node
+        clusters.append(cluster)
+    return clusters
+
+
+def _mac(cluster_index: int, vmid: int, nic_index: int) -> str:
+    return f"BC:24:{cluster_index:02X}:{(vmid >> 8) & 0xFF:02X}:{vmid & 0xFF:02X}:{nic_index:02X}"
+
+
+def _guest_ip(cluster_index: int, vmid: int, nic_index: int) -> str:
+    return f"10.{cluster_index * 16 + nic_index}.{(vmid >> 8) & 0xFF}.{vmid & 0xFF or 1}"
+
+
+def _build_cluster(cluster_index: int, size: TopologySize, *, vmid_base: int) -> SeededCluster:
+    name = f"bench-cluster-{cluster_index + 1:02d}"
+    nodes = [
+        f"pve-{cluster_index + 1:02d}-{node + 1:02d}" for node in range(size.nodes_per_cluster)
+    ]
+    routes: dict[str, RouteValue] = {}
+    resources: list[dict[str, Any]] = []
+    status: list[dict[str, Any]] = [
+        {
+            "type": "cluster",
+            "id": "cluster",
+            "name": name,
+            "nodes": len(nodes),
+            "quorate": 1,
+            "version": 7,
+        }
+    ]
+    backups_by_node: dict[str, list[dict[str, Any]]] = {node: [] for node in nodes}
+    vmid = vmid_base
+
+    routes["/version"] = {"version": "8.3.2", "release": "8.3", "repoid": "3e76eec21c4a14a7"}
+    routes["/cluster/config/join"] = {
+        "config_digest": f"{cluster_index:040x}",
+        "preferred_node": nodes[0],
+        "totem": {"cluster_name": name, "config_version": "3"},
+        "nodelist": [
+            {"name": node, "pve_fp": f"AA:BB:{cluster_index:02X}:{index:02X}"}
+            for index, node in enumerate(nodes)
+        ],
+    }
+    routes["/cluster/options"] = {"keyboard": "en-us", "tag-style": "color-map=bench:1d28d2"}
+    routes["/cluster/replication"] = []
+    routes["/cluster/backup"] = []
+    routes["/cluster/ha/status/current"] = []
+    routes["/cluster/ha/resources"] = []
+    storages = [
+        {"storage": "local-lvm", "type": "lvmthin", "content": "images,rootdir", "shared": 0},
+        {
+            "storage": BACKUP_STORAGE,
+            "type": "pbs",
+            "content": "backup",
+            "shared": 1,
+            "nodes": ",".join(nodes),
+        },
+    ]
+    routes["/storage"] = storages
+    for storage in storages:
+        routes[f"/storage/{storage['storage']}"] = storage
+
+    for node_index, node in enumerate(nodes):
+        status.append(
+            {
+                "type": "node",
+                "id": f"node/{node}",
+                "name": node,
+                "ip": f"192.0.2.{cluster_index * 32 + node_index + 1}",
+                "nodeid": node_index + 1,
+                "online": 1,
+                "local": 1 if node_index == 0 else 0,
+                "level": "",
+            }
+        )
+        resources.append(
+            {
+                "id": f"node/{node}",
+                "type": "node",
+                "node": node,
+                "status": "online",
+                "maxcpu": 32,
+                "maxmem": 137_438_953_472,
+                "maxdisk": 1_099_511_627_776,
+                "uptime": 864_000,
+            }
+        )
+        for storage in ("local-lvm", BACKUP_STORAGE):
+            resources.append(
+                {
+                    "id": f"storage/{node}/{storage}",
+                    "type": "storage",
+                    "node": node,
+                    "storage": storage,
+                    "status": "available",
+                    "shared": 1 if storage == BACKUP_STORAGE else 0,
+                    "maxdisk": 4_398_046_511_104,
+                }
+            )
+        routes[f"/nodes/{node}/network"] = [
+            {"iface": "eno1", "type": "eth", "active": 1, "method": "manual"},
+            {
+                "iface": "vmbr0",
+                "type": "bridge",
+                "active": 1,
+                "bridge_ports": "eno1",
+                "method": "static",
+                "cidr": f"192.0.2.{cluster_index * 32 + node_index + 1}/24",
+            },
+        ]
+        node_tasks: list[dict[str, Any]] = []
+
+        for vm_index in range(size.vms_per_node):
+            vm_type = "lxc" if vm_index % 4 == 3 else "qemu"
+            vm_name = f"{vm_type}-{vmid}"
+            running = vm_index % 5 != 4
+            resources.append(
+                {
+                    "id": f"{vm_type}/{vmid}",
+                    "type": vm_type,
+                    "vmid": vmid,
+                    "name": vm_name,
+                    "node": node,
+                    "status": "running" if running else "stopped",
+                    "maxcpu": 2 + vm_index % 3,
+                    "maxmem": (2 + vm_index % 4) * 1_073_741_824,
+                    "maxdisk": 34_359_738_368,
+                    "template": 0,
+                    "uptime": 3600 + vmid if running else 0,
+                    "tags": "bench",
+                }
+            )
+            routes[f"/nodes/{node}/{vm_type}/{vmid}/config"] = _vm_config(
+                cluster_index, vm_type, vmid, vm_name, vm_index, size
+            )
+            if vm_type == "qemu":
+                # ``None`` makes the backend raise, like a guest without a running agent.
+                routes[f"/nodes/{node}/qemu/{vmid}/agent"] = (
+                    [{"name": "network-get-interfaces"}, {"name": "get-host-name"}]
+                    if running
+                    else None
+                )
+                routes[f"/nodes/{node}/qemu/{vmid}/agent/network-get-interfaces"] = (
+                    _agent_interfaces(cluster_index, vmid, size) if running else None
+                )
+                routes[f"/nodes/{node}/qemu/{vmid}/agent/get-host-name"] = (
+                    {"result": {"host-name": vm_name}} if running else None
+                )
+            else:
+                routes[f"/nodes/{node}/lxc/{vmid}/interfaces"] = [
+                    {
+                        "name": f"eth{nic}",
+                        "hwaddr": _mac(cluster_index, vmid, nic).lower(),
+                        "inet": f"{_guest_ip(cluster_index, vmid, nic)}/24",
+                    }
+                    for nic in range(size.nics_per_vm)
+                ]
+            routes[f"/nodes/{node}/{vm_type}/{vmid}/snapshot"] = _snapshots(vmid, size)
+            for backup_index in range(size.backups_per_vm):
+                backups_by_node[node].append(
+                    {
+                        "volid": (
+                            f"{BACKUP_STORAGE}:backup/{'ct' if vm_type == 'lxc' else 'vm'}"
+                            f"/{vmid}/2026-01-{backup_index + 1:02d}T00:00:00Z"
+                        ),
+                        "vmid": vmid,
+                        "content": "backup",
+                        "format": "pbs-ct" if vm_type == "lxc" else "pbs-vm",
+                        "size": 2_147_483_648,
+                        "ctime": BASE_CTIME + backup_index * 86_400,
+                        "subtype": vm_type,
+                        "verification": {"state": "ok"},
+                    }
+                )
+            for task_index in range(size.tasks_per_vm):
+                starttime = BASE_CTIME + vmid * 10 + task_index
+                node_tasks.append(
+                    {
+                        "upid": (
+                            f"UPID:{node}:{vmid:08X}:{task_index:08X}:{starttime:08X}"
+                            f":vzdump:{vmid}:root@pam:"
+                        ),
+                        "node": node,
+                        "pid": vmid,
+                        "pstart": task_index,
+                        "starttime": starttime,
+                        "endtime": starttime + 30,
+                        "type": "vzdump",
+                        "id": str(vmid),
+                        "user": "root@pam",
+                        "status": "OK",
+                    }
+                )
+            vmid += 1
+
+        routes[f"/nodes/{node}/tasks"] = _task_list_route(node_tasks)
+
+    for node in nodes:
+        routes[f"/nodes/{node}/storage/local-lvm/content"] = []
+        routes[f"/nodes/{node}/storage/{BACKUP_STORAGE}/content"] = [
+            backup for node_backups in backups_by_node.values() for backup in node_backups
+        ]
+        routes[f"/nodes/{node}/storage"] = [
+            {"storage": "local-lvm", "type": "lvmthin", "content": "images,rootdir", "active": 1},
+            {"storage": BACKUP_STORAGE, "type": "pbs", "content": "backup", "active": 1},
+        ]
+
+    routes["/cluster/status"] = status
+    routes["/cluster/resources"] = _resources_route(resources)
+    return SeededCluster(
+        name=name,
+        host=f"{name}.bench.invalid",
+        nodes=nodes,
+        vm_count=vmid - vmid_base,
+        routes=routes,
+    )
+
+
+def _vm_config(
+    cluster_index: int,
+    vm_type: str,
+    vmid: int,
+    vm_name: str,
+    vm_index: int,
+    size: TopologySize,
+) -> dict[str, Any]:
+    config: dict[str, Any] = {
+        "memory": str((2 + vm_index % 4) * 1024),
+        "cores": 2 + vm_index % 3,
+        "onboot": 1,
+        "digest": f"{vmid:040x}",
+        "tags": "bench",
+        "description": f"Benchmark guest {vmid}",
+    }
+    if vm_type == "qemu":
+        config.update(
+            {
+                "name": vm_name,
+                "sockets": 1,
+                "ostype": "l26",
+                "agent": "1",
+                "scsihw": "virtio-scsi-single",
+                "boot": "order=scsi0",
+            }
+        )
+        for nic in range(size.nics_per_vm):
+            config[f"net{nic}"] = (
+                f"virtio={_mac(cluster_index, vmid, nic)},bridge=vmbr0,tag={100 + nic}"
+            )
+        for disk in range(size.disks_per_vm):
+            config[f"scsi{disk}"] = f"local-lvm:vm-{vmid}-disk-{disk},size={32 + disk * 16}G"
+        config[f"ipconfig{0}"] = f"ip={_guest_ip(cluster_index, vmid, 0)}/24"
+        return config
+
+    config.update({"hostname": vm_name, "ostype": "debian", "arch": "amd64", "unprivileged": 1})
+    for nic in range(size.nics_per_vm):
+        config[f"net{nic}"] = (
+            f"name=eth{nic},bridge=vmbr0,hwaddr={_mac(cluster_index, vmid, nic)},"
+            f"ip={_guest_ip(cluster_index, vmid, nic)}/24,type=veth"
+        )
+    config["rootfs"] = f"local-lvm:vm-{vmid}-disk-0,size=8G"
+    for disk in range(1, size.disks_per_vm):
+        config[f"mp{disk - 1}"] = f"local-lvm:vm-{vmid}-disk-{disk},mp=/srv/data{disk},size=16G"
+    return config
+
+
+def _agent_interfaces(cluster_index: int, vmid: int, size: TopologySize) -> dict[str, Any]:
+    interfaces: list[dict[str, Any]] = [
+        {
+            "name": "lo",
+            "hardware-address": "00:00:00:00:00:00",
+            "ip-addresses": [
+                {"ip-address": "127.0.0.1", "ip-address-type": "ipv4", "prefix": 8},
+            ],
+        }
+    ]
+    for nic in range(size.nics_per_vm):
+        interfaces.append(
+            {
+                "name": f"ens{18 + nic}",
+                "hardware-address": _mac(cluster_index, vmid, nic).lower(),
+                "ip-addresses": [
+                    {
+                        "ip-address": _guest_ip(cluster_index, vmid, nic),
+                        "ip-address-type": "ipv4",
+                        "prefix": 24,
+                    }
+                ],
+            }
+        )
+    return {"result": interfaces}
+
+
+def _snapshots(vmid: int, size: TopologySize) -> list[dict[str, Any]]:
+    snapshots: list[dict[str, Any]] = [
+        {
+            "name": f"bench-{index + 1}",
+            "description": f"Benchmark snapshot {index + 1}",
+            "snaptime": BASE_CTIME + vmid + index,
+            "vmstate": 0,
+            **({"parent": f"bench-{index}"} if index else {}),
+        }
+        for index in range(size.snapshots_per_vm)
+    ]
+    current: dict[str, Any] = {"name": "current", "description": "You are here!", "running": 1}
+    if snapshots:
+        current["parent"] = snapshots[-1]["name"]
+    return [*snapshots, current]
+
+
+def _resources_route(resources: list[dict[str, Any]]) -> Callable[[dict[str, Any]], Any]:
+    def _route(params: dict[str, Any]) -> list[dict[str, Any]]:
+        resource_type = params.get("type")
+        if resource_type == "vm":
+            return [item for item in resources if item["type"] in {"qemu", "lxc"}]
+        if resource_type in {"node", "storage"}:
+            return [item for item in resources if item["type"] == resource_type]
+        return resources
+
+    return _route
+
+
+def _task_list_route(tasks: list[dict[str, Any]]) -> Callable[[dict[str, Any]], Any]:
+    ordered = sorted(tasks, key=lambda task: task["starttime"], reverse=True)
+
+    def _route(params: dict[str, Any]) -> list[dict[str, Any]]:
+        selected = ordered
+        vmid = params.get("vmid")
+        if vmid is not None:
+            selected = [task for task in selected if task["id"] == str(vmid)]
+        since = params.get("since")
+        if since is not None:
+            selected = [task for task in selected if task["starttime"] >= int(since)]
+        until = params.get("until")
+        if until is not None:
+            selected = [task for task in selected if task["starttime"] <= int(until)]
+        start = int(params.get("start") or 0)
+        limit = int(params.get("limit") or 50)
+        return selected[start : start + limit]
+
+    return _route
@@ -1,5 +1,19 @@
 """Python exports for the optional proxbox reconciliation engine."""
 
-from proxbox_reconcile_rs._native import build_vm_operation_queue_json, engine_version
+from proxbox_reconcile_rs._native import (
+    build_vm_operation_queue_json,
+    engine_version,
+    extract_vm_snapshot_identities_json,
+    normalize_current_vm_payloads_json,
+    normalize_desired_vm_payloads_json,
+    reconcile_keyed_collection_json,
+)
 
-__all__ = ["build_vm_operation_queue_json", "engine_version"]
+__all__ = [
+    "build_vm_operation_queue_json",
+    "engine_version",
+    "extract_vm_snapshot_identities_json",
+    "normalize_current_vm_payloads_json",
+    "normalize_desired_vm_payloads_json",
+    "reconcile_keyed_collection_json",
+]
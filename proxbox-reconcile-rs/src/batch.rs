@@ -0,0 +1,114 @@
+use serde_json::{Map, Value};
+
+use crate::normalize::{normalize_current_vm_payload, normalize_desired_vm_payload};
+use crate::vm::{extract_vm_snapshot_identity, ReconcileError, VmSnapshotIdentity};
+
+/// Normalize a JSON array of NetBox VM records; the output keeps input order.
+pub fn normalize_current_vm_payloads_json(
+    input: &[u8],
+    supports_vm_type: bool,
+) -> Result<Vec<u8>, ReconcileError> {
+    let records: Vec<Value> = serde_json::from_slice(input)?;
+    let normalized: Vec<Map<String, Value>> = records
+        .iter()
+        .map(|record| normalize_current_vm_payload(record, supports_vm_type))
+        .collect();
+    Ok(serde_json::to_vec(&normalized)?)
+}
+
+/// Normalize a JSON array of desired VM payloads; the output keeps input order.
+pub fn normalize_desired_vm_payloads_json(
+    input: &[u8],
+    supports_vm_type: bool,
+) -> Result<Vec<u8>, ReconcileError> {
+    let payloads: Vec<Map<String, Value>> = serde_json::from_slice(input)?;
+    let normalized: Vec<Map<String, Value>> = payloads
+        .iter()
+        .map(|payload| normalize_desired_vm_payload(payload, supports_vm_type))
+        .collect();
+    Ok(serde_json::to_vec(&normalized)?)
+}
+
+/// Extract snapshot identity keys from a JSON array of NetBox VM records.
+pub fn extract_vm_snapshot_identities_json(input: &[u8]) -> Result<Vec<u8>, ReconcileError> {
+    let records: Vec<Value> = serde_json::from_slice(input)?;
+    let identities: Vec<VmSnapshotIdentity> =
+        records.iter().map(extract_vm_snapshot_identity).collect();
+    Ok(serde_json::to_vec(&identities)?)
+}
+
+#[cfg(test)]
+mod tests {
+    use serde_json::json;
+
+    use super::*;
+
+    fn decode(output: Vec<u8>) -> Value {
+        serde_json::from_slice(&output).unwrap()
+    }
+
+    #[test]
+    fn current_payloads_are_normalized_in_order() {
+        let input = json!([
+            {"name": "a", "status": {"value": "offline"}, "cluster": {"id": 1}, "tags": [{"id": 3}, 1]},
+            {"name": "b", "status": "running", "virtual_machine_type": {"id": 7}}
+        ]);
+
+        let output = decode(
+            normalize_current_vm_payloads_json(input.to_string().as_bytes(), false).unwrap(),
+        );
+
+        assert_eq!(output[0]["name"], json!("a"));
+        assert_eq!(output[0]["cluster"], json!(1));
+        assert_eq!(output[0]["tags"], json!([1, 3]));
+        assert_eq!(output[0]["custom_fields"], json!({}));
+        assert_eq!(output[1]["status"], json!("active"));
+        assert!(output[1].get("virtual_machine_type").is_none());
+    }
+
+    #[test]
+    fn desired_payloads_keep_vm_type_when_supported() {
+        let input = json!([{"name": "a", "virtual_machine_type": 7, "memory": "2048"}]);
+
+        let output =
+            decode(normalize_desired_vm_payloads_json(input.to_string().as_bytes(), true).unwrap());
+
+        assert_eq!(output[0]["virtual_machine_type"], json!(7));
+        assert_eq!(output[0]["memory"], json!(2048));
+        assert_eq!(output[0]["vcpus"], json!(0));
+    }
+
+    #[test]
+    fn snapshot_identities_require_vmid_for_scope_keys() {
+        let input = json!([
+            {
+                "cluster": {"id": 1},
+                "custom_fields": {
+                    "proxmox_endpoint_id": 500,
+                    "proxmox_vm_id": "101",
+                    "proxmox_vm_type": "QEMU"
+                }
+            },
+            {"cluster": {"id": 2}, "custom_fields": {"proxmox_endpoint_id": 500}},
+            "not-a-record"
+        ]);
+
+        let output =
+            decode(extract_vm_snapshot_identities_json(input.to_string().as_bytes()).unwrap());
+
+        assert_eq!(
+            output,
+            json!([
+                {"endpoint_id": 500, "cluster_id": 1, "proxmox_vmid": 101, "vm_type": "qemu"},
+                {"endpoint_id": null, "cluster_id": null, "proxmox_vmid": null, "vm_type": null},
+                {"endpoint_id": null, "cluster_id": null, "proxmox_vmid": null, "vm_type": null}
+            ])
+        );
+    }
+
+    #[test]
+    fn batch_inputs_must_be_arrays() {
+        assert!(extract_vm_snapshot_identities_json(b"{}").is_err());
+        assert!(normalize_desired_vm_payloads_json(b"[1]", true).is_err());
+    }
+}
@@ -0,0 +1,233 @@
+use std::collections::HashMap;
+use std::collections::HashSet;
+
+use serde::{Deserialize, Serialize};
+use serde_json::{Map, Value};
+
+use crate::diff::diff_payloads;
+use crate::vm::ReconcileError;
+
+/// Generic "keyed collection" reconcile input.
+///
+/// `desired` and `current` are already normalized into the same diff shape by
+/// the caller; the engine only matches them by key and computes patches.
+#[derive(Debug, Deserialize)]
+pub struct KeyedReconcileInput {
+    pub key_fields: Vec<String>,
+    #[serde(default)]
+    pub patchable_fields: Option<Vec<String>>,
+    #[serde(default)]
+    pub nullable_fields: Vec<String>,
+    #[serde(default)]
+    pub delete_missing: bool,
+    pub desired: Vec<Map<String, Value>>,
+    pub current: Vec<Map<String, Value>>,
+}
+
+#[derive(Debug, PartialEq, Serialize)]
+pub struct KeyedUpdate {
+    pub desired_index: usize,
+    pub current_index: usize,
+    pub patch: Map<String, Value>,
+}
+
+#[derive(Debug, PartialEq, Serialize)]
+pub struct KeyedMatch {
+    pub desired_index: usize,
+    pub current_index: usize,
+}
+
+/// Index-based plan; every index points into the input `desired`/`current` lists.
+#[derive(Debug, Default, PartialEq, Serialize)]
+pub struct KeyedReconcilePlan {
+    pub create: Vec<usize>,
+    pub update: Vec<KeyedUpdate>,
+    pub unchanged: Vec<KeyedMatch>,
+    pub delete: Vec<usize>,
+    pub duplicate_desired: Vec<usize>,
+}
+
+pub fn reconcile_keyed_collection_json(input: &[u8]) -> Result<Vec<u8>, ReconcileError> {
+    let input: KeyedReconcileInput = serde_json::from_slice(input)?;
+    let plan = reconcile_keyed_collection(&input);
+    Ok(serde_json::to_vec(&plan)?)
+}
+
+/// Match desired to current records by key and split them into create/update/delete sets.
+///
+/// The first current record per key wins; later ones are reported in `delete`
+/// when `delete_missing` is set, so callers control which duplicate survives by
+/// ordering `current`. Records whose key fields are all empty are ignored.
+pub fn reconcile_keyed_collection(input: &KeyedReconcileInput) -> KeyedReconcilePlan {
+    let mut plan = KeyedReconcilePlan::default();
+    let mut current_by_key: HashMap<String, usize> = HashMap::new();
+    for (index, record) in input.current.iter().enumerate() {
+        let Some(key) = record_key(record, &input.key_fields) else {
+            continue;
+        };
+        if current_by_key.contains_key(&key) {
+            if input.delete_missing {
+                plan.delete.push(index);
+            }
+            continue;
+        }
+        current_by_key.insert(key, index);
+    }
+
+    let allowed: Option<HashSet<&str>> = input
+        .patchable_fields
+        .as_ref()
+        .map(|fields| fields.iter().map(String::as_str).collect());
+    let mut seen_desired: HashSet<String> = HashSet::new();
+    let mut matched_current: HashSet<usize> = HashSet::new();
+
+    for (desired_index, desired) in input.desired.iter().enumerate() {
+        let Some(key) = record_key(desired, &input.key_fields) else {
+            continue;
+        };
+        if !seen_desired.insert(key.clone()) {
+            plan.duplicate_desired.push(desired_index);
+            continue;
+        }
+        let Some(&current_index) = current_by_key.get(&key) else {
+            plan.create.push(desired_index);
+            continue;
+        };
+        matched_current.insert(current_index);
+        let current = &input.current[current_index];
+        let mut patch = diff_payloads(desired, current);
+        for field_name in &input.nullable_fields {
+            let current_set = current
+                .get(field_name)
+                .is_some_and(|value| !value.is_null());
+            if current_set && !desired.contains_key(field_name) {
+                patch.insert(field_name.clone(), Value::Null);
+            }
+        }
+        if let Some(allowed) = &allowed {
+            patch.retain(|field_name, _| allowed.contains(field_name.as_str()));
+        }
+        if patch.is_empty() {
+            plan.unchanged.push(KeyedMatch {
+                desired_index,
+                current_index,
+            });
+        } else {
+            plan.update.push(KeyedUpdate {
+                desired_index,
+                current_index,
+                patch,
+            });
+        }
+    }
+
+    if input.delete_missing {
+        plan.delete.extend(
+            current_by_key
+                .values()
+                .copied()
+                .filter(|index| !matched_current.contains(index)),
+        );
+        plan.delete.sort_unstable();
+    }
+    plan
+}
+
+fn record_key(record: &Map<String, Value>, key_fields: &[String]) -> Option<String> {
+    let parts: Vec<Value> = key_fields
+        .iter()
+        .map(|field_name| key_part(record.get(field_name)))
+        .collect();
+    if parts.iter().all(Value::is_null) {
+        return None;
+    }
+    serde_json::to_string(&parts).ok()
+}
+
+/// Canonical key component: empty values collapse to null and integral floats
+/// to integers so `1` and `1.0` select the same record, as they do in Python.
+fn key_part(value: Option<&Value>) -> Value {
+    match value {
+        None | Some(Value::Null) => Value::Null,
+        Some(Value::String(text)) if text.is_empty() => Value::Null,
+        Some(Value::Number(number)) => match number.as_f64() {
+            Some(float) if number.is_f64() && float.fract() == 0.0 => Value::from(float as i64),
+            _ => Value::Number(number.clone()),
+        },
+        Some(other) => other.clone(),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use serde_json::json;
+
+    use super::*;
+
+    fn plan_for(input: Value) -> Value {
+        let output = reconcile_keyed_collection_json(input.to_string().as_bytes()).unwrap();
+        serde_json::from_slice(&output).unwrap()
+    }
+
+    #[test]
+    fn splits_desired_into_create_update_and_unchanged() {
+        let plan = plan_for(json!({
+            "key_fields": ["virtual_machine", "name"],
+            "desired": [
+                {"virtual_machine": 1, "name": "scsi0", "size": 10},
+                {"virtual_machine": 1, "name": "scsi1", "size": 20},
+                {"virtual_machine": 1, "name": "scsi2", "size": 30}
+            ],
+            "current": [
+                {"virtual_machine": 1.0, "name": "scsi1", "size": 25},
+                {"virtual_machine": 1, "name": "scsi2", "size": 30.0}
+            ]
+        }));
+
+        assert_eq!(plan["create"], json!([0]));
+        assert_eq!(
+            plan["update"],
+            json!([{"desired_index": 1, "current_index": 0, "patch": {"size": 20}}])
+        );
+        assert_eq!(
+            plan["unchanged"],
+            json!([{"desired_index": 2, "current_index": 1}])
+        );
+        assert_eq!(plan["delete"], json!([]));
+    }
+
+    #[test]
+    fn nullable_and_patchable_fields_shape_the_patch() {
+        let plan = plan_for(json!({
+            "key_fields": ["name"],
+            "patchable_fields": ["storage", "size"],
+            "nullable_fields": ["storage"],
+            "desired": [{"name": "a", "size": 1, "description": "new"}],
+            "current": [{"name": "a", "size": 1, "storage": 4, "description": "old"}]
+        }));
+
+        assert_eq!(plan["update"][0]["patch"], json!({"storage": null}));
+    }
+
+    #[test]
+    fn delete_missing_reports_unmatched_and_duplicate_current_records() {
+        let plan = plan_for(json!({
+            "key_fields": ["name"],
+            "delete_missing": true,
+            "desired": [{"name": "a"}, {"name": "a"}, {"name": ""}],
+            "current": [{"name": "a"}, {"name": "b"}, {"name": "a"}, {"name": null}]
+        }));
+
+        assert_eq!(plan["delete"], json!([1, 2]));
+        assert_eq!(plan["duplicate_desired"], json!([1]));
+        assert_eq!(
+            plan["unchanged"],
+            json!([{"desired_index": 0, "current_index": 0}])
+        );
+    }
+
+    #[test]
+    fn input_must_be_an_object() {
+        assert!(reconcile_keyed_collection_json(b"[]").is_err());
+    }
+}
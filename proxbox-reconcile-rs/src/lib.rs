@@ -1,7 +1,9 @@
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 
+mod batch;
 mod diff;
+mod keyed;
 mod normalize;
 mod vm;
 
@@ -18,10 +20,54 @@ fn build_vm_operation_queue_json(py: Python<'_>, input: Vec<u8>) -> PyResult<Vec
     })
 }
 
+#[pyfunction]
+fn normalize_current_vm_payloads_json(
+    py: Python<'_>,
+    input: Vec<u8>,
+    supports_vm_type: bool,
+) -> PyResult<Vec<u8>> {
+    py.detach(|| {
+        batch::normalize_current_vm_payloads_json(&input, supports_vm_type)
+            .map_err(|error| PyValueError::new_err(error.to_string()))
+    })
+}
+
+#[pyfunction]
+fn normalize_desired_vm_payloads_json(
+    py: Python<'_>,
+    input: Vec<u8>,
+    supports_vm_type: bool,
+) -> PyResult<Vec<u8>> {
+    py.detach(|| {
+        batch::normalize_desired_vm_payloads_json(&input, supports_vm_type)
+            .map_err(|error| PyValueError::new_err(error.to_string()))
+    })
+}
+
+#[pyfunction]
+fn extract_vm_snapshot_identities_json(py: Python<'_>, input: Vec<u8>) -> PyResult<Vec<u8>> {
+    py.detach(|| {
+        batch::extract_vm_snapshot_identities_json(&input)
+            .map_err(|error| PyValueError::new_err(error.to_string()))
+    })
+}
+
+#[pyfunction]
+fn reconcile_keyed_collection_json(py: Python<'_>, input: Vec<u8>) -> PyResult<Vec<u8>> {
+    py.detach(|| {
+        keyed::reconcile_keyed_collection_json(&input)
+            .map_err(|error| PyValueError::new_err(error.to_string()))
+    })
+}
+
 #[pymodule]
 fn _native(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(engine_version, m)?)?;
     m.add_function(wrap_pyfunction!(build_vm_operation_queue_json, m)?)?;
+    m.add_function(wrap_pyfunction!(normalize_current_vm_payloads_json, m)?)?;
+    m.add_function(wrap_pyfunction!(normalize_desired_vm_payloads_json, m)?)?;
+    m.add_function(wrap_pyfunction!(extract_vm_snapshot_identities_json, m)?)?;
+    m.add_function(wrap_pyfunction!(reconcile_keyed_collection_json, m)?)?;
     Ok(())
 }
 
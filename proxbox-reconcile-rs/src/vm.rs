@@ -54,6 +54,18 @@ pub struct VmOperation {
     pub patch_payload: Map<String, Value>,
 }
 
+/// Identity fields the Python snapshot indexer reads from every NetBox VM record.
+///
+/// `endpoint_id` and `cluster_id` are only set when the record also carries a
+/// parseable `proxmox_vm_id`, matching the keys used by the snapshot indexes.
+#[derive(Debug, PartialEq, Serialize)]
+pub struct VmSnapshotIdentity {
+    pub endpoint_id: Option<i64>,
+    pub cluster_id: Option<i64>,
+    pub proxmox_vmid: Option<i64>,
+    pub vm_type: Option<String>,
+}
+
 type TypedSnapshotIndex = HashMap<(i64, i64, String), Value>;
 type UntypedSnapshotIndex = HashMap<(i64, i64), Vec<Value>>;
 
@@ -241,6 +253,21 @@ fn select_existing_vm_record(
     (candidates.len() == 1).then(|| candidates[0].clone())
 }
 
+pub fn extract_vm_snapshot_identity(record: &Value) -> VmSnapshotIdentity {
+    let endpoint_key = extract_endpoint_and_proxmox_vmid(record);
+    let cluster_key = extract_cluster_and_proxmox_vmid(record);
+    let proxmox_vmid = record
+        .get("custom_fields")
+        .and_then(Value::as_object)
+        .and_then(|custom_fields| relation_id(custom_fields.get("proxmox_vm_id")));
+    VmSnapshotIdentity {
+        endpoint_id: endpoint_key.map(|(endpoint_id, _)| endpoint_id),
+        cluster_id: cluster_key.map(|(cluster_id, _)| cluster_id),
+        proxmox_vmid,
+        vm_type: extract_proxmox_vm_type(record),
+    }
+}
+
 fn extract_cluster_and_proxmox_vmid(record: &Value) -> Option<(i64, i64)> {
     let object = record.as_object()?;
     let cluster_id = relation_id(object.get("cluster"))?;
@@ -9,3 +9,13 @@ def test_engine_version() -> None:
 
 def test_build_vm_operation_queue_json_is_exported() -> None:
     assert callable(proxbox_reconcile_rs.build_vm_operation_queue_json)
+
+
+def test_batch_normalizers_are_exported() -> None:
+    assert callable(proxbox_reconcile_rs.normalize_current_vm_payloads_json)
+    assert callable(proxbox_reconcile_rs.normalize_desired_vm_payloads_json)
+    assert callable(proxbox_reconcile_rs.extract_vm_snapshot_identities_json)
+
+
+def test_keyed_collection_reconcile_is_exported() -> None:
+    assert callable(proxbox_reconcile_rs.reconcile_keyed_collection_json)
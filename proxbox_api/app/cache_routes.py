@@ -5,6 +5,7 @@ from __future__ import annotations
 from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse
 
+from proxbox_api.auth import verified_key_cache
 from proxbox_api.cache import global_cache
 from proxbox_api.netbox_rest import (
     _netbox_get_cache,
@@ -13,10 +14,18 @@ from proxbox_api.netbox_rest import (
     get_cache_prometheus_metrics,
 )
 from proxbox_api.services.custom_fields import invalidate_custom_fields_cache
+from proxbox_api.services.guest_agent_cache import guest_agent_cache
+from proxbox_api.services.proxmox.cluster_cache import cluster_cache
+from proxbox_api.services.proxmox.inventory import vm_config_cache
+from proxbox_api.services.proxmox_limiter import get_proxmox_limiter_prometheus_metrics
 from proxbox_api.services.sync.reconciliation.metrics import (
     get_reconciliation_metrics,
     get_reconciliation_prometheus_metrics,
 )
+from proxbox_api.session.proxmox_pool import (
+    get_proxmox_session_pool,
+    invalidate_proxmox_sessions,
+)
 
 cache_router = APIRouter()
 
@@ -33,6 +42,11 @@ async def get_cache() -> dict:
         "proxbox_cache": global_cache.return_cache(),
         "netbox_get_cache_metrics": netbox_metrics,
         "reconciliation_metrics": reconciliation_metrics,
+        "proxmox_session_pool": get_proxmox_session_pool().stats(),
+        "cluster_cache": cluster_cache.stats(),
+        "vm_config_cache": vm_config_cache.stats(),
+        "guest_agent_cache": guest_agent_cache.stats(),
+        "verified_key_cache": verified_key_cache.stats(),
         "netbox_get_cache_sample": sample_keys,
     }
 
@@ -45,7 +59,11 @@ async def get_cache_metrics_json() -> dict:
 @cache_router.get("/cache/metrics/prometheus")
 async def get_cache_metrics_prometheus() -> PlainTextResponse:
     return PlainTextResponse(
-        content=get_cache_prometheus_metrics() + get_reconciliation_prometheus_metrics(),
+        content=(
+            get_cache_prometheus_metrics()
+            + get_reconciliation_prometheus_metrics()
+            + get_proxmox_limiter_prometheus_metrics()
+        ),
         media_type="text/plain; charset=utf-8",
     )
 
@@ -55,6 +73,11 @@ async def clear_cache() -> dict:
     global_cache.clear_cache()
     clear_rest_get_cache()
     invalidate_custom_fields_cache()
+    cluster_cache.clear()
+    vm_config_cache.clear()
+    guest_agent_cache.clear()
+    verified_key_cache.clear()
+    await invalidate_proxmox_sessions()
     return {"message": "All caches cleared"}
 
 
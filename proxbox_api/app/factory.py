@@ -2,243 +2,42 @@
 
 from __future__ import annotations
 
-import asyncio
-import ipaddress
 import os
-import time
-from collections import defaultdict
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
 
 from proxbox_api import __version__
 from proxbox_api.app import bootstrap
-from proxbox_api.app.cache_routes import register_cache_routes
 from proxbox_api.app.cors import build_cors_origins
 from proxbox_api.app.exceptions import register_exception_handlers
-from proxbox_api.app.full_update import register_full_update_routes
+from proxbox_api.app.middleware import (
+    APIKeyAuthMiddleware,
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+)
 from proxbox_api.app.root_meta import root_meta_router
-from proxbox_api.app.websockets import register_websocket_routes
-from proxbox_api.auth import check_auth_header_with_session, get_session_factory
+from proxbox_api.app.router_manifest import enabled_features, include_manifest_routers
 from proxbox_api.exception import ProxboxException
 from proxbox_api.log_buffer import configure_buffer_logger
 from proxbox_api.logger import logger
-from proxbox_api.openapi_custom import custom_openapi_builder
-from proxbox_api.routes.admin import router as admin_router
+from proxbox_api.openapi_custom import custom_openapi_builder, mount_openapi_route
 from proxbox_api.routes.auth import router as auth_router
-from proxbox_api.routes.cloud import azure_vhd_imports_router as cloud_azure_vhd_imports_router
-from proxbox_api.routes.cloud import firecracker_router as cloud_firecracker_router
-from proxbox_api.routes.cloud import image_factory_router as cloud_image_factory_router
-from proxbox_api.routes.cloud import lxc_router as cloud_lxc_router
-from proxbox_api.routes.cloud import network_router as cloud_network_router
-from proxbox_api.routes.cloud import provision_router as cloud_provision_router
-from proxbox_api.routes.cloud import provision_stream_router as cloud_provision_stream_router
-from proxbox_api.routes.cloud import pve_template_router as cloud_pve_template_router
-from proxbox_api.routes.cloud import qemu_templates_router as cloud_qemu_templates_router
-from proxbox_api.routes.cloud import template_images_router as cloud_template_images_router
-from proxbox_api.routes.cloud import templates_router as cloud_templates_router
-from proxbox_api.routes.cloud import versions_router as cloud_versions_router
-from proxbox_api.routes.dcim import router as dcim_router
-from proxbox_api.routes.extras import router as extras_router
-from proxbox_api.routes.intent import router as intent_router
-from proxbox_api.routes.intent.deletion_requests import router as deletion_requests_router
-from proxbox_api.routes.intent.vm_tags import router as vm_tags_router
-from proxbox_api.routes.netbox import router as netbox_router
-from proxbox_api.routes.proxmox import router as proxmox_router
-from proxbox_api.routes.proxmox.access import router as px_access_router
-from proxbox_api.routes.proxmox.cluster import router as px_cluster_router
-from proxbox_api.routes.proxmox.datacenter import router as px_datacenter_router
-from proxbox_api.routes.proxmox.firewall import router as px_firewall_router
-from proxbox_api.routes.proxmox.ha import router as px_ha_router
-from proxbox_api.routes.proxmox.nodes import router as px_nodes_router
-from proxbox_api.routes.proxmox.replication import router as px_replication_router
-from proxbox_api.routes.proxmox.runtime_generated import register_generated_proxmox_routes
-from proxbox_api.routes.proxmox.sdn import router as px_sdn_router
-from proxbox_api.routes.proxmox.services import router as px_services_router
-from proxbox_api.routes.proxmox.zfs import router as px_zfs_router
-from proxbox_api.routes.proxmox_actions import router as proxmox_actions_router
-from proxbox_api.routes.ssh_terminal import router as ssh_terminal_router
-from proxbox_api.routes.sync.active import router as sync_active_router
-from proxbox_api.routes.sync.individual import router as sync_individual_router
-from proxbox_api.routes.virtualization import router as virtualization_router
-from proxbox_api.routes.virtualization.virtual_machines import router as virtual_machines_router
+from proxbox_api.routes.proxmox.runtime_generated import (
+    install_lazy_generated_proxmox_routes,
+    lazy_generated_routes_enabled,
+    register_generated_proxmox_routes,
+)
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
 
 
-AUTH_EXEMPT_PATHS = frozenset(
-    {
-        "/",
-        "/docs",
-        "/redoc",
-        "/openapi.json",
-        "/health",
-        "/meta",
-        "/auth/register-key",
-        "/auth/bootstrap-status",
-    }
-)
-
-
-def _load_trusted_proxies() -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
-    raw = os.environ.get("PROXBOX_TRUSTED_PROXIES", "").strip()
-    if not raw:
-        return ()
-    networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = []
-    for token in raw.split(","):
-        token = token.strip()
-        if not token:
-            continue
-        try:
-            networks.append(ipaddress.ip_network(token, strict=False))
-        except ValueError:
-            logger.warning("Ignoring invalid PROXBOX_TRUSTED_PROXIES entry: %s", token)
-    return tuple(networks)
-
-
-_TRUSTED_PROXIES = _load_trusted_proxies()
-
-
-def _peer_is_trusted(peer_ip: str) -> bool:
-    if not _TRUSTED_PROXIES:
-        return False
-    try:
-        peer = ipaddress.ip_address(peer_ip)
-    except ValueError:
-        return False
-    return any(peer in net for net in _TRUSTED_PROXIES)
-
-
-def resolve_client_ip(request: Request) -> str:
-    """Return the originating client IP, trusting X-Forwarded-For only from configured proxies.
-
-    Set PROXBOX_TRUSTED_PROXIES to a comma-separated list of CIDRs / IPs to enable header trust.
-    Without this env var, the peer IP is always returned, which prevents per-IP rate-limit
-    and brute-force-lockout bypass via spoofed X-Forwarded-For headers.
-    """
-    peer_ip = request.client.host if request.client else "unknown"
-    if not _peer_is_trusted(peer_ip):
-        return peer_ip
-    forwarded = request.headers.get("X-Forwarded-For")
-    if not forwarded:
-        return peer_ip
-    # Walk right-to-left, skipping trusted-proxy hops, to find the first untrusted client.
-    candidates = [token.strip() for token in forwarded.split(",") if token.strip()]
-    for candidate in reversed(candidates):
-        if not _peer_is_trusted(candidate):
-            return candidate
-    return candidates[0] if candidates else peer_ip
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting per IP address.
-
-    Limits requests to a configurable rate per minute.
-    """
-
-    def __init__(self, app: FastAPI, requests_per_minute: int = 60) -> None:
-        super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.window_size = 60.0
-        self._requests: dict[str, list[float]] = defaultdict(list)
-
-    def _clean_old_requests(self, ip: str, now: float) -> None:
-        cutoff = now - self.window_size
-        self._requests[ip] = [t for t in self._requests[ip] if t > cutoff]
-        # Remove IP entry if no requests remain (prevent unbounded dict growth)
-        if not self._requests[ip]:
-            del self._requests[ip]
-
-    def _get_client_ip(self, request: Request) -> str:
-        return resolve_client_ip(request)
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        path = request.url.path
-        if path.startswith("/static/") or path in AUTH_EXEMPT_PATHS:
-            return await call_next(request)
-
-        now = time.time()
-        ip = self._get_client_ip(request)
-        self._clean_old_requests(ip, now)
-
-        if len(self._requests[ip]) >= self.requests_per_minute:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded. Please try again later."},
-                headers={"Retry-After": "60"},
-            )
-
-        self._requests[ip].append(now)
-        return await call_next(request)
-
-
-_DOCS_CSP = (
-    "default-src 'self'; "
-    "script-src 'self' 'unsafe-inline'; "
-    "style-src 'self' 'unsafe-inline'; "
-    "img-src 'self' data:; "
-    "frame-ancestors 'none'"
-)
-_DEFAULT_CSP = "default-src 'self'; frame-ancestors 'none'"
-_DOCS_PATHS = frozenset({"/docs", "/redoc"})
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses."""
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        csp = _DOCS_CSP if request.url.path in _DOCS_PATHS else _DEFAULT_CSP
-        response.headers["Content-Security-Policy"] = csp
-        return response
-
-
-class APIKeyAuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to enforce API key authentication on protected routes."""
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        path = request.url.path
-
-        if path in AUTH_EXEMPT_PATHS or path.startswith("/static/"):
-            return await call_next(request)
-
-        api_key = request.headers.get("X-Proxbox-API-Key")
-        client_ip = self._get_client_ip(request)
-
-        session_factory = get_session_factory(request.app)
-        with session_factory() as session:
-            authorized, error_message = await asyncio.to_thread(
-                check_auth_header_with_session, session, api_key, client_ip
-            )
-
-        if not authorized:
-            status_code = 429 if "Too many failed" in (error_message or "") else 401
-            return JSONResponse(
-                status_code=status_code,
-                content={"detail": error_message},
-                headers={"Retry-After": "300"} if status_code == 429 else {},
-            )
-
-        return await call_next(request)
-
-    def _get_client_ip(self, request: Request) -> str:
-        return resolve_client_ip(request)
-
-
 # Legacy module-level placeholders (some tooling may read these names).
 configuration = None
 default_config: dict = {}
@@ -250,7 +49,10 @@ PROXBOX_PLUGIN_NAME: str = "netbox_proxbox"
 @asynccontextmanager
 async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
     try:
-        register_generated_proxmox_routes(app)
+        if lazy_generated_routes_enabled():
+            install_lazy_generated_proxmox_routes(app)
+        else:
+            register_generated_proxmox_routes(app)
     except ProxboxException as error:
         logger.warning(
             "Generated Proxmox proxy routes were not mounted: %s",
@@ -273,6 +75,12 @@ async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     yield
 
+    from proxbox_api.services.sync.vm_payload_pool import shutdown_vm_payload_pool
+    from proxbox_api.session.proxmox_pool import shutdown_proxmox_session_pool
+
+    shutdown_vm_payload_pool()
+    await shutdown_proxmox_session_pool()
+
 
 async def _run_bootstrap_pass(app: FastAPI) -> None:
     """Resolve the ``ensure_netbox_objects`` flag and run NetBox bootstrap.
@@ -353,12 +161,15 @@ def create_app() -> FastAPI:  # noqa: C901
         lifespan=_lifespan,
         docs_url=None,
         redoc_url=None,
+        # Served by mount_openapi_route from cached, pre-serialized bytes.
+        openapi_url=None,
     )
 
     def custom_openapi():
         return custom_openapi_builder(app)
 
     app.openapi = custom_openapi
+    mount_openapi_route(app)
 
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     static_dir = os.path.join(base_dir, "static")
@@ -424,98 +235,6 @@ def create_app() -> FastAPI:  # noqa: C901
     app.include_router(root_meta_router)
     app.include_router(auth_router)
 
-    features = {
-        token.strip().lower()
-        for token in os.environ.get("PROXBOX_FEATURES", "").split(",")
-        if token.strip()
-    }
-    sidecar_features = {"pbs", "ceph", "pdm"}
-    sidecar_only = bool(features) and features.issubset(sidecar_features)
-    include_pbs = not features or "pbs" in features
-    include_ceph = not features or "ceph" in features
-    include_pdm = not features or "pdm" in features
-
-    if not sidecar_only:
-        register_cache_routes(app)
-        register_full_update_routes(app)
-        register_websocket_routes(app)
-        app.include_router(admin_router, prefix="/admin", tags=["admin"])
-        app.include_router(netbox_router, prefix="/netbox", tags=["netbox"])
-        app.include_router(px_nodes_router, prefix="/proxmox/nodes", tags=["proxmox / nodes"])
-        app.include_router(px_cluster_router, prefix="/proxmox/cluster", tags=["proxmox / cluster"])
-        app.include_router(px_ha_router, prefix="/proxmox/cluster", tags=["proxmox / ha"])
-        app.include_router(px_replication_router, prefix="/proxmox", tags=["proxmox / replication"])
-        app.include_router(px_firewall_router, prefix="/proxmox", tags=["proxmox / firewall"])
-        app.include_router(px_sdn_router, prefix="/proxmox", tags=["proxmox / sdn"])
-        app.include_router(px_datacenter_router, prefix="/proxmox", tags=["proxmox / datacenter"])
-        app.include_router(px_access_router, prefix="/proxmox", tags=["proxmox / access"])
-        app.include_router(px_services_router, prefix="/proxmox", tags=["proxmox / services"])
-        app.include_router(px_zfs_router, prefix="/proxmox", tags=["proxmox / zfs"])
-        app.include_router(
-            proxmox_actions_router, prefix="/proxmox", tags=["proxmox / operational verbs"]
-        )
-        app.include_router(proxmox_router, prefix="/proxmox", tags=["proxmox"])
-        app.include_router(dcim_router, prefix="/dcim", tags=["dcim"])
-        app.include_router(virtualization_router, prefix="/virtualization", tags=["virtualization"])
-        app.include_router(
-            virtual_machines_router,
-            prefix="/virtualization/virtual-machines",
-            tags=["virtualization / virtual-machines"],
-        )
-        app.include_router(extras_router, prefix="/extras", tags=["extras"])
-        app.include_router(intent_router, prefix="/intent", tags=["intent"])
-        app.include_router(deletion_requests_router, prefix="/intent", tags=["intent"])
-        app.include_router(vm_tags_router, prefix="/intent", tags=["intent"])
-        app.include_router(cloud_lxc_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_provision_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_provision_stream_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_firecracker_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_azure_vhd_imports_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_network_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_image_factory_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_template_images_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_pve_template_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_qemu_templates_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_templates_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(cloud_versions_router, prefix="/cloud", tags=["cloud"])
-        app.include_router(ssh_terminal_router, prefix="/ssh", tags=["ssh terminal"])
-        app.include_router(
-            sync_individual_router, prefix="/sync/individual", tags=["sync / individual"]
-        )
-        app.include_router(sync_active_router)
-
-    if include_pbs:
-        try:
-            from proxbox_api.pbs import admin_router as pbs_admin_router  # noqa: PLC0415
-            from proxbox_api.pbs import router as pbs_router  # noqa: PLC0415
-        except ImportError as exc:
-            logger.info("PBS subpackage unavailable; /pbs/* routes disabled (%s)", exc)
-        else:
-            app.include_router(pbs_admin_router, prefix="/pbs", tags=["pbs"])
-            app.include_router(pbs_router, prefix="/pbs", tags=["pbs"])
-
-    if include_ceph:
-        try:
-            from proxbox_api.ceph import router as ceph_router  # noqa: PLC0415
-        except ImportError as exc:
-            logger.info("Ceph subpackage unavailable; /ceph/* routes disabled (%s)", exc)
-        else:
-            app.include_router(ceph_router, prefix="/ceph", tags=["ceph"])
-        try:
-            from proxbox_api.ceph.v2_routes import router as ceph_v2_router  # noqa: PLC0415
-        except ImportError as exc:
-            logger.info("Ceph v2 subpackage unavailable; /ceph/v2/* routes disabled (%s)", exc)
-        else:
-            app.include_router(ceph_v2_router, prefix="/ceph/v2", tags=["ceph-v2"])
-
-    if include_pdm:
-        try:
-            from proxbox_api.pdm import admin_router as pdm_admin_router  # noqa: PLC0415
-            from proxbox_api.pdm import router as pdm_router  # noqa: PLC0415
-        except ImportError as exc:
-            logger.info("PDM subpackage unavailable; /pdm/* routes disabled (%s)", exc)
-        else:
-            app.include_router(pdm_admin_router, prefix="/pdm", tags=["pdm"])
-            app.include_router(pdm_router, prefix="/pdm", tags=["pdm"])
+    include_manifest_routers(app, enabled_features())
 
     return app
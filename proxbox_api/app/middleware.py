@@ -0,0 +1,214 @@
+"""Pure ASGI middleware: rate limiting, API-key authentication, security headers.
+
+These run on every HTTP request, so they are plain ASGI callables rather than
+``BaseHTTPMiddleware`` subclasses. That avoids the extra task and response
+stream wrapping per request, and lets long-lived ``StreamingResponse`` (SSE)
+bodies flow straight through to the server. Non-HTTP scopes (websocket,
+lifespan) pass through untouched, as they did before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import os
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+
+from proxbox_api.auth import check_auth_header_with_session, get_session_factory
+from proxbox_api.logger import logger
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+AUTH_EXEMPT_PATHS = frozenset(
+    {
+        "/",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/health",
+        "/meta",
+        "/auth/register-key",
+        "/auth/bootstrap-status",
+    }
+)
+
+
+def _is_exempt(path: str) -> bool:
+    return path in AUTH_EXEMPT_PATHS or path.startswith("/static/")
+
+
+def _load_trusted_proxies() -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    raw = os.environ.get("PROXBOX_TRUSTED_PROXIES", "").strip()
+    if not raw:
+        return ()
+    networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = []
+    for token in raw.split(","):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(token, strict=False))
+        except ValueError:
+            logger.warning("Ignoring invalid PROXBOX_TRUSTED_PROXIES entry: %s", token)
+    return tuple(networks)
+
+
+_TRUSTED_PROXIES = _load_trusted_proxies()
+
+
+def _peer_is_trusted(peer_ip: str) -> bool:
+    if not _TRUSTED_PROXIES:
+        return False
+    try:
+        peer = ipaddress.ip_address(peer_ip)
+    except ValueError:
+        return False
+    return any(peer in net for net in _TRUSTED_PROXIES)
+
+
+def resolve_client_ip(connection: HTTPConnection) -> str:
+    """Return the originating client IP, trusting X-Forwarded-For only from configured proxies.
+
+    Set PROXBOX_TRUSTED_PROXIES to a comma-separated list of CIDRs / IPs to enable header trust.
+    Without this env var, the peer IP is always returned, which prevents per-IP rate-limit
+    and brute-force-lockout bypass via spoofed X-Forwarded-For headers.
+    """
+    peer_ip = connection.client.host if connection.client else "unknown"
+    if not _peer_is_trusted(peer_ip):
+        return peer_ip
+    forwarded = connection.headers.get("X-Forwarded-For")
+    if not forwarded:
+        return peer_ip
+    # Walk right-to-left, skipping trusted-proxy hops, to find the first untrusted client.
+    candidates = [token.strip() for token in forwarded.split(",") if token.strip()]
+    for candidate in reversed(candidates):
+        if not _peer_is_trusted(candidate):
+            return candidate
+    return candidates[0] if candidates else peer_ip
+
+
+class RateLimitMiddleware:
+    """Simple in-memory rate limiting per IP address.
+
+    Limits requests to a configurable rate per minute.
+    """
+
+    def __init__(self, app: ASGIApp, requests_per_minute: int = 60) -> None:
+        self.app = app
+        self.requests_per_minute = requests_per_minute
+        self.window_size = 60.0
+        self._requests: dict[str, list[float]] = defaultdict(list)
+
+    def _clean_old_requests(self, ip: str, now: float) -> None:
+        cutoff = now - self.window_size
+        self._requests[ip] = [t for t in self._requests[ip] if t > cutoff]
+        # Remove IP entry if no requests remain (prevent unbounded dict growth)
+        if not self._requests[ip]:
+            del self._requests[ip]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        ip = resolve_client_ip(HTTPConnection(scope))
+        self._clean_old_requests(ip, now)
+
+        if len(self._requests[ip]) >= self.requests_per_minute:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded. Please try again later."},
+                headers={"Retry-After": "60"},
+            )
+            await response(scope, receive, send)
+            return
+
+        self._requests[ip].append(now)
+        await self.app(scope, receive, send)
+
+
+_DOCS_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data:; "
+    "frame-ancestors 'none'"
+)
+_DEFAULT_CSP = "default-src 'self'; frame-ancestors 'none'"
+_DOCS_PATHS = frozenset({"/docs", "/redoc"})
+
+_SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+)
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        csp = _DOCS_CSP if scope["path"] in _DOCS_PATHS else _DEFAULT_CSP
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _SECURITY_HEADERS:
+                    headers[name] = value
+                headers["Content-Security-Policy"] = csp
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class APIKeyAuthMiddleware:
+    """Middleware to enforce API key authentication on protected routes."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        api_key = connection.headers.get("X-Proxbox-API-Key")
+        client_ip = resolve_client_ip(connection)
+
+        session_factory = get_session_factory(scope.get("app"))
+        with session_factory() as session:
+            authorized, error_message = await asyncio.to_thread(
+                check_auth_header_with_session, session, api_key, client_ip
+            )
+
+        if not authorized:
+            status_code = 429 if "Too many failed" in (error_message or "") else 401
+            response = JSONResponse(
+                status_code=status_code,
+                content={"detail": error_message},
+                headers={"Retry-After": "300"} if status_code == 429 else {},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,274 @@
+"""Feature-gated manifest of the HTTP routers mounted by ``create_app``.
+
+Routers are listed by import path instead of being imported at module load, so
+a deployment only pays the import cost of the route groups it enables through
+``PROXBOX_FEATURES``:
+
+* unset or empty: every feature is mounted;
+* only sidecar flags (``pbs``, ``ceph``, ``pdm``): just those service groups;
+* anything else: the ``core`` Proxmox/NetBox/sync surface plus the listed
+  optional groups. ``PROXBOX_FEATURES=sync`` (or ``core``) is the minimal
+  sync-only profile.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from proxbox_api.logger import logger
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+CORE_FEATURE = "core"
+SIDECAR_FEATURES = frozenset({"pbs", "ceph", "pdm"})
+OPTIONAL_FEATURES = frozenset({"cloud", "firecracker", "image-factory", "ssh"}) | SIDECAR_FEATURES
+_CORE_ALIASES = frozenset({CORE_FEATURE, "sync"})
+
+
+@dataclass(frozen=True, slots=True)
+class RouterSpec:
+    """One router (or ``register_*(app)`` hook) and the feature that gates it."""
+
+    module: str
+    attribute: str
+    feature: str = CORE_FEATURE
+    prefix: str = ""
+    tags: tuple[str, ...] = ()
+    register: bool = False
+    optional: bool = False
+
+
+ROUTER_MANIFEST: tuple[RouterSpec, ...] = (
+    RouterSpec("proxbox_api.app.cache_routes", "register_cache_routes", register=True),
+    RouterSpec("proxbox_api.app.full_update", "register_full_update_routes", register=True),
+    RouterSpec("proxbox_api.app.websockets", "register_websocket_routes", register=True),
+    RouterSpec("proxbox_api.routes.admin", "router", prefix="/admin", tags=("admin",)),
+    RouterSpec("proxbox_api.routes.netbox", "router", prefix="/netbox", tags=("netbox",)),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.nodes",
+        "router",
+        prefix="/proxmox/nodes",
+        tags=("proxmox / nodes",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.cluster",
+        "router",
+        prefix="/proxmox/cluster",
+        tags=("proxmox / cluster",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.ha",
+        "router",
+        prefix="/proxmox/cluster",
+        tags=("proxmox / ha",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.replication",
+        "router",
+        prefix="/proxmox",
+        tags=("proxmox / replication",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.firewall",
+        "router",
+        prefix="/proxmox",
+        tags=("proxmox / firewall",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.sdn", "router", prefix="/proxmox", tags=("proxmox / sdn",)
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.datacenter",
+        "router",
+        prefix="/proxmox",
+        tags=("proxmox / datacenter",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.access",
+        "router",
+        prefix="/proxmox",
+        tags=("proxmox / access",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.services",
+        "router",
+        prefix="/proxmox",
+        tags=("proxmox / services",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox.zfs", "router", prefix="/proxmox", tags=("proxmox / zfs",)
+    ),
+    RouterSpec(
+        "proxbox_api.routes.proxmox_actions",
+        "router",
+        prefix="/proxmox",
+        tags=("proxmox / operational verbs",),
+    ),
+    RouterSpec("proxbox_api.routes.proxmox", "router", prefix="/proxmox", tags=("proxmox",)),
+    RouterSpec("proxbox_api.routes.dcim", "router", prefix="/dcim", tags=("dcim",)),
+    RouterSpec(
+        "proxbox_api.routes.virtualization",
+        "router",
+        prefix="/virtualization",
+        tags=("virtualization",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.virtualization.virtual_machines",
+        "router",
+        prefix="/virtualization/virtual-machines",
+        tags=("virtualization / virtual-machines",),
+    ),
+    RouterSpec("proxbox_api.routes.extras", "router", prefix="/extras", tags=("extras",)),
+    RouterSpec("proxbox_api.routes.intent", "router", prefix="/intent", tags=("intent",)),
+    RouterSpec(
+        "proxbox_api.routes.intent.deletion_requests",
+        "router",
+        prefix="/intent",
+        tags=("intent",),
+    ),
+    RouterSpec("proxbox_api.routes.intent.vm_tags", "router", prefix="/intent", tags=("intent",)),
+    RouterSpec("proxbox_api.routes.cloud.lxc", "router", "cloud", prefix="/cloud", tags=("cloud",)),
+    RouterSpec(
+        "proxbox_api.routes.cloud.provision", "router", "cloud", prefix="/cloud", tags=("cloud",)
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.provision_stream",
+        "stream_router",
+        "cloud",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.firecracker",
+        "router",
+        "firecracker",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.azure_vhd_imports",
+        "router",
+        "cloud",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.network", "router", "cloud", prefix="/cloud", tags=("cloud",)
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.image_factory",
+        "router",
+        "image-factory",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.template_images",
+        "router",
+        "cloud",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.pve_template",
+        "router",
+        "cloud",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.qemu_templates",
+        "router",
+        "cloud",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.templates", "router", "cloud", prefix="/cloud", tags=("cloud",)
+    ),
+    RouterSpec(
+        "proxbox_api.routes.cloud.catalog",
+        "versions_router",
+        "cloud",
+        prefix="/cloud",
+        tags=("cloud",),
+    ),
+    RouterSpec(
+        "proxbox_api.routes.ssh_terminal", "router", "ssh", prefix="/ssh", tags=("ssh terminal",)
+    ),
+    RouterSpec(
+        "proxbox_api.routes.sync.individual",
+        "router",
+        prefix="/sync/individual",
+        tags=("sync / individual",),
+    ),
+    RouterSpec("proxbox_api.routes.sync.active", "router"),
+    RouterSpec(
+        "proxbox_api.pbs", "admin_router", "pbs", prefix="/pbs", tags=("pbs",), optional=True
+    ),
+    RouterSpec("proxbox_api.pbs", "router", "pbs", prefix="/pbs", tags=("pbs",), optional=True),
+    RouterSpec("proxbox_api.ceph", "router", "ceph", prefix="/ceph", tags=("ceph",), optional=True),
+    RouterSpec(
+        "proxbox_api.ceph.v2_routes",
+        "router",
+        "ceph",
+        prefix="/ceph/v2",
+        tags=("ceph-v2",),
+        optional=True,
+    ),
+    RouterSpec(
+        "proxbox_api.pdm", "admin_router", "pdm", prefix="/pdm", tags=("pdm",), optional=True
+    ),
+    RouterSpec("proxbox_api.pdm", "router", "pdm", prefix="/pdm", tags=("pdm",), optional=True),
+)
+
+
+def enabled_features(raw: str | None = None) -> frozenset[str]:
+    """Resolve ``PROXBOX_FEATURES`` into the set of mounted feature groups."""
+    if raw is None:
+        raw = os.environ.get("PROXBOX_FEATURES", "")
+    requested = {token.strip().lower() for token in raw.split(",") if token.strip()}
+    if not requested:
+        return OPTIONAL_FEATURES | {CORE_FEATURE}
+    if requested <= SIDECAR_FEATURES:
+        return frozenset(requested)
+    features = (requested & OPTIONAL_FEATURES) | {CORE_FEATURE}
+    unknown = requested - OPTIONAL_FEATURES - _CORE_ALIASES
+    if unknown:
+        logger.warning("Ignoring unknown PROXBOX_FEATURES entries: %s", ", ".join(sorted(unknown)))
+    return frozenset(features)
+
+
+def include_manifest_routers(
+    app: FastAPI,
+    features: frozenset[str],
+    manifest: tuple[RouterSpec, ...] = ROUTER_MANIFEST,
+) -> None:
+    """Import and mount every manifest entry whose feature is enabled.
+
+    Optional entries (the PBS, Ceph and PDM subpackages) fail open: an
+    ``ImportError`` is logged and that route group is skipped.
+    """
+    for spec in manifest:
+        if spec.feature not in features:
+            continue
+        try:
+            target = getattr(importlib.import_module(spec.module), spec.attribute)
+        except ImportError as exc:
+            if not spec.optional:
+                raise
+            logger.info(
+                "%s subpackage unavailable; %s/* routes disabled (%s)",
+                spec.feature.upper(),
+                spec.prefix,
+                exc,
+            )
+            continue
+        if spec.register:
+            target(app)
+        else:
+            app.include_router(target, prefix=spec.prefix, tags=list(spec.tags))
@@ -32,7 +32,7 @@ async def _do_ws_auth(websocket: WebSocket, api_key: str | None, client_ip: str)
 
 def _get_client_ip(websocket: WebSocket) -> str:
     # Reuse the request-side resolver for trusted-proxy semantics.
-    from proxbox_api.app.factory import _peer_is_trusted
+    from proxbox_api.app.middleware import _peer_is_trusted
 
     peer_ip = websocket.client.host if websocket.client else "unknown"
     if not _peer_is_trusted(peer_ip):
@@ -7,6 +7,13 @@ Subsequent key management requires authentication via /auth/keys endpoints.
 
 from __future__ import annotations
 
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager, contextmanager
 from typing import Callable
 
@@ -17,6 +24,76 @@ from proxbox_api.database import ApiKey, AuthLockout, async_session_factory, eng
 
 _LOCKOUT_DURATION = 300
 _MAX_FAILED_ATTEMPTS = 5
+_VERIFIED_KEY_CACHE_MAX_ENTRIES = 256
+
+
+def _resolve_verified_key_ttl_seconds() -> float:
+    raw = os.environ.get("PROXBOX_AUTH_KEY_CACHE_TTL_SECONDS", "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else 60.0
+    except ValueError:
+        return 60.0
+
+
+class VerifiedKeyCache:
+    """Bounded TTL cache of API keys that already passed bcrypt verification.
+
+    Entries are keyed by an HMAC of the presented key under a per-process
+    random secret, so raw keys are never held and digests are useless outside
+    this process. A hit authorizes the request without touching the database.
+    The key routes drop entries when a key is deleted or deactivated; other
+    workers notice at most one TTL later. A TTL of ``0`` disables the cache.
+    """
+
+    def __init__(self, max_entries: int = _VERIFIED_KEY_CACHE_MAX_ENTRIES) -> None:
+        self._secret = secrets.token_bytes(32)
+        self._entries: OrderedDict[bytes, tuple[int | None, float]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _digest(self, api_key: str) -> bytes:
+        return hmac.new(self._secret, api_key.encode(), hashlib.sha256).digest()
+
+    def get(self, api_key: str) -> bool:
+        """Return whether ``api_key`` was verified within the TTL."""
+        digest = self._digest(api_key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return False
+            if entry[1] <= time.monotonic():
+                del self._entries[digest]
+                return False
+            self._entries.move_to_end(digest)
+            return True
+
+    def put(self, api_key: str, key_id: int | None) -> None:
+        ttl = _resolve_verified_key_ttl_seconds()
+        if ttl <= 0:
+            return
+        digest = self._digest(api_key)
+        with self._lock:
+            self._entries[digest] = (key_id, time.monotonic() + ttl)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_key(self, key_id: int) -> None:
+        """Forget every cached credential that verified as ``key_id``."""
+        with self._lock:
+            for digest in [d for d, (cached_id, _) in self._entries.items() if cached_id == key_id]:
+                del self._entries[digest]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self._max_entries}
+
+
+verified_key_cache = VerifiedKeyCache()
 
 
 async def is_locked_out_async(session: AsyncSession, ip: str) -> bool:
@@ -47,6 +124,9 @@ async def check_auth_header_with_session_async(
 
     Returns (authorized, error_message) tuple.
     """
+    if api_key and verified_key_cache.get(api_key):
+        return True, None
+
     if await is_locked_out_async(session, client_ip):
         return False, "Too many failed authentication attempts. Please try again later."
 
@@ -63,7 +143,8 @@ async def check_auth_header_with_session_async(
             return False, f"API key required. {remaining} attempts remaining."
         return False, "API key required."
 
-    if not await ApiKey.verify_any_async(session, api_key):
+    key_id = await ApiKey.verify_any_id_async(session, api_key)
+    if key_id is None:
         await record_failed_attempt_async(session, client_ip)
         remaining = _MAX_FAILED_ATTEMPTS - await _get_attempt_count_async(session, client_ip)
         if remaining > 0:
@@ -71,6 +152,7 @@ async def check_auth_header_with_session_async(
         return False, "Invalid API key."
 
     await clear_failed_attempts_async(session, client_ip)
+    verified_key_cache.put(api_key, key_id)
     return True, None
 
 
@@ -115,6 +197,9 @@ def check_auth_header_with_session(
 
     Returns (authorized, error_message) tuple.
     """
+    if api_key and verified_key_cache.get(api_key):
+        return True, None
+
     if is_locked_out(session, client_ip):
         return False, "Too many failed authentication attempts. Please try again later."
 
@@ -131,7 +216,8 @@ def check_auth_header_with_session(
             return False, f"API key required. {remaining} attempts remaining."
         return False, "API key required."
 
-    if not ApiKey.verify_any(session, api_key):
+    key_id = ApiKey.verify_any_id(session, api_key)
+    if key_id is None:
         record_failed_attempt(session, client_ip)
         remaining = _MAX_FAILED_ATTEMPTS - _get_attempt_count(session, client_ip)
         if remaining > 0:
@@ -139,6 +225,7 @@ def check_auth_header_with_session(
         return False, "Invalid API key."
 
     clear_failed_attempts(session, client_ip)
+    verified_key_cache.put(api_key, key_id)
     return True, None
 
 
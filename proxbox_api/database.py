@@ -186,6 +186,45 @@ class FirewallIntentRequestRecord(SQLModel, table=True):
     updated_at: float = Field(default_factory=time.time)
 
 
+class TaskArchiveCursor(SQLModel, table=True):
+    """High-water mark of the task archive already reconciled for one node.
+
+    ``scope`` is ``endpoint:<id>`` for endpoint-backed sessions and
+    ``cluster:<name>`` for legacy sessions. ``covered_vmids`` lists the VMIDs
+    whose history the cursor already covers; VMs that appear later are
+    backfilled from the full archive once.
+    """
+
+    __tablename__: ClassVar[str] = "task_archive_cursor"
+    __table_args__ = {"extend_existing": True}
+
+    scope: str = Field(primary_key=True)
+    node: str = Field(primary_key=True)
+    last_starttime: int = Field(default=0)
+    last_upid: str | None = Field(default=None)
+    covered_vmids: list[int] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    updated_at: float = Field(default_factory=time.time)
+
+    @staticmethod
+    async def load_all_async(session: AsyncSession) -> list[TaskArchiveCursor]:
+        return list((await session.exec(select(TaskArchiveCursor))).all())
+
+    @staticmethod
+    async def upsert_many_async(session: AsyncSession, cursors: list[TaskArchiveCursor]) -> None:
+        now = time.time()
+        for cursor in cursors:
+            existing = await session.get(TaskArchiveCursor, (cursor.scope, cursor.node))
+            if existing is None:
+                cursor.updated_at = now
+                session.add(cursor)
+                continue
+            existing.last_starttime = cursor.last_starttime
+            existing.last_upid = cursor.last_upid
+            existing.covered_vmids = list(cursor.covered_vmids)
+            existing.updated_at = now
+        await session.commit()
+
+
 class PBSEndpoint(SQLModel, table=True):
     """Proxmox Backup Server (PBS) endpoint record.
 
@@ -581,25 +620,37 @@ class ApiKey(SQLModel, table=True):
 
     @staticmethod
     def verify_any(session: Session, provided_key: str) -> bool:
+        return ApiKey.verify_any_id(session, provided_key) is not None
+
+    @staticmethod
+    def verify_any_id(session: Session, provided_key: str) -> int | None:
+        """Return the id of the active key matching ``provided_key``, if any."""
+
         for row in session.exec(select(ApiKey).where(ApiKey.is_active == True)):  # noqa: E712
             try:
                 if bcrypt.checkpw(provided_key.encode(), row.key_hash.encode()):
-                    return True
+                    return row.id
             except Exception:
                 continue
-        return False
+        return None
 
     @staticmethod
     async def verify_any_async(session: AsyncSession, provided_key: str) -> bool:
+        return await ApiKey.verify_any_id_async(session, provided_key) is not None
+
+    @staticmethod
+    async def verify_any_id_async(session: AsyncSession, provided_key: str) -> int | None:
+        """Return the id of the active key matching ``provided_key``, if any."""
+
         result = await session.exec(select(ApiKey).where(ApiKey.is_active == True))  # noqa: E712
         provided = provided_key.encode()
         for row in result:
             try:
                 if await asyncio.to_thread(bcrypt.checkpw, provided, row.key_hash.encode()):
-                    return True
+                    return row.id
             except Exception:
                 continue
-        return False
+        return None
 
 
 def _migrate_api_key_bootstrap_claim(target_engine: Engine = engine) -> None:
@@ -2149,7 +2149,14 @@ async def rest_bulk_reconcile_async(  # noqa: C901
     strict_lookup: bool = False,
     nullable_fields: set[str] | frozenset[str] | None = None,
     fallback_to_individual: bool = True,
+    keyed_engine: bool = False,
 ) -> BulkReconcileResult:
+    """Reconcile ``payloads`` against one pre-fetched listing of ``path`` in bulk.
+
+    With ``keyed_engine`` the create/patch/unchanged split is computed by the
+    generic keyed reconcile, which honours the ``reconciliation_engine``
+    setting (Python, Rust or compare); otherwise it is diffed inline.
+    """
     if not payloads:
         return BulkReconcileResult(records=[], created=0, updated=0, unchanged=0, failed=0)
 
@@ -2215,46 +2222,85 @@ async def rest_bulk_reconcile_async(  # noqa: C901
                 return selected
         return candidates[0]
 
+    def _current_payload(record: RestRecord) -> dict[str, object]:
+        current_normalized = current_normalizer(record.serialize())
+        if supports_model_validation:
+            current_model = schema.model_validate(current_normalized)
+            return current_model.model_dump(exclude_none=True, by_alias=True)
+        return {
+            key: value for key, value in dict(current_normalized or {}).items() if value is not None
+        }
+
     to_create: list[tuple[dict[str, object], dict[str, object]]] = []
     to_patch: list[tuple[RestRecord, dict[str, object], dict[str, object]]] = []
     records: list[RestRecord] = []
     unchanged = 0
 
-    for desired_payload, lookup in desired_entries:
-        lookup_key = _lookup_tuple(lookup)
-        if lookup_key is None:
-            continue
-        existing_record = _select_existing(lookup_key)
-        if existing_record is None:
-            to_create.append((desired_payload, lookup))
-            continue
-        current_normalized = current_normalizer(existing_record.serialize())
-        if supports_model_validation:
-            current_model = schema.model_validate(current_normalized)
-            current_payload = current_model.model_dump(exclude_none=True, by_alias=True)
-        else:
-            current_payload = {
+    if keyed_engine:
+        from proxbox_api.services.sync.reconciliation.keyed import (
+            KeyedReconcileSpec,
+            reconcile_keyed_collection,
+        )
+
+        selected_records = [
+            record
+            for record in (_select_existing(lookup_key) for lookup_key in existing_groups)
+            if record is not None
+        ]
+        plan = reconcile_keyed_collection(
+            KeyedReconcileSpec(
+                key_fields=tuple(lookup_fields),
+                patchable_fields=(
+                    frozenset(str(field) for field in patchable_fields)
+                    if patchable_fields is not None
+                    else None
+                ),
+                nullable_fields=frozenset(nullable_fields or ()),
+            ),
+            [desired_payload for desired_payload, _lookup in desired_entries],
+            [_current_payload(record) for record in selected_records],
+            collection=path,
+        )
+        to_create.extend(desired_entries[index] for index in plan.create)
+        for update in plan.update:
+            to_patch.append(
+                (
+                    selected_records[update.current_index],
+                    update.patch,
+                    desired_entries[update.desired_index][1],
+                )
+            )
+        records.extend(selected_records[current_index] for _index, current_index in plan.unchanged)
+        unchanged += len(plan.unchanged)
+    else:
+        for desired_payload, lookup in desired_entries:
+            lookup_key = _lookup_tuple(lookup)
+            if lookup_key is None:
+                continue
+            existing_record = _select_existing(lookup_key)
+            if existing_record is None:
+                to_create.append((desired_payload, lookup))
+                continue
+            current_payload = _current_payload(existing_record)
+            patch_payload = {
                 key: value
-                for key, value in dict(current_normalized or {}).items()
-                if value is not None
+                for key, value in desired_payload.items()
+                if current_payload.get(key) != value
             }
-        patch_payload = {
-            key: value
-            for key, value in desired_payload.items()
-            if current_payload.get(key) != value
-        }
-        if nullable_fields:
-            for field in nullable_fields:
-                if current_payload.get(field) is not None and field not in desired_payload:
-                    patch_payload[field] = None
-        if patchable_fields is not None:
-            allowed = {str(field) for field in patchable_fields}
-            patch_payload = {key: value for key, value in patch_payload.items() if key in allowed}
-        if patch_payload:
-            to_patch.append((existing_record, patch_payload, lookup))
-        else:
-            records.append(existing_record)
-            unchanged += 1
+            if nullable_fields:
+                for field in nullable_fields:
+                    if current_payload.get(field) is not None and field not in desired_payload:
+                        patch_payload[field] = None
+            if patchable_fields is not None:
+                allowed = {str(field) for field in patchable_fields}
+                patch_payload = {
+                    key: value for key, value in patch_payload.items() if key in allowed
+                }
+            if patch_payload:
+                to_patch.append((existing_record, patch_payload, lookup))
+            else:
+                records.append(existing_record)
+                unchanged += 1
 
     created = 0
     updated = 0
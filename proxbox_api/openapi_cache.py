@@ -0,0 +1,84 @@
+"""Pre-serialized JSON documents served with ETag and gzip negotiation.
+
+The application OpenAPI document embeds every generated Proxmox route and runs
+to several megabytes. Serializing it on every ``/openapi.json`` request costs
+far more than building it once. A ``SerializedDocument`` holds the compact
+JSON bytes, their gzip encoding and a validator computed once per document.
+``response`` answers ``If-None-Match`` with ``304`` and serves the gzip bytes
+to clients that accept them.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from hashlib import sha256
+
+from fastapi import Request
+from fastapi.responses import Response
+
+_GZIP_LEVEL = 6
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for token in accept_encoding.split(","):
+        coding, _, params = token.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.lower().startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SerializedDocument:
+    """Compact JSON bytes of one document, plus gzip encoding and weak ETag."""
+
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+    @classmethod
+    def from_object(cls, document: object) -> SerializedDocument:
+        # Same encoding as FastAPI's JSONResponse.
+        body = json.dumps(
+            document,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        return cls(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0),
+            # Weak: the identity and gzip representations are semantically equal.
+            etag=f'W/"{sha256(body).hexdigest()[:32]}"',
+        )
+
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            return Response(
+                content=self.gzip_body,
+                media_type="application/json",
+                headers={**headers, "Content-Encoding": "gzip"},
+            )
+        return Response(content=self.body, media_type="application/json", headers=headers)
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import Response
 
+from proxbox_api.openapi_cache import SerializedDocument
 from proxbox_api.proxmox_to_netbox.proxmox_schema import (
     DEFAULT_PROXMOX_OPENAPI_TAG,
     load_proxmox_generated_openapi,
@@ -49,3 +51,34 @@ def custom_openapi_builder(app: FastAPI) -> dict[str, object]:
 
     app.openapi_schema = openapi_schema
     return app.openapi_schema
+
+
+def invalidate_openapi_cache(app: FastAPI) -> None:
+    """Drop the cached schema and its serialized bytes after the route set changes."""
+
+    app.openapi_schema = None
+    app.state.openapi_document = None
+
+
+def serialized_openapi_document(app: FastAPI) -> SerializedDocument:
+    """Return the serialized OpenAPI document, built once per route-set generation.
+
+    The bytes are tied to the identity of ``app.openapi_schema``, so anything
+    that resets the schema (route remounts included) also invalidates them.
+    """
+
+    schema = app.openapi()
+    cached = getattr(app.state, "openapi_document", None)
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    document = SerializedDocument.from_object(schema)
+    app.state.openapi_document = (schema, document)
+    return document
+
+
+def mount_openapi_route(app: FastAPI, path: str = "/openapi.json") -> None:
+    """Serve the OpenAPI document from cached bytes with ETag and gzip support."""
+
+    @app.get(path, include_in_schema=False)
+    async def cached_openapi(request: Request) -> Response:
+        return serialized_openapi_document(app).response(request)
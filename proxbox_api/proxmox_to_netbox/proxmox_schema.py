@@ -9,7 +9,8 @@ from pathlib import Path
 from proxbox_api.logger import logger
 
 DEFAULT_PROXMOX_OPENAPI_TAG = "latest"
-RUNTIME_GENERATED_ROUTE_CACHE_FILENAME = "runtime_generated_routes_cache.json"
+RUNTIME_GENERATED_ROUTE_CACHE_FILENAME = "runtime_generated_routes_cache.pickle"
+RUNTIME_GENERATED_MODELS_DIRNAME = "runtime_models"
 
 
 def get_user_generated_dir() -> Path:
@@ -62,6 +63,15 @@ def proxmox_generated_route_cache_path() -> Path:
     return get_user_generated_dir() / RUNTIME_GENERATED_ROUTE_CACHE_FILENAME
 
 
+def proxmox_generated_model_package_root() -> Path:
+    """Return the directory holding on-disk packages of runtime-generated Pydantic models.
+
+    Each package is keyed by a hash of its OpenAPI document, so regular imports
+    and ``__pycache__`` bytecode can be reused by later worker processes.
+    """
+    return get_user_generated_dir() / RUNTIME_GENERATED_MODELS_DIRNAME
+
+
 def available_proxmox_sdk_versions() -> list[str]:
     """List generated Proxmox version tags that have an available OpenAPI artifact.
 
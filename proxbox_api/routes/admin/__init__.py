@@ -4,13 +4,14 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
 from proxbox_api import templates
-from proxbox_api.routes.admin import encryption, logs
+from proxbox_api.routes.admin import encryption, logs, proxmox_limiter
 from proxbox_api.routes.netbox import GetNetBoxEndpoint
 
 router = APIRouter()
 
 router.include_router(logs.router)
 router.include_router(encryption.router)
+router.include_router(proxmox_limiter.router)
 
 
 def _sanitize_endpoint_for_display(endpoint: object) -> dict:
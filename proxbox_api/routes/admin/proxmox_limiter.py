@@ -0,0 +1,15 @@
+"""Inspection endpoint for the per-node adaptive Proxmox request limiter."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from proxbox_api.services.proxmox_limiter import get_proxmox_request_limiter
+
+router = APIRouter()
+
+
+@router.get("/proxmox-limiter")
+async def get_proxmox_limiter_state() -> dict:
+    """Return global, per-endpoint and per-node limits, in-flight and queued requests."""
+    return get_proxmox_request_limiter().stats()
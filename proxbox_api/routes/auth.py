@@ -15,6 +15,7 @@ from pydantic import BaseModel
 from sqlalchemy import func, text
 from sqlmodel import select
 
+from proxbox_api.auth import verified_key_cache
 from proxbox_api.database import (
     ApiKey,
     ApiKeyBootstrapConflict,
@@ -126,6 +127,7 @@ async def _delete_key_safely(
         raise _last_active_key_error()
     await session.delete(key)
     await session.commit()
+    verified_key_cache.invalidate_key(key_id)
 
 
 async def _deactivate_key_safely(
@@ -143,6 +145,7 @@ async def _deactivate_key_safely(
     key.is_active = False
     session.add(key)
     await session.commit()
+    verified_key_cache.invalidate_key(key_id)
     await session.refresh(key)
     return key
 
@@ -1,17 +1,28 @@
-"""Cloud Portal provisioning routes."""
+"""Cloud Portal provisioning routes.
 
-from proxbox_api.routes.cloud.azure_vhd_imports import router as azure_vhd_imports_router
-from proxbox_api.routes.cloud.catalog import versions_router
-from proxbox_api.routes.cloud.firecracker import router as firecracker_router
-from proxbox_api.routes.cloud.image_factory import router as image_factory_router
-from proxbox_api.routes.cloud.lxc import router as lxc_router
-from proxbox_api.routes.cloud.network import router as network_router
-from proxbox_api.routes.cloud.provision import router as provision_router
-from proxbox_api.routes.cloud.provision_stream import stream_router as provision_stream_router
-from proxbox_api.routes.cloud.pve_template import router as pve_template_router
-from proxbox_api.routes.cloud.qemu_templates import router as qemu_templates_router
-from proxbox_api.routes.cloud.template_images import router as template_images_router
-from proxbox_api.routes.cloud.templates import router as templates_router
+Routers are resolved on first attribute access so importing a single cloud
+module (or running with the ``cloud`` feature disabled) does not import the
+whole provisioning stack.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+_ROUTER_MODULES = {
+    "azure_vhd_imports_router": ("proxbox_api.routes.cloud.azure_vhd_imports", "router"),
+    "lxc_router": ("proxbox_api.routes.cloud.lxc", "router"),
+    "provision_router": ("proxbox_api.routes.cloud.provision", "router"),
+    "provision_stream_router": ("proxbox_api.routes.cloud.provision_stream", "stream_router"),
+    "firecracker_router": ("proxbox_api.routes.cloud.firecracker", "router"),
+    "image_factory_router": ("proxbox_api.routes.cloud.image_factory", "router"),
+    "pve_template_router": ("proxbox_api.routes.cloud.pve_template", "router"),
+    "network_router": ("proxbox_api.routes.cloud.network", "router"),
+    "qemu_templates_router": ("proxbox_api.routes.cloud.qemu_templates", "router"),
+    "template_images_router": ("proxbox_api.routes.cloud.template_images", "router"),
+    "templates_router": ("proxbox_api.routes.cloud.templates", "router"),
+    "versions_router": ("proxbox_api.routes.cloud.catalog", "versions_router"),
+}
 
 __all__ = (
     "azure_vhd_imports_router",
@@ -27,3 +38,13 @@ __all__ = (
     "templates_router",
     "versions_router",
 )
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name, attribute = _ROUTER_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    router = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = router
+    return router
@@ -30,6 +30,7 @@ from proxbox_api.services.cloud_network import (
     validate_cloud_network_configured,
 )
 from proxbox_api.services.proxmox_helpers import get_node_storage_content, get_node_task_status
+from proxbox_api.services.task_watcher import get_task_watcher
 from proxbox_api.session.netbox import get_netbox_async_session
 from proxbox_api.session.proxmox import ProxmoxSession
 from proxbox_api.utils.log_scrubbing import scrub_cloud_init
@@ -37,7 +38,6 @@ from proxbox_api.utils.log_scrubbing import scrub_cloud_init
 router = APIRouter()
 
 _TASK_TIMEOUT_SECONDS = 300.0
-_TASK_POLL_INTERVAL_SECONDS = 1.0
 
 
 class CloudLXCTemplateItem(BaseModel):
@@ -88,20 +88,16 @@ def _extract_upid(response: object) -> str | None:
 
 
 async def _wait_for_upid(proxmox: ProxmoxSession, node: str, upid: str) -> None:
-    async def _poll() -> None:
-        while True:
-            task_status = await get_node_task_status(proxmox, node, upid)
-            status_value = getattr(task_status, "status", None)
-            exitstatus = getattr(task_status, "exitstatus", None)
-            if status_value == "stopped":
-                if exitstatus in (None, "OK"):
-                    return
-                raise ProxmoxAPIError(
-                    message=f"Proxmox LXC create task failed: exitstatus={exitstatus}"
-                )
-            await asyncio.sleep(_TASK_POLL_INTERVAL_SECONDS)
-
-    await asyncio.wait_for(_poll(), timeout=_TASK_TIMEOUT_SECONDS)
+    update = await asyncio.wait_for(
+        get_task_watcher().wait(proxmox, node, upid, status_fetcher=get_node_task_status),
+        timeout=_TASK_TIMEOUT_SECONDS,
+    )
+    if update.error is not None:
+        raise update.error
+    if not update.succeeded:
+        raise ProxmoxAPIError(
+            message=f"Proxmox LXC create task failed: exitstatus={update.exitstatus}"
+        )
 
 
 def _is_mock_mode() -> bool:
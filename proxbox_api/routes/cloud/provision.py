@@ -35,6 +35,7 @@ from proxbox_api.services.cloud_network import (
 )
 from proxbox_api.services.proxmox_helpers import get_node_task_status
 from proxbox_api.services.sync.vm_network import ensure_ip_assigned_to_vm
+from proxbox_api.services.task_watcher import get_task_watcher
 from proxbox_api.services.verb_dispatch import (
     resolve_netbox_vm_id,
     resolve_proxmox_node,
@@ -49,7 +50,6 @@ from proxbox_api.utils.log_scrubbing import scrub_cloud_init
 router = APIRouter()
 
 _TASK_TIMEOUT_SECONDS = 300.0
-_TASK_POLL_INTERVAL_SECONDS = 1.0
 _JOURNAL_TIMEOUT_SECONDS = 5.0
 _DRIVE_PREFIXES = ("ide", "sata", "scsi", "virtio")
 _NETBOX_ENDPOINT_PATH = "/api/plugins/proxbox/endpoints/proxmox/"
@@ -188,18 +188,14 @@ def _is_mock_proxmox_mode() -> bool:
 
 
 async def _wait_for_upid(proxmox: ProxmoxSession, node: str, upid: str) -> None:
-    async def _poll() -> None:
-        while True:
-            task_status = await get_node_task_status(proxmox, node, upid)
-            status_value = getattr(task_status, "status", None)
-            exitstatus = getattr(task_status, "exitstatus", None)
-            if status_value == "stopped":
-                if exitstatus in (None, "OK"):
-                    return
-                raise ProxmoxAPIError(message=f"Proxmox task failed with exitstatus={exitstatus}")
-            await asyncio.sleep(_TASK_POLL_INTERVAL_SECONDS)
-
-    await asyncio.wait_for(_poll(), timeout=_TASK_TIMEOUT_SECONDS)
+    update = await asyncio.wait_for(
+        get_task_watcher().wait(proxmox, node, upid, status_fetcher=get_node_task_status),
+        timeout=_TASK_TIMEOUT_SECONDS,
+    )
+    if update.error is not None:
+        raise update.error
+    if not update.succeeded:
+        raise ProxmoxAPIError(message=f"Proxmox task failed with exitstatus={update.exitstatus}")
 
 
 def _has_cloudinit_drive(config_payload: object) -> bool:
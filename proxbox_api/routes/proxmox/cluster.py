@@ -16,6 +16,8 @@ from proxbox_api.schemas.proxmox import (
     ClusterStatusSchema,
     ClusterStatusSchemaList,
 )
+from proxbox_api.services.proxmox.cluster_cache import cluster_cache, resources_fingerprint
+from proxbox_api.services.proxmox_helpers import dump_models
 from proxbox_api.services.proxmox_helpers import (
     get_cluster_resources as get_typed_cluster_resources,
 )
@@ -165,7 +167,9 @@ async def cluster_status(pxs: ProxmoxSessionsDep) -> ClusterStatusSchemaList:
         [
             await parse_cluster_status(
                 proxmox_object=px,
-                data=await get_typed_cluster_status(px),
+                data=await cluster_cache.get_or_fetch(
+                    "status", px, lambda px=px: get_typed_cluster_status(px)
+                ),
             )
             for px in pxs
         ]
@@ -177,6 +181,12 @@ ClusterStatusDep = Annotated[ClusterStatusSchemaList, Depends(cluster_status)]
 # /proxmox/cluster/ API Endpoints
 
 
+async def _fetch_cluster_resource_rows(
+    px: ProxmoxSession, resource_type: str | None
+) -> list[dict[str, object]]:
+    return dump_models(await get_typed_cluster_resources(px, resource_type=resource_type, raw=True))
+
+
 @router.get("/resources", response_model=ClusterResourcesList)
 async def cluster_resources(
     pxs: ProxmoxSessionsDep,
@@ -220,20 +230,24 @@ async def cluster_resources(
     seen_resource_ids_by_cluster: dict[str, set[str]] = {}
 
     for px in pxs:
-        resources = await get_typed_cluster_resources(px, resource_type=resource_type)
+        resources = await cluster_cache.get_or_fetch(
+            "resources",
+            px,
+            lambda px=px: _fetch_cluster_resource_rows(px, resource_type),
+            variant=str(resource_type or ""),
+            fingerprint=resources_fingerprint,
+        )
         cluster_name = px.name
         if cluster_name not in cluster_resource_map:
             cluster_resource_map[cluster_name] = []
             seen_resource_ids_by_cluster[cluster_name] = set()
         seen_resource_ids = seen_resource_ids_by_cluster[cluster_name]
         for resource in resources:
-            resource_id: str = resource.id
+            resource_id = resource.get("id")
             if resource_id in seen_resource_ids:
                 continue
             seen_resource_ids.add(resource_id)
-            cluster_resource_map[cluster_name].append(
-                resource.model_dump(mode="python", by_alias=True, exclude_none=True)
-            )
+            cluster_resource_map[cluster_name].append(dict(resource))
 
     return [{name: items} for name, items in cluster_resource_map.items()]
 
@@ -11,6 +11,7 @@ from sqlmodel import select
 from proxbox_api.database import AsyncDatabaseSessionDep as SessionDep
 from proxbox_api.database import ProxmoxEndpoint
 from proxbox_api.enum.proxmox import ProxmoxAccessMethod
+from proxbox_api.session.proxmox_pool import invalidate_proxmox_sessions
 from proxbox_api.settings_client import get_settings
 from proxbox_api.ssrf import clear_endpoint_cache, pre_allow_endpoint_hosts, validate_endpoint_host
 from proxbox_api.utils.async_compat import maybe_await as _maybe_await
@@ -298,6 +299,7 @@ async def update_proxmox_endpoint(  # noqa: C901
     await _maybe_await(session.refresh(db_endpoint))
 
     clear_endpoint_cache()
+    await invalidate_proxmox_sessions(endpoint_id)
     return _to_public_endpoint(db_endpoint)
 
 
@@ -311,4 +313,5 @@ async def delete_proxmox_endpoint(endpoint_id: int, session: SessionDep) -> dict
     await _maybe_await(session.commit())
 
     clear_endpoint_cache()
+    await invalidate_proxmox_sessions(endpoint_id)
     return {"message": "Proxmox endpoint deleted."}
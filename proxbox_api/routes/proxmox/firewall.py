@@ -25,7 +25,6 @@ from proxbox_api.database import AsyncDatabaseSessionDep as SessionDep
 from proxbox_api.database import ProxmoxEndpoint
 from proxbox_api.logger import logger
 from proxbox_api.proxmox_async import resolve_async
-from proxbox_api.routes.intent.dispatchers.common import get_vm_proxy
 from proxbox_api.schemas.firewall import (
     FirewallAliasWrite,
     FirewallIPSetEntryWrite,
@@ -146,6 +145,13 @@ class FirewallSummarySchema(BaseModel):
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 
+def _vm_proxy(px: object, node: str, vmid: int, vm_type: str) -> object:
+    # Deferred: the intent package imports services.firewall_intent, which imports this module.
+    from proxbox_api.routes.intent.dispatchers.common import get_vm_proxy  # noqa: PLC0415
+
+    return get_vm_proxy(px, node, vmid, vm_type)
+
+
 def _bool(value: object) -> bool | None:
     if value is None:
         return None
@@ -977,7 +983,7 @@ async def vm_firewall_rules(vmid: int, node: str, pxs: ProxmoxSessionsDep, vm_ty
     zone = "vm_qemu" if vm_type == "qemu" else "vm_lxc"
     for px in pxs:
         try:
-            vm_proxy = get_vm_proxy(px, node, vmid, vm_type)
+            vm_proxy = _vm_proxy(px, node, vmid, vm_type)
             raw_rules = await _safe_get(vm_proxy.firewall.rules.get())
             for rule in raw_rules:
                 results.append(_rule_from_raw(rule, px.name, zone, node=node, vmid=vmid))
@@ -1003,7 +1009,7 @@ async def vm_firewall_ipsets(vmid: int, node: str, pxs: ProxmoxSessionsDep, vm_t
     zone = "vm_qemu" if vm_type == "qemu" else "vm_lxc"
     for px in pxs:
         try:
-            vm_proxy = get_vm_proxy(px, node, vmid, vm_type)
+            vm_proxy = _vm_proxy(px, node, vmid, vm_type)
             raw_sets = await _safe_get(vm_proxy.firewall.ipset.get())
             for ipset in raw_sets:
                 set_name = ipset.get("name") or ""
@@ -1049,7 +1055,7 @@ async def vm_firewall_aliases(vmid: int, node: str, pxs: ProxmoxSessionsDep, vm_
     zone = "vm_qemu" if vm_type == "qemu" else "vm_lxc"
     for px in pxs:
         try:
-            vm_proxy = get_vm_proxy(px, node, vmid, vm_type)
+            vm_proxy = _vm_proxy(px, node, vmid, vm_type)
             raw_aliases = await _safe_get(vm_proxy.firewall.aliases.get())
             for alias in raw_aliases:
                 results.append(
@@ -1084,7 +1090,7 @@ async def vm_firewall_options(vmid: int, node: str, pxs: ProxmoxSessionsDep, vm_
     zone = "vm_qemu" if vm_type == "qemu" else "vm_lxc"
     for px in pxs:
         try:
-            vm_proxy = get_vm_proxy(px, node, vmid, vm_type)
+            vm_proxy = _vm_proxy(px, node, vmid, vm_type)
             raw = await _safe_get_dict(vm_proxy.firewall.options.get())
             if raw:
                 return _options_from_raw(raw, px.name, zone, node=node, vmid=vmid)
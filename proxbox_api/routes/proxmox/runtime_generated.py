@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
+import importlib.util
 import inspect
 import json
+import os
+import pickle
 import sys
 import threading
 from copy import deepcopy
 from datetime import UTC, datetime
+from functools import cache
 from hashlib import sha256
 from pathlib import Path as FilePath
 from types import ModuleType
 from typing import Literal
 
 from fastapi import Body, Depends, FastAPI, Path, Query
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
 
 from proxbox_api.database import get_async_session
 from proxbox_api.exception import ProxboxException
 from proxbox_api.logger import logger
+from proxbox_api.openapi_custom import invalidate_openapi_cache
 from proxbox_api.proxmox_async import resolve_async
+from proxbox_api.proxmox_codegen import pydantic_generator
 from proxbox_api.proxmox_codegen.pydantic_generator import (
     generate_pydantic_models_from_openapi,
 )
@@ -27,13 +37,21 @@ from proxbox_api.proxmox_to_netbox.proxmox_schema import (
     DEFAULT_PROXMOX_OPENAPI_TAG,
     available_proxmox_sdk_versions,
     load_proxmox_generated_openapi,
+    proxmox_generated_model_package_root,
     proxmox_generated_route_cache_path,
 )
-from proxbox_api.session.proxmox import resolve_proxmox_target_session
+from proxbox_api.runtime_settings import get_bool
+from proxbox_api.session.proxmox import (
+    release_proxmox_session,
+    resolve_proxmox_target_session,
+)
 
 _GENERATED_ROUTE_TAG_PREFIX = "proxmox / live-generated"
 _GENERATED_ROUTE_NAME_PREFIX = "generated_proxmox_route__"
-_GENERATED_ROUTE_CACHE_FORMAT = 1
+_GENERATED_ROUTE_CACHE_FORMAT = 2
+_MODEL_PACKAGE_FORMAT = 1
+_LAZY_LOADER_ROUTE_NAME = f"{_GENERATED_ROUTE_NAME_PREFIX}lazy_loader"
+_LAZY_REDISPATCH_SCOPE_KEY = "proxbox.generated_routes.lazy_redispatched"
 _GENERATED_ROUTE_STATE_LOCK = threading.RLock()
 _GENERATED_ROUTE_STATE: dict[str, object] = {
     "route_names": set(),
@@ -42,6 +60,7 @@ _GENERATED_ROUTE_STATE: dict[str, object] = {
     "cache_path": str(proxmox_generated_route_cache_path()),
     "cache_enabled": True,
     "loaded_from_cache": False,
+    "pending_versions": set(),
 }
 
 # In-process cache of generated Pydantic model modules, keyed by version tag.
@@ -122,18 +141,96 @@ def _render_proxmox_path(path_template: str, path_values: dict[str, object]) ->
     return rendered
 
 
+@cache
+def _model_generator_fingerprint() -> str:
+    """Digest of the code generator, so generator changes invalidate on-disk packages."""
+    digest = sha256(f"{_MODEL_PACKAGE_FORMAT}:{sys.version_info[:2]}".encode())
+    digest.update(FilePath(pydantic_generator.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def _model_package_dir(version_tag: str, document_fingerprint: str) -> FilePath:
+    package_key = sha256(
+        f"{_model_generator_fingerprint()}:{document_fingerprint}".encode()
+    ).hexdigest()[:24]
+    return proxmox_generated_model_package_root() / (
+        f"proxmox_{slugify_identifier(version_tag)}_{package_key}"
+    )
+
+
+def _write_model_package(package_dir: FilePath, code: str) -> FilePath | None:
+    """Persist generated model source as a package; return its ``__init__.py`` or None."""
+    init_path = package_dir / "__init__.py"
+    try:
+        package_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = package_dir / f".__init__.{os.getpid()}.tmp"
+        temp_path.write_text(code, encoding="utf-8")
+        # Atomic rename: concurrent workers racing on the same key write identical source.
+        os.replace(temp_path, init_path)
+    except OSError as error:
+        logger.warning(
+            "Unable to persist generated Proxmox models to %s: %s",
+            package_dir,
+            error,
+        )
+        return None
+    return init_path
+
+
+def _import_model_package(module_name: str, init_path: FilePath) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(
+        module_name,
+        init_path,
+        submodule_search_locations=[str(init_path.parent)],
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot import generated Proxmox models from {init_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
 def _load_model_module(openapi_document: dict[str, object], version_tag: str) -> ModuleType:
+    """Return the generated Pydantic models for one OpenAPI document.
+
+    Generated source is kept as a package under
+    ``proxmox_generated_model_package_root()``, keyed by the document and
+    generator hashes. Later processes import it through the regular import
+    system, which also reuses its ``__pycache__`` bytecode, instead of
+    re-running codegen. Unwritable locations fall back to an in-memory module.
+    """
     cache_key = _model_module_cache_key(openapi_document, version_tag)
     with _GENERATED_ROUTE_STATE_LOCK:
         cached_module = _MODEL_MODULE_CACHE.get(cache_key)
         if cached_module is not None:
             return cached_module
-        code = generate_pydantic_models_from_openapi(openapi_document)
-        module = ModuleType(
-            f"proxbox_api.generated.proxmox.runtime_{version_tag.replace('.', '_')}"
-        )
-        sys.modules[module.__name__] = module
-        exec(code, module.__dict__)
+        module_name = f"proxbox_api.generated.proxmox.runtime_{version_tag.replace('.', '_')}"
+        package_dir = _model_package_dir(version_tag, cache_key[1])
+        init_path = package_dir / "__init__.py"
+        module = None
+        if init_path.exists():
+            try:
+                module = _import_model_package(module_name, init_path)
+            except Exception as error:
+                logger.warning(
+                    "Regenerating unreadable Proxmox model package %s: %s",
+                    package_dir,
+                    error,
+                )
+        if module is None:
+            code = generate_pydantic_models_from_openapi(openapi_document)
+            written_path = _write_model_package(package_dir, code)
+            if written_path is not None:
+                module = _import_model_package(module_name, written_path)
+            else:
+                module = ModuleType(module_name)
+                sys.modules[module_name] = module
+                exec(code, module.__dict__)
         for value in module.__dict__.values():
             if (
                 isinstance(value, type)
@@ -159,7 +256,8 @@ def _read_generated_route_cache() -> dict[str, object] | None:
         return None
 
     try:
-        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        with cache_path.open("rb") as cache_file:
+            payload = pickle.load(cache_file)
     except Exception as error:
         logger.warning(
             "Unable to load generated Proxmox route cache from %s: %s",
@@ -207,7 +305,11 @@ def _write_generated_route_cache(
         "mounted_versions": sorted(documents.keys(), key=_version_sort_key),
         "documents": documents,
     }
-    cache_path.write_text(json.dumps(cache_payload, indent=2, sort_keys=True), encoding="utf-8")
+    # Pickle loads the multi-megabyte document set several times faster than JSON.
+    temp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    with temp_path.open("wb") as cache_file:
+        pickle.dump(cache_payload, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
     return cache_path
 
 
@@ -459,9 +561,7 @@ def _build_generated_endpoint(  # noqa: C901
                 python_exception=str(error),
             )
         finally:
-            close_method = getattr(target, "aclose", None)
-            if callable(close_method):
-                await close_method()
+            await release_proxmox_session(target)
 
         if response_model is None:
             return result
@@ -651,6 +751,7 @@ def register_generated_proxmox_routes(
             and openapi_document is None
             and openapi_documents is None
             and _GENERATED_ROUTE_STATE["route_names"]
+            and not _GENERATED_ROUTE_STATE["pending_versions"]
         ):
             existing_route_names = {getattr(route, "name", None) for route in app.routes}
             if set(_GENERATED_ROUTE_STATE["route_names"]).issubset(existing_route_names):
@@ -719,6 +820,7 @@ def register_generated_proxmox_routes(
 
         previous_names = set(_GENERATED_ROUTE_STATE["route_names"])
         _remove_generated_routes(app, previous_names)
+        _remove_lazy_loader(app)
         for spec in route_specs:
             app.add_api_route(**spec)
         _prioritize_generated_routes(app, all_route_names)
@@ -727,7 +829,7 @@ def register_generated_proxmox_routes(
             documents=dict(sorted(documents.items(), key=lambda item: _version_sort_key(item[0]))),
             alias_version_tag=_GENERATED_ROUTE_STATE["alias_version_tag"],
         )
-        app.openapi_schema = None
+        invalidate_openapi_cache(app)
         _GENERATED_ROUTE_STATE["route_names"] = all_route_names
         _GENERATED_ROUTE_STATE["versions"] = version_state
         _GENERATED_ROUTE_STATE["cache_path"] = str(cache_path)
@@ -755,6 +857,161 @@ def register_generated_proxmox_routes(
         }
 
 
+def lazy_generated_routes_enabled() -> bool:
+    """Whether startup mounts generated Proxmox routes per version on first use."""
+    return get_bool(
+        settings_key="generated_routes_lazy",
+        env="PROXBOX_GENERATED_ROUTES_LAZY",
+        default=True,
+    )
+
+
+def _mount_generated_version(app: FastAPI, version_tag: str, document: dict[str, object]) -> None:
+    """Add one version's routes next to the already mounted ones. Caller holds the lock."""
+    version_specs, state = _build_version_route_specs(version_tag=version_tag, document=document)
+    versions = _GENERATED_ROUTE_STATE["versions"]
+    previous = versions.get(version_tag)
+    if previous is not None:
+        _remove_generated_routes(app, set(previous["route_names"]))
+    for spec in version_specs:
+        app.add_api_route(**spec)
+    route_names = set(_GENERATED_ROUTE_STATE["route_names"])
+    if previous is not None:
+        route_names -= set(previous["route_names"])
+    route_names |= state["route_names"]
+    _prioritize_generated_routes(app, route_names)
+    versions[version_tag] = state
+    _GENERATED_ROUTE_STATE["route_names"] = route_names
+    _GENERATED_ROUTE_STATE["pending_versions"].discard(version_tag)
+    invalidate_openapi_cache(app)
+
+
+def _remove_lazy_loader(app: FastAPI) -> None:
+    _remove_generated_routes(app, {_LAZY_LOADER_ROUTE_NAME})
+    _GENERATED_ROUTE_STATE["pending_versions"] = set()
+
+
+class _LazyGeneratedRouteLoader:
+    """ASGI fallback for ``/proxmox/api2/{version_tag}/...`` while that version is unmounted.
+
+    Mounts the version, then dispatches the request again through the router,
+    which now matches the freshly mounted route. A request that still lands
+    here after one re-dispatch has no generated route and gets a 404.
+    """
+
+    def __init__(self, app: FastAPI) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        version_tag = str(scope.get("path_params", {}).get("version_tag") or "")
+        if not scope.get(_LAZY_REDISPATCH_SCOPE_KEY) and await run_in_threadpool(
+            ensure_generated_proxmox_version, self._app, version_tag
+        ):
+            scope[_LAZY_REDISPATCH_SCOPE_KEY] = True
+            await self._app.router(scope, receive, send)
+            return
+        response = JSONResponse(status_code=404, content={"detail": "Not Found"})
+        await response(scope, receive, send)
+
+
+def install_lazy_generated_proxmox_routes(app: FastAPI) -> dict[str, object]:
+    """Prepare generated Proxmox routes for on-demand mounting.
+
+    Only the alias version (``latest``, which is also the one in
+    ``/openapi.json``) is mounted right away. Every other available version is
+    mounted, models included, on the first request under its
+    ``/proxmox/api2/{version_tag}/`` prefix or when
+    ``ensure_generated_proxmox_version`` is called for it (for instance when
+    an endpoint of that release connects).
+    """
+
+    with _GENERATED_ROUTE_STATE_LOCK:
+        existing_route_names = {getattr(route, "name", None) for route in app.routes}
+        if _GENERATED_ROUTE_STATE["route_names"] and set(
+            _GENERATED_ROUTE_STATE["route_names"]
+        ).issubset(existing_route_names):
+            return {
+                "message": "Generated Proxmox live routes already registered.",
+                **generated_proxmox_route_state(),
+            }
+
+        versions = sorted(available_proxmox_sdk_versions(), key=_version_sort_key)
+        if not versions:
+            raise ProxboxException(
+                message="Generated Proxmox OpenAPI schema not found.",
+                detail="Run /proxmox/viewer/generate first.",
+            )
+
+        _remove_generated_routes(app, set(_GENERATED_ROUTE_STATE["route_names"]))
+        _remove_lazy_loader(app)
+        _GENERATED_ROUTE_STATE["route_names"] = set()
+        _GENERATED_ROUTE_STATE["versions"] = {}
+        _GENERATED_ROUTE_STATE["loaded_from_cache"] = False
+        _GENERATED_ROUTE_STATE["pending_versions"] = set(versions)
+
+        alias_version_tag = str(_GENERATED_ROUTE_STATE["alias_version_tag"])
+        if alias_version_tag in versions:
+            document = load_proxmox_generated_openapi(version_tag=alias_version_tag)
+            if document:
+                _mount_generated_version(app, alias_version_tag, document)
+
+        app.router.routes.append(
+            Route(
+                "/proxmox/api2/{version_tag}/{proxmox_path:path}",
+                endpoint=_LazyGeneratedRouteLoader(app),
+                methods=["GET", "POST", "PUT", "DELETE"],
+                name=_LAZY_LOADER_ROUTE_NAME,
+                include_in_schema=False,
+            )
+        )
+        invalidate_openapi_cache(app)
+        return {
+            "message": "Generated Proxmox live routes prepared for on-demand mounting.",
+            **generated_proxmox_route_state(),
+        }
+
+
+def ensure_generated_proxmox_version(app: FastAPI, version_tag: str) -> bool:
+    """Mount a pending generated version; return whether it is mounted now.
+
+    Building a version runs codegen and ``model_rebuild`` over the whole
+    Proxmox API, so async callers should run this in a worker thread.
+    """
+
+    with _GENERATED_ROUTE_STATE_LOCK:
+        if version_tag in _GENERATED_ROUTE_STATE["versions"]:
+            return True
+        if version_tag not in _GENERATED_ROUTE_STATE["pending_versions"]:
+            return False
+        document = load_proxmox_generated_openapi(version_tag=version_tag)
+        if not document:
+            _GENERATED_ROUTE_STATE["pending_versions"].discard(version_tag)
+            return False
+        _mount_generated_version(app, version_tag, document)
+        logger.info("Mounted generated Proxmox routes for version %s on first use.", version_tag)
+        return True
+
+
+def generated_proxmox_version_pending(version_tag: str) -> bool:
+    with _GENERATED_ROUTE_STATE_LOCK:
+        return version_tag in _GENERATED_ROUTE_STATE["pending_versions"]
+
+
+def add_generated_proxmox_version(app: FastAPI, version_tag: str) -> bool:
+    """Mount a newly generated version next to the lazily prepared ones."""
+
+    with _GENERATED_ROUTE_STATE_LOCK:
+        if not any(
+            getattr(route, "name", None) == _LAZY_LOADER_ROUTE_NAME for route in app.router.routes
+        ):
+            install_lazy_generated_proxmox_routes(app)
+        document = load_proxmox_generated_openapi(version_tag=version_tag)
+        if not document:
+            return False
+        _mount_generated_version(app, version_tag, document)
+        return True
+
+
 def generated_proxmox_route_state() -> dict[str, object]:
     """Return metadata about the currently mounted generated Proxmox route set."""
 
@@ -766,6 +1023,9 @@ def generated_proxmox_route_state() -> dict[str, object]:
             "cache_path": _GENERATED_ROUTE_STATE["cache_path"],
             "cache_enabled": _GENERATED_ROUTE_STATE["cache_enabled"],
             "loaded_from_cache": _GENERATED_ROUTE_STATE["loaded_from_cache"],
+            "pending_versions": sorted(
+                _GENERATED_ROUTE_STATE["pending_versions"], key=_version_sort_key
+            ),
             "route_count": len(_GENERATED_ROUTE_STATE["route_names"]),
             "versions": {
                 mounted_version: {
@@ -786,10 +1046,11 @@ def clear_generated_proxmox_routes(app: FastAPI) -> None:
 
     with _GENERATED_ROUTE_STATE_LOCK:
         _remove_generated_routes(app, set(_GENERATED_ROUTE_STATE["route_names"]))
+        _remove_lazy_loader(app)
         _GENERATED_ROUTE_STATE["route_names"] = set()
         _GENERATED_ROUTE_STATE["versions"] = {}
         _GENERATED_ROUTE_STATE["loaded_from_cache"] = False
-        app.openapi_schema = None
+        invalidate_openapi_cache(app)
 
 
 def clear_generated_proxmox_route_cache() -> None:
@@ -5,10 +5,11 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import PlainTextResponse
 
 from proxbox_api.exception import ProxboxException
+from proxbox_api.openapi_cache import SerializedDocument
 from proxbox_api.proxmox_codegen.apidoc_parser import PROXMOX_API_VIEWER_URL
 from proxbox_api.proxmox_codegen.pipeline import generate_proxmox_codegen_bundle_async
 from proxbox_api.proxmox_to_netbox.netbox_schema import netbox_openapi_schema_source
@@ -28,6 +29,20 @@ from proxbox_api.ssrf import validate_endpoint_url
 
 router = APIRouter()
 
+# Serialized viewer documents per version tag, keyed by the artifact's stat.
+_VIEWER_OPENAPI_CACHE: dict[str, tuple[tuple[str, int, int], SerializedDocument]] = {}
+
+
+def _serialized_viewer_openapi(version_tag: str, openapi_path: Path) -> SerializedDocument:
+    stat = openapi_path.stat()
+    key = (str(openapi_path), stat.st_mtime_ns, stat.st_size)
+    cached = _VIEWER_OPENAPI_CACHE.get(version_tag)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    document = SerializedDocument.from_object(json.loads(openapi_path.read_text(encoding="utf-8")))
+    _VIEWER_OPENAPI_CACHE[version_tag] = (key, document)
+    return document
+
 
 def _enforce_codegen_source_url(source_url: str) -> None:
     """Block codegen `source_url` values that resolve to internal/reserved hosts.
@@ -138,6 +153,7 @@ async def generate_viewer_codegen_artifacts(
 
 @router.get("/openapi")
 async def proxmox_viewer_openapi(
+    request: Request,
     regenerate: bool = Query(
         default=False,
         description="Regenerate from upstream viewer before returning OpenAPI output.",
@@ -194,12 +210,13 @@ async def proxmox_viewer_openapi(
             )
             return bundle.openapi
 
-        return json.loads(openapi_path.read_text(encoding="utf-8"))
+        document = _serialized_viewer_openapi(version_tag, openapi_path)
     except Exception as error:
         raise ProxboxException(
             message="Failed to load generated OpenAPI schema.",
             python_exception=str(error),
         )
+    return document.response(request)
 
 
 @router.get("/openapi/embedded")
@@ -64,6 +64,7 @@ from proxbox_api.services.proxmox_helpers import (
     start_vm,
     stop_vm,
 )
+from proxbox_api.services.task_watcher import get_task_watcher
 from proxbox_api.services.verb_dispatch import (
     build_journal_comments,
     build_success_response,
@@ -3315,7 +3316,6 @@ async def _migrate_stream_generator(
     vm_type: VmType,
     vmid: int,
     endpoint_id: int,
-    poll_interval: float = 2.0,
     keepalive_interval: float = 15.0,
 ) -> AsyncGenerator[str, None]:
     """Yield SSE frames covering the migrate task lifecycle (§7.1).
@@ -3326,8 +3326,10 @@ async def _migrate_stream_generator(
       3. ``migrate_succeeded`` xor ``migrate_failed`` — final frame
          based on the Proxmox ``exitstatus``.
 
-    A keepalive comment is interleaved between polls to keep proxies
-    from closing the connection.
+    Task status comes from the shared task watcher, so concurrent streams
+    on one migration poll Proxmox once. A keepalive comment is emitted
+    whenever no update arrives within ``keepalive_interval`` to keep
+    proxies from closing the connection.
     """
     dispatched_frame = {
         "event": "migrate_dispatched",
@@ -3342,60 +3344,53 @@ async def _migrate_stream_generator(
     }
     yield f"event: {dispatched_frame['event']}\ndata: {json.dumps(dispatched_frame['data'])}\n\n"
 
-    last_keepalive = asyncio.get_event_loop().time()
-    while True:
-        try:
-            task_status = await get_node_task_status(proxmox, node, task_upid)
-        except ProxmoxAPIError as error:
-            failed = {
-                "event": "migrate_failed",
-                "data": {"task_upid": task_upid, "error_detail": str(error)},
-            }
-            yield f"event: {failed['event']}\ndata: {json.dumps(failed['data'])}\n\n"
-            return
-
-        status_field = getattr(task_status, "status", None) or (
-            task_status.get("status") if isinstance(task_status, dict) else None
-        )
-        exitstatus = getattr(task_status, "exitstatus", None) or (
-            task_status.get("exitstatus") if isinstance(task_status, dict) else None
-        )
-
-        if status_field == "stopped":
-            ok = exitstatus == "OK" or exitstatus is None
-            event_name = "migrate_succeeded" if ok else "migrate_failed"
-            frame = {
-                "event": event_name,
+    async with get_task_watcher().subscribe(
+        proxmox,
+        node,
+        task_upid,
+        endpoint_key=endpoint_id,
+        status_fetcher=get_node_task_status,
+    ) as subscription:
+        while True:
+            try:
+                update = await asyncio.wait_for(subscription.next(), keepalive_interval)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            except asyncio.CancelledError:
+                return
+
+            if update.error is not None:
+                failed = {
+                    "event": "migrate_failed",
+                    "data": {"task_upid": task_upid, "error_detail": str(update.error)},
+                }
+                yield f"event: {failed['event']}\ndata: {json.dumps(failed['data'])}\n\n"
+                return
+
+            if update.finished:
+                event_name = "migrate_succeeded" if update.succeeded else "migrate_failed"
+                frame = {
+                    "event": event_name,
+                    "data": {
+                        "task_upid": task_upid,
+                        "exitstatus": update.exitstatus,
+                    },
+                }
+                yield f"event: {event_name}\ndata: {json.dumps(frame['data'])}\n\n"
+                return
+
+            progress_frame = {
+                "event": "migrate_progress",
                 "data": {
                     "task_upid": task_upid,
-                    "exitstatus": exitstatus,
+                    "progress": update.progress,
+                    "status": update.status,
                 },
             }
-            yield f"event: {event_name}\ndata: {json.dumps(frame['data'])}\n\n"
-            return
-
-        progress_value = getattr(task_status, "progress", None)
-        if progress_value is None and isinstance(task_status, dict):
-            progress_value = task_status.get("progress")
-        progress_frame = {
-            "event": "migrate_progress",
-            "data": {
-                "task_upid": task_upid,
-                "progress": progress_value,
-                "status": status_field,
-            },
-        }
-        yield f"event: {progress_frame['event']}\ndata: {json.dumps(progress_frame['data'])}\n\n"
-
-        try:
-            await asyncio.sleep(poll_interval)
-        except asyncio.CancelledError:
-            return
-
-        now = asyncio.get_event_loop().time()
-        if now - last_keepalive >= keepalive_interval:
-            yield ": keepalive\n\n"
-            last_keepalive = now
+            yield (
+                f"event: {progress_frame['event']}\ndata: {json.dumps(progress_frame['data'])}\n\n"
+            )
 
 
 async def _handle_stub(
@@ -28,6 +28,16 @@ from proxbox_api.proxmox_to_netbox.models import NetBoxBackupSyncState
 from proxbox_api.routes.proxmox.cluster import ClusterStatusDep
 from proxbox_api.runtime_settings import get_int
 from proxbox_api.services.proxmox_helpers import dump_models, get_node_storage_content
+from proxbox_api.services.proxmox_limiter import get_proxmox_request_limiter
+from proxbox_api.services.sync.backup_discovery import (
+    BackupStorageListing,
+    index_backups_by_vmid,
+    plan_backup_storage_listings,
+)
+from proxbox_api.services.sync.reconciliation.keyed import (
+    KeyedReconcileSpec,
+    reconcile_keyed_collection,
+)
 from proxbox_api.services.sync.storage_links import (
     build_storage_index,
     find_storage_record,
@@ -556,17 +566,6 @@ def _normalize_existing_backup(
     }
 
 
-def _compute_backup_diff(
-    desired: dict[str, object],
-    current: dict[str, object],
-) -> dict[str, object]:
-    diff: dict[str, object] = {}
-    for key, value in desired.items():
-        if current.get(key) != value:
-            diff[key] = value
-    return diff
-
-
 def _backup_owner_key(record: dict[str, object]) -> tuple[int, str]:
     virtual_machine_id = _relation_id_or_none(record.get("virtual_machine"))
     volume_id = str(record.get("volume_id") or "").strip()
@@ -638,23 +637,32 @@ async def _bulk_reconcile_backups(  # noqa: C901
     results_payloads: list[dict] = []
     journal_entries: list[dict] = []
 
+    # Only existing backups owned by an incoming payload can match, so the rest of
+    # the (potentially very large) listing is never normalized. Both sides carry
+    # the owner key under the same field names, which is what the keyed
+    # reconcile matches on.
+    desired_normalized: list[dict] = []
+    matched_existing: list[RestRecord] = []
     for payload in proxmox_backup_payloads:
-        owner_key = _backup_owner_key(payload)
-        existing = existing_by_owner.get(owner_key)
-
-        if existing is None:
-            validated = NetBoxBackupSyncState.model_validate(payload)
-            to_create.append(validated.model_dump(exclude_none=True, by_alias=True))
-            continue
-
-        current_normalized = _normalize_existing_backup(existing)
         desired_model = NetBoxBackupSyncState.model_validate(payload)
-        desired_normalized = desired_model.model_dump(exclude_none=True, by_alias=True)
-        diff = _compute_backup_diff(desired_normalized, current_normalized)
-        if diff:
-            to_patch.append((existing, diff))
-        else:
-            results_payloads.append(existing.serialize())
+        desired_normalized.append(desired_model.model_dump(exclude_none=True, by_alias=True))
+        existing = existing_by_owner.get(_backup_owner_key(payload))
+        if existing is not None:
+            matched_existing.append(existing)
+
+    plan = reconcile_keyed_collection(
+        KeyedReconcileSpec(key_fields=("virtual_machine", "volume_id")),
+        desired_normalized,
+        [_normalize_existing_backup(existing) for existing in matched_existing],
+        collection="backups",
+    )
+    results_payloads.extend(
+        matched_existing[current_index].serialize() for _index, current_index in plan.unchanged
+    )
+    to_create.extend(desired_normalized[index] for index in plan.create)
+    to_patch.extend(
+        (matched_existing[update.current_index], update.patch) for update in plan.update
+    )
 
     created_count = 0
     for i in range(0, len(to_create), batch_size):
@@ -855,6 +863,7 @@ async def get_node_backups(
                             storage=storage,
                             vmid=vmid,
                             content="backup",
+                            raw=True,
                         )
                         if inspect.isawaitable(raw_backups):
                             raw_backups = await raw_backups
@@ -1128,45 +1137,65 @@ async def _create_all_virtual_machine_backups(  # noqa: C901
         discovery_task_owners: list[tuple[int, str] | None] = []
         owner_discovery_ok: dict[tuple[int, str], bool] = {}
         fetch_semaphore = asyncio.Semaphore(fetch_max_concurrency or _resolve_fetch_concurrency())
+        limiter = get_proxmox_request_limiter()
 
-        async def _discover_backups_for_node_storage(
+        async def _discover_backups_for_listing(
             proxmox,
             endpoint_id: int | None,
             cluster_name: str,
-            node_name: str,
-            storage_name: str,
+            listing: BackupStorageListing,
             allowed_vmids: set[str] | None,
         ) -> tuple[list[dict], set[str]]:
             effective_vmids = allowed_vmids if allowed_vmids is not None else selected_vmids
             if effective_vmids is not None and not effective_vmids:
                 return [], set()
-            async with fetch_semaphore:
-                _extra: dict = {}
-                if effective_vmids is not None and len(effective_vmids) == 1:
-                    _extra["vmid"] = next(iter(effective_vmids))
-                raw_backups = await get_node_storage_content(
-                    proxmox,
-                    node=node_name,
-                    storage=storage_name,
-                    content="backup",
-                    **_extra,
-                )
-                backups = dump_models(raw_backups)
-                if effective_vmids is not None:
-                    backups = [
-                        backup
-                        for backup in backups
-                        if str(backup.get("vmid", "")).strip() in effective_vmids
-                    ]
-                volids = _volids_from_proxmox_storage_backup_items(backups)
-                filtered = []
-                for backup in backups:
-                    if backup.get("content") != "backup":
-                        continue
-                    annotated_backup = dict(backup)
-                    annotated_backup[_BACKUP_ENDPOINT_ID_KEY] = endpoint_id
-                    annotated_backup[_BACKUP_CLUSTER_NAME_KEY] = cluster_name
-                    filtered.append(annotated_backup)
+            _extra: dict = {}
+            if effective_vmids is not None and len(effective_vmids) == 1:
+                _extra["vmid"] = next(iter(effective_vmids))
+            # A shared storage is listed once; the remaining eligible nodes
+            # are only asked when the preferred node cannot serve it.
+            last_error: Exception | None = None
+            for node_name in listing.nodes:
+                try:
+                    async with fetch_semaphore, limiter.slot(cluster_name, node_name):
+                        raw_backups = await get_node_storage_content(
+                            proxmox,
+                            node=node_name,
+                            storage=listing.storage,
+                            content="backup",
+                            raw=True,
+                            **_extra,
+                        )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as error:
+                    last_error = error
+                    if len(listing.nodes) > 1:
+                        logger.info(
+                            "Shared backup storage %s could not be listed from node %s: %s",
+                            listing.storage,
+                            node_name,
+                            error,
+                        )
+                    continue
+                break
+            else:
+                raise last_error or RuntimeError(f"No node can list storage {listing.storage}")
+            backups = dump_models(raw_backups)
+            if effective_vmids is not None:
+                by_vmid = index_backups_by_vmid(backups)
+                backups = [
+                    backup for vmid in sorted(effective_vmids) for backup in by_vmid.get(vmid, ())
+                ]
+            volids = _volids_from_proxmox_storage_backup_items(backups)
+            filtered = []
+            for backup in backups:
+                if backup.get("content") != "backup":
+                    continue
+                annotated_backup = dict(backup)
+                annotated_backup[_BACKUP_ENDPOINT_ID_KEY] = endpoint_id
+                annotated_backup[_BACKUP_CLUSTER_NAME_KEY] = cluster_name
+                filtered.append(annotated_backup)
             return filtered, volids
 
         for proxmox, cluster in zip(pxs, cluster_status):
@@ -1189,36 +1218,23 @@ async def _create_all_virtual_machine_backups(  # noqa: C901
             if discovery_owner is not None:
                 owner_discovery_ok.setdefault(discovery_owner, True)
             storage_payload = await resolve_async(proxmox.session.storage.get())
-            storage_list = [
-                {
-                    "storage": storage_dict.get("storage"),
-                    "nodes": storage_dict.get("nodes", "all"),
-                }
-                for storage_dict in storage_payload
-                if "backup" in storage_dict.get("content")
-            ]
 
             if discovery_owner is not None and not (cluster and cluster.node_list):
                 owner_discovery_ok[discovery_owner] = False
             if cluster and cluster.node_list:
-                for cluster_node in cluster.node_list:
-                    for storage in storage_list:
-                        if storage.get("nodes") == "all" or cluster_node.name in storage.get(
-                            "nodes", []
-                        ):
-                            discovery_tasks.append(
-                                asyncio.create_task(
-                                    _discover_backups_for_node_storage(
-                                        proxmox=proxmox,
-                                        endpoint_id=endpoint_id,
-                                        cluster_name=cluster_name,
-                                        node_name=cluster_node.name,
-                                        storage_name=storage.get("storage"),
-                                        allowed_vmids=allowed_vmids,
-                                    )
-                                )
+                for listing in plan_backup_storage_listings(storage_payload, cluster.node_list):
+                    discovery_tasks.append(
+                        asyncio.create_task(
+                            _discover_backups_for_listing(
+                                proxmox=proxmox,
+                                endpoint_id=endpoint_id,
+                                cluster_name=cluster_name,
+                                listing=listing,
+                                allowed_vmids=allowed_vmids,
                             )
-                            discovery_task_owners.append(discovery_owner)
+                        )
+                    )
+                    discovery_task_owners.append(discovery_owner)
 
         if discovery_tasks:
             discovery_results = await asyncio.gather(*discovery_tasks, return_exceptions=True)
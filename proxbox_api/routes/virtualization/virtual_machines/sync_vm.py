@@ -58,10 +58,15 @@ from proxbox_api.services.custom_fields import (
     legacy_custom_field_fallback_query,
     legacy_custom_fields_payload,
 )
+from proxbox_api.services.guest_agent_cache import guest_agent_boot_marker
 from proxbox_api.services.name_collision import (
     NameResolution,
     resolve_unique_vm_name,
 )
+from proxbox_api.services.proxmox.inventory import (
+    resolve_vm_config_max_age_seconds,
+    vm_config_cache,
+)
 from proxbox_api.services.proxmox.tag_styles import fetch_tag_color_map
 from proxbox_api.services.proxmox_helpers import (
     fetch_qemu_guest_agent_network_interfaces,
@@ -69,6 +74,7 @@ from proxbox_api.services.proxmox_helpers import (
     get_qemu_guest_agent_network_interfaces,
     sanitize_dns_hostname,
 )
+from proxbox_api.services.proxmox_limiter import get_proxmox_request_limiter
 from proxbox_api.services.sync.devices import (
     _effective_cluster_site_id,
     _ensure_cluster,
@@ -164,6 +170,11 @@ from proxbox_api.services.sync.vm_helpers import (
 from proxbox_api.services.sync.vm_helpers import (
     to_mapping as _to_mapping,
 )
+from proxbox_api.services.sync.vm_payload_pool import (
+    VMPayloadJob,
+    resolve_vm_prepare_process_workers,
+    run_vm_payload_jobs,
+)
 from proxbox_api.services.sync.vmid_helpers import (
     extract_proxmox_endpoint_id,
     extract_proxmox_session_endpoint_id,
@@ -274,21 +285,24 @@ async def _fetch_vm_config_only(*, pxs: object, resource: dict[str, object]) ->
     return cast("dict[str, object]", vm_config_result or {})
 
 
-async def _prepare_vm_from_config(  # noqa: C901
+async def _resolve_vm_payload_job(  # noqa: C901
     cluster_name: str,
     resource: dict[str, object],
     vm_config: dict[str, object],
     context: _VMPreparationContext,
-) -> _PreparedVMState:
-    """Prepare desired NetBox VM state from an already fetched Proxmox config."""
+) -> tuple[VMPayloadJob, dict[str, object], datetime]:
+    """Resolve NetBox dependencies for a VM into a picklable payload job.
+
+    Returns ``(job, lookup, now)``. All NetBox I/O for the VM happens here so
+    the remaining payload build is pure CPU work that can run in a thread or
+    a worker process.
+    """
 
     vm_type = str(resource.get("type") or "unknown")
     vm_type_key = vm_type.lower() if vm_type else "undefined"
     if vm_type_key not in context.vm_role_mapping:
         vm_type_key = "undefined"
 
-    vm_config_obj = await asyncio.to_thread(ProxmoxVmConfigInput.model_validate, vm_config)
-
     cluster_dependencies = context.cluster_dependency_cache.get(str(cluster_name), {})
     cluster = cluster_dependencies.get("cluster")
     if cluster is None:
@@ -348,44 +362,137 @@ async def _prepare_vm_from_config(  # noqa: C901
     proxmox_tag_ids = await context.resolve_vm_proxmox_tag_ids(str(cluster_name), vm_config)
     proxbox_tag_id = int(getattr(context.tag, "id", 0) or 0)
     merged_tag_ids = sorted({proxbox_tag_id, *proxmox_tag_ids} - {0})
-    desired_payload = await asyncio.to_thread(
-        build_netbox_virtual_machine_payload,
-        proxmox_resource=resource,
-        proxmox_config=vm_config,
-        cluster_id=int(getattr(cluster, "id", 0) or 0),
-        device_id=int(getattr(device, "id", 0) or 0),
-        role_id=None if vm_type_id else int(getattr(role, "id", 0) or 0),
-        tag_ids=merged_tag_ids,
-        site_id=site_id,
-        tenant_id=int(getattr(cluster_dependencies.get("tenant"), "id", 0) or 0) or None,
-        virtual_machine_type_id=vm_type_id,
-        last_updated=now,
-        cluster_name=str(cluster_name),
-        proxmox_url=context.proxmox_url_by_cluster.get(str(cluster_name)),
-        endpoint_id=context.endpoint_id_by_cluster.get(str(cluster_name)),
-        parse_description_metadata=context.behavior_flags.parse_description_metadata,
-        overwrite_flags=context.effective_vm_overwrite_flags,
-    )
     cluster_id = int(getattr(cluster, "id", 0) or 0) or None
     endpoint_id = context.endpoint_id_by_cluster.get(str(cluster_name))
+    job = VMPayloadJob(
+        resource=resource,
+        vm_config=vm_config,
+        payload_kwargs={
+            "cluster_id": int(getattr(cluster, "id", 0) or 0),
+            "device_id": int(getattr(device, "id", 0) or 0),
+            "role_id": None if vm_type_id else int(getattr(role, "id", 0) or 0),
+            "tag_ids": merged_tag_ids,
+            "site_id": site_id,
+            "tenant_id": int(getattr(cluster_dependencies.get("tenant"), "id", 0) or 0) or None,
+            "virtual_machine_type_id": vm_type_id,
+            "last_updated": now,
+            "cluster_name": str(cluster_name),
+            "proxmox_url": context.proxmox_url_by_cluster.get(str(cluster_name)),
+            "endpoint_id": endpoint_id,
+            "parse_description_metadata": context.behavior_flags.parse_description_metadata,
+            "overwrite_flags": context.effective_vm_overwrite_flags,
+        },
+    )
     lookup = _vm_identity_lookup(
         vmid=resource.get("vmid"),
         endpoint_id=endpoint_id,
         cluster_id=cluster_id,
     )
+    return job, lookup, now
+
 
+def _prepared_vm_state(
+    cluster_name: str,
+    job: VMPayloadJob,
+    lookup: dict[str, object],
+    now: datetime,
+    *,
+    vm_config_obj: ProxmoxVmConfigInput,
+    desired_payload: dict[str, object],
+) -> _PreparedVMState:
     return _PreparedVMState(
         cluster_name=str(cluster_name),
-        resource=resource,
-        vm_config=vm_config,
+        resource=job.resource,
+        vm_config=job.vm_config,
         vm_config_obj=vm_config_obj,
         desired_payload=desired_payload,
         lookup=lookup,
         now=now,
-        vm_type=vm_type,
+        vm_type=str(job.resource.get("type") or "unknown"),
+    )
+
+
+async def _prepare_vm_from_config(
+    cluster_name: str,
+    resource: dict[str, object],
+    vm_config: dict[str, object],
+    context: _VMPreparationContext,
+) -> _PreparedVMState:
+    """Prepare desired NetBox VM state from an already fetched Proxmox config."""
+
+    vm_config_obj = await asyncio.to_thread(ProxmoxVmConfigInput.model_validate, vm_config)
+    job, lookup, now = await _resolve_vm_payload_job(cluster_name, resource, vm_config, context)
+    desired_payload = await asyncio.to_thread(
+        build_netbox_virtual_machine_payload,
+        proxmox_resource=resource,
+        proxmox_config=vm_config,
+        **job.payload_kwargs,
+    )
+    return _prepared_vm_state(
+        cluster_name,
+        job,
+        lookup,
+        now,
+        vm_config_obj=vm_config_obj,
+        desired_payload=desired_payload,
     )
 
 
+async def _prepare_vms_in_process_pool(
+    fetched_vm_configs: list[tuple[str, dict[str, object], dict[str, object]]],
+    context: _VMPreparationContext,
+    *,
+    workers: int,
+) -> tuple[list[_PreparedVMState], int]:
+    """Resolve dependencies on the loop, then build payloads in worker processes.
+
+    Returns ``(prepared_vms, failed_count)`` with the same per-VM failure
+    accounting as the sequential in-process path.
+    """
+
+    pending: list[tuple[str, VMPayloadJob, dict[str, object], datetime]] = []
+    failed = 0
+    for cluster_name, resource, vm_config in fetched_vm_configs:
+        try:
+            job, lookup, now = await _resolve_vm_payload_job(
+                cluster_name, resource, vm_config, context
+            )
+        except Exception as error:
+            logger.warning(
+                "VM preparation failed: cluster=%s vmid=%s error=%s",
+                cluster_name,
+                resource.get("vmid"),
+                error,
+            )
+            failed += 1
+            continue
+        pending.append((cluster_name, job, lookup, now))
+
+    results = await run_vm_payload_jobs([job for _, job, _, _ in pending], workers=workers)
+    prepared: list[_PreparedVMState] = []
+    for (cluster_name, job, lookup, now), result in zip(pending, results):
+        if result.error is not None or result.vm_config_obj is None:
+            logger.warning(
+                "VM preparation failed: cluster=%s vmid=%s error=%s",
+                cluster_name,
+                job.resource.get("vmid"),
+                result.error,
+            )
+            failed += 1
+            continue
+        prepared.append(
+            _prepared_vm_state(
+                cluster_name,
+                job,
+                lookup,
+                now,
+                vm_config_obj=result.vm_config_obj,
+                desired_payload=result.desired_payload or {},
+            )
+        )
+    return prepared, failed
+
+
 def _vm_dependency_error_detail(error: Exception) -> str:
     details: list[str] = []
     for attr_name in ("detail", "python_exception"):
@@ -406,6 +513,7 @@ async def _resolve_vm_dns_name(
     vmid: object,
     vm_type: object,
     vm_config: dict[str, object] | None,
+    boot_marker: str | None = None,
 ) -> str | None:
     """Resolve the guest hostname to use as IPAM `dns_name` for a VM.
 
@@ -425,7 +533,9 @@ async def _resolve_vm_dns_name(
         return None
 
     try:
-        return await get_qemu_guest_agent_hostname(proxmox_session, node, int(vmid))
+        return await get_qemu_guest_agent_hostname(
+            proxmox_session, node, int(vmid), boot_marker=boot_marker
+        )
     except Exception as exc:
         logger.debug("VM dns_name resolution failed for node=%s vmid=%s: %s", node, vmid, exc)
         return None
@@ -2322,16 +2432,29 @@ async def create_virtual_machines(  # noqa: C901
         if not operation_inputs:
             return [], 0
 
-        fetch_semaphore = asyncio.Semaphore(max(1, resolve_vm_sync_concurrency()))
+        fetch_limiter = get_proxmox_request_limiter()
+        endpoint_limit = max(1, resolve_vm_sync_concurrency())
+        # Explicitly selected VMs always read a fresh config.
+        config_max_age = resolve_vm_config_max_age_seconds() if selected_vm_ids is None else 0
 
         async def _fetch_with_limit(
             cluster_name: str,
             resource: dict[str, object],
         ) -> dict[str, object]:
-            async with fetch_semaphore:
+            cached_config = vm_config_cache.lookup(
+                cluster_name, resource, max_age_seconds=config_max_age
+            )
+            if cached_config is not None:
+                return cached_config
+            async with fetch_limiter.slot(
+                cluster_name, resource.get("node"), endpoint_limit=endpoint_limit
+            ):
                 cluster_px = px_by_cluster.get(str(cluster_name))
                 fetch_pxs = [cluster_px] if cluster_px is not None else pxs
-                return await _fetch_vm_config_only(pxs=fetch_pxs, resource=resource)
+                vm_config = await _fetch_vm_config_only(pxs=fetch_pxs, resource=resource)
+            if config_max_age > 0:
+                vm_config_cache.store(cluster_name, resource, vm_config)
+            return vm_config
 
         fetch_t0 = time.perf_counter()
         fetch_results = await asyncio.gather(
@@ -2361,24 +2484,33 @@ async def create_virtual_machines(  # noqa: C901
             fetched_vm_configs.append((cluster_name, resource, fetch_result))
 
         process_t0 = time.perf_counter()
-        for cluster_name, resource, vm_config in fetched_vm_configs:
-            try:
-                prepared_vms.append(
-                    await _prepare_vm_from_config(
+        prepare_workers = resolve_vm_prepare_process_workers()
+        if prepare_workers > 0:
+            prepared_vms, prepare_failed = await _prepare_vms_in_process_pool(
+                fetched_vm_configs,
+                prepare_context,
+                workers=prepare_workers,
+            )
+            failed_vms += prepare_failed
+        else:
+            for cluster_name, resource, vm_config in fetched_vm_configs:
+                try:
+                    prepared_vms.append(
+                        await _prepare_vm_from_config(
+                            cluster_name,
+                            resource,
+                            vm_config,
+                            prepare_context,
+                        )
+                    )
+                except Exception as prepared_result:
+                    logger.warning(
+                        "VM preparation failed: cluster=%s vmid=%s error=%s",
                         cluster_name,
-                        resource,
-                        vm_config,
-                        prepare_context,
+                        resource.get("vmid"),
+                        prepared_result,
                     )
-                )
-            except Exception as prepared_result:
-                logger.warning(
-                    "VM preparation failed: cluster=%s vmid=%s error=%s",
-                    cluster_name,
-                    resource.get("vmid"),
-                    prepared_result,
-                )
-                failed_vms += 1
+                    failed_vms += 1
         process_ms = (time.perf_counter() - process_t0) * 1000
 
         logger.info(
@@ -2882,6 +3014,7 @@ async def create_virtual_machines(  # noqa: C901
                         proxmox_session,
                         node=str(resource.get("node")),
                         vmid=int(resource.get("vmid")),
+                        boot_marker=guest_agent_boot_marker(resource, vm_config),
                     )
                     guest_agent_interfaces = guest_agent_result.interfaces
                     guest_agent_diagnostic = guest_agent_result.diagnostic
@@ -2926,6 +3059,7 @@ async def create_virtual_machines(  # noqa: C901
                 vmid=resource.get("vmid"),
                 vm_type=vm_type,
                 vm_config=vm_config,
+                boot_marker=guest_agent_boot_marker(resource, vm_config),
             )
 
             if vm_networks:
@@ -3189,10 +3323,12 @@ async def create_virtual_machines(  # noqa: C901
         return virtual_machine
 
     max_concurrency = resolve_vm_sync_concurrency()
-    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = get_proxmox_request_limiter()
 
     async def _run_vm_task(cluster_name: str, resource: dict):
-        async with semaphore:
+        async with limiter.slot(
+            cluster_name, resource.get("node"), endpoint_limit=max_concurrency, observe=False
+        ):
             return await create_vm_task(cluster_name, resource)
 
     async def _create_cluster_vms(cluster: dict) -> list:
@@ -3435,7 +3571,10 @@ async def create_only_vm_interfaces(  # noqa: C901
             if proxmox_session and resource_node:
                 guest_agent_interfaces = (
                     await get_qemu_guest_agent_network_interfaces(
-                        proxmox_session, resource_node, int(vmid)
+                        proxmox_session,
+                        resource_node,
+                        int(vmid),
+                        boot_marker=guest_agent_boot_marker(resource, vm_config),
                     )
                     or []
                 )
@@ -3554,7 +3693,7 @@ async def create_only_vm_interfaces(  # noqa: C901
         return interface_payloads, interface_info
 
     max_concurrency = resolve_vm_sync_concurrency()
-    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = get_proxmox_request_limiter()
 
     async def _run_task(
         cluster_name: str,
@@ -3562,7 +3701,9 @@ async def create_only_vm_interfaces(  # noqa: C901
         endpoint_id: int | None,
         resource: dict,
     ) -> tuple[list[dict], dict]:
-        async with semaphore:
+        async with limiter.slot(
+            cluster_name, resource.get("node"), endpoint_limit=max_concurrency, observe=False
+        ):
             return await _sync_vm_interfaces(cluster_name, cluster_id, endpoint_id, resource)
 
     async def _create_cluster_tasks(cluster: dict) -> list:
@@ -4086,7 +4227,10 @@ async def create_only_vm_ip_addresses(  # noqa: C901
             if proxmox_session and resource_node:
                 guest_agent_interfaces = (
                     await get_qemu_guest_agent_network_interfaces(
-                        proxmox_session, resource_node, int(vmid)
+                        proxmox_session,
+                        resource_node,
+                        int(vmid),
+                        boot_marker=guest_agent_boot_marker(resource, vm_config),
                     )
                     or []
                 )
@@ -4102,6 +4246,7 @@ async def create_only_vm_ip_addresses(  # noqa: C901
             vmid=vmid,
             vm_type=vm_type,
             vm_config=vm_config,
+            boot_marker=guest_agent_boot_marker(resource, vm_config),
         )
 
         vm_networks = _parse_vm_networks(vm_config)
@@ -4329,7 +4474,7 @@ async def create_only_vm_ip_addresses(  # noqa: C901
         return ip_payloads, first_ips, ip_info
 
     max_concurrency = resolve_vm_sync_concurrency()
-    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = get_proxmox_request_limiter()
 
     async def _run_task(
         cluster_name: str,
@@ -4337,7 +4482,9 @@ async def create_only_vm_ip_addresses(  # noqa: C901
         endpoint_id: int | None,
         resource: dict,
     ) -> tuple[list[dict], list[dict], dict]:
-        async with semaphore:
+        async with limiter.slot(
+            cluster_name, resource.get("node"), endpoint_limit=max_concurrency, observe=False
+        ):
             return await _sync_vm_ips(cluster_name, cluster_id, endpoint_id, resource)
 
     async def _create_cluster_tasks(cluster: dict) -> list:
@@ -22,6 +22,9 @@ _generation_tasks: dict[str, dict[str, object]] = {}
 # Keys: version_tag strings
 # Values: {"status": "pending"|"running"|"completed"|"failed", "error": str|None}
 
+# Strong references to in-flight lazy route mounts so they are not garbage collected.
+_background_mounts: set[asyncio.Task] = set()
+
 
 def extract_release_tag(version_info: dict | str | None) -> str | None:
     """Extract major.minor release tag from Proxmox version data.
@@ -86,6 +89,7 @@ async def ensure_schema_for_version(
         return {"status": "skipped", "reason": "could not determine Proxmox release version"}
 
     if has_schema_for_release(release_tag):
+        _schedule_pending_version_mount(app, release_tag)
         return {"status": "available", "version_tag": release_tag}
 
     # Check whether generation is already in progress
@@ -113,6 +117,22 @@ async def ensure_schema_for_version(
     }
 
 
+def _schedule_pending_version_mount(app: FastAPI, version_tag: str) -> None:
+    """Mount a lazily deferred version in the background once one of its endpoints connects."""
+    from proxbox_api.routes.proxmox.runtime_generated import (
+        ensure_generated_proxmox_version,
+        generated_proxmox_version_pending,
+    )
+
+    if not generated_proxmox_version_pending(version_tag):
+        return
+    task = asyncio.get_running_loop().create_task(
+        asyncio.to_thread(ensure_generated_proxmox_version, app, version_tag)
+    )
+    _background_mounts.add(task)
+    task.add_done_callback(_background_mounts.discard)
+
+
 def _start_background_generation(app: FastAPI, version_tag: str) -> None:
     """Launch a background asyncio task to generate the schema and register routes."""
     with _generation_lock:
@@ -129,7 +149,11 @@ def _start_background_generation(app: FastAPI, version_tag: str) -> None:
 async def _generate_and_register(app: FastAPI, version_tag: str) -> None:
     """Background coroutine: generate schema then register routes without app restart."""
     from proxbox_api.proxmox_codegen.pipeline import generate_proxmox_codegen_bundle_async
-    from proxbox_api.routes.proxmox.runtime_generated import register_generated_proxmox_routes
+    from proxbox_api.routes.proxmox.runtime_generated import (
+        add_generated_proxmox_version,
+        lazy_generated_routes_enabled,
+        register_generated_proxmox_routes,
+    )
 
     with _generation_lock:
         _generation_tasks[version_tag] = {"status": "running", "error": None}
@@ -154,10 +178,14 @@ async def _generate_and_register(app: FastAPI, version_tag: str) -> None:
             version_tag,
         )
 
-        # Re-register all available versions (including the newly generated one).
-        # Force the rebuild so the freshly generated version is mounted even
-        # though a route set is already registered in-process.
-        register_generated_proxmox_routes(app, force_rebuild=True)
+        if lazy_generated_routes_enabled():
+            # Mount only the new version; the others stay deferred until used.
+            add_generated_proxmox_version(app, version_tag)
+        else:
+            # Re-register all available versions (including the newly generated one).
+            # Force the rebuild so the freshly generated version is mounted even
+            # though a route set is already registered in-process.
+            register_generated_proxmox_routes(app, force_rebuild=True)
 
         with _generation_lock:
             _generation_tasks[version_tag] = {"status": "completed", "error": None}
@@ -0,0 +1,165 @@
+"""TTL cache for QEMU guest-agent results, including failures.
+
+Guest-agent calls are the slowest Proxmox requests the sync makes: a VM whose
+agent is enabled in its config but not running makes every call wait up to
+``guest_agent_timeout``. Results are cached per
+``(endpoint, node, vmid, boot marker)``:
+
+* successes for ``guest_agent_cache_ttl_seconds`` (guest IPs change, so this
+  stays short);
+* classified failures for ``guest_agent_negative_ttl_seconds``, so known
+  agentless VMs are skipped on following syncs.
+
+The boot marker combines the VM's pid, its boot time (derived from the
+``/cluster/resources`` uptime) and the config digest, so a reboot, a
+start/stop or a config edit lands on a fresh key and the agent is asked
+again. Callers that cannot supply a marker are not cached.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from proxbox_api.runtime_settings import get_int
+
+CacheKey = tuple[str, str, str, str, str]
+
+# Two uptime snapshots of one boot rarely disagree by more than a few
+# seconds; bucketing the derived boot time keeps them on the same key.
+_BOOT_TIME_BUCKET_SECONDS = 60
+_MAX_ENTRIES = 20_000
+
+
+def _resolve_success_ttl() -> int:
+    return get_int(
+        settings_key="guest_agent_cache_ttl_seconds",
+        env="PROXBOX_GUEST_AGENT_CACHE_TTL_SECONDS",
+        default=60,
+        minimum=0,
+        maximum=86_400,
+    )
+
+
+def _resolve_negative_ttl() -> int:
+    return get_int(
+        settings_key="guest_agent_negative_ttl_seconds",
+        env="PROXBOX_GUEST_AGENT_NEGATIVE_TTL_SECONDS",
+        default=900,
+        minimum=0,
+        maximum=86_400,
+    )
+
+
+def guest_agent_boot_marker(
+    resource: dict[str, object] | None,
+    vm_config: dict[str, object] | None = None,
+) -> str | None:
+    """Identify one boot of one VM config, or ``None`` when that is unknowable."""
+    if not isinstance(resource, dict):
+        return None
+    digest = vm_config.get("digest") if isinstance(vm_config, dict) else None
+    digest_text = str(digest) if digest else ""
+    status = str(resource.get("status") or "")
+    if status and status != "running":
+        return f"{status}:{digest_text}"
+    try:
+        uptime = int(resource.get("uptime") or 0)
+    except (TypeError, ValueError):
+        uptime = 0
+    pid = resource.get("pid")
+    if uptime <= 0 and not pid:
+        return None
+    boot_bucket = int(time.time() - uptime) // _BOOT_TIME_BUCKET_SECONDS if uptime > 0 else ""
+    return f"{pid or ''}:{boot_bucket}:{digest_text}"
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: object
+    failed: bool
+    expires_at: float
+
+
+class GuestAgentCache:
+    """Bounded LRU of guest-agent outcomes with separate success/failure TTLs."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.skips = 0
+
+    @staticmethod
+    def key(
+        kind: str,
+        session: object,
+        node: object,
+        vmid: object,
+        boot_marker: str,
+    ) -> CacheKey:
+        return (kind, str(getattr(session, "name", "") or ""), str(node), str(vmid), boot_marker)
+
+    def lookup(self, key: CacheKey) -> _Entry | None:
+        """Return a live entry; failures count as skips, successes as hits."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.failed:
+                self.skips += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def skip_if_failed(self, key: CacheKey) -> bool:
+        """Whether ``key`` holds a live failure; counts a skip when it does."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.failed or entry.expires_at <= time.monotonic():
+                return False
+            self.skips += 1
+            return True
+
+    def store(self, key: CacheKey, value: object, *, failed: bool) -> None:
+        ttl = _resolve_negative_ttl() if failed else _resolve_success_ttl()
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(
+                value=value, failed=failed, expires_at=time.monotonic() + ttl
+            )
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss/skip counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.skips = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "entries": len(self._entries),
+                "negative_entries": sum(
+                    1 for entry in self._entries.values() if entry.failed and entry.expires_at > now
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+                "skips": self.skips,
+            }
+
+
+guest_agent_cache = GuestAgentCache()
@@ -0,0 +1,209 @@
+"""Short-lived, single-flight cache of per-endpoint cluster status and resources.
+
+The ``cluster_status`` and ``cluster_resources`` dependencies run for nearly
+every route and for every full update, and the plugin UI polls several of those
+routes per second. Both listings are cached per Proxmox endpoint for
+``cluster_cache_ttl_seconds``. Concurrent misses on one key share a single
+Proxmox request. A TTL of ``0`` disables the cache.
+
+Each ``/cluster/resources`` entry also carries a fingerprint of the fields that
+matter to sync (id, node, status, sizing, name, tags, template, lock, HA
+state). A sync phase can call ``unchanged_since_last_run`` to learn that
+nothing moved since its previous run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+from proxbox_api.runtime_settings import get_int
+from proxbox_api.services.sync.vmid_helpers import extract_proxmox_session_endpoint_id
+
+CacheKey = tuple[str, str, str]
+
+_FINGERPRINT_FIELDS = (
+    "id",
+    "node",
+    "status",
+    "maxmem",
+    "maxdisk",
+    "maxcpu",
+    "name",
+    "tags",
+    "template",
+    "lock",
+    "hastate",
+    "pool",
+)
+
+
+def resolve_cluster_cache_ttl_seconds() -> int:
+    return get_int(
+        settings_key="cluster_cache_ttl_seconds",
+        env="PROXBOX_CLUSTER_CACHE_TTL_SECONDS",
+        default=5,
+        minimum=0,
+        maximum=3_600,
+    )
+
+
+def endpoint_cache_scope(session: object) -> str:
+    """Identify the Proxmox endpoint behind ``session`` for cache keys."""
+    endpoint_id = extract_proxmox_session_endpoint_id(session)
+    if endpoint_id is not None:
+        return f"endpoint:{endpoint_id}"
+    host = getattr(session, "domain", None) or getattr(session, "ip_address", None) or ""
+    return f"cluster:{getattr(session, 'name', '') or ''}@{host}"
+
+
+def resources_fingerprint(resources: Iterable[dict[str, object]]) -> str:
+    """Order-independent digest of the sync-relevant ``/cluster/resources`` fields."""
+    rows = sorted(
+        json.dumps(
+            [resource.get(field_name) for field_name in _FINGERPRINT_FIELDS],
+            default=str,
+            separators=(",", ":"),
+        )
+        for resource in resources
+    )
+    digest = hashlib.sha1(usedforsecurity=False)
+    for row in rows:
+        digest.update(row.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: object
+    fingerprint: str | None
+    expires_at: float
+
+
+class ClusterCache:
+    """Per-endpoint TTL cache with single-flight refresh per event loop."""
+
+    def __init__(self) -> None:
+        self._entries: dict[CacheKey, _Entry] = {}
+        self._inflight: dict[tuple[asyncio.AbstractEventLoop, CacheKey], asyncio.Task] = {}
+        self._last_seen: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(
+        self,
+        kind: str,
+        session: object,
+        fetch: Callable[[], Awaitable[object]],
+        *,
+        variant: str = "",
+        fingerprint: Callable[[object], str] | None = None,
+    ) -> object:
+        """Return the cached ``kind`` listing for ``session``, fetching it once on a miss."""
+        ttl = resolve_cluster_cache_ttl_seconds()
+        if ttl <= 0:
+            return await fetch()
+        key = (kind, endpoint_cache_scope(session), variant)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.value
+            task = self._inflight.get((loop, key))
+            if task is None:
+                self.misses += 1
+                task = loop.create_task(self._refresh(key, fetch, ttl, fingerprint))
+                self._inflight[(loop, key)] = task
+                task.add_done_callback(
+                    lambda completed, current_loop=loop: self._clear_inflight(
+                        current_loop, key, completed
+                    )
+                )
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _refresh(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[object]],
+        ttl: int,
+        fingerprint: Callable[[object], str] | None,
+    ) -> object:
+        value = await fetch()
+        entry = _Entry(
+            value=value,
+            fingerprint=fingerprint(value) if fingerprint is not None else None,
+            expires_at=time.monotonic() + ttl,
+        )
+        with self._lock:
+            self._entries[key] = entry
+        return value
+
+    def _clear_inflight(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        key: CacheKey,
+        task: asyncio.Task,
+    ) -> None:
+        with self._lock:
+            if self._inflight.get((loop, key)) is task:
+                self._inflight.pop((loop, key), None)
+
+    def fingerprint(self, kind: str, session: object, *, variant: str = "") -> str | None:
+        """Fingerprint of the last ``kind`` listing fetched for ``session``, live or not."""
+        with self._lock:
+            entry = self._entries.get((kind, endpoint_cache_scope(session), variant))
+            return entry.fingerprint if entry is not None else None
+
+    def unchanged_since_last_run(self, consumer: str, session: object) -> bool:
+        """Whether ``/cluster/resources`` is unchanged since ``consumer`` last asked.
+
+        Records the current fingerprint for ``consumer``, so each call compares
+        against the previous one. Unknown fingerprints always count as changed.
+        """
+        current = self.fingerprint("resources", session)
+        if current is None:
+            return False
+        marker = (consumer, endpoint_cache_scope(session))
+        with self._lock:
+            previous = self._last_seen.get(marker)
+            self._last_seen[marker] = current
+        return previous == current
+
+    def clear(self) -> None:
+        """Drop every entry, fingerprint marker and counter."""
+        with self._lock:
+            self._entries.clear()
+            self._last_seen.clear()
+            self.hits = self.misses = self.coalesced = 0
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "entries": len(self._entries),
+                "live_entries": sum(
+                    1 for entry in self._entries.values() if entry.expires_at > now
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "fingerprints": {
+                    f"{kind}:{scope}": entry.fingerprint
+                    for (kind, scope, variant), entry in self._entries.items()
+                    if entry.fingerprint is not None and not variant
+                },
+            }
+
+
+cluster_cache = ClusterCache()
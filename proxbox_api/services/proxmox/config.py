@@ -55,13 +55,11 @@ async def resolve_vm_config(
     try:
         for px in pxs:
             try:
-                config = await get_typed_vm_config(px, node=node, vm_type=vm_type, vmid=vmid)
-                if config:
-                    return config.model_dump(
-                        mode="python",
-                        by_alias=True,
-                        exclude_none=True,
-                    )
+                config = await get_typed_vm_config(
+                    px, node=node, vm_type=vm_type, vmid=vmid, raw=True
+                )
+                if config is not None:
+                    return config
             except ProxboxException as error:
                 errors.append(f"{_session_label(px)}: {_format_session_error(error)}")
 
@@ -0,0 +1,159 @@
+"""Incremental VM config fetch planning for the full-update VM phase.
+
+The VM phase reads ``nodes/{node}/{qemu|lxc}/{vmid}/config`` for every VM,
+although most of what it maps (name, status, memory, disk, CPUs, tags,
+template, lock, HA state) already arrives in the single ``/cluster/resources``
+listing. Only network and disk lines truly require the per-VM config call.
+
+The planner keeps the last config per ``(cluster, node, type, vmid)`` together
+with a signature of that VM's ``/cluster/resources`` row. A cached config is
+reused while the row signature is unchanged and the entry is younger than
+``vm_config_max_age_seconds``; resized, retagged, migrated, locked or
+restarted VMs are refetched immediately, and every VM is refetched at least
+once per window so NIC and disk edits (which no bulk listing exposes) are
+picked up. Proxmox's config ``digest`` is kept so refetches that found no
+change are counted, which is the signal for tuning the window.
+
+A window of ``0`` (the default) disables reuse and keeps one config call per
+VM per run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from proxbox_api.runtime_settings import get_int
+
+ConfigKey = tuple[str, str, str, str]
+
+_SIGNATURE_FIELDS = (
+    "name",
+    "status",
+    "maxmem",
+    "maxdisk",
+    "maxcpu",
+    "tags",
+    "template",
+    "lock",
+    "hastate",
+    "pool",
+)
+_MAX_ENTRIES = 50_000
+
+
+def resolve_vm_config_max_age_seconds() -> int:
+    """Seconds a cached VM config may be reused while its resource row is unchanged."""
+    return get_int(
+        settings_key="vm_config_max_age_seconds",
+        env="PROXBOX_VM_CONFIG_MAX_AGE_SECONDS",
+        default=0,
+        minimum=0,
+        maximum=86_400,
+    )
+
+
+def resource_signature(resource: dict[str, object]) -> str:
+    """Digest the ``/cluster/resources`` fields that change with the VM config."""
+    payload = json.dumps(
+        [resource.get(field_name) for field_name in _SIGNATURE_FIELDS],
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+def config_cache_key(cluster_name: str, resource: dict[str, object]) -> ConfigKey:
+    return (
+        str(cluster_name),
+        str(resource.get("node") or ""),
+        str(resource.get("type") or ""),
+        str(resource.get("vmid") or ""),
+    )
+
+
+@dataclass(slots=True)
+class _CachedConfig:
+    signature: str
+    config: dict[str, object]
+    digest: str | None
+    fetched_at: float
+
+
+class VmConfigCache:
+    """Bounded LRU of VM configs keyed by cluster, node, type and vmid."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._entries: OrderedDict[ConfigKey, _CachedConfig] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.reused_total = 0
+        self.fetched_total = 0
+        self.unchanged_refetch_total = 0
+
+    def lookup(
+        self,
+        cluster_name: str,
+        resource: dict[str, object],
+        *,
+        max_age_seconds: int,
+    ) -> dict[str, object] | None:
+        """Return a copy of the cached config when it may stand in for a fetch."""
+        if max_age_seconds <= 0:
+            return None
+        key = config_cache_key(cluster_name, resource)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if (
+                entry.signature != resource_signature(resource)
+                or time.monotonic() - entry.fetched_at >= max_age_seconds
+            ):
+                return None
+            self._entries.move_to_end(key)
+            self.reused_total += 1
+            return dict(entry.config)
+
+    def store(
+        self,
+        cluster_name: str,
+        resource: dict[str, object],
+        config: dict[str, object],
+    ) -> None:
+        key = config_cache_key(cluster_name, resource)
+        digest = config.get("digest")
+        digest = digest if isinstance(digest, str) else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None and digest is not None and previous.digest == digest:
+                self.unchanged_refetch_total += 1
+            self.fetched_total += 1
+            self._entries[key] = _CachedConfig(
+                signature=resource_signature(resource),
+                config=dict(config),
+                digest=digest,
+                fetched_at=time.monotonic(),
+            )
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "reused_total": self.reused_total,
+                "fetched_total": self.fetched_total,
+                "unchanged_refetch_total": self.unchanged_refetch_total,
+            }
+
+
+vm_config_cache = VmConfigCache()
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import functools
 import re
+import time
 from collections.abc import Callable, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -16,18 +18,69 @@ from proxmox_sdk.sdk.exceptions import (
     ProxmoxTimeoutError,
     ResourceException,
 )
+from pydantic import BaseModel, RootModel
 
 from proxbox_api.exception import ProxboxException, ProxmoxAPIError
 from proxbox_api.generated.proxmox.latest import pydantic_models as generated_models
 from proxbox_api.logger import logger
 from proxbox_api.proxmox_async import resolve_async
+from proxbox_api.services.guest_agent_cache import guest_agent_cache
 from proxbox_api.session.proxmox import ProxmoxSession
 
 
 def _model_dump(model: object) -> dict[str, object]:
+    if isinstance(model, dict):
+        return model
     return model.model_dump(mode="python", by_alias=True, exclude_none=True)
 
 
+def _resolve_validate_responses() -> bool:
+    """Whether ``raw=True`` fetches still validate through the generated models.
+
+    Resolution: env PROXBOX_PROXMOX_VALIDATE_RESPONSES > ProxboxPluginSettings
+    proxmox_validate_responses > default False. Turn it on for debug or
+    compare runs that must catch schema drift.
+    """
+    from proxbox_api import runtime_settings
+
+    return runtime_settings.get_bool(
+        settings_key="proxmox_validate_responses",
+        env="PROXBOX_PROXMOX_VALIDATE_RESPONSES",
+        default=False,
+    )
+
+
+def _raw_row(payload: dict[str, object]) -> dict[str, object]:
+    return {key: value for key, value in payload.items() if value is not None}
+
+
+def _list_response(model: type[RootModel], result: object, *, raw: bool) -> list[object]:
+    """Validate a list response, or pass its rows through for ``raw`` consumers.
+
+    Internal sync consumers dump the models straight back to dicts, so for
+    them the rows Proxmox returned are used as-is (``None`` values dropped,
+    like ``dump_models``). Anything that is not a list of dicts, and every
+    call while validation is enforced, goes through the model.
+    """
+    if (
+        raw
+        and isinstance(result, list)
+        and all(isinstance(item, dict) for item in result)
+        and not _resolve_validate_responses()
+    ):
+        return [_raw_row(item) for item in result]
+    items = model.model_validate(result).root
+    return dump_models(items) if raw else items
+
+
+def _mapping_response(model: type[BaseModel], result: object, *, raw: bool) -> object:
+    """Single-object counterpart of ``_list_response``."""
+    if raw and isinstance(result, dict) and not _resolve_validate_responses():
+        return _raw_row(result)
+    validated = model.model_validate(result)
+    return _model_dump(validated) if raw else validated
+
+
 def _task_upid_from_payload(payload: object) -> str:
     if isinstance(payload, str):
         return payload
@@ -85,8 +138,14 @@ async def get_cluster_status(
 async def get_cluster_resources(
     session: ProxmoxSession,
     resource_type: str | None = None,
-) -> list[generated_models.GetClusterResourcesResponseItem]:
-    """Get cluster resources from Proxmox."""
+    *,
+    raw: bool = False,
+) -> list[generated_models.GetClusterResourcesResponseItem] | list[dict[str, object]]:
+    """Get cluster resources from Proxmox.
+
+    ``raw=True`` returns plain dicts and skips model validation unless
+    ``proxmox_validate_responses`` is enabled.
+    """
     try:
         if resource_type:
             # ``ClusterResourcesType`` is a ``(str, Enum)``. Passing the enum
@@ -100,8 +159,7 @@ async def get_cluster_resources(
             result = await resolve_async(session.session("cluster/resources").get(type=type_param))
         else:
             result = await resolve_async(session.session("cluster/resources").get())
-        validated = generated_models.GetClusterResourcesResponse.model_validate(result)
-        return validated.root
+        return _list_response(generated_models.GetClusterResourcesResponse, result, raw=raw)
     except ProxboxException:
         raise
     except ProxmoxTimeoutError as error:
@@ -291,18 +349,29 @@ async def get_vm_config(
     node: str,
     vm_type: str,
     vmid: int,
+    *,
+    raw: bool = False,
 ) -> (
     generated_models.GetNodesNodeQemuVmidConfigResponse
     | generated_models.GetNodesNodeLxcVmidConfigResponse
+    | dict[str, object]
 ):
-    """Get VM configuration from Proxmox."""
+    """Get VM configuration from Proxmox.
+
+    ``raw=True`` returns a plain dict and skips model validation unless
+    ``proxmox_validate_responses`` is enabled.
+    """
     try:
         if vm_type == "qemu":
             payload = await resolve_async(session.session.nodes(node).qemu(vmid).config.get())
-            return generated_models.GetNodesNodeQemuVmidConfigResponse.model_validate(payload)
+            return _mapping_response(
+                generated_models.GetNodesNodeQemuVmidConfigResponse, payload, raw=raw
+            )
         if vm_type == "lxc":
             payload = await resolve_async(session.session.nodes(node).lxc(vmid).config.get())
-            return generated_models.GetNodesNodeLxcVmidConfigResponse.model_validate(payload)
+            return _mapping_response(
+                generated_models.GetNodesNodeLxcVmidConfigResponse, payload, raw=raw
+            )
         raise ValueError(f"Unsupported VM type: {vm_type}")
     except ProxboxException:
         raise
@@ -564,6 +633,8 @@ async def fetch_qemu_guest_agent_network_interfaces(
     session: ProxmoxSession,
     node: str,
     vmid: int,
+    *,
+    boot_marker: str | None = None,
 ) -> GuestAgentFetchResult:
     """Fetch and normalize guest-agent interfaces, with a structured diagnostic.
 
@@ -571,8 +642,32 @@ async def fetch_qemu_guest_agent_network_interfaces(
     success and ``GuestAgentFetchResult(interfaces=[], diagnostic="...")`` on
     failure. The diagnostic is suitable for surfacing to the SSE/WebSocket
     progress stream so operators see *why* IPs were not synced for a VM.
+
+    With a ``boot_marker`` (see ``guest_agent_boot_marker``) the outcome is
+    served from and stored in the guest-agent cache, so a VM whose agent
+    failed is not asked again until it reboots or its config changes.
     """
+    if boot_marker is None:
+        return await _fetch_qemu_guest_agent_network_interfaces(session, node, vmid)
+    key = guest_agent_cache.key("interfaces", session, node, vmid, boot_marker)
+    entry = guest_agent_cache.lookup(key)
+    if entry is not None:
+        return copy.deepcopy(entry.value)
+    result = await _fetch_qemu_guest_agent_network_interfaces(session, node, vmid)
+    guest_agent_cache.store(key, copy.deepcopy(result), failed=result.diagnostic is not None)
+    return result
+
+
+async def _fetch_qemu_guest_agent_network_interfaces(
+    session: ProxmoxSession,
+    node: str,
+    vmid: int,
+) -> GuestAgentFetchResult:
+    from proxbox_api.services.proxmox_limiter import get_proxmox_request_limiter  # noqa: PLC0415
+
     timeout_s = _resolve_guest_agent_timeout()
+    limiter = get_proxmox_request_limiter()
+    started = time.perf_counter()
 
     async def _primary_call() -> object:
         with _scoped_proxmox_backend_timeout(session, timeout_s):
@@ -618,11 +713,16 @@ async def fetch_qemu_guest_agent_network_interfaces(
                     ),
                     timeout=timeout_s,
                 )
+        limiter.observe(getattr(session, "name", None), node, time.perf_counter() - started)
         return GuestAgentFetchResult(
             interfaces=_normalize_guest_agent_interfaces(payload),
             diagnostic=None,
         )
     except Exception as error:
+        if _is_timeout_error(error):
+            limiter.observe(
+                getattr(session, "name", None), node, time.perf_counter() - started, timed_out=True
+            )
         level, hint = _classify_guest_agent_error(error)
         log_fn = {
             "info": logger.info,
@@ -644,6 +744,8 @@ async def get_qemu_guest_agent_network_interfaces(
     session: ProxmoxSession,
     node: str,
     vmid: int,
+    *,
+    boot_marker: str | None = None,
 ) -> list[dict[str, object]]:
     """Return normalized guest-agent interfaces or [] when unavailable.
 
@@ -651,7 +753,9 @@ async def get_qemu_guest_agent_network_interfaces(
     callers that only need the interface list. New callers should prefer the
     structured variant so they can surface a diagnostic to the user.
     """
-    result = await fetch_qemu_guest_agent_network_interfaces(session, node, vmid)
+    result = await fetch_qemu_guest_agent_network_interfaces(
+        session, node, vmid, boot_marker=boot_marker
+    )
     return result.interfaces
 
 
@@ -711,6 +815,8 @@ async def get_qemu_guest_agent_hostname(
     session: ProxmoxSession,
     node: str,
     vmid: int,
+    *,
+    boot_marker: str | None = None,
 ) -> str | None:
     """Return the guest-reported hostname or None when unavailable.
 
@@ -718,7 +824,31 @@ async def get_qemu_guest_agent_hostname(
     by `get_qemu_guest_agent_network_interfaces`), then falls back to scanning
     the normalized network-interfaces payload for an FQDN/hostname-like
     field. Returns None on any failure so callers can stay terse.
+
+    With a ``boot_marker`` resolved hostnames are cached, and VMs with a
+    cached interfaces failure are skipped without calling the agent.
     """
+    hostname_key = None
+    if boot_marker is not None:
+        hostname_key = guest_agent_cache.key("hostname", session, node, vmid, boot_marker)
+        entry = guest_agent_cache.lookup(hostname_key)
+        if entry is not None:
+            return entry.value
+        interfaces_key = guest_agent_cache.key("interfaces", session, node, vmid, boot_marker)
+        if guest_agent_cache.skip_if_failed(interfaces_key):
+            return None
+    hostname = await _get_qemu_guest_agent_hostname(session, node, vmid, boot_marker)
+    if hostname_key is not None and hostname:
+        guest_agent_cache.store(hostname_key, hostname, failed=False)
+    return hostname
+
+
+async def _get_qemu_guest_agent_hostname(
+    session: ProxmoxSession,
+    node: str,
+    vmid: int,
+    boot_marker: str | None,
+) -> str | None:
     try:
         payload: object | None = None
         try:
@@ -749,7 +879,9 @@ async def get_qemu_guest_agent_hostname(
         if hostname:
             return hostname
 
-        interfaces = await get_qemu_guest_agent_network_interfaces(session, node, vmid)
+        interfaces = await get_qemu_guest_agent_network_interfaces(
+            session, node, vmid, boot_marker=boot_marker
+        )
         return _extract_hostname_from_interfaces(interfaces)
     except Exception as error:
         logger.warning(
@@ -825,18 +957,23 @@ async def get_node_storage_content(
     session: ProxmoxSession,
     node: str,
     storage: str,
+    *,
+    raw: bool = False,
     **kwargs: object,
-) -> list[generated_models.GetNodesNodeStorageStorageContentResponseItem]:
-    """Get storage content from a specific node."""
+) -> list[generated_models.GetNodesNodeStorageStorageContentResponseItem] | list[dict[str, object]]:
+    """Get storage content from a specific node.
+
+    ``raw=True`` returns plain dicts and skips model validation unless
+    ``proxmox_validate_responses`` is enabled.
+    """
     try:
         params = {key: value for key, value in kwargs.items() if value is not None}
         result = await resolve_async(
             session.session.nodes(node).storage(storage).content.get(**params)
         )
-        validated = generated_models.GetNodesNodeStorageStorageContentResponse.model_validate(
-            result
+        return _list_response(
+            generated_models.GetNodesNodeStorageStorageContentResponse, result, raw=raw
         )
-        return validated.root
     except ProxboxException:
         raise
     except ProxmoxTimeoutError as error:
@@ -927,8 +1064,13 @@ async def get_node_tasks(
     until: int | None = None,
     errors: bool | None = None,
     userfilter: str | None = None,
-) -> list[generated_models.GetNodesNodeTasksResponseItem]:
-    """Get tasks from a specific node."""
+    raw: bool = False,
+) -> list[generated_models.GetNodesNodeTasksResponseItem] | list[dict[str, object]]:
+    """Get tasks from a specific node.
+
+    ``raw=True`` returns plain dicts and skips model validation unless
+    ``proxmox_validate_responses`` is enabled.
+    """
     try:
         params = {
             "vmid": vmid,
@@ -944,8 +1086,7 @@ async def get_node_tasks(
         }
         filtered = {key: value for key, value in params.items() if value is not None}
         result = await resolve_async(session.session.nodes(node).tasks.get(**filtered))
-        validated = generated_models.GetNodesNodeTasksResponse.model_validate(result)
-        return validated.root
+        return _list_response(generated_models.GetNodesNodeTasksResponse, result, raw=raw)
     except ProxboxException:
         raise
     except ProxmoxTimeoutError as error:
@@ -986,6 +1127,36 @@ async def get_node_task_status(
         )
 
 
+@_dual_mode
+async def get_node_task_log(
+    session: ProxmoxSession,
+    node: str,
+    upid: str,
+    *,
+    start: int | None = None,
+    limit: int | None = None,
+) -> list[dict[str, object]]:
+    """Get task log lines, optionally from line offset ``start``."""
+    try:
+        params = {key: value for key, value in {"start": start, "limit": limit}.items() if value}
+        result = await resolve_async(session.session.nodes(node).tasks(upid).log.get(**params))
+        validated = generated_models.GetNodesNodeTasksUpidLogResponse.model_validate(result or [])
+        return [_model_dump(item) for item in validated.root]
+    except ProxboxException:
+        raise
+    except ProxmoxTimeoutError as error:
+        raise ProxmoxAPIError(message="Proxmox task log request timed out", original_error=error)
+    except ProxmoxConnectionError as error:
+        raise ProxmoxAPIError(
+            message="Unable to connect to Proxmox for task log", original_error=error
+        )
+    except Exception as error:
+        raise ProxmoxAPIError(
+            message="Error fetching Proxmox task log",
+            original_error=error,
+        )
+
+
 @_dual_mode
 async def get_vm_status(
     session: ProxmoxSession,
@@ -1537,7 +1708,7 @@ async def get_vm_config_individual(
     vmid: int,
 ) -> dict[str, object]:
     """Get VM configuration for a specific VM."""
-    config = await get_vm_config(session, node, vm_type, vmid)
+    config = await get_vm_config(session, node, vm_type, vmid, raw=True)
     return _model_dump(config)
 
 
@@ -1560,7 +1731,7 @@ async def get_vm_backups_individual(
     """Get backups for a specific VM from storage content."""
     try:
         content = await get_node_storage_content(
-            session, node, storage, vmid=str(vmid), content="backup"
+            session, node, storage, raw=True, vmid=str(vmid), content="backup"
         )
         backups = []
         for item in content:
@@ -1588,7 +1759,7 @@ async def get_vm_tasks_individual(
 ) -> list[dict[str, object]]:
     """Get tasks for a specific VM."""
     try:
-        tasks = await get_node_tasks(session, node, vmid=vmid, source=source)
+        tasks = await get_node_tasks(session, node, vmid=vmid, source=source, raw=True)
         task_dicts = [_model_dump(t) for t in tasks]
         if vmid is not None:
             filtered = []
@@ -1618,7 +1789,7 @@ async def get_vm_resource_individual(
 ) -> dict[str, object]:
     """Get a single VM resource from cluster resources filtered by node and vmid."""
     try:
-        resources = await get_cluster_resources(session)
+        resources = await get_cluster_resources(session, raw=True)
         for resource in resources:
             resource_dict = _model_dump(resource)
             res_type = resource_dict.get("type", "")
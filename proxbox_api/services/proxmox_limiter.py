@@ -0,0 +1,305 @@
+"""Hierarchical, per-node adaptive limiter for Proxmox API requests.
+
+VM config, guest-agent, snapshot and task fetches used to share one flat
+semaphore sized by ``vm_sync_max_concurrency``. A single slow node (heavy IO,
+saturated ``pveproxy``) then ends up holding most permits and stalls every
+cluster. Requests now pass three gates, most specific first:
+
+* **node** -- an AIMD limit per ``(endpoint, node)``. It starts at
+  ``proxmox_node_max_concurrency``, is halved on every timeout, drops by one
+  while the latency EWMA exceeds ``proxmox_node_slow_latency_ms`` and grows by
+  one after a full window of fast responses;
+* **endpoint** -- ``vm_sync_max_concurrency`` per Proxmox endpoint, so
+  clusters no longer compete for the same permits;
+* **global** -- ``proxmox_global_max_concurrency`` across the process.
+
+Gates hold loop-bound futures, so there is one limiter per event loop; the
+running API uses a single loop and keeps its learned node limits for the
+process lifetime.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from proxbox_api.logger import logger
+from proxbox_api.runtime_settings import get_int
+from proxbox_api.services.proxmox_helpers import _is_timeout_error
+
+_EWMA_WEIGHT = 0.2
+
+
+def _resolve_global_max_concurrency() -> int:
+    return get_int(
+        settings_key="proxmox_global_max_concurrency",
+        env="PROXBOX_PROXMOX_GLOBAL_MAX_CONCURRENCY",
+        default=16,
+        minimum=1,
+    )
+
+
+def _resolve_node_max_concurrency() -> int:
+    return get_int(
+        settings_key="proxmox_node_max_concurrency",
+        env="PROXBOX_PROXMOX_NODE_MAX_CONCURRENCY",
+        default=4,
+        minimum=1,
+    )
+
+
+def _resolve_node_slow_latency_ms() -> int:
+    return get_int(
+        settings_key="proxmox_node_slow_latency_ms",
+        env="PROXBOX_PROXMOX_NODE_SLOW_LATENCY_MS",
+        default=5000,
+        minimum=1,
+    )
+
+
+class _Gate:
+    """FIFO counting gate whose limit can change while permits are held."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Woken and cancelled in the same tick: hand the permit on.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.active = max(0, self.active - 1)
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.active += 1
+            waiter.set_result(None)
+
+    def stats(self) -> dict[str, int]:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting}
+
+
+@dataclass(slots=True)
+class _NodeState:
+    gate: _Gate
+    ceiling: int
+    ewma_latency_s: float | None = None
+    fast_streak: int = 0
+    observations_total: int = 0
+    timeouts_total: int = 0
+    decreases_total: int = 0
+
+
+class ProxmoxRequestLimiter:
+    """Global -> endpoint -> node limiter with latency/timeout-driven node limits."""
+
+    def __init__(self) -> None:
+        self._global = _Gate(_resolve_global_max_concurrency())
+        self._endpoints: dict[str, _Gate] = {}
+        self._nodes: dict[tuple[str, str], _NodeState] = {}
+
+    def _node_state(self, endpoint: str, node: str) -> _NodeState:
+        key = (endpoint, node)
+        state = self._nodes.get(key)
+        ceiling = _resolve_node_max_concurrency()
+        if state is None:
+            state = _NodeState(gate=_Gate(ceiling), ceiling=ceiling)
+            self._nodes[key] = state
+        elif state.ceiling != ceiling:
+            state.ceiling = ceiling
+            state.gate.set_limit(min(state.gate.limit, ceiling))
+        return state
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        endpoint: object,
+        node: object = None,
+        *,
+        endpoint_limit: int | None = None,
+        observe: bool = True,
+    ) -> AsyncIterator[None]:
+        """Hold one permit at each level for the duration of the block.
+
+        With ``observe`` the block's latency and timeouts feed the node's
+        adaptive limit; pass ``observe=False`` when the block also does
+        NetBox work and would skew the node's latency.
+        """
+        endpoint_key = str(endpoint or "")
+        node_key = str(node or "")
+        self._global.set_limit(_resolve_global_max_concurrency())
+        endpoint_gate = self._endpoints.get(endpoint_key)
+        if endpoint_gate is None:
+            endpoint_gate = _Gate(endpoint_limit or self._global.limit)
+            self._endpoints[endpoint_key] = endpoint_gate
+        elif endpoint_limit is not None and endpoint_gate.limit != endpoint_limit:
+            endpoint_gate.set_limit(endpoint_limit)
+        gates: list[_Gate] = []
+        if node_key:
+            gates.append(self._node_state(endpoint_key, node_key).gate)
+        gates += [endpoint_gate, self._global]
+
+        acquired: list[_Gate] = []
+        try:
+            for gate in gates:
+                await gate.acquire()
+                acquired.append(gate)
+            started = time.perf_counter()
+            try:
+                yield
+            except Exception as error:
+                if observe and node_key and _is_timeout_error(error):
+                    self.observe(
+                        endpoint_key, node_key, time.perf_counter() - started, timed_out=True
+                    )
+                raise
+            if observe and node_key:
+                self.observe(endpoint_key, node_key, time.perf_counter() - started)
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+    def observe(
+        self,
+        endpoint: object,
+        node: object,
+        latency_s: float,
+        *,
+        timed_out: bool = False,
+    ) -> None:
+        """Feed one Proxmox response (or timeout) into the node's AIMD limit."""
+        if not node:
+            return
+        state = self._node_state(str(endpoint or ""), str(node))
+        state.observations_total += 1
+        previous = state.ewma_latency_s
+        state.ewma_latency_s = (
+            latency_s if previous is None else previous + _EWMA_WEIGHT * (latency_s - previous)
+        )
+        limit = state.gate.limit
+        if timed_out:
+            state.timeouts_total += 1
+            new_limit = max(1, limit // 2)
+        elif state.ewma_latency_s * 1000 > _resolve_node_slow_latency_ms():
+            new_limit = max(1, limit - 1)
+        else:
+            state.fast_streak += 1
+            if state.fast_streak < limit or limit >= state.ceiling:
+                return
+            new_limit = limit + 1
+        state.fast_streak = 0
+        if new_limit == limit:
+            return
+        if new_limit < limit:
+            state.decreases_total += 1
+            logger.info(
+                "Proxmox node %s/%s limit %s -> %s (ewma=%.0fms timed_out=%s)",
+                endpoint,
+                node,
+                limit,
+                new_limit,
+                state.ewma_latency_s * 1000,
+                timed_out,
+            )
+        state.gate.set_limit(new_limit)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "global": self._global.stats(),
+            "endpoints": {name: gate.stats() for name, gate in sorted(self._endpoints.items())},
+            "nodes": [
+                {
+                    "endpoint": endpoint,
+                    "node": node,
+                    **state.gate.stats(),
+                    "ceiling": state.ceiling,
+                    "ewma_latency_ms": (
+                        round(state.ewma_latency_s * 1000, 1)
+                        if state.ewma_latency_s is not None
+                        else None
+                    ),
+                    "observations_total": state.observations_total,
+                    "timeouts_total": state.timeouts_total,
+                    "decreases_total": state.decreases_total,
+                }
+                for (endpoint, node), state in sorted(self._nodes.items())
+            ],
+        }
+
+
+_limiters: dict[asyncio.AbstractEventLoop, ProxmoxRequestLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_proxmox_request_limiter() -> ProxmoxRequestLimiter:
+    """Return the limiter bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _limiters_lock:
+        for stale_loop in [known for known in _limiters if known.is_closed()]:
+            _limiters.pop(stale_loop, None)
+        limiter = _limiters.get(loop)
+        if limiter is None:
+            limiter = ProxmoxRequestLimiter()
+            _limiters[loop] = limiter
+        return limiter
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_PROMETHEUS_SERIES = (
+    ("limit", "proxbox_proxmox_node_limit", "gauge", "Current adaptive request limit per node"),
+    ("active", "proxbox_proxmox_node_active", "gauge", "In-flight Proxmox requests per node"),
+    (
+        "timeouts_total",
+        "proxbox_proxmox_node_timeouts_total",
+        "counter",
+        "Proxmox request timeouts per node",
+    ),
+)
+
+
+def get_proxmox_limiter_prometheus_metrics() -> str:
+    """Return the running loop's node limiter state in Prometheus text format."""
+    nodes = get_proxmox_request_limiter().stats()["nodes"]
+    lines: list[str] = []
+    for stat_key, name, metric_type, help_text in _PROMETHEUS_SERIES:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        for node in nodes:
+            labels = (
+                f'endpoint="{_escape_label(node["endpoint"])}",node="{_escape_label(node["node"])}"'
+            )
+            lines.append(f"{name}{{{labels}}} {node[stat_key]}")
+    return "\n".join(lines) + "\n"
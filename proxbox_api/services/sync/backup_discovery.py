@@ -0,0 +1,104 @@
+"""Plan backup storage listings so shared storages are read once per cluster.
+
+``GET /storage`` describes every storage of a cluster, including whether it is
+``shared`` and which ``nodes`` may use it. A shared storage (PBS, NFS, CIFS,
+CephFS, ...) returns the same volume list from every node, so listing it per
+node only multiplies identical requests. The planner emits one listing per
+shared storage, with every eligible node as an ordered fallback (online nodes
+first), and one listing per node for local storages.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+# Storage types whose content is shared by construction, for configs that do
+# not carry an explicit ``shared`` flag.
+_SHARED_STORAGE_TYPES = frozenset({"pbs", "nfs", "cifs", "cephfs", "glusterfs"})
+
+
+@dataclass(frozen=True)
+class BackupStorageListing:
+    """One ``content=backup`` listing and the nodes that may serve it, in order."""
+
+    storage: str
+    nodes: tuple[str, ...]
+    shared: bool
+
+
+def storage_is_shared(storage_config: Mapping[str, object]) -> bool:
+    shared = storage_config.get("shared")
+    if shared is not None and str(shared).strip() not in {"", "0", "false", "False"}:
+        return True
+    return str(storage_config.get("type") or "").strip().lower() in _SHARED_STORAGE_TYPES
+
+
+def storage_node_filter(storage_config: Mapping[str, object]) -> frozenset[str] | None:
+    """Nodes a storage is restricted to, or ``None`` when every node may use it."""
+    nodes = storage_config.get("nodes")
+    if nodes is None or nodes == "all":
+        return None
+    if isinstance(nodes, str):
+        names = nodes.split(",")
+    elif isinstance(nodes, Iterable):
+        names = [str(name) for name in nodes]
+    else:
+        return None
+    parsed = frozenset(name.strip() for name in names if name.strip())
+    return parsed or None
+
+
+def _holds_backups(storage_config: Mapping[str, object]) -> bool:
+    content = storage_config.get("content")
+    if isinstance(content, str):
+        return "backup" in {item.strip() for item in content.split(",")}
+    if isinstance(content, Iterable):
+        return "backup" in {str(item).strip() for item in content}
+    return False
+
+
+def plan_backup_storage_listings(
+    storage_configs: Iterable[Mapping[str, object]],
+    cluster_nodes: Iterable[object],
+) -> list[BackupStorageListing]:
+    """Return the listings needed to cover every backup storage of one cluster.
+
+    ``cluster_nodes`` are cluster-status node entries; only their ``name`` and
+    optional ``online`` attributes are read.
+    """
+    node_entries = [node for node in cluster_nodes if getattr(node, "name", None)]
+    ordered_nodes = [
+        str(node.name)
+        for node in sorted(
+            node_entries,
+            key=lambda node: getattr(node, "online", True) is False,
+        )
+    ]
+    listings: list[BackupStorageListing] = []
+    for storage_config in storage_configs:
+        storage_name = str(storage_config.get("storage") or "").strip()
+        if not storage_name or not _holds_backups(storage_config):
+            continue
+        allowed = storage_node_filter(storage_config)
+        eligible = tuple(node for node in ordered_nodes if allowed is None or node in allowed)
+        if not eligible:
+            continue
+        if storage_is_shared(storage_config):
+            listings.append(BackupStorageListing(storage=storage_name, nodes=eligible, shared=True))
+            continue
+        listings.extend(
+            BackupStorageListing(storage=storage_name, nodes=(node,), shared=False)
+            for node in eligible
+        )
+    return listings
+
+
+def index_backups_by_vmid(backups: Iterable[dict]) -> dict[str, list[dict]]:
+    """Group storage content rows by their normalized ``vmid``."""
+    index: dict[str, list[dict]] = {}
+    for backup in backups:
+        vmid = str(backup.get("vmid", "")).strip()
+        if vmid:
+            index.setdefault(vmid, []).append(backup)
+    return index
@@ -0,0 +1,246 @@
+"""Generic keyed-collection reconcile with optional native acceleration.
+
+Virtual disks, backups and snapshots all reconcile a list of desired payloads
+against existing NetBox records matched by a handful of key fields. Callers
+normalize both sides into the same diff shape; this module matches them by key
+and returns an index-based plan of records to create, patch, leave alone or
+delete. The ``reconciliation_engine`` setting selects the implementation
+exactly as it does for the VM operation queue.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from proxbox_api.services.sync.reconciliation.metrics import (
+    KEYED_RECONCILE_SECONDS,
+    increment_reconciliation_mismatch_total,
+    record_compare_fallback,
+    timed,
+)
+from proxbox_api.services.sync.reconciliation.vm_queue import (
+    _reconciliation_compare_strict,
+    _reconciliation_engine,
+)
+
+try:
+    from proxbox_reconcile_rs._native import (
+        reconcile_keyed_collection_json as _rust_reconcile_keyed,
+    )
+except ImportError:
+    _rust_reconcile_keyed = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class KeyedReconcileSpec:
+    """How to match and diff one collection.
+
+    ``patchable_fields`` limits patches to the listed fields (``None`` allows
+    all). ``nullable_fields`` are cleared when set in NetBox but absent from the
+    desired payload. With ``delete_missing`` the plan also lists current records
+    whose key is not desired, plus every duplicate after the first per key.
+    """
+
+    key_fields: tuple[str, ...]
+    patchable_fields: frozenset[str] | None = None
+    nullable_fields: frozenset[str] = frozenset()
+    delete_missing: bool = False
+
+
+@dataclass(slots=True)
+class KeyedUpdate:
+    """A desired payload matched to a current record that needs ``patch``."""
+
+    desired_index: int
+    current_index: int
+    patch: dict[str, Any]
+
+
+@dataclass(slots=True)
+class KeyedReconcilePlan:
+    """Index-based plan; indices point into the ``desired``/``current`` inputs."""
+
+    create: list[int] = field(default_factory=list)
+    update: list[KeyedUpdate] = field(default_factory=list)
+    unchanged: list[tuple[int, int]] = field(default_factory=list)
+    delete: list[int] = field(default_factory=list)
+    duplicate_desired: list[int] = field(default_factory=list)
+
+
+def native_keyed_reconcile_available() -> bool:
+    """Return whether the installed extension exports the keyed reconcile primitive."""
+
+    return _rust_reconcile_keyed is not None
+
+
+def _key_part(value: object) -> object:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _record_key(record: dict[str, Any], key_fields: Sequence[str]) -> tuple[object, ...] | None:
+    key = tuple(_key_part(record.get(field_name)) for field_name in key_fields)
+    if all(part is None for part in key):
+        return None
+    return key
+
+
+def reconcile_keyed_collection_python(  # noqa: C901
+    spec: KeyedReconcileSpec,
+    desired: Sequence[dict[str, Any]],
+    current: Sequence[dict[str, Any]],
+) -> KeyedReconcilePlan:
+    """Pure-Python keyed reconcile; mirrors ``keyed.rs`` in the native engine."""
+
+    plan = KeyedReconcilePlan()
+    current_by_key: dict[tuple[object, ...], int] = {}
+    for index, record in enumerate(current):
+        key = _record_key(record, spec.key_fields)
+        if key is None:
+            continue
+        if key in current_by_key:
+            if spec.delete_missing:
+                plan.delete.append(index)
+            continue
+        current_by_key[key] = index
+
+    seen_desired: set[tuple[object, ...]] = set()
+    matched_current: set[int] = set()
+    for desired_index, payload in enumerate(desired):
+        key = _record_key(payload, spec.key_fields)
+        if key is None:
+            continue
+        if key in seen_desired:
+            plan.duplicate_desired.append(desired_index)
+            continue
+        seen_desired.add(key)
+        current_index = current_by_key.get(key)
+        if current_index is None:
+            plan.create.append(desired_index)
+            continue
+        matched_current.add(current_index)
+        existing = current[current_index]
+        patch = {
+            key_name: value
+            for key_name, value in payload.items()
+            if key_name not in existing or existing[key_name] != value
+        }
+        for field_name in spec.nullable_fields:
+            if existing.get(field_name) is not None and field_name not in payload:
+                patch[field_name] = None
+        if spec.patchable_fields is not None:
+            patch = {
+                key_name: value
+                for key_name, value in patch.items()
+                if key_name in spec.patchable_fields
+            }
+        if patch:
+            plan.update.append(KeyedUpdate(desired_index, current_index, patch))
+        else:
+            plan.unchanged.append((desired_index, current_index))
+
+    if spec.delete_missing:
+        plan.delete.extend(
+            index for index in current_by_key.values() if index not in matched_current
+        )
+        plan.delete.sort()
+    return plan
+
+
+def reconcile_keyed_collection_rust(
+    spec: KeyedReconcileSpec,
+    desired: Sequence[dict[str, Any]],
+    current: Sequence[dict[str, Any]],
+) -> KeyedReconcilePlan:
+    """Run the native keyed reconcile and decode its plan."""
+
+    if _rust_reconcile_keyed is None:
+        raise RuntimeError("proxbox-reconcile-rs does not export reconcile_keyed_collection_json")
+    input_bytes = json.dumps(
+        {
+            "key_fields": list(spec.key_fields),
+            "patchable_fields": (
+                sorted(spec.patchable_fields) if spec.patchable_fields is not None else None
+            ),
+            "nullable_fields": sorted(spec.nullable_fields),
+            "delete_missing": spec.delete_missing,
+            "desired": list(desired),
+            "current": list(current),
+        },
+        default=str,
+    ).encode()
+    raw = json.loads(_rust_reconcile_keyed(input_bytes))
+    return KeyedReconcilePlan(
+        create=list(raw.get("create", [])),
+        update=[
+            KeyedUpdate(item["desired_index"], item["current_index"], item["patch"])
+            for item in raw.get("update", [])
+        ],
+        unchanged=[
+            (item["desired_index"], item["current_index"]) for item in raw.get("unchanged", [])
+        ],
+        delete=list(raw.get("delete", [])),
+        duplicate_desired=list(raw.get("duplicate_desired", [])),
+    )
+
+
+def reconcile_keyed_collection(
+    spec: KeyedReconcileSpec,
+    desired: Sequence[dict[str, Any]],
+    current: Sequence[dict[str, Any]],
+    *,
+    collection: str = "",
+) -> KeyedReconcilePlan:
+    """Reconcile ``desired`` against ``current`` with the configured engine.
+
+    ``python`` runs the pure-Python implementation, ``rust`` requires the
+    extension, and ``compare`` runs both and returns the Python plan, counting
+    mismatches in the reconciliation metrics. ``collection`` only labels log
+    lines.
+    """
+
+    engine = _reconciliation_engine()
+    if engine == "rust":
+        with timed(KEYED_RECONCILE_SECONDS, label="rust"):
+            return reconcile_keyed_collection_rust(spec, desired, current)
+
+    with timed(KEYED_RECONCILE_SECONDS, label="python"):
+        python_plan = reconcile_keyed_collection_python(spec, desired, current)
+    if engine == "python":
+        return python_plan
+    if not native_keyed_reconcile_available():
+        record_compare_fallback("rust_unavailable")
+        return python_plan
+
+    try:
+        with timed(KEYED_RECONCILE_SECONDS, label="rust"):
+            rust_plan = reconcile_keyed_collection_rust(spec, desired, current)
+    except Exception as exc:
+        increment_reconciliation_mismatch_total()
+        record_compare_fallback("rust_error")
+        logger.exception("Rust keyed reconcile failed for %s in compare mode", collection)
+        if _reconciliation_compare_strict():
+            raise AssertionError("Rust keyed reconcile failed in compare mode") from exc
+        return python_plan
+
+    if rust_plan != python_plan:
+        increment_reconciliation_mismatch_total()
+        record_compare_fallback("mismatch")
+        logger.error(
+            "Rust keyed reconcile mismatch for %s: python=%s rust=%s",
+            collection,
+            python_plan,
+            rust_plan,
+        )
+        if _reconciliation_compare_strict():
+            raise AssertionError(f"Rust/Python keyed reconcile mismatch for {collection}")
+    return python_plan
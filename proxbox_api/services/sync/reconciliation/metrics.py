@@ -1,37 +1,237 @@
-"""Lightweight metrics for reconciliation engine observability."""
+"""Lightweight metrics for reconciliation engine observability.
+
+Everything here is process-local and dependency-free: counters and
+fixed-bucket histograms are plain dictionaries guarded by a lock, rendered
+on demand as JSON (``/cache/metrics``) or Prometheus text
+(``/cache/metrics/prometheus``). The histograms let operators compare the
+Python and Rust engines on live traffic instead of offline benchmarks.
+"""
 
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+# Seconds. Queue builds for a few VMs finish in well under a millisecond while
+# multi-thousand VM snapshots can take seconds, so the buckets span both.
+HISTOGRAM_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+QUEUE_BUILD_SECONDS = "proxbox_reconcile_queue_build_seconds"
+BRIDGE_ENCODE_SECONDS = "proxbox_reconcile_bridge_encode_seconds"
+BRIDGE_DECODE_SECONDS = "proxbox_reconcile_bridge_decode_seconds"
+SNAPSHOT_INDEX_SECONDS = "proxbox_reconcile_snapshot_index_seconds"
+KEYED_RECONCILE_SECONDS = "proxbox_reconcile_keyed_seconds"
+
+_HISTOGRAM_HELP = {
+    QUEUE_BUILD_SECONDS: "VM operation-queue build time by reconciliation engine",
+    BRIDGE_ENCODE_SECONDS: "Time to serialize prepared VM state for the Rust bridge",
+    BRIDGE_DECODE_SECONDS: "Time to decode the Rust bridge operation queue",
+    SNAPSHOT_INDEX_SECONDS: "Time to index the NetBox VM snapshot by identity",
+    KEYED_RECONCILE_SECONDS: "Disk, backup and snapshot keyed reconcile time by engine",
+}
+
+_OPERATION_METHODS = ("GET", "CREATE", "UPDATE")
+
+_lock = threading.Lock()
 _reconcile_mismatch_total = 0
+_compare_fallback_total: dict[str, int] = {}
+_operations_total: dict[tuple[str, str], int] = {}
+_last_run_operations: dict[str, int] = dict.fromkeys(_OPERATION_METHODS, 0)
+_runs_total: dict[str, int] = {}
+# name -> label value ("" when unlabelled) -> [bucket counts..., count, sum]
+_histograms: dict[str, dict[str, list[float]]] = {}
 
 
 def increment_reconciliation_mismatch_total() -> None:
     """Record one Rust/Python reconciliation output mismatch."""
 
     global _reconcile_mismatch_total
-    _reconcile_mismatch_total += 1
+    with _lock:
+        _reconcile_mismatch_total += 1
+
+
+def record_compare_fallback(reason: str) -> None:
+    """Record why compare mode returned Python output without a clean Rust comparison.
+
+    Reasons in use: ``rust_unavailable``, ``rust_error`` and ``mismatch``.
+    """
+
+    with _lock:
+        _compare_fallback_total[reason] = _compare_fallback_total.get(reason, 0) + 1
+
+
+def observe_duration(name: str, seconds: float, *, label: str = "") -> None:
+    """Add one observation to the histogram ``name``."""
+
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        values = series.get(label)
+        if values is None:
+            values = [0.0] * (len(HISTOGRAM_BUCKETS) + 2)
+            series[label] = values
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            if seconds <= bound:
+                values[index] += 1
+        values[-2] += 1
+        values[-1] += seconds
+
+
+@contextmanager
+def timed(name: str, *, label: str = "") -> Iterator[None]:
+    """Observe the wall time of the enclosed block into histogram ``name``."""
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_duration(name, time.perf_counter() - started, label=label)
+
+
+def record_operation_queue(engine: str, operations: Iterable[object]) -> None:
+    """Count GET/CREATE/UPDATE operations for one queue build, per cluster.
+
+    Also replaces the ``last run`` gauges so a scrape shows the composition
+    of the most recent reconciliation alongside the cumulative counters.
+    """
+
+    run_counts = dict.fromkeys(_OPERATION_METHODS, 0)
+    cluster_counts: dict[tuple[str, str], int] = {}
+    for operation in operations:
+        method = str(getattr(operation, "method", ""))
+        prepared = getattr(operation, "prepared", None)
+        cluster_name = str(getattr(prepared, "cluster_name", "") or "")
+        run_counts[method] = run_counts.get(method, 0) + 1
+        key = (cluster_name, method)
+        cluster_counts[key] = cluster_counts.get(key, 0) + 1
+
+    global _last_run_operations
+    with _lock:
+        _runs_total[engine] = _runs_total.get(engine, 0) + 1
+        _last_run_operations = run_counts
+        for key, count in cluster_counts.items():
+            _operations_total[key] = _operations_total.get(key, 0) + count
 
 
 def reset_reconciliation_metrics() -> None:
     """Reset reconciliation metrics for tests."""
 
-    global _reconcile_mismatch_total
-    _reconcile_mismatch_total = 0
+    global _reconcile_mismatch_total, _last_run_operations
+    with _lock:
+        _reconcile_mismatch_total = 0
+        _compare_fallback_total.clear()
+        _operations_total.clear()
+        _last_run_operations = dict.fromkeys(_OPERATION_METHODS, 0)
+        _runs_total.clear()
+        _histograms.clear()
+
 
+def _histogram_summary() -> dict[str, dict[str, dict[str, float]]]:
+    return {
+        name: {
+            label or "all": {"count": int(values[-2]), "sum": round(values[-1], 6)}
+            for label, values in series.items()
+        }
+        for name, series in _histograms.items()
+    }
 
-def get_reconciliation_metrics() -> dict[str, int]:
+
+def get_reconciliation_metrics() -> dict[str, object]:
     """Return reconciliation metrics using the public metric names."""
 
-    return {"proxbox_reconcile_mismatch_total": _reconcile_mismatch_total}
+    with _lock:
+        operations: dict[str, dict[str, int]] = {}
+        for (cluster_name, method), count in sorted(_operations_total.items()):
+            operations.setdefault(cluster_name, {})[method] = count
+        return {
+            "proxbox_reconcile_mismatch_total": _reconcile_mismatch_total,
+            "proxbox_reconcile_compare_fallback_total": dict(_compare_fallback_total),
+            "proxbox_reconcile_runs_total": dict(_runs_total),
+            "proxbox_reconcile_operations_total": operations,
+            "proxbox_reconcile_last_run_operations": dict(_last_run_operations),
+            "proxbox_reconcile_durations": _histogram_summary(),
+        }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(**labels: str) -> str:
+    pairs = [f'{key}="{_escape_label(value)}"' for key, value in labels.items() if value != ""]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _histogram_lines(name: str, label_name: str) -> list[str]:
+    lines = [f"# HELP {name} {_HISTOGRAM_HELP[name]}", f"# TYPE {name} histogram"]
+    for label, values in sorted(_histograms.get(name, {}).items()):
+        base = {label_name: label} if label_name else {}
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            bucket_labels = _format_labels(**base, le=f"{bound:g}")
+            lines.append(f"{name}_bucket{bucket_labels} {int(values[index])}")
+        lines.append(f"{name}_bucket{_format_labels(**base, le='+Inf')} {int(values[-2])}")
+        lines.append(f"{name}_sum{_format_labels(**base)} {values[-1]:.6f}")
+        lines.append(f"{name}_count{_format_labels(**base)} {int(values[-2])}")
+    return lines
 
 
 def get_reconciliation_prometheus_metrics() -> str:
     """Return reconciliation metrics in Prometheus text exposition format."""
 
-    metrics = get_reconciliation_metrics()
-    lines = [
-        "# HELP proxbox_reconcile_mismatch_total Total Rust/Python reconciliation mismatches",
-        "# TYPE proxbox_reconcile_mismatch_total counter",
-        f"proxbox_reconcile_mismatch_total {metrics['proxbox_reconcile_mismatch_total']}",
-    ]
+    with _lock:
+        lines = [
+            "# HELP proxbox_reconcile_mismatch_total Total Rust/Python reconciliation mismatches",
+            "# TYPE proxbox_reconcile_mismatch_total counter",
+            f"proxbox_reconcile_mismatch_total {_reconcile_mismatch_total}",
+            "# HELP proxbox_reconcile_compare_fallback_total Compare-mode runs that returned "
+            "Python output without a matching Rust result, by reason",
+            "# TYPE proxbox_reconcile_compare_fallback_total counter",
+        ]
+        for reason, count in sorted(_compare_fallback_total.items()):
+            lines.append(
+                f"proxbox_reconcile_compare_fallback_total{_format_labels(reason=reason)} {count}"
+            )
+        lines += [
+            "# HELP proxbox_reconcile_runs_total VM operation-queue builds by engine",
+            "# TYPE proxbox_reconcile_runs_total counter",
+        ]
+        for engine, count in sorted(_runs_total.items()):
+            lines.append(f"proxbox_reconcile_runs_total{_format_labels(engine=engine)} {count}")
+        lines += [
+            "# HELP proxbox_reconcile_operations_total VM reconciliation operations by "
+            "cluster and method",
+            "# TYPE proxbox_reconcile_operations_total counter",
+        ]
+        for (cluster_name, method), count in sorted(_operations_total.items()):
+            labels = _format_labels(cluster=cluster_name, method=method)
+            lines.append(f"proxbox_reconcile_operations_total{labels} {count}")
+        lines += [
+            "# HELP proxbox_reconcile_last_run_operations VM reconciliation operations in the "
+            "most recent queue build, by method",
+            "# TYPE proxbox_reconcile_last_run_operations gauge",
+        ]
+        for method, count in sorted(_last_run_operations.items()):
+            labels = _format_labels(method=method)
+            lines.append(f"proxbox_reconcile_last_run_operations{labels} {count}")
+        lines += _histogram_lines(QUEUE_BUILD_SECONDS, "engine")
+        lines += _histogram_lines(BRIDGE_ENCODE_SECONDS, "")
+        lines += _histogram_lines(BRIDGE_DECODE_SECONDS, "")
+        lines += _histogram_lines(SNAPSHOT_INDEX_SECONDS, "")
+        lines += _histogram_lines(KEYED_RECONCILE_SECONDS, "engine")
     return "\n".join(lines) + "\n"
@@ -0,0 +1,182 @@
+"""Batch VM payload normalizers with optional native acceleration.
+
+The optional ``proxbox-reconcile-rs`` extension exports list-in/list-out
+versions of the normalizers its VM engine uses. Each helper here calls the
+native batch function when the extension provides it and otherwise runs the
+pure-Python port below, which mirrors ``normalize.rs`` field by field.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Sequence
+from typing import Any
+
+try:
+    from proxbox_reconcile_rs._native import (
+        extract_vm_snapshot_identities_json as _rust_extract_identities,
+    )
+    from proxbox_reconcile_rs._native import (
+        normalize_current_vm_payloads_json as _rust_normalize_current,
+    )
+    from proxbox_reconcile_rs._native import (
+        normalize_desired_vm_payloads_json as _rust_normalize_desired,
+    )
+except ImportError:
+    _rust_extract_identities = None
+    _rust_normalize_current = None
+    _rust_normalize_desired = None
+
+_INT_TEXT = re.compile(r"^[+-]?\d+$")
+_STATUS_MAP = {
+    "running": "active",
+    "online": "active",
+    "active": "active",
+    "stopped": "offline",
+    "paused": "offline",
+    "offline": "offline",
+    "planned": "planned",
+}
+
+# (endpoint_id, cluster_id, proxmox_vmid, vm_type) per snapshot record.
+VMSnapshotIdentity = tuple[int | None, int | None, int | None, str | None]
+
+
+def native_normalizers_available() -> bool:
+    """Return whether the installed extension exports the batch normalizers."""
+
+    return (
+        _rust_normalize_current is not None
+        and _rust_normalize_desired is not None
+        and _rust_extract_identities is not None
+    )
+
+
+def _dumps(items: Sequence[object]) -> bytes:
+    return json.dumps(list(items), default=str).encode()
+
+
+def _value_to_int(value: object) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip()
+        return int(text) if _INT_TEXT.match(text) else None
+    return None
+
+
+def _relation_id(value: object) -> int | None:
+    if isinstance(value, dict):
+        relation = _relation_id(value.get("id")) if "id" in value else None
+        if relation is None and "value" in value:
+            relation = _relation_id(value.get("value"))
+        return relation
+    return _value_to_int(value)
+
+
+def _normalize_status(value: object) -> str:
+    if value is None:
+        return "active"
+    if not isinstance(value, str):
+        return "active"
+    return _STATUS_MAP.get(value.strip().lower(), "active")
+
+
+def _normalize_tags(value: object) -> list[int]:
+    if not isinstance(value, list):
+        return []
+    tag_ids: set[int] = set()
+    for item in value:
+        candidate = item.get("id") if isinstance(item, dict) else item
+        tag_id = _value_to_int(candidate)
+        if tag_id is not None:
+            tag_ids.add(tag_id)
+    return sorted(tag_ids)
+
+
+def _normalize_vm_payload(source: object, supports_vm_type: bool) -> dict[str, Any]:
+    data = source if isinstance(source, dict) else {}
+    payload: dict[str, Any] = {}
+    if data.get("name") is not None:
+        payload["name"] = data["name"]
+    payload["status"] = _normalize_status(data.get("status"))
+    relation_fields = ["cluster", "device", "site"]
+    if supports_vm_type:
+        relation_fields.append("virtual_machine_type")
+    relation_fields.append("role")
+    for field_name in relation_fields:
+        relation = _relation_id(data.get(field_name))
+        if relation is not None and relation > 0:
+            payload[field_name] = relation
+    for field_name in ("vcpus", "memory", "disk"):
+        payload[field_name] = _value_to_int(data.get(field_name)) or 0
+    payload["tags"] = _normalize_tags(data.get("tags"))
+    custom_fields = data.get("custom_fields")
+    payload["custom_fields"] = dict(custom_fields) if isinstance(custom_fields, dict) else {}
+    if data.get("description") is not None:
+        payload["description"] = data["description"]
+    return payload
+
+
+def normalize_current_vm_payloads(
+    records: Sequence[dict[str, object]],
+    *,
+    supports_virtual_machine_type_field: bool = True,
+) -> list[dict[str, Any]]:
+    """Normalize NetBox VM records into the engine's diff shape, preserving order."""
+
+    if not records:
+        return []
+    if _rust_normalize_current is not None:
+        output = _rust_normalize_current(_dumps(records), supports_virtual_machine_type_field)
+        return json.loads(output)
+    return [
+        _normalize_vm_payload(record, supports_virtual_machine_type_field) for record in records
+    ]
+
+
+def normalize_desired_vm_payloads(
+    payloads: Sequence[dict[str, object]],
+    *,
+    supports_virtual_machine_type_field: bool = True,
+) -> list[dict[str, Any]]:
+    """Normalize desired VM payloads into the engine's diff shape, preserving order."""
+
+    if not payloads:
+        return []
+    if _rust_normalize_desired is not None:
+        output = _rust_normalize_desired(_dumps(payloads), supports_virtual_machine_type_field)
+        return json.loads(output)
+    return [
+        _normalize_vm_payload(payload, supports_virtual_machine_type_field) for payload in payloads
+    ]
+
+
+def extract_vm_snapshot_identities_native(
+    records: Sequence[dict[str, object]],
+) -> list[VMSnapshotIdentity] | None:
+    """Extract snapshot identity keys natively, or ``None`` without the extension.
+
+    The Python equivalent lives next to the snapshot indexer in ``vm_queue``,
+    which is the only consumer and owns the identity semantics.
+    """
+
+    if _rust_extract_identities is None:
+        return None
+    if not records:
+        return []
+    decoded = json.loads(_rust_extract_identities(_dumps(records)))
+    return [
+        (
+            identity.get("endpoint_id"),
+            identity.get("cluster_id"),
+            identity.get("proxmox_vmid"),
+            identity.get("vm_type"),
+        )
+        for identity in decoded
+    ]
@@ -7,6 +7,12 @@ from typing import Any
 
 from pydantic import BaseModel, TypeAdapter
 
+from proxbox_api.services.sync.reconciliation.metrics import (
+    BRIDGE_DECODE_SECONDS,
+    BRIDGE_ENCODE_SECONDS,
+    timed,
+)
+
 try:
     from proxbox_reconcile_rs._native import build_vm_operation_queue_json as _rust_build
 except ImportError:
@@ -91,10 +97,12 @@ def build_vm_operation_queue_rust(
     if _rust_build is None:
         raise RuntimeError("proxbox-reconcile-rs is not installed")
 
-    input_bytes = dump_bridge_input_json(
-        prepared_vms=prepared_vms,
-        netbox_snapshot=netbox_snapshot,
-        flags=flags,
-    )
+    with timed(BRIDGE_ENCODE_SECONDS):
+        input_bytes = dump_bridge_input_json(
+            prepared_vms=prepared_vms,
+            netbox_snapshot=netbox_snapshot,
+            flags=flags,
+        )
     output_bytes = _rust_build(input_bytes)
-    return json.loads(output_bytes)
+    with timed(BRIDGE_DECODE_SECONDS):
+        return json.loads(output_bytes)
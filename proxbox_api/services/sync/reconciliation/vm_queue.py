@@ -10,7 +10,17 @@ from typing import Any, Literal
 from proxbox_api.proxmox_to_netbox.models import NetBoxVirtualMachineCreateBody
 from proxbox_api.runtime_settings import get_plugin_bool, get_plugin_str
 from proxbox_api.services.sync.reconciliation.metrics import (
+    QUEUE_BUILD_SECONDS,
+    SNAPSHOT_INDEX_SECONDS,
     increment_reconciliation_mismatch_total,
+    record_compare_fallback,
+    record_operation_queue,
+    timed,
+)
+from proxbox_api.services.sync.reconciliation.normalize import (
+    VMSnapshotIdentity,
+    extract_vm_snapshot_identities_native,
+    native_normalizers_available,
 )
 from proxbox_api.services.sync.reconciliation.rust_bridge import (
     build_vm_operation_queue_rust,
@@ -118,27 +128,68 @@ def build_vm_snapshot_identity_indexes(
     _TypedSnapshotIndex,
     _UntypedSnapshotIndex,
 ]:
-    """Index NetBox VM records by endpoint identity plus legacy cluster identity."""
+    """Index NetBox VM records by endpoint identity plus legacy cluster identity.
+
+    Identity keys are extracted in one native batch call when the Rust
+    extension is installed and a Rust-backed engine is selected; otherwise the
+    Python extractors below are used record by record.
+    """
+
+    with timed(SNAPSHOT_INDEX_SECONDS):
+        identities = None
+        if _native_snapshot_identities_enabled():
+            identities = extract_vm_snapshot_identities_native(snapshot)
+        if identities is None:
+            identities = [_snapshot_identity(record) for record in snapshot]
+        return _index_snapshot_identities(snapshot, identities)
+
+
+def _native_snapshot_identities_enabled() -> bool:
+    if not native_normalizers_available():
+        return False
+    engine = get_plugin_str(settings_key="reconciliation_engine", default="python")
+    return engine.lower() != "python"
+
+
+def _snapshot_identity(record: dict[str, object]) -> VMSnapshotIdentity:
+    endpoint_key = extract_endpoint_and_proxmox_vmid(record)
+    cluster_key = extract_cluster_and_proxmox_vmid(record)
+    proxmox_vmid = (endpoint_key or cluster_key or (None, None))[1]
+    return (
+        endpoint_key[0] if endpoint_key is not None else None,
+        cluster_key[0] if cluster_key is not None else None,
+        proxmox_vmid,
+        extract_proxmox_vm_type(record),
+    )
 
+
+def _index_snapshot_identities(
+    snapshot: list[dict[str, object]],
+    identities: list[VMSnapshotIdentity],
+) -> tuple[
+    _TypedSnapshotIndex,
+    _UntypedSnapshotIndex,
+    _TypedSnapshotIndex,
+    _UntypedSnapshotIndex,
+]:
     endpoint_typed_index: _TypedSnapshotIndex = {}
     endpoint_untyped_candidates: _UntypedSnapshotIndex = {}
     cluster_typed_index: _TypedSnapshotIndex = {}
     cluster_untyped_candidates: _UntypedSnapshotIndex = {}
-    for current in snapshot:
-        vm_type = extract_proxmox_vm_type(current)
-        endpoint_key = extract_endpoint_and_proxmox_vmid(current)
-        if endpoint_key is not None:
+    for current, (endpoint_id, cluster_id, proxmox_vmid, vm_type) in zip(snapshot, identities):
+        if proxmox_vmid is None:
+            continue
+        if endpoint_id is not None:
+            endpoint_key = (endpoint_id, proxmox_vmid)
             endpoint_untyped_candidates.setdefault(endpoint_key, []).append(current)
             if vm_type is not None:
-                endpoint_typed_index.setdefault(
-                    (endpoint_key[0], endpoint_key[1], vm_type), current
-                )
+                endpoint_typed_index.setdefault((endpoint_id, proxmox_vmid, vm_type), current)
 
-        cluster_key = extract_cluster_and_proxmox_vmid(current)
-        if cluster_key is not None:
+        if cluster_id is not None:
+            cluster_key = (cluster_id, proxmox_vmid)
             cluster_untyped_candidates.setdefault(cluster_key, []).append(current)
             if vm_type is not None:
-                cluster_typed_index.setdefault((cluster_key[0], cluster_key[1], vm_type), current)
+                cluster_typed_index.setdefault((cluster_id, proxmox_vmid, vm_type), current)
     return (
         endpoint_typed_index,
         endpoint_untyped_candidates,
@@ -333,21 +384,29 @@ def build_vm_operation_queue(
     engine = _reconciliation_engine()
 
     if engine == "rust":
-        return _build_vm_operation_queue_with_rust(prepared_vms, netbox_snapshot, flags)
-
-    py_ops = build_vm_operation_queue_python(
-        prepared_vms,
-        netbox_snapshot,
-        **flags,
-    )
+        rust_ops = _build_vm_operation_queue_with_rust(prepared_vms, netbox_snapshot, flags)
+        record_operation_queue("rust", rust_ops)
+        return rust_ops
+
+    with timed(QUEUE_BUILD_SECONDS, label="python"):
+        py_ops = build_vm_operation_queue_python(
+            prepared_vms,
+            netbox_snapshot,
+            **flags,
+        )
+    record_operation_queue("python", py_ops)
 
-    if engine == "python" or not rust_available():
+    if engine == "python":
+        return py_ops
+    if not rust_available():
+        record_compare_fallback("rust_unavailable")
         return py_ops
 
     try:
         rust_ops = _build_vm_operation_queue_with_rust(prepared_vms, netbox_snapshot, flags)
     except Exception as exc:
         increment_reconciliation_mismatch_total()
+        record_compare_fallback("rust_error")
         logger.exception("Rust reconciliation failed in compare mode; returning Python output")
         if _reconciliation_compare_strict():
             raise AssertionError("Rust reconciliation failed in compare mode") from exc
@@ -357,6 +416,7 @@ def build_vm_operation_queue(
     normalized_rust_ops = _normalize_ops(rust_ops)
     if normalized_py_ops != normalized_rust_ops:
         increment_reconciliation_mismatch_total()
+        record_compare_fallback("mismatch")
         diff = _format_diff(normalized_py_ops, normalized_rust_ops)
         logger.error("Rust reconciliation mismatch:\n%s", diff)
         if _reconciliation_compare_strict():
@@ -370,12 +430,13 @@ def _build_vm_operation_queue_with_rust(
     netbox_snapshot: list[dict[str, object]],
     flags: dict[str, bool],
 ) -> list[NetBoxVMOperation]:
-    raw_ops = build_vm_operation_queue_rust(
-        prepared_vms=prepared_vms,
-        netbox_snapshot=netbox_snapshot,
-        flags=flags,
-    )
-    return _adapt_to_dataclasses(raw_ops, prepared_vms)
+    with timed(QUEUE_BUILD_SECONDS, label="rust"):
+        raw_ops = build_vm_operation_queue_rust(
+            prepared_vms=prepared_vms,
+            netbox_snapshot=netbox_snapshot,
+            flags=flags,
+        )
+        return _adapt_to_dataclasses(raw_ops, prepared_vms)
 
 
 def _reconciliation_engine() -> Literal["python", "compare", "rust"]:
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime
 
 from proxbox_api.exception import ProxboxException
@@ -18,6 +20,7 @@ from proxbox_api.netbox_rest import (
 from proxbox_api.proxmox_to_netbox.models import NetBoxSnapshotSyncState
 from proxbox_api.runtime_settings import get_int
 from proxbox_api.services.proxmox_helpers import get_vm_snapshots
+from proxbox_api.services.proxmox_limiter import get_proxmox_request_limiter
 from proxbox_api.services.sync._helpers import _extract_fk_id
 from proxbox_api.services.sync.storage_links import (
     build_storage_index,
@@ -164,17 +167,46 @@ async def build_snapshot_payload(
         return None
 
 
+def _index_snapshot_resources_by_vmid(
+    cluster_resources: list[dict[str, object]] | None,
+) -> dict[str, list[tuple[str | None, str | None]]]:
+    """Map each VMID to its ``(node, cluster)`` candidates in one resource pass."""
+    index: dict[str, list[tuple[str | None, str | None]]] = {}
+    for cluster in cluster_resources or []:
+        if not isinstance(cluster, dict):
+            continue
+        cluster_items = list(cluster.items())
+        if not cluster_items:
+            continue
+        cluster_key, resources = cluster_items[0]
+        if not isinstance(resources, list):
+            continue
+        for resource in resources:
+            if not isinstance(resource, dict):
+                continue
+            vmid_key = normalize_vmid(resource.get("vmid"))
+            if vmid_key is not None:
+                index.setdefault(vmid_key, []).append((resource.get("node"), cluster_key))
+    return index
+
+
 def _resolve_snapshot_node_from_resources(
     vmid: int,
     cluster_resources: list[dict[str, object]] | None,
     cluster_name: str | None = None,
+    *,
+    resource_index: dict[str, list[tuple[str | None, str | None]]] | None = None,
 ) -> tuple[str | None, str | None]:
     """Resolve node and cluster from cluster resource listings."""
     if not cluster_resources:
         return None, None
 
     vmid_key = normalize_vmid(vmid)
-    candidates = _snapshot_node_candidates_for_vmid(cluster_resources, vmid_key)
+    candidates = (
+        list(resource_index.get(vmid_key, ()))
+        if resource_index is not None
+        else _snapshot_node_candidates_for_vmid(cluster_resources, vmid_key)
+    )
     if not candidates:
         return None, None
     if cluster_name:
@@ -281,12 +313,14 @@ def _resolve_snapshot_node_context(
     cluster_resources: list[dict[str, object]] | None,
     *,
     require_unique_match: bool = False,
+    resource_index: dict[str, list[tuple[str | None, str | None]]] | None = None,
 ) -> tuple[str | None, str | None]:
     """Resolve the node and cluster name for a VM snapshot sync."""
     node_name, resource_cluster_name = _resolve_snapshot_node_from_resources(
         vmid,
         cluster_resources,
         cluster_name=cluster_name,
+        resource_index=resource_index,
     )
     resolved_cluster_name = resource_cluster_name or cluster_name
     if node_name:
@@ -307,14 +341,22 @@ async def _collect_snapshot_payloads_for_vm(
     vmid: int,
     netbox_vm_id: int,
     fetch_semaphore: asyncio.Semaphore,
-    storage_record: dict | None,
+    storage_record_loader: Callable[[], Awaitable[dict | None]],
 ) -> tuple[list[dict], set[str], bool]:
-    """Return payloads, names, and whether every intended Proxmox read succeeded."""
+    """Return payloads, names, and whether every intended Proxmox read succeeded.
+
+    The storage record costs a NetBox request, so it is only loaded once the
+    VM turns out to have at least one real snapshot.
+    """
     snapshot_payloads: list[dict] = []
     proxmox_snapshot_names: set[str] = set()
 
+    limiter = get_proxmox_request_limiter()
+
     async def _fetch_snapshots_for_endpoint(proxmox: object) -> list[dict[str, object]]:
-        async with fetch_semaphore:
+        # Wait for the node slot before taking a global fetch slot so VMs
+        # queued behind a slow node never hold capacity other nodes could use.
+        async with limiter.slot(getattr(proxmox, "name", None), node_name), fetch_semaphore:
             result = get_vm_snapshots(
                 session=proxmox,
                 node=node_name,
@@ -341,6 +383,8 @@ async def _collect_snapshot_payloads_for_vm(
         len(pxs),
         len(snapshot_results),
     )
+    storage_record: dict | None = None
+    storage_record_loaded = False
     for result in snapshot_results:
         if isinstance(result, Exception):
             logger.warning(
@@ -362,6 +406,9 @@ async def _collect_snapshot_payloads_for_vm(
                 )
                 continue
             proxmox_snapshot_names.add(snap_name)
+            if not storage_record_loaded:
+                storage_record = await storage_record_loader()
+                storage_record_loaded = True
             payload = await build_snapshot_payload(
                 snapshot,
                 vmid,
@@ -376,27 +423,38 @@ async def _collect_snapshot_payloads_for_vm(
     return snapshot_payloads, proxmox_snapshot_names, collection_complete
 
 
-async def _sync_single_vm_snapshots(  # noqa: C901
+@dataclass(frozen=True)
+class _SnapshotFetchTarget:
+    """A NetBox VM whose node and owning session(s) are already resolved."""
+
+    vm_name: str
+    vmid: int
+    netbox_vm_id: int
+    node_name: str
+    cluster_name: str | None
+    proxmox_type: str
+    sessions: tuple[object, ...]
+
+    @property
+    def node_key(self) -> tuple[tuple[object, ...], str]:
+        return tuple(getattr(px, "name", None) for px in self.sessions), self.node_name
+
+
+async def _plan_vm_snapshot_fetch(
     vm: object,
-    nb,
+    *,
     pxs: list,
     cluster_status: list | None,
     cluster_resources: list[dict[str, object]] | None,
+    resource_index: dict[str, list[tuple[str | None, str | None]]],
     node: str | None,
-    storage_index: dict,
-    fetch_semaphore: asyncio.Semaphore,
-    tag_refs: list[dict],
     use_websocket: bool,
     websocket: object | None,
     undefined_html: str,
-    completed_html: str,
     failed_html: str,
     explicitly_selected: bool,
-) -> tuple[list[dict], set[str], bool]:
-    """Return payloads, names, and a proven-complete discovery coverage flag."""
-    snapshot_payloads: list[dict] = []
-    proxmox_snapshot_names: set[str] = set()
-
+) -> _SnapshotFetchTarget | None:
+    """Resolve where a VM's snapshots live, or ``None`` when that is not provable."""
     vm_data = to_mapping(vm)
     vmid = extract_proxmox_vmid(vm_data)
     vm_name = vm_data.get("name", "unknown")
@@ -409,7 +467,7 @@ async def _sync_single_vm_snapshots(  # noqa: C901
         vm_cluster_name = str(cluster.get("name") or "").strip() or None
 
     if not vmid:
-        return ([], set(), False)
+        return None
 
     if use_websocket and websocket:
         await websocket.send_json(
@@ -435,6 +493,7 @@ async def _sync_single_vm_snapshots(  # noqa: C901
             cluster_status,
             cluster_resources,
             require_unique_match=explicitly_selected,
+            resource_index=resource_index,
         )
 
         logger.debug(
@@ -465,14 +524,7 @@ async def _sync_single_vm_snapshots(  # noqa: C901
                         },
                     }
                 )
-            return ([], set(), False)
-
-        storage_record = await _resolve_snapshot_storage_record(
-            nb,
-            vm_id=int(netbox_vm_id),
-            cluster_name=cluster_name,
-            storage_index=storage_index,
-        )
+            return None
 
         effective_pxs = _snapshot_sessions_for_vm(
             pxs,
@@ -489,30 +541,20 @@ async def _sync_single_vm_snapshots(  # noqa: C901
                 vmid,
                 endpoint_id,
             )
-            return ([], set(), False)
+            return None
 
-        (
-            snapshot_payloads,
-            proxmox_snapshot_names,
-            collection_complete,
-        ) = await _collect_snapshot_payloads_for_vm(
-            effective_pxs,
+        return _SnapshotFetchTarget(
+            vm_name=str(vm_name),
+            vmid=int(vmid),
+            netbox_vm_id=int(netbox_vm_id),
             node_name=node_name,
+            cluster_name=cluster_name,
             proxmox_type=proxmox_type,
-            vmid=vmid,
-            netbox_vm_id=netbox_vm_id,
-            fetch_semaphore=fetch_semaphore,
-            storage_record=storage_record,
+            sessions=tuple(effective_pxs),
         )
 
-        if not collection_complete:
-            logger.warning(
-                "Snapshot discovery was incomplete for VM %s (vmid=%s); stale cleanup is disabled",
-                vm_name,
-                vmid,
-            )
-            return snapshot_payloads, proxmox_snapshot_names, False
-
+    except Exception as e:
+        logger.error(f"Error syncing snapshots for VM {vm_name} ({vmid}): {e}")
         if use_websocket and websocket:
             await websocket.send_json(
                 {
@@ -520,18 +562,54 @@ async def _sync_single_vm_snapshots(  # noqa: C901
                     "type": "sync",
                     "data": {
                         "completed": True,
+                        "error": str(e),
                         "name": vm_name,
-                        "netbox_id": netbox_vm_id,
-                        "snapshots_found": len(proxmox_snapshot_names),
-                        "sync_status": completed_html,
+                        "sync_status": failed_html,
                     },
                 }
             )
+        return None
+
+
+async def _collect_vm_snapshots(
+    target: _SnapshotFetchTarget,
+    *,
+    nb,
+    storage_index: dict,
+    fetch_semaphore: asyncio.Semaphore,
+    netbox_semaphore: asyncio.Semaphore,
+    use_websocket: bool,
+    websocket: object | None,
+    completed_html: str,
+    failed_html: str,
+) -> tuple[list[dict], set[str], bool]:
+    """Return payloads, names, and a proven-complete discovery coverage flag."""
 
-        return snapshot_payloads, proxmox_snapshot_names, True
+    async def _load_storage_record() -> dict | None:
+        async with netbox_semaphore:
+            return await _resolve_snapshot_storage_record(
+                nb,
+                vm_id=target.netbox_vm_id,
+                cluster_name=target.cluster_name,
+                storage_index=storage_index,
+            )
 
+    try:
+        (
+            snapshot_payloads,
+            proxmox_snapshot_names,
+            collection_complete,
+        ) = await _collect_snapshot_payloads_for_vm(
+            list(target.sessions),
+            node_name=target.node_name,
+            proxmox_type=target.proxmox_type,
+            vmid=target.vmid,
+            netbox_vm_id=target.netbox_vm_id,
+            fetch_semaphore=fetch_semaphore,
+            storage_record_loader=_load_storage_record,
+        )
     except Exception as e:
-        logger.error(f"Error syncing snapshots for VM {vm_name} ({vmid}): {e}")
+        logger.error(f"Error syncing snapshots for VM {target.vm_name} ({target.vmid}): {e}")
         if use_websocket and websocket:
             await websocket.send_json(
                 {
@@ -540,13 +618,37 @@ async def _sync_single_vm_snapshots(  # noqa: C901
                     "data": {
                         "completed": True,
                         "error": str(e),
-                        "name": vm_name,
+                        "name": target.vm_name,
                         "sync_status": failed_html,
                     },
                 }
             )
+        return [], set(), False
+
+    if not collection_complete:
+        logger.warning(
+            "Snapshot discovery was incomplete for VM %s (vmid=%s); stale cleanup is disabled",
+            target.vm_name,
+            target.vmid,
+        )
+        return snapshot_payloads, proxmox_snapshot_names, False
+
+    if use_websocket and websocket:
+        await websocket.send_json(
+            {
+                "object": "snapshot",
+                "type": "sync",
+                "data": {
+                    "completed": True,
+                    "name": target.vm_name,
+                    "netbox_id": target.netbox_vm_id,
+                    "snapshots_found": len(proxmox_snapshot_names),
+                    "sync_status": completed_html,
+                },
+            }
+        )
 
-        return (snapshot_payloads, proxmox_snapshot_names, False)
+    return snapshot_payloads, proxmox_snapshot_names, True
 
 
 def _normalize_snapshot_vm_type(proxmox_type: object) -> str:
@@ -723,32 +825,63 @@ async def create_virtual_machine_snapshots(  # noqa: C901
         )
 
     fetch_semaphore = asyncio.Semaphore(fetch_max_concurrency or _resolve_fetch_concurrency())
-    vm_sync_semaphore = asyncio.Semaphore(_resolve_vm_sync_concurrency())
-
-    async def _sync_vm_with_semaphore(
-        vm: object,
-    ) -> tuple[list[dict[str, object]], set[str], bool]:
-        async with vm_sync_semaphore:
-            return await _sync_single_vm_snapshots(
-                vm=vm,
-                nb=nb,
-                pxs=pxs,
-                cluster_status=cluster_status,
-                cluster_resources=cluster_resources,
-                node=node,
-                storage_index=storage_index,
-                fetch_semaphore=fetch_semaphore,
-                tag_refs=tag_refs,
-                use_websocket=use_websocket,
-                websocket=websocket,
-                undefined_html=undefined_html,
-                completed_html=completed_html,
-                failed_html=failed_html,
-                explicitly_selected=netbox_vm_ids is not None,
-            )
+    netbox_semaphore = asyncio.Semaphore(_resolve_vm_sync_concurrency())
+    resource_index = _index_snapshot_resources_by_vmid(cluster_resources)
+
+    # Resolve every VM's node once up front, then collect per (endpoint, node)
+    # so each node's requests queue on that node's limiter slot.
+    plans = [
+        await _plan_vm_snapshot_fetch(
+            vm,
+            pxs=pxs,
+            cluster_status=cluster_status,
+            cluster_resources=cluster_resources,
+            resource_index=resource_index,
+            node=node,
+            use_websocket=use_websocket,
+            websocket=websocket,
+            undefined_html=undefined_html,
+            failed_html=failed_html,
+            explicitly_selected=netbox_vm_ids is not None,
+        )
+        for vm in vms
+    ]
+    node_groups: dict[tuple[tuple[object, ...], str], list[int]] = {}
+    for index, plan in enumerate(plans):
+        if plan is not None:
+            node_groups.setdefault(plan.node_key, []).append(index)
+
+    results: list[tuple[list[dict], set[str], bool] | BaseException] = [
+        ([], set(), False) for _ in vms
+    ]
 
-    sync_tasks = [_sync_vm_with_semaphore(vm) for vm in vms]
-    results = await asyncio.gather(*sync_tasks, return_exceptions=True)
+    async def _collect_node_group(indexes: list[int]) -> None:
+        group_results = await asyncio.gather(
+            *(
+                _collect_vm_snapshots(
+                    plans[index],
+                    nb=nb,
+                    storage_index=storage_index,
+                    fetch_semaphore=fetch_semaphore,
+                    netbox_semaphore=netbox_semaphore,
+                    use_websocket=use_websocket,
+                    websocket=websocket,
+                    completed_html=completed_html,
+                    failed_html=failed_html,
+                )
+                for index in indexes
+            ),
+            return_exceptions=True,
+        )
+        for index, group_result in zip(indexes, group_results):
+            results[index] = group_result
+
+    logger.info(
+        "Collecting snapshots for %d VM(s) across %d node(s)",
+        sum(len(indexes) for indexes in node_groups.values()),
+        len(node_groups),
+    )
+    await asyncio.gather(*(_collect_node_group(indexes) for indexes in node_groups.values()))
 
     # Collect all snapshot payloads from all VMs, emit per-VM item_progress
     all_snapshot_payloads: list[dict] = []
@@ -822,6 +955,7 @@ async def create_virtual_machine_snapshots(  # noqa: C901
                     "node": record.get("node"),
                     "virtual_machine": _extract_fk_id(record.get("virtual_machine")),
                 },
+                keyed_engine=True,
             )
             created = reconcile_result.created
             updated = reconcile_result.updated
@@ -4,6 +4,13 @@ Archived task rows are collected once per selected Proxmox node, associated to
 NetBox VMs in memory, and reconciled in one bounded NetBox operation.  This is
 deliberately different from the live-task API: archive rows already contain
 their terminal status and therefore require no per-UPID status requests.
+
+With ``task_history_incremental`` enabled, the unscoped sync keeps a persisted
+high-water mark per ``(endpoint, node)`` and only asks each node for tasks
+started since that mark, minus ``task_history_cursor_overlap_seconds`` so
+long-running tasks that finished after the previous run are still picked up.
+VMs that are new to a scope are backfilled once from the full archive with a
+``vmid`` filter. UPID dedupe and the repeated-page guards stay in place.
 """
 
 from __future__ import annotations
@@ -14,11 +21,12 @@ from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from proxbox_api.database import TaskArchiveCursor, async_session_factory
 from proxbox_api.exception import ProxboxException
 from proxbox_api.logger import logger
 from proxbox_api.netbox_rest import RestRecord, rest_bulk_reconcile_async, rest_list_async
 from proxbox_api.proxmox_to_netbox.models import NetBoxTaskHistorySyncState
-from proxbox_api.runtime_settings import get_int
+from proxbox_api.runtime_settings import get_bool, get_int
 from proxbox_api.services.custom_fields import custom_fields_enabled, warn_legacy_custom_fields
 from proxbox_api.services.proxmox_helpers import dump_models, get_node_tasks
 from proxbox_api.services.sync._helpers import _extract_fk_id, _normalize_text
@@ -37,6 +45,9 @@ from proxbox_api.services.sync.vmid_helpers import (
 
 _TASK_ARCHIVE_PAGE_SIZE = 500
 _TASK_HISTORY_PATH = "/api/plugins/proxbox/task-history/"
+# Beyond this many newly seen VMIDs a node is cheaper to walk in full than to
+# backfill one filtered archive walk per VM.
+_ARCHIVE_BACKFILL_MAX_VMIDS = 16
 
 
 def _resolve_fetch_concurrency() -> int:
@@ -48,6 +59,24 @@ def _resolve_fetch_concurrency() -> int:
     )
 
 
+def _resolve_incremental_archive() -> bool:
+    return get_bool(
+        settings_key="task_history_incremental",
+        env="PROXBOX_TASK_HISTORY_INCREMENTAL",
+        default=False,
+    )
+
+
+def _resolve_cursor_overlap_seconds() -> int:
+    return get_int(
+        settings_key="task_history_cursor_overlap_seconds",
+        env="PROXBOX_TASK_HISTORY_CURSOR_OVERLAP_SECONDS",
+        default=86_400,
+        minimum=0,
+        maximum=30 * 86_400,
+    )
+
+
 _TASK_HISTORY_PATCHABLE_FIELDS = frozenset(
     {
         # Identity corrections are intentional: a historic UPID associated to
@@ -90,6 +119,13 @@ class _ArchiveResult:
     successful_request: bool
 
 
+@dataclass(frozen=True)
+class _ArchiveCursor:
+    last_starttime: int
+    last_upid: str | None
+    covered_vmids: frozenset[int]
+
+
 @dataclass(frozen=True)
 class _ArchiveSelection:
     nodes: tuple[_ArchiveNode, ...]
@@ -556,8 +592,10 @@ async def _fetch_node_archive(
     semaphore: asyncio.Semaphore,
     until: int,
     vmid: int | None = None,
+    since: int | None = None,
 ) -> _ArchiveResult:
     collected: list[dict[str, object]] = []
+    window = {"since": since} if since is not None else {}
     seen_upids: set[str] = set()
     seen_pages: set[tuple[str, ...]] = set()
     offset = 0
@@ -575,6 +613,8 @@ async def _fetch_node_archive(
                     start=offset,
                     limit=_TASK_ARCHIVE_PAGE_SIZE,
                     until=until,
+                    raw=True,
+                    **window,
                 )
                 if inspect.isawaitable(raw):
                     raw = await raw
@@ -636,6 +676,141 @@ async def _fetch_node_archive(
     )
 
 
+def _cursor_key(source: _ArchiveNode) -> tuple[str, str]:
+    if source.endpoint_id is not None:
+        return f"endpoint:{source.endpoint_id}", source.node_name
+    return f"cluster:{source.cluster_name}", source.node_name
+
+
+def _scope_vmids(source: _ArchiveNode, targets: Sequence[_VMTarget]) -> frozenset[int]:
+    """VMIDs whose tasks an archive walk of ``source`` can attribute to a target."""
+    return frozenset(
+        target.vmid
+        for target in targets
+        if target.cluster_name == source.cluster_name
+        and target.endpoint_id in (None, source.endpoint_id)
+    )
+
+
+async def _load_archive_cursors() -> dict[tuple[str, str], _ArchiveCursor] | None:
+    try:
+        async with async_session_factory() as session:
+            rows = await TaskArchiveCursor.load_all_async(session)
+    except asyncio.CancelledError:
+        raise
+    except Exception as error:
+        logger.warning("Task archive cursors are unavailable; walking full archives: %s", error)
+        return None
+    return {
+        (row.scope, row.node): _ArchiveCursor(
+            last_starttime=row.last_starttime,
+            last_upid=row.last_upid,
+            covered_vmids=frozenset(int(vmid) for vmid in row.covered_vmids or ()),
+        )
+        for row in rows
+    }
+
+
+async def _save_archive_cursors(cursors: dict[tuple[str, str], _ArchiveCursor]) -> None:
+    if not cursors:
+        return
+    rows = [
+        TaskArchiveCursor(
+            scope=scope,
+            node=node,
+            last_starttime=cursor.last_starttime,
+            last_upid=cursor.last_upid,
+            covered_vmids=sorted(cursor.covered_vmids),
+        )
+        for (scope, node), cursor in cursors.items()
+    ]
+    try:
+        async with async_session_factory() as session:
+            await TaskArchiveCursor.upsert_many_async(session, rows)
+    except asyncio.CancelledError:
+        raise
+    except Exception as error:
+        # The next run simply re-reads from the previous mark.
+        logger.warning("Unable to persist task archive cursors: %s", error)
+
+
+async def _fetch_node_archive_since_cursor(
+    source: _ArchiveNode,
+    *,
+    semaphore: asyncio.Semaphore,
+    until: int,
+    cursor: _ArchiveCursor,
+    scope_vmids: frozenset[int],
+    overlap_seconds: int,
+) -> _ArchiveResult:
+    """Read the archive window after ``cursor`` plus full history for new VMs."""
+    backfill = sorted(scope_vmids - cursor.covered_vmids)
+    if len(backfill) > _ARCHIVE_BACKFILL_MAX_VMIDS:
+        return await _fetch_node_archive(source, semaphore=semaphore, until=until)
+    since = cursor.last_starttime - overlap_seconds
+    results = await asyncio.gather(
+        _fetch_node_archive(
+            source,
+            semaphore=semaphore,
+            until=until,
+            since=since if since > 0 else None,
+        ),
+        *(
+            _fetch_node_archive(source, semaphore=semaphore, until=until, vmid=vmid)
+            for vmid in backfill
+        ),
+    )
+    collected: list[dict[str, object]] = []
+    seen_upids: set[str] = set()
+    for result in results:
+        _append_unique_archive_tasks(
+            list(result.tasks),
+            node_name=source.node_name,
+            seen_upids=seen_upids,
+            collected=collected,
+        )
+    return _ArchiveResult(
+        source=source,
+        tasks=tuple(collected),
+        errors=sum(result.errors for result in results),
+        successful_request=any(result.successful_request for result in results),
+    )
+
+
+def _advance_archive_cursors(
+    archive_results: Sequence[_ArchiveResult | BaseException],
+    cursors: dict[tuple[str, str], _ArchiveCursor],
+    targets: Sequence[_VMTarget],
+    eligible: set[tuple[str, str]],
+) -> dict[tuple[str, str], _ArchiveCursor]:
+    """Move each cleanly collected node's mark to its newest archived task."""
+    advanced: dict[tuple[str, str], _ArchiveCursor] = {}
+    for archive_result in archive_results:
+        if (
+            isinstance(archive_result, BaseException)
+            or archive_result.errors
+            or not archive_result.successful_request
+        ):
+            continue
+        key = _cursor_key(archive_result.source)
+        if key not in eligible:
+            continue
+        previous = cursors.get(key)
+        last_starttime = previous.last_starttime if previous is not None else 0
+        last_upid = previous.last_upid if previous is not None else None
+        for task in archive_result.tasks:
+            starttime = normalize_positive_int(task.get("starttime")) or 0
+            if starttime > last_starttime:
+                last_starttime = starttime
+                last_upid = _normalize_text(task.get("upid"))
+        advanced[key] = _ArchiveCursor(
+            last_starttime=last_starttime,
+            last_upid=last_upid,
+            covered_vmids=_scope_vmids(archive_result.source, targets),
+        )
+    return advanced
+
+
 async def _reconcile_task_payloads(
     nb: object,
     payloads: list[dict[str, object]],
@@ -829,17 +1004,53 @@ async def sync_all_virtual_machine_task_histories(  # noqa: C901
         name for name, scopes in cluster_source_scopes.items() if len(scopes) == 1
     }
 
+    # Selected-VM runs only attribute tasks of their own targets, so they
+    # must neither read nor advance the shared per-node marks.
+    cursors = (
+        await _load_archive_cursors()
+        if netbox_vm_ids is None and _resolve_incremental_archive()
+        else None
+    )
+    cursor_eligible = (
+        {
+            _cursor_key(node)
+            for node in nodes
+            if node.endpoint_id is not None or node.cluster_name in legacy_safe_clusters
+        }
+        if cursors is not None
+        else set()
+    )
+    overlap_seconds = _resolve_cursor_overlap_seconds()
+
     until = int(datetime.now(timezone.utc).timestamp())
     semaphore = asyncio.Semaphore(
         fetch_max_concurrency if fetch_max_concurrency is not None else _resolve_fetch_concurrency()
     )
+
+    def _collect(node: _ArchiveNode):
+        key = _cursor_key(node)
+        cursor = cursors.get(key) if cursors is not None and key in cursor_eligible else None
+        if cursor is None:
+            return _fetch_node_archive(node, semaphore=semaphore, until=until)
+        return _fetch_node_archive_since_cursor(
+            node,
+            semaphore=semaphore,
+            until=until,
+            cursor=cursor,
+            scope_vmids=_scope_vmids(node, targets),
+            overlap_seconds=overlap_seconds,
+        )
+
     archive_results = await asyncio.gather(
-        *(_fetch_node_archive(node, semaphore=semaphore, until=until) for node in nodes),
+        *(_collect(node) for node in nodes),
         return_exceptions=True,
     )
 
     successful_nodes = 0
     errors = len(selection.missing_scopes)
+    # Rows skipped for ownership conflicts must be re-read once the conflict
+    # is fixed in NetBox, so any such skip holds every cursor in place.
+    ownership_errors = 0
     observations: dict[str, list[tuple[_VMTarget, dict[str, object]]]] = {}
     for archive_result in archive_results:
         if isinstance(archive_result, asyncio.CancelledError):
@@ -859,6 +1070,7 @@ async def sync_all_virtual_machine_task_histories(  # noqa: C901
                 continue
             if (archive_result.source.cluster_name, task_vmid) in mixed_identity_collisions:
                 errors += 1
+                ownership_errors += 1
                 skipped += 1
                 logger.warning(
                     "Skipping task UPID %s because an endpoint-scoped VM and an "
@@ -893,6 +1105,7 @@ async def sync_all_virtual_machine_task_histories(  # noqa: C901
                         ownership_ambiguous = True
             if ownership_ambiguous:
                 errors += 1
+                ownership_errors += 1
                 skipped += 1
                 logger.warning(
                     "Skipping task UPID %s because VM ownership is ambiguous for "
@@ -923,6 +1136,7 @@ async def sync_all_virtual_machine_task_histories(  # noqa: C901
         owners = {observation[0].netbox_id for observation in upid_observations}
         if len(owners) != 1:
             errors += 1
+            ownership_errors += 1
             skipped += 1
             logger.warning(
                 "Skipping task UPID %s because it maps to multiple VM owners: %s",
@@ -970,6 +1184,11 @@ async def sync_all_virtual_machine_task_histories(  # noqa: C901
             http_status_code=502,
         ) from error
 
+    if cursors is not None and not ownership_errors:
+        await _save_archive_cursors(
+            _advance_archive_cursors(archive_results, cursors, targets, cursor_eligible)
+        )
+
     result: dict[str, object] = {
         "count": len(targets),
         "created": reconciled,
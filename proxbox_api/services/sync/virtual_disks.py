@@ -18,6 +18,10 @@ from proxbox_api.proxmox_to_netbox.models import NetBoxVirtualDiskSyncState, Pro
 from proxbox_api.runtime_settings import get_int
 from proxbox_api.services.custom_fields import legacy_custom_fields_payload
 from proxbox_api.services.proxmox.config import resolve_vm_config
+from proxbox_api.services.sync.reconciliation.keyed import (
+    KeyedReconcileSpec,
+    reconcile_keyed_collection,
+)
 from proxbox_api.services.sync.storage_links import (
     build_storage_index,
     find_storage_record,
@@ -222,33 +226,29 @@ async def _delete_stale_virtual_disks(
         "/api/virtualization/virtual-disks/",
         query={"virtual_machine_id": vm_id, "limit": 500},
     )
-    stale_ids: list[int] = []
-    desired_names = set(desired_disks)
-    desired_records: dict[str, list[tuple[int, int]]] = {}
+    current: list[dict[str, object]] = []
     for record in existing_disks:
         data = to_mapping(record)
         name = str(data.get("name") or "").strip()
         record_id = relation_id(data.get("id"))
         if not name or record_id is None:
             continue
-        if name not in desired_names:
-            stale_ids.append(record_id)
-            continue
         try:
             size = int(data.get("size") or 0)
         except (TypeError, ValueError):
             size = 0
-        desired_records.setdefault(name, []).append((record_id, size))
-
-    for name, records in desired_records.items():
-        if len(records) <= 1:
-            continue
-        desired_size = desired_disks[name]
-        keep_id = next(
-            (record_id for record_id, size in records if size == desired_size),
-            records[0][0],
-        )
-        stale_ids.extend(record_id for record_id, _size in records if record_id != keep_id)
+        current.append({"id": record_id, "name": name, "size": size})
+
+    # Among duplicate names the first record survives, so sort the one whose
+    # size matches Proxmox to the front of its group (the sort is stable).
+    current.sort(key=lambda disk: disk["size"] != desired_disks.get(str(disk["name"])))
+    plan = reconcile_keyed_collection(
+        KeyedReconcileSpec(key_fields=("name",), delete_missing=True),
+        [{"name": name} for name in desired_disks],
+        current,
+        collection="virtual-disks",
+    )
+    stale_ids = [int(current[index]["id"]) for index in plan.delete]
 
     if not stale_ids:
         return 0
@@ -575,6 +575,7 @@ async def _sync_virtual_disks_for_vm(
                 lookup_query_field_map={"virtual_machine": "virtual_machine_id"},
                 strict_lookup=True,
                 nullable_fields={"storage"},
+                keyed_engine=True,
             )
             disks_created = bulk_result.created
             disks_updated = bulk_result.updated
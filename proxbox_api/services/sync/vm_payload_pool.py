@@ -0,0 +1,164 @@
+"""Process-pool offload for the CPU-bound VM desired-payload preparation stage.
+
+Building the desired NetBox VM payload (``ProxmoxVmConfigInput`` validation,
+the ``proxmox_to_netbox`` transform, net config parsing and normalization) is
+pure CPU work. ``asyncio.to_thread`` keeps it off the event loop but still
+serializes it on the GIL, so on large clusters the full-update prepare phase
+grows linearly with VM count. This module batches that work into a
+``ProcessPoolExecutor`` when ``vm_prepare_process_workers`` is greater than 0.
+
+Jobs and results are plain picklable dataclasses: every NetBox lookup
+(device, role, VM type, tags) is resolved on the event loop before a job is
+built, so worker processes never touch a session, cache or settings client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from proxbox_api.logger import logger
+from proxbox_api.proxmox_to_netbox.models import ProxmoxVmConfigInput
+from proxbox_api.runtime_settings import get_int
+from proxbox_api.services.sync.virtual_machines import build_netbox_virtual_machine_payload
+
+
+@dataclass(slots=True)
+class VMPayloadJob:
+    """Picklable input for one VM payload build.
+
+    ``payload_kwargs`` holds every keyword argument of
+    :func:`build_netbox_virtual_machine_payload` except the raw Proxmox
+    resource and config, which are carried separately.
+    """
+
+    resource: dict[str, object]
+    vm_config: dict[str, object]
+    payload_kwargs: dict[str, object] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class VMPayloadResult:
+    """Picklable output for one VM payload build.
+
+    ``error`` is set instead of raising so a single bad VM config does not
+    abort the rest of its batch.
+    """
+
+    vm_config_obj: ProxmoxVmConfigInput | None = None
+    desired_payload: dict[str, object] | None = None
+    error: str | None = None
+
+
+def resolve_vm_prepare_process_workers() -> int:
+    """Worker processes for VM payload preparation (0 keeps the in-process path)."""
+    return get_int(
+        settings_key="vm_prepare_process_workers",
+        env="PROXBOX_VM_PREPARE_PROCESS_WORKERS",
+        default=0,
+        minimum=0,
+        maximum=64,
+    )
+
+
+def resolve_vm_prepare_batch_size() -> int:
+    """Number of VM payload jobs shipped to a worker process per task."""
+    return get_int(
+        settings_key="vm_prepare_batch_size",
+        env="PROXBOX_VM_PREPARE_BATCH_SIZE",
+        default=16,
+        minimum=1,
+    )
+
+
+def prepare_vm_payload(job: VMPayloadJob) -> VMPayloadResult:
+    """Validate the VM config and build its desired NetBox payload."""
+    try:
+        vm_config_obj = ProxmoxVmConfigInput.model_validate(job.vm_config)
+        desired_payload = build_netbox_virtual_machine_payload(
+            proxmox_resource=job.resource,
+            proxmox_config=job.vm_config,
+            **job.payload_kwargs,
+        )
+    except Exception as error:  # noqa: BLE001
+        return VMPayloadResult(error=f"{type(error).__name__}: {error}")
+    return VMPayloadResult(
+        vm_config_obj=vm_config_obj,
+        desired_payload=dict(desired_payload),
+    )
+
+
+def prepare_vm_payload_batch(jobs: list[VMPayloadJob]) -> list[VMPayloadResult]:
+    """Worker entry point: prepare a batch of jobs, preserving order."""
+    return [prepare_vm_payload(job) for job in jobs]
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool, recreating it when the worker count changes."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            # ``spawn`` avoids forking an interpreter that owns a running event
+            # loop, open sockets and SQLite connections.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_workers = workers
+            logger.info("Started VM payload preparation pool: workers=%d", workers)
+        return _pool
+
+
+def shutdown_vm_payload_pool(*, wait: bool = True) -> None:
+    """Stop the shared preparation pool (called from the app lifespan)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+async def run_vm_payload_jobs(
+    jobs: list[VMPayloadJob],
+    *,
+    workers: int | None = None,
+    batch_size: int | None = None,
+) -> list[VMPayloadResult]:
+    """Prepare ``jobs`` and return one result per job, in input order.
+
+    With ``workers`` of 0 the batch runs in a single ``asyncio.to_thread``
+    call. Otherwise jobs are chunked by ``batch_size`` and fanned out across
+    the shared process pool. A broken pool (for example a worker killed by
+    the OOM killer) is discarded and the batch is retried in-process.
+    """
+    if not jobs:
+        return []
+    workers = resolve_vm_prepare_process_workers() if workers is None else workers
+    if workers <= 0:
+        return await asyncio.to_thread(prepare_vm_payload_batch, jobs)
+
+    size = max(1, resolve_vm_prepare_batch_size() if batch_size is None else batch_size)
+    chunks = [jobs[index : index + size] for index in range(0, len(jobs), size)]
+    loop = asyncio.get_running_loop()
+    try:
+        pool = _get_pool(workers)
+        chunk_results = await asyncio.gather(
+            *[loop.run_in_executor(pool, prepare_vm_payload_batch, chunk) for chunk in chunks]
+        )
+    except BrokenProcessPool as error:
+        logger.warning("VM payload preparation pool failed, falling back to in-process: %s", error)
+        shutdown_vm_payload_pool(wait=False)
+        return await asyncio.to_thread(prepare_vm_payload_batch, jobs)
+    return [result for chunk in chunk_results for result in chunk]
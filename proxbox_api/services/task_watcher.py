@@ -0,0 +1,324 @@
+"""Shared polling of Proxmox task status and log lines.
+
+Streams and wait helpers that follow a Proxmox task subscribe here instead of
+running their own ``while True`` loops. Each ``(endpoint, node, UPID)`` has at
+most one poller per event loop, whatever the number of subscribers (several UI
+tabs on one migration, a provisioning wait and its SSE stream, ...). The poller
+fans every status change out to all subscribers. When a subscriber asks for
+the log, it reads only the lines past the last seen offset.
+
+The interval is adaptive. It starts at ``task_watch_min_interval_ms``, grows
+by half on every poll that saw no change, up to
+``task_watch_max_interval_ms``, and drops back to the minimum as soon as the
+status, progress or log moves. The poller stops when the task finishes, on the
+first status error, or when its last subscriber leaves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from proxbox_api.logger import logger
+from proxbox_api.runtime_settings import get_int
+from proxbox_api.services.proxmox_helpers import get_node_task_log, get_node_task_status
+
+TaskKey = tuple[str, str, str]
+StatusFetcher = Callable[[object, str, str], Awaitable[object] | object]
+
+_LOG_PAGE_SIZE = 500
+_MAX_BUFFERED_LOG_LINES = 2_000
+
+
+def _resolve_min_interval_seconds() -> float:
+    return (
+        get_int(
+            settings_key="task_watch_min_interval_ms",
+            env="PROXBOX_TASK_WATCH_MIN_INTERVAL_MS",
+            default=1_000,
+            minimum=100,
+            maximum=60_000,
+        )
+        / 1000
+    )
+
+
+def _resolve_max_interval_seconds() -> float:
+    return (
+        get_int(
+            settings_key="task_watch_max_interval_ms",
+            env="PROXBOX_TASK_WATCH_MAX_INTERVAL_MS",
+            default=5_000,
+            minimum=100,
+            maximum=300_000,
+        )
+        / 1000
+    )
+
+
+def _field(payload: object, name: str) -> object:
+    if isinstance(payload, dict):
+        return payload.get(name)
+    return getattr(payload, name, None)
+
+
+@dataclass(frozen=True, slots=True)
+class TaskUpdate:
+    """One observation of a task, with the log lines that are new to the subscriber."""
+
+    status: str | None
+    exitstatus: str | None
+    progress: object = None
+    log_lines: tuple[dict[str, object], ...] = ()
+    error: Exception | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.error is not None or self.status == "stopped"
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and self.status == "stopped" and self.exitstatus in (None, "OK")
+
+
+class TaskSubscription:
+    """Async iterator over one subscriber's task updates; ends after the final one."""
+
+    def __init__(self, queue: asyncio.Queue[TaskUpdate]) -> None:
+        self._queue = queue
+        self._done = False
+
+    def __aiter__(self) -> TaskSubscription:
+        return self
+
+    async def __anext__(self) -> TaskUpdate:
+        if self._done:
+            raise StopAsyncIteration
+        return await self.next()
+
+    async def next(self) -> TaskUpdate:
+        update = await self._queue.get()
+        if update.finished:
+            self._done = True
+        return update
+
+
+class _WatchedTask:
+    def __init__(
+        self,
+        key: TaskKey,
+        session: object,
+        node: str,
+        upid: str,
+        status_fetcher: StatusFetcher,
+    ) -> None:
+        self.key = key
+        self.session = session
+        self.node = node
+        self.upid = upid
+        self.status_fetcher = status_fetcher
+        self.subscribers: dict[asyncio.Queue[TaskUpdate], bool] = {}
+        self.latest: TaskUpdate | None = None
+        self.log: deque[dict[str, object]] = deque(maxlen=_MAX_BUFFERED_LOG_LINES)
+        self.log_offset = 0
+        self.polls = 0
+        self.poller: asyncio.Task[None] | None = None
+
+    @property
+    def wants_log(self) -> bool:
+        return any(self.subscribers.values())
+
+    def publish(self, update: TaskUpdate) -> None:
+        self.latest = update
+        for queue, include_log in self.subscribers.items():
+            if include_log or not update.log_lines:
+                queue.put_nowait(update)
+            else:
+                queue.put_nowait(
+                    TaskUpdate(
+                        status=update.status,
+                        exitstatus=update.exitstatus,
+                        progress=update.progress,
+                        error=update.error,
+                    )
+                )
+
+    async def fetch_status(self) -> object:
+        result = self.status_fetcher(self.session, self.node, self.upid)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def fetch_new_log_lines(self) -> tuple[dict[str, object], ...]:
+        new_lines: list[dict[str, object]] = []
+        while True:
+            try:
+                page = get_node_task_log(
+                    self.session,
+                    self.node,
+                    self.upid,
+                    start=self.log_offset,
+                    limit=_LOG_PAGE_SIZE,
+                )
+                if inspect.isawaitable(page):
+                    page = await page
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                # The log is best effort; status still drives the subscribers.
+                logger.debug("Task log read failed for %s: %s", self.upid, error)
+                break
+            lines = [dict(line) for line in page or []]
+            new_lines.extend(lines)
+            self.log_offset += len(lines)
+            if len(lines) < _LOG_PAGE_SIZE:
+                break
+        self.log.extend(new_lines)
+        return tuple(new_lines)
+
+    async def run(self) -> None:
+        min_interval = _resolve_min_interval_seconds()
+        max_interval = max(min_interval, _resolve_max_interval_seconds())
+        interval = min_interval
+        previous: tuple[object, ...] | None = None
+        while self.subscribers:
+            self.polls += 1
+            try:
+                payload = await self.fetch_status()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self.publish(TaskUpdate(status=None, exitstatus=None, error=error))
+                return
+            status = _field(payload, "status")
+            update = TaskUpdate(
+                status=str(status) if status is not None else None,
+                exitstatus=_field(payload, "exitstatus"),
+                progress=_field(payload, "progress"),
+                log_lines=await self.fetch_new_log_lines() if self.wants_log else (),
+            )
+            self.publish(update)
+            if update.finished:
+                return
+            observed = (update.status, update.progress, self.log_offset)
+            interval = min_interval if observed != previous else min(interval * 1.5, max_interval)
+            previous = observed
+            await asyncio.sleep(interval)
+
+
+class TaskWatcher:
+    """Event-loop-local registry of shared task pollers."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[TaskKey, _WatchedTask] = {}
+
+    @staticmethod
+    def key(session: object, node: str, upid: str, endpoint_key: object = None) -> TaskKey:
+        if endpoint_key is None:
+            endpoint_key = getattr(session, "db_endpoint_id", None) or getattr(
+                session, "name", None
+            )
+        if endpoint_key is None:
+            endpoint_key = f"session:{id(session)}"
+        return str(endpoint_key), str(node), str(upid)
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        session: object,
+        node: str,
+        upid: str,
+        *,
+        endpoint_key: object = None,
+        include_log: bool = False,
+        status_fetcher: StatusFetcher | None = None,
+    ) -> AsyncIterator[TaskSubscription]:
+        """Follow a task; the poller is shared with every other subscriber of it."""
+        key = self.key(session, node, upid, endpoint_key)
+        watched = self._tasks.get(key)
+        if watched is None or (watched.poller is not None and watched.poller.done()):
+            watched = _WatchedTask(key, session, node, upid, status_fetcher or get_node_task_status)
+            self._tasks[key] = watched
+        queue: asyncio.Queue[TaskUpdate] = asyncio.Queue()
+        if watched.latest is not None:
+            latest = watched.latest
+            queue.put_nowait(
+                TaskUpdate(
+                    status=latest.status,
+                    exitstatus=latest.exitstatus,
+                    progress=latest.progress,
+                    log_lines=tuple(watched.log) if include_log else (),
+                    error=latest.error,
+                )
+            )
+        watched.subscribers[queue] = include_log
+        if watched.poller is None:
+            watched.poller = asyncio.create_task(watched.run())
+        try:
+            yield TaskSubscription(queue)
+        finally:
+            watched.subscribers.pop(queue, None)
+            if not watched.subscribers:
+                if watched.poller is not None and not watched.poller.done():
+                    watched.poller.cancel()
+                if self._tasks.get(key) is watched:
+                    self._tasks.pop(key, None)
+
+    async def wait(
+        self,
+        session: object,
+        node: str,
+        upid: str,
+        *,
+        endpoint_key: object = None,
+        status_fetcher: StatusFetcher | None = None,
+    ) -> TaskUpdate:
+        """Return the final update of a task."""
+        async with self.subscribe(
+            session,
+            node,
+            upid,
+            endpoint_key=endpoint_key,
+            status_fetcher=status_fetcher,
+        ) as subscription:
+            update = await subscription.next()
+            while not update.finished:
+                update = await subscription.next()
+            return update
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "tasks": [
+                {
+                    "endpoint": watched.key[0],
+                    "node": watched.key[1],
+                    "upid": watched.key[2],
+                    "subscribers": len(watched.subscribers),
+                    "polls": watched.polls,
+                    "log_offset": watched.log_offset,
+                }
+                for watched in self._tasks.values()
+            ]
+        }
+
+
+_watchers: dict[asyncio.AbstractEventLoop, TaskWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_task_watcher() -> TaskWatcher:
+    """Return the task watcher bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _watchers_lock:
+        for stale_loop in [known for known in _watchers if known.is_closed()]:
+            _watchers.pop(stale_loop, None)
+        watcher = _watchers.get(loop)
+        if watcher is None:
+            watcher = TaskWatcher()
+            _watchers[loop] = watcher
+        return watcher
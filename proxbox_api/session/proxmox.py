@@ -12,6 +12,7 @@ from proxbox_api.session.proxmox_providers import (
     close_proxmox_sessions,
     load_proxmox_session_schemas,
     proxmox_sessions,
+    release_proxmox_session,
     resolve_proxmox_target_session,
 )
 
@@ -68,5 +69,6 @@ __all__ = (
     "close_proxmox_sessions",
     "load_proxmox_session_schemas",
     "proxmox_sessions",
+    "release_proxmox_session",
     "resolve_proxmox_target_session",
 )
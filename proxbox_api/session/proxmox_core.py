@@ -90,6 +90,8 @@ class ProxmoxSession:
         self.tenant_slug: str | None = None
         self.tenant_name: str | None = None
         self.db_endpoint_id: int | None = None
+        # Set while the session is owned by the process-wide session pool.
+        self.pooled = False
 
         if cluster_config is not None:
             try:
@@ -469,7 +471,13 @@ class ProxmoxSession:
             ) from error
 
     async def aclose(self) -> None:
-        """Async close for session cleanup."""
+        """Async close for session cleanup.
+
+        A no-op for pooled sessions, which are shared between requests and
+        closed by the pool on eviction.
+        """
+        if getattr(self, "pooled", False):
+            return
         sdk_session = getattr(self, "session", None)
         if sdk_session is not None and hasattr(sdk_session, "close"):
             close_result = sdk_session.close()
@@ -0,0 +1,275 @@
+"""Process-wide pool of authenticated Proxmox sessions.
+
+``ProxmoxSession.create`` authenticates, probes ``/version`` and reads cluster
+status and node fingerprints, so building one per endpoint per request makes
+every small plugin UI call pay TLS setup plus ticket auth against every
+cluster. The pool keeps one live session per endpoint and credential
+fingerprint and lends it to request dependencies instead.
+
+Entries are:
+
+* **health checked** with a ``/version`` probe when lent out more than
+  ``proxmox_session_health_check_seconds`` after the last probe; a failed probe
+  rebuilds them;
+* **renewed** after ``proxmox_session_ticket_max_age_seconds`` when they use
+  password (ticket) auth, before Proxmox's two-hour ticket lifetime runs out;
+* **evicted** once unborrowed for ``proxmox_session_pool_idle_seconds``;
+* **invalidated** when the backing ``ProxmoxEndpoint`` row changes.
+
+SDK clients hold an ``aiohttp`` session bound to the loop that created them,
+so there is one pool per event loop. Pooled sessions ignore ``aclose()``;
+only the pool closes them, after the last borrower has released them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+
+from proxbox_api.logger import logger
+from proxbox_api.proxmox_async import resolve_async
+from proxbox_api.runtime_settings import get_bool, get_int
+from proxbox_api.schemas.proxmox import ProxmoxSessionSchema
+from proxbox_api.session.proxmox_core import ProxmoxSession
+
+PoolKey = tuple[object, str]
+
+
+def proxmox_session_pool_enabled() -> bool:
+    """Whether request dependencies borrow pooled sessions (default on)."""
+    return get_bool(
+        settings_key="proxmox_session_pool_enabled",
+        env="PROXBOX_PROXMOX_SESSION_POOL_ENABLED",
+        default=True,
+    )
+
+
+def _resolve_idle_seconds() -> int:
+    return get_int(
+        settings_key="proxmox_session_pool_idle_seconds",
+        env="PROXBOX_PROXMOX_SESSION_POOL_IDLE_SECONDS",
+        default=300,
+        minimum=1,
+    )
+
+
+def _resolve_health_check_seconds() -> int:
+    return get_int(
+        settings_key="proxmox_session_health_check_seconds",
+        env="PROXBOX_PROXMOX_SESSION_HEALTH_CHECK_SECONDS",
+        default=60,
+        minimum=0,
+    )
+
+
+def _resolve_ticket_max_age_seconds() -> int:
+    return get_int(
+        settings_key="proxmox_session_ticket_max_age_seconds",
+        env="PROXBOX_PROXMOX_SESSION_TICKET_MAX_AGE_SECONDS",
+        default=5400,
+        minimum=60,
+        maximum=7000,
+    )
+
+
+def credential_fingerprint(schema: ProxmoxSessionSchema) -> str:
+    """Digest every connection-relevant field, secrets included, without storing them."""
+    return hashlib.sha256(schema.model_dump_json().encode()).hexdigest()
+
+
+def pool_key(schema: ProxmoxSessionSchema) -> PoolKey:
+    """Key a schema by endpoint identity plus credential fingerprint."""
+    identity = schema.db_endpoint_id
+    if identity is None:
+        identity = (schema.domain, schema.ip_address, schema.http_port, schema.name)
+    return identity, credential_fingerprint(schema)
+
+
+@dataclass(slots=True)
+class _PoolEntry:
+    key: PoolKey
+    session: ProxmoxSession
+    uses_ticket: bool
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    last_checked: float = field(default_factory=time.monotonic)
+    borrowers: int = 0
+    retired: bool = False
+
+
+async def _close_session(session: ProxmoxSession) -> None:
+    session.pooled = False
+    try:
+        await session.aclose()
+    except Exception as error:  # pragma: no cover - defensive
+        logger.debug("Failed to close pooled Proxmox session: %s", error)
+
+
+class ProxmoxSessionPool:
+    """Lend authenticated ``ProxmoxSession`` objects keyed by endpoint and credentials."""
+
+    def __init__(self) -> None:
+        self._entries: dict[PoolKey, _PoolEntry] = {}
+        self._by_session: dict[int, _PoolEntry] = {}
+        self._key_locks: dict[PoolKey, asyncio.Lock] = {}
+        self.created_total = 0
+        self.reused_total = 0
+        self.evicted_total = 0
+        self.health_failures_total = 0
+
+    async def acquire(self, schema: ProxmoxSessionSchema) -> ProxmoxSession:
+        """Borrow a session for ``schema``, creating or renewing it as needed."""
+        await self.evict_idle()
+        key = pool_key(schema)
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and not await self._is_usable(entry):
+                await self._retire(entry)
+                entry = None
+            if entry is None:
+                session = await ProxmoxSession.create(schema)
+                session.pooled = True
+                entry = _PoolEntry(
+                    key=key,
+                    session=session,
+                    uses_ticket=not (session.token_name and session._get_token_value()),
+                )
+                self._entries[key] = entry
+                self._by_session[id(session)] = entry
+                self.created_total += 1
+            else:
+                self.reused_total += 1
+            entry.borrowers += 1
+            entry.last_used = time.monotonic()
+            return entry.session
+
+    async def release(self, session: ProxmoxSession) -> None:
+        """Return a borrowed session; retired entries close with their last borrower."""
+        entry = self._by_session.get(id(session))
+        if entry is None or entry.session is not session:
+            return
+        entry.borrowers = max(0, entry.borrowers - 1)
+        entry.last_used = time.monotonic()
+        if entry.retired and entry.borrowers == 0:
+            self._by_session.pop(id(session), None)
+            await _close_session(session)
+
+    def owns(self, session: object) -> bool:
+        entry = self._by_session.get(id(session))
+        return entry is not None and entry.session is session
+
+    async def _is_usable(self, entry: _PoolEntry) -> bool:
+        now = time.monotonic()
+        if not entry.session.CONNECTED or entry.session.session is None:
+            return False
+        if entry.uses_ticket and now - entry.created_at >= _resolve_ticket_max_age_seconds():
+            logger.info("Renewing Proxmox ticket session for %s", entry.session.name)
+            return False
+        if now - entry.last_checked < _resolve_health_check_seconds():
+            return True
+        try:
+            await resolve_async(entry.session.session.version.get())
+        except Exception as error:
+            self.health_failures_total += 1
+            logger.warning(
+                "Pooled Proxmox session for %s failed its health check; reconnecting: %s",
+                entry.session.name,
+                error,
+            )
+            return False
+        entry.last_checked = now
+        return True
+
+    async def _retire(self, entry: _PoolEntry) -> None:
+        if self._entries.get(entry.key) is entry:
+            self._entries.pop(entry.key, None)
+        entry.retired = True
+        if entry.borrowers == 0:
+            self._by_session.pop(id(entry.session), None)
+            await _close_session(entry.session)
+
+    async def evict_idle(self) -> int:
+        """Close unborrowed sessions idle for longer than the configured TTL."""
+        cutoff = time.monotonic() - _resolve_idle_seconds()
+        idle = [
+            entry
+            for entry in self._entries.values()
+            if entry.borrowers == 0 and entry.last_used < cutoff
+        ]
+        for entry in idle:
+            await self._retire(entry)
+        self.evicted_total += len(idle)
+        return len(idle)
+
+    async def invalidate(self, endpoint_id: int | None = None) -> int:
+        """Retire sessions for ``endpoint_id`` (all sessions when ``None``)."""
+        matched = [
+            entry
+            for entry in self._entries.values()
+            if endpoint_id is None or entry.key[0] == endpoint_id
+        ]
+        for entry in matched:
+            await self._retire(entry)
+        return len(matched)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sessions": len(self._entries),
+            "borrowed": sum(1 for entry in self._entries.values() if entry.borrowers),
+            "created_total": self.created_total,
+            "reused_total": self.reused_total,
+            "evicted_total": self.evicted_total,
+            "health_failures_total": self.health_failures_total,
+        }
+
+
+_pools: dict[asyncio.AbstractEventLoop, ProxmoxSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_proxmox_session_pool() -> ProxmoxSessionPool:
+    """Return the pool bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        for stale_loop in [known for known in _pools if known.is_closed()]:
+            _pools.pop(stale_loop, None)
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = ProxmoxSessionPool()
+            _pools[loop] = pool
+        return pool
+
+
+async def invalidate_proxmox_sessions(endpoint_id: int | None = None) -> int:
+    """Retire pooled sessions for an endpoint after its row changed.
+
+    Pools on other running event loops are invalidated on their own loop, since
+    only that loop may close their sessions; the returned count covers the
+    current loop's pool.
+    """
+    current_loop = asyncio.get_running_loop()
+    with _pools_lock:
+        others = [
+            (loop, pool)
+            for loop, pool in _pools.items()
+            if loop is not current_loop and loop.is_running()
+        ]
+    for loop, pool in others:
+        asyncio.run_coroutine_threadsafe(pool.invalidate(endpoint_id), loop)
+    return await get_proxmox_session_pool().invalidate(endpoint_id)
+
+
+async def shutdown_proxmox_session_pool() -> None:
+    """Close every session in the running loop's pool (called from the app lifespan)."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.pop(loop, None)
+    if pool is None:
+        return
+    for entry in list(pool._entries.values()):
+        entry.borrowers = 0
+        await pool._retire(entry)
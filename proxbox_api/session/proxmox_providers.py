@@ -19,6 +19,10 @@ from proxbox_api.netbox_rest import rest_list_async
 from proxbox_api.schemas.proxmox import ProxmoxSessionSchema, ProxmoxTokenSchema
 from proxbox_api.session.netbox import get_netbox_async_session
 from proxbox_api.session.proxmox_core import ProxmoxSession
+from proxbox_api.session.proxmox_pool import (
+    get_proxmox_session_pool,
+    proxmox_session_pool_enabled,
+)
 from proxbox_api.settings_client import (
     get_default_settings,
     get_settings,
@@ -142,7 +146,7 @@ async def proxmox_sessions(  # noqa: C901
     async def return_single_session(field: str, value: str) -> list[ProxmoxSession]:
         for proxmox_schema in proxmox_schemas:
             if value == getattr(proxmox_schema, field, None):
-                session = await ProxmoxSession.create(proxmox_schema)
+                session = await _open_session(proxmox_schema)
                 return [session]
 
         raise ProxboxException(
@@ -164,7 +168,7 @@ async def proxmox_sessions(  # noqa: C901
 
     try:
         sessions = await asyncio.gather(
-            *[ProxmoxSession.create(px_schema) for px_schema in proxmox_schemas]
+            *[_open_session(px_schema) for px_schema in proxmox_schemas]
         )
         return list(sessions)
     except Exception as error:
@@ -173,6 +177,14 @@ async def proxmox_sessions(  # noqa: C901
         )
 
 
+async def _open_session(proxmox_schema: ProxmoxSessionSchema) -> ProxmoxSession:
+    """Borrow a pooled session, or create a private one when pooling is disabled."""
+
+    if proxmox_session_pool_enabled():
+        return await get_proxmox_session_pool().acquire(proxmox_schema)
+    return await ProxmoxSession.create(proxmox_schema)
+
+
 async def proxmox_sessions_dep(
     sessions: Annotated[list[ProxmoxSession], Depends(proxmox_sessions)],
 ):
@@ -180,12 +192,27 @@ async def proxmox_sessions_dep(
         yield sessions
     finally:
         for session in sessions:
-            close_method = getattr(session, "aclose", None)
-            if callable(close_method):
-                try:
-                    await close_method()
-                except Exception as error:  # pragma: no cover
-                    logger.debug("Failed to clean up proxmox session: %s", error)
+            await release_proxmox_session(session)
+
+
+async def release_proxmox_session(session: object) -> None:
+    """Return a pooled session to the pool, or close a private one.
+
+    Call once per session obtained from :func:`proxmox_sessions` or
+    :func:`resolve_proxmox_target_session`.
+    """
+    if session is None:
+        return
+    pool = get_proxmox_session_pool()
+    if pool.owns(session):
+        await pool.release(session)  # type: ignore[arg-type]
+        return
+    close_method = getattr(session, "aclose", None)
+    if callable(close_method):
+        try:
+            await close_method()
+        except Exception as error:  # pragma: no cover
+            logger.debug("Failed to clean up proxmox session: %s", error)
 
 
 async def close_proxmox_sessions(pxs: list[ProxmoxSession]) -> None:
@@ -193,7 +220,8 @@ async def close_proxmox_sessions(pxs: list[ProxmoxSession]) -> None:
 
     This helper is used by routes that receive ``pxs`` from dependency injection
     and want explicit teardown at the end of execution. It is idempotent and
-    tolerates already-closed sessions.
+    tolerates already-closed sessions. Pooled sessions ignore it; the
+    dependency returns them to the pool.
     """
     for session in pxs:
         close_method = getattr(session, "aclose", None)
@@ -564,7 +592,7 @@ async def resolve_proxmox_target_session(
             continue
         for proxmox_schema in proxmox_schemas:
             if value == getattr(proxmox_schema, field, None):
-                return await ProxmoxSession.create(proxmox_schema)
+                return await _open_session(proxmox_schema)
         raise ProxboxException(
             message=f"No result found for Proxmox Sessions based on the provided {field}",
             detail="Check if the provided parameters are correct",
@@ -582,4 +610,4 @@ async def resolve_proxmox_target_session(
             detail="Generated Proxmox proxy routes require an explicit target when more than one endpoint is configured.",
         )
 
-    return await ProxmoxSession.create(proxmox_schemas[0])
+    return await _open_session(proxmox_schemas[0])
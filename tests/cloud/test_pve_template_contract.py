@@ -14,10 +14,10 @@ ROOT = Path(__file__).resolve().parents[2]
 
 
 def test_cloud_pve_template_build_route_registered() -> None:
-    factory = (ROOT / "proxbox_api/app/factory.py").read_text()
+    manifest = (ROOT / "proxbox_api/app/router_manifest.py").read_text()
     init = (ROOT / "proxbox_api/routes/cloud/__init__.py").read_text()
     assert "pve_template_router" in init
-    assert "cloud_pve_template_router" in factory
+    assert '"proxbox_api.routes.cloud.pve_template"' in manifest
 
 
 def test_cloud_pve_template_build_route_source_shape() -> None:
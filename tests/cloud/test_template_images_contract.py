@@ -8,10 +8,10 @@ ROOT = Path(__file__).resolve().parents[2]
 
 
 def test_cloud_template_image_build_route_registered() -> None:
-    factory = (ROOT / "proxbox_api/app/factory.py").read_text()
+    manifest = (ROOT / "proxbox_api/app/router_manifest.py").read_text()
     init = (ROOT / "proxbox_api/routes/cloud/__init__.py").read_text()
     assert "template_images_router" in init
-    assert "cloud_template_images_router" in factory
+    assert '"proxbox_api.routes.cloud.template_images"' in manifest
 
 
 def test_cloud_template_image_build_route_creates_bootable_cloudinit_template() -> None:
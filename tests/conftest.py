@@ -24,6 +24,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from proxbox_api.auth import verified_key_cache
 from proxbox_api.database import get_async_session, get_session
 from proxbox_api.main import app
 from proxbox_api.netbox_rest import _reset_netbox_globals
@@ -32,6 +33,8 @@ from proxbox_api.routes.proxmox.runtime_generated import (
     clear_generated_proxmox_routes,
 )
 from proxbox_api.services.custom_fields import invalidate_custom_fields_cache
+from proxbox_api.services.guest_agent_cache import guest_agent_cache
+from proxbox_api.services.proxmox.cluster_cache import cluster_cache
 from proxbox_api.services.sync.sync_state_reader import (
     reset_sidecar_reader_availability_cache,
 )
@@ -116,6 +119,9 @@ def reset_fastapi_state():
     app.openapi_schema = None
     _reset_netbox_globals()
     invalidate_custom_fields_cache()
+    guest_agent_cache.clear()
+    cluster_cache.clear()
+    verified_key_cache.clear()
     invalidate_settings_cache()
     reset_sidecar_reader_availability_cache()
     yield
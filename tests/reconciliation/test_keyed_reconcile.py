@@ -0,0 +1,173 @@
+"""Tests for the generic keyed-collection reconcile and its engine dispatch."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from proxbox_api import runtime_settings
+from proxbox_api.services.sync import virtual_disks
+from proxbox_api.services.sync.reconciliation import keyed
+from proxbox_api.services.sync.reconciliation.keyed import (
+    KeyedReconcileSpec,
+    KeyedUpdate,
+    reconcile_keyed_collection,
+    reconcile_keyed_collection_python,
+)
+from proxbox_api.services.sync.reconciliation.metrics import (
+    get_reconciliation_metrics,
+    reset_reconciliation_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def _python_engine(monkeypatch):
+    monkeypatch.setattr(runtime_settings, "_load_settings", lambda: None)
+    monkeypatch.setattr(keyed, "_rust_reconcile_keyed", None)
+    reset_reconciliation_metrics()
+
+
+def _use_engine(monkeypatch, engine: str, *, strict: bool = False) -> None:
+    monkeypatch.setattr(
+        runtime_settings,
+        "_load_settings",
+        lambda: {"reconciliation_engine": engine, "reconciliation_compare_strict": strict},
+    )
+
+
+def _native_plan(plan: dict[str, object]):
+    def fake_native(input_bytes: bytes) -> bytes:
+        json.loads(input_bytes)
+        return json.dumps(
+            {"create": [], "update": [], "unchanged": [], "delete": [], **plan}
+        ).encode()
+
+    return fake_native
+
+
+def test_python_plan_splits_create_update_and_unchanged() -> None:
+    plan = reconcile_keyed_collection_python(
+        KeyedReconcileSpec(key_fields=("virtual_machine", "name")),
+        [
+            {"virtual_machine": 1, "name": "scsi0", "size": 10},
+            {"virtual_machine": 1, "name": "scsi1", "size": 20},
+            {"virtual_machine": 1, "name": "scsi2", "size": 30},
+        ],
+        [
+            {"virtual_machine": 1.0, "name": "scsi1", "size": 25},
+            {"virtual_machine": 1, "name": "scsi2", "size": 30.0},
+        ],
+    )
+
+    assert plan.create == [0]
+    assert plan.update == [KeyedUpdate(desired_index=1, current_index=0, patch={"size": 20})]
+    assert plan.unchanged == [(2, 1)]
+    assert plan.delete == []
+
+
+def test_python_plan_applies_nullable_and_patchable_fields() -> None:
+    plan = reconcile_keyed_collection_python(
+        KeyedReconcileSpec(
+            key_fields=("name",),
+            patchable_fields=frozenset({"storage", "size"}),
+            nullable_fields=frozenset({"storage"}),
+        ),
+        [{"name": "a", "size": 1, "description": "new"}],
+        [{"name": "a", "size": 1, "storage": 4, "description": "old"}],
+    )
+
+    assert plan.update == [KeyedUpdate(0, 0, {"storage": None})]
+
+
+def test_python_plan_deletes_unmatched_and_duplicate_current_records() -> None:
+    plan = reconcile_keyed_collection_python(
+        KeyedReconcileSpec(key_fields=("name",), delete_missing=True),
+        [{"name": "a"}, {"name": "a"}, {"name": ""}],
+        [{"name": "a"}, {"name": "b"}, {"name": "a"}, {"name": None}],
+    )
+
+    assert plan.delete == [1, 2]
+    assert plan.duplicate_desired == [1]
+    assert plan.unchanged == [(0, 0)]
+
+
+def test_rust_engine_requires_the_extension(monkeypatch) -> None:
+    _use_engine(monkeypatch, "rust")
+
+    with pytest.raises(RuntimeError, match="reconcile_keyed_collection_json"):
+        reconcile_keyed_collection(KeyedReconcileSpec(key_fields=("name",)), [{"name": "a"}], [])
+
+
+def test_rust_engine_decodes_native_plan(monkeypatch) -> None:
+    _use_engine(monkeypatch, "rust")
+    monkeypatch.setattr(
+        keyed,
+        "_rust_reconcile_keyed",
+        _native_plan({"update": [{"desired_index": 0, "current_index": 0, "patch": {"size": 2}}]}),
+    )
+
+    plan = reconcile_keyed_collection(
+        KeyedReconcileSpec(key_fields=("name",)),
+        [{"name": "a", "size": 2}],
+        [{"name": "a", "size": 1}],
+    )
+
+    assert plan.update == [KeyedUpdate(0, 0, {"size": 2})]
+
+
+def test_compare_mode_returns_python_plan_and_counts_mismatch(monkeypatch) -> None:
+    _use_engine(monkeypatch, "compare")
+    monkeypatch.setattr(keyed, "_rust_reconcile_keyed", _native_plan({"create": [0]}))
+
+    plan = reconcile_keyed_collection(
+        KeyedReconcileSpec(key_fields=("name",)),
+        [{"name": "a"}],
+        [{"name": "a"}],
+        collection="snapshots",
+    )
+
+    assert plan.unchanged == [(0, 0)]
+    metrics = get_reconciliation_metrics()
+    assert metrics["proxbox_reconcile_mismatch_total"] == 1
+    assert metrics["proxbox_reconcile_compare_fallback_total"] == {"mismatch": 1}
+
+
+def test_compare_mode_strict_raises_on_mismatch(monkeypatch) -> None:
+    _use_engine(monkeypatch, "compare", strict=True)
+    monkeypatch.setattr(keyed, "_rust_reconcile_keyed", _native_plan({"create": [0]}))
+
+    with pytest.raises(AssertionError, match="keyed reconcile mismatch"):
+        reconcile_keyed_collection(
+            KeyedReconcileSpec(key_fields=("name",)), [{"name": "a"}], [{"name": "a"}]
+        )
+
+
+def test_stale_disk_cleanup_keeps_the_duplicate_matching_proxmox_size(monkeypatch) -> None:
+    existing = [
+        {"id": 1, "name": "scsi0", "size": 10},
+        {"id": 2, "name": "scsi0", "size": 32},
+        {"id": 3, "name": "scsi1", "size": 8},
+        {"id": 4, "name": "old", "size": 8},
+    ]
+    deleted: list[int] = []
+
+    async def fake_list(nb, path, query=None):
+        return existing
+
+    async def fake_delete(nb, path, ids):
+        deleted.extend(ids)
+        return len(ids)
+
+    monkeypatch.setattr(virtual_disks, "rest_list_async", fake_list)
+    monkeypatch.setattr(virtual_disks, "rest_bulk_delete_async", fake_delete)
+
+    count = asyncio.run(
+        virtual_disks._delete_stale_virtual_disks(
+            object(), vm_id=7, desired_disks={"scsi0": 32, "scsi1": 8}
+        )
+    )
+
+    assert count == 2
+    assert deleted == [1, 4]
@@ -0,0 +1,145 @@
+"""Tests for batch VM normalizers and their pure-Python fallback."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from proxbox_api import runtime_settings
+from proxbox_api.services.sync.reconciliation import normalize, vm_queue
+from proxbox_api.services.sync.reconciliation.normalize import (
+    extract_vm_snapshot_identities_native,
+    normalize_current_vm_payloads,
+    normalize_desired_vm_payloads,
+)
+from proxbox_api.services.sync.reconciliation.vm_queue import build_vm_snapshot_identity_indexes
+from tests.reconciliation.test_vm_queue_python import _snapshot_vm
+
+
+@pytest.fixture(autouse=True)
+def _python_fallback(monkeypatch):
+    monkeypatch.setattr(runtime_settings, "_load_settings", lambda: None)
+    monkeypatch.setattr(normalize, "_rust_normalize_current", None)
+    monkeypatch.setattr(normalize, "_rust_normalize_desired", None)
+    monkeypatch.setattr(normalize, "_rust_extract_identities", None)
+
+
+def test_current_fallback_matches_engine_diff_shape() -> None:
+    [normalized] = normalize_current_vm_payloads(
+        [
+            {
+                "name": "qemu-100",
+                "status": {"value": "active", "label": "Active"},
+                "cluster": {"id": 1},
+                "device": {"id": "10"},
+                "site": None,
+                "role": {"value": 20},
+                "virtual_machine_type": {"id": 55},
+                "vcpus": 2.0,
+                "memory": "2048",
+                "tags": [{"id": 99}, 3, "3", {"id": None}],
+                "custom_fields": {"proxmox_vm_id": 100},
+                "description": None,
+            }
+        ],
+        supports_virtual_machine_type_field=False,
+    )
+
+    assert normalized == {
+        "name": "qemu-100",
+        "status": "active",
+        "cluster": 1,
+        "device": 10,
+        "role": 20,
+        "vcpus": 2,
+        "memory": 2048,
+        "disk": 0,
+        "tags": [3, 99],
+        "custom_fields": {"proxmox_vm_id": 100},
+    }
+
+
+def test_desired_fallback_maps_proxmox_status_and_keeps_vm_type() -> None:
+    normalized = normalize_desired_vm_payloads(
+        [
+            {"name": "a", "status": "stopped", "virtual_machine_type": 7},
+            {"name": "b", "status": "planned", "cluster": 0, "vcpus": True},
+        ]
+    )
+
+    assert normalized[0]["status"] == "offline"
+    assert normalized[0]["virtual_machine_type"] == 7
+    assert normalized[1]["status"] == "planned"
+    assert "cluster" not in normalized[1]
+    assert normalized[1]["vcpus"] == 0
+
+
+def test_native_batch_functions_are_used_when_available(monkeypatch) -> None:
+    calls: list[tuple[list[object], bool]] = []
+
+    def fake_native(input_bytes: bytes, supports_vm_type: bool) -> bytes:
+        records = json.loads(input_bytes)
+        calls.append((records, supports_vm_type))
+        return json.dumps([{"name": record["name"]} for record in records]).encode()
+
+    monkeypatch.setattr(normalize, "_rust_normalize_current", fake_native)
+
+    result = normalize_current_vm_payloads(
+        [{"name": "a"}, {"name": "b"}],
+        supports_virtual_machine_type_field=False,
+    )
+
+    assert result == [{"name": "a"}, {"name": "b"}]
+    assert calls == [([{"name": "a"}, {"name": "b"}], False)]
+
+
+def test_native_identities_are_none_without_extension() -> None:
+    assert extract_vm_snapshot_identities_native([_snapshot_vm()]) is None
+
+
+def test_snapshot_index_uses_native_identities_for_rust_engines(monkeypatch) -> None:
+    monkeypatch.setattr(
+        runtime_settings,
+        "_load_settings",
+        lambda: {"reconciliation_engine": "rust"},
+    )
+    monkeypatch.setattr(normalize, "_rust_normalize_current", lambda data, flag: b"[]")
+    monkeypatch.setattr(normalize, "_rust_normalize_desired", lambda data, flag: b"[]")
+    monkeypatch.setattr(
+        normalize,
+        "_rust_extract_identities",
+        lambda data: json.dumps(
+            [{"endpoint_id": 500, "cluster_id": 1, "proxmox_vmid": 100, "vm_type": "qemu"}]
+        ).encode(),
+    )
+    monkeypatch.setattr(
+        vm_queue,
+        "_snapshot_identity",
+        lambda record: pytest.fail("python identity extraction should not run"),
+    )
+    record = _snapshot_vm()
+
+    endpoint_typed, endpoint_untyped, cluster_typed, cluster_untyped = (
+        build_vm_snapshot_identity_indexes([record])
+    )
+
+    assert endpoint_typed == {(500, 100, "qemu"): record}
+    assert endpoint_untyped == {(500, 100): [record]}
+    assert cluster_typed == {(1, 100, "qemu"): record}
+    assert cluster_untyped == {(1, 100): [record]}
+
+
+def test_snapshot_index_python_path_matches_native_identity_shape() -> None:
+    typed = _snapshot_vm(record_id=1, vmid=100, vm_type="qemu")
+    untyped = _snapshot_vm(record_id=2, vmid=101, vm_type=None)
+    no_vmid = _snapshot_vm(record_id=3, vmid=None)
+
+    endpoint_typed, endpoint_untyped, cluster_typed, cluster_untyped = (
+        build_vm_snapshot_identity_indexes([typed, untyped, no_vmid])
+    )
+
+    assert endpoint_typed == {(500, 100, "qemu"): typed}
+    assert endpoint_untyped == {(500, 100): [typed], (500, 101): [untyped]}
+    assert set(cluster_typed) == {(1, 100, "qemu")}
+    assert set(cluster_untyped) == {(1, 100), (1, 101)}
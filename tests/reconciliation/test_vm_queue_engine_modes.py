@@ -226,3 +226,67 @@ def test_reconciliation_mismatch_metric_is_exposed_through_cache_metrics() -> No
 
     assert json_metrics["proxbox_reconcile_mismatch_total"] == 1
     assert b"proxbox_reconcile_mismatch_total 1" in prometheus_response.body
+
+
+def test_python_mode_records_queue_composition_and_timings() -> None:
+    prepared = [_prepared_vm(vmid=100), _prepared_vm(vmid=101, cluster_name="cluster-b")]
+
+    build_vm_operation_queue(prepared, [_snapshot_vm()])
+
+    metrics = get_reconciliation_metrics()
+    assert metrics["proxbox_reconcile_runs_total"] == {"python": 1}
+    assert metrics["proxbox_reconcile_last_run_operations"] == {"GET": 1, "CREATE": 1, "UPDATE": 0}
+    assert metrics["proxbox_reconcile_operations_total"] == {
+        "cluster-a": {"GET": 1},
+        "cluster-b": {"CREATE": 1},
+    }
+    durations = metrics["proxbox_reconcile_durations"]
+    assert durations["proxbox_reconcile_queue_build_seconds"]["python"]["count"] == 1
+    assert durations["proxbox_reconcile_snapshot_index_seconds"]["all"]["count"] == 1
+
+
+def test_compare_mode_records_fallback_reasons(monkeypatch) -> None:
+    monkeypatch.setattr(
+        runtime_settings,
+        "_load_settings",
+        lambda: {"reconciliation_engine": "compare"},
+    )
+    build_vm_operation_queue([_prepared_vm()], [])
+
+    def broken_rust_build(input_bytes: bytes) -> bytes:
+        raise ValueError("boom")
+
+    monkeypatch.setattr(rust_bridge, "_rust_build", broken_rust_build)
+    build_vm_operation_queue([_prepared_vm()], [])
+
+    monkeypatch.setattr(rust_bridge, "_rust_build", lambda input_bytes: _rust_output("CREATE"))
+    build_vm_operation_queue([_prepared_vm()], [_snapshot_vm()])
+
+    metrics = get_reconciliation_metrics()
+    assert metrics["proxbox_reconcile_compare_fallback_total"] == {
+        "rust_unavailable": 1,
+        "rust_error": 1,
+        "mismatch": 1,
+    }
+    durations = metrics["proxbox_reconcile_durations"]
+    assert durations["proxbox_reconcile_bridge_encode_seconds"]["all"]["count"] == 2
+    assert durations["proxbox_reconcile_bridge_decode_seconds"]["all"]["count"] == 1
+
+
+def test_reconciliation_histograms_are_exposed_in_prometheus_format(monkeypatch) -> None:
+    monkeypatch.setattr(
+        runtime_settings,
+        "_load_settings",
+        lambda: {"reconciliation_engine": "rust"},
+    )
+    monkeypatch.setattr(rust_bridge, "_rust_build", lambda input_bytes: _rust_output("UPDATE"))
+
+    build_vm_operation_queue([_prepared_vm()], [])
+
+    body = asyncio.run(get_cache_metrics_prometheus()).body.decode()
+    assert "# TYPE proxbox_reconcile_queue_build_seconds histogram" in body
+    assert 'proxbox_reconcile_queue_build_seconds_bucket{engine="rust",le="+Inf"} 1' in body
+    assert 'proxbox_reconcile_queue_build_seconds_count{engine="rust"} 1' in body
+    assert 'proxbox_reconcile_operations_total{cluster="cluster-a",method="UPDATE"} 1' in body
+    assert 'proxbox_reconcile_runs_total{engine="rust"} 1' in body
+    assert "proxbox_reconcile_bridge_decode_seconds_count 1" in body
@@ -182,3 +182,21 @@ def test_rotation_allows_old_key_deactivation_and_deletion(
     assert deleted.status_code == 204
     db_session.refresh(new_key)
     assert new_key.is_active is True
+
+
+def test_deactivated_key_is_rejected_after_cached_verification(
+    auth_test_client,
+    test_api_key: str,
+    db_session: Session,
+) -> None:
+    replacement = ApiKey.store_key(db_session, _SECOND_KEY, label="replacement")
+
+    auth_test_client.headers["X-Proxbox-API-Key"] = _SECOND_KEY
+    assert auth_test_client.get("/auth/keys").status_code == 200
+    auth_test_client.headers["X-Proxbox-API-Key"] = test_api_key
+    deactivated = auth_test_client.post(f"/auth/keys/{replacement.id}/deactivate")
+    auth_test_client.headers["X-Proxbox-API-Key"] = _SECOND_KEY
+    rejected = auth_test_client.get("/auth/keys")
+
+    assert deactivated.status_code == 200
+    assert rejected.status_code == 401
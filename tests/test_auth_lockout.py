@@ -118,3 +118,46 @@ def test_attempt_counter_persists_across_sessions(db_engine, stored_key: str) ->
         lockout = session.get(AuthLockout, CLIENT_IP)
         assert lockout is not None
         assert lockout.attempts >= 1
+
+
+def test_verified_key_cache_skips_bcrypt_on_repeat(
+    db_session: Session, stored_key: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+    original = ApiKey.verify_any_id
+
+    def counting_verify(session, key):
+        calls.append(key)
+        return original(session, key)
+
+    monkeypatch.setattr(ApiKey, "verify_any_id", staticmethod(counting_verify))
+
+    for _ in range(3):
+        assert auth.check_auth_header_with_session(db_session, stored_key, CLIENT_IP) == (
+            True,
+            None,
+        )
+    assert calls == [stored_key]
+
+    auth.check_auth_header_with_session(db_session, WRONG_KEY, CLIENT_IP)
+    auth.check_auth_header_with_session(db_session, WRONG_KEY, CLIENT_IP)
+    assert calls.count(WRONG_KEY) == 2
+
+
+def test_verified_key_cache_invalidates_by_key_id_and_honours_zero_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = auth.VerifiedKeyCache(max_entries=2)
+    cache.put("key-a", 1)
+    cache.put("key-b", 2)
+    cache.put("key-c", 3)
+    assert cache.get("key-a") is False
+    assert cache.get("key-b") is True
+
+    cache.invalidate_key(2)
+    assert cache.get("key-b") is False
+    assert cache.get("key-c") is True
+
+    monkeypatch.setenv("PROXBOX_AUTH_KEY_CACHE_TTL_SECONDS", "0")
+    cache.put("key-d", 4)
+    assert cache.get("key-d") is False
@@ -0,0 +1,72 @@
+"""Tests for the shared-storage-aware backup listing planner."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from proxbox_api.services.sync.backup_discovery import (
+    BackupStorageListing,
+    index_backups_by_vmid,
+    plan_backup_storage_listings,
+    storage_node_filter,
+)
+
+
+def _nodes(*names: str, offline: tuple[str, ...] = ()) -> list[SimpleNamespace]:
+    return [SimpleNamespace(name=name, online=name not in offline) for name in names]
+
+
+def test_shared_storage_is_listed_once_with_online_nodes_first() -> None:
+    listings = plan_backup_storage_listings(
+        [{"storage": "pbs", "type": "pbs", "content": "backup"}],
+        _nodes("pve1", "pve2", "pve3", offline=("pve1",)),
+    )
+
+    assert listings == [
+        BackupStorageListing(storage="pbs", nodes=("pve2", "pve3", "pve1"), shared=True)
+    ]
+
+
+def test_local_storage_is_listed_per_eligible_node() -> None:
+    listings = plan_backup_storage_listings(
+        [
+            {"storage": "local", "type": "dir", "content": "iso,backup", "nodes": "pve1,pve3"},
+            {"storage": "images", "type": "dir", "content": "images"},
+        ],
+        _nodes("pve1", "pve2", "pve3"),
+    )
+
+    assert [(listing.storage, listing.nodes) for listing in listings] == [
+        ("local", ("pve1",)),
+        ("local", ("pve3",)),
+    ]
+
+
+def test_explicit_shared_flag_and_node_restriction_apply_together() -> None:
+    listings = plan_backup_storage_listings(
+        [{"storage": "san", "type": "dir", "shared": 1, "content": "backup", "nodes": "pve2"}],
+        _nodes("pve1", "pve2"),
+    )
+
+    assert listings == [BackupStorageListing(storage="san", nodes=("pve2",), shared=True)]
+
+
+def test_node_filter_does_not_match_node_name_prefixes() -> None:
+    assert storage_node_filter({"nodes": "pve10,pve2"}) == frozenset({"pve10", "pve2"})
+    assert storage_node_filter({"nodes": "all"}) is None
+    assert (
+        plan_backup_storage_listings(
+            [{"storage": "local", "content": "backup", "nodes": "pve10"}], _nodes("pve1")
+        )
+        == []
+    )
+
+
+def test_index_groups_rows_by_normalized_vmid() -> None:
+    index = index_backups_by_vmid(
+        [{"vmid": 101, "volid": "a"}, {"vmid": " 101 ", "volid": "b"}, {"volid": "orphan"}]
+    )
+
+    assert {vmid: [row["volid"] for row in rows] for vmid, rows in index.items()} == {
+        "101": ["a", "b"]
+    }
@@ -761,3 +761,56 @@ async def test_estate_backup_cleanup_suppresses_ambiguous_exact_vm_owners(monkey
     assert deleted_ids == []
     completed = [message for message in messages if message.get("status") == "completed"]
     assert completed[-1]["result"]["failed_tasks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_backup_storage_is_listed_once_and_falls_back_to_next_node(monkeypatch):
+    listed_from: list[tuple[str, str]] = []
+    reconciled_payloads: list[dict] = []
+
+    async def _vm_list(_nb, path, *, query=None):
+        return [_netbox_vm(7, endpoint_id=1, cluster_name="cluster-a")]
+
+    async def _empty_storage_index(_nb):
+        return {}
+
+    async def _get_backups(_proxmox, *, node, storage, **_kwargs):
+        listed_from.append((node, storage))
+        if node == "pve-a":
+            raise RuntimeError("node busy")
+        return [
+            {
+                "content": "backup",
+                "vmid": 101,
+                "volid": f"{storage}:backup/vm/101/{node}",
+                "format": "pbs-vm",
+                "subtype": "qemu",
+            }
+        ]
+
+    async def _bulk(_nb, payloads, **_kwargs):
+        reconciled_payloads.extend(payloads)
+        return payloads, len(payloads), 0
+
+    px = SimpleNamespace(
+        db_endpoint_id=1,
+        session=SimpleNamespace(
+            storage=SimpleNamespace(
+                get=lambda: [{"storage": "pbs", "type": "pbs", "content": "backup"}]
+            )
+        ),
+    )
+    monkeypatch.setattr(backups_vm, "rest_list_async", _vm_list)
+    monkeypatch.setattr(backups_vm, "_load_storage_index", _empty_storage_index)
+    monkeypatch.setattr(backups_vm, "get_node_storage_content", _get_backups)
+    monkeypatch.setattr(backups_vm, "_bulk_reconcile_backups", _bulk)
+
+    await _create_all_virtual_machine_backups(
+        netbox_session=object(),
+        pxs=[px],
+        cluster_status=[_cluster("cluster-a", "pve-a", "pve-b", "pve-c")],
+        tag=object(),
+    )
+
+    assert listed_from == [("pve-a", "pbs"), ("pve-b", "pbs")]
+    assert [payload["virtual_machine"] for payload in reconciled_payloads] == [7]
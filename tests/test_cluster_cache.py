@@ -0,0 +1,141 @@
+"""Tests for the per-endpoint cluster status/resources cache."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import proxbox_api.routes.proxmox.cluster as cluster_module
+from proxbox_api.routes.proxmox.cluster import cluster_resources
+from proxbox_api.services.proxmox import cluster_cache as cache_module
+from proxbox_api.services.proxmox.cluster_cache import ClusterCache, resources_fingerprint
+
+
+@pytest.fixture
+def ttl(monkeypatch):
+    def _set(seconds: int) -> None:
+        monkeypatch.setattr(cache_module, "resolve_cluster_cache_ttl_seconds", lambda: seconds)
+
+    _set(5)
+    return _set
+
+
+def _resource(vmid: int, **overrides) -> dict[str, object]:
+    return {
+        "id": f"qemu/{vmid}",
+        "vmid": vmid,
+        "node": "pve01",
+        "status": "running",
+        "maxmem": 1024,
+        "type": "qemu",
+        **overrides,
+    }
+
+
+async def test_concurrent_misses_share_one_fetch_and_hits_skip_it(ttl):
+    cache = ClusterCache()
+    session = SimpleNamespace(db_endpoint_id=7, name="lab")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return [_resource(100)]
+
+    first, second = await asyncio.gather(
+        cache.get_or_fetch("resources", session, fetch),
+        cache.get_or_fetch("resources", session, fetch),
+    )
+    third = await cache.get_or_fetch("resources", session, fetch)
+
+    assert calls == 1
+    assert first == second == third
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 1, 1)
+
+
+async def test_zero_ttl_always_fetches(ttl):
+    ttl(0)
+    cache = ClusterCache()
+    session = SimpleNamespace(db_endpoint_id=7, name="lab")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return []
+
+    await cache.get_or_fetch("status", session, fetch)
+    await cache.get_or_fetch("status", session, fetch)
+
+    assert calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+async def test_failed_fetch_is_not_cached(ttl):
+    cache = ClusterCache()
+    session = SimpleNamespace(db_endpoint_id=7, name="lab")
+
+    async def broken():
+        raise RuntimeError("proxmox down")
+
+    async def working():
+        return [_resource(100)]
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("resources", session, broken)
+    assert await cache.get_or_fetch("resources", session, working) == [_resource(100)]
+
+
+def test_fingerprint_ignores_order_and_volatile_counters():
+    base = [_resource(100), _resource(101)]
+    reordered = [_resource(101, cpu=0.9, netin=5), _resource(100, uptime=99)]
+
+    assert resources_fingerprint(base) == resources_fingerprint(reordered)
+    assert resources_fingerprint(base) != resources_fingerprint(
+        [_resource(100, maxmem=2048), _resource(101)]
+    )
+
+
+async def test_unchanged_since_last_run_tracks_each_consumer(ttl):
+    cache = ClusterCache()
+    session = SimpleNamespace(db_endpoint_id=7, name="lab")
+    rows = [_resource(100)]
+
+    async def fetch():
+        return list(rows)
+
+    await cache.get_or_fetch("resources", session, fetch, fingerprint=resources_fingerprint)
+    assert cache.unchanged_since_last_run("vm-sync", session) is False
+    assert cache.unchanged_since_last_run("vm-sync", session) is True
+    assert cache.unchanged_since_last_run("disk-sync", session) is False
+
+    cache.clear()
+    rows[0] = _resource(100, status="stopped")
+    await cache.get_or_fetch("resources", session, fetch, fingerprint=resources_fingerprint)
+    assert cache.unchanged_since_last_run("vm-sync", session) is False
+
+
+def test_cluster_resources_dependency_reuses_cached_rows(monkeypatch, ttl):
+    px = SimpleNamespace(name="lab", db_endpoint_id=3)
+    calls = 0
+
+    async def fake_get(_px, resource_type=None, **_kwargs):
+        nonlocal calls
+        calls += 1
+        return [_resource(100)]
+
+    monkeypatch.setattr(cluster_module, "get_typed_cluster_resources", fake_get)
+
+    async def run_twice():
+        first = await cluster_resources(pxs=[px], type=None)
+        first[0]["lab"][0]["name"] = "mutated by a consumer"
+        return await cluster_resources(pxs=[px], type=None)
+
+    second = asyncio.run(run_twice())
+
+    assert calls == 1
+    assert second == [{"lab": [_resource(100)]}]
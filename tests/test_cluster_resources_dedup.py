@@ -36,7 +36,7 @@ def test_distinct_clusters_keep_overlapping_vmid(monkeypatch):
     px_a = SimpleNamespace(name="cluster-a")
     px_b = SimpleNamespace(name="cluster-b")
 
-    async def fake_get(_px, resource_type=None):
+    async def fake_get(_px, resource_type=None, **_kwargs):
         return [_FakeResource("qemu/100", 100)]
 
     monkeypatch.setattr(cluster_module, "get_typed_cluster_resources", fake_get)
@@ -54,7 +54,7 @@ def test_same_cluster_multiple_endpoints_dedupe(monkeypatch):
     px1 = SimpleNamespace(name="shared-cluster")
     px2 = SimpleNamespace(name="shared-cluster")
 
-    async def fake_get(_px, resource_type=None):
+    async def fake_get(_px, resource_type=None, **_kwargs):
         return [_FakeResource("qemu/100", 100), _FakeResource("lxc/101", 101)]
 
     monkeypatch.setattr(cluster_module, "get_typed_cluster_resources", fake_get)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import pickle
 import sys
 from pathlib import Path
 from types import ModuleType, SimpleNamespace
@@ -26,9 +27,12 @@ from proxbox_api.proxmox_to_netbox.proxmox_schema import (
     available_proxmox_sdk_versions,
     load_proxmox_generated_openapi,
 )
+from proxbox_api.routes.proxmox import runtime_generated
 from proxbox_api.routes.proxmox.runtime_generated import (
     clear_generated_proxmox_routes,
+    ensure_generated_proxmox_version,
     generated_proxmox_route_state,
+    install_lazy_generated_proxmox_routes,
     register_generated_proxmox_routes,
 )
 from proxbox_api.routes.proxmox.viewer_codegen import refresh_generated_proxmox_routes
@@ -424,12 +428,16 @@ def _isolate_runtime_generated_route_cache(
 ) -> None:
     """Use a worker-local cache file so pytest-xdist does not fight over the repo default."""
     cache_dir = tmp_path_factory.mktemp("runtime_generated_routes_cache")
-    cache_file = cache_dir / "runtime_generated_routes_cache.json"
+    cache_file = cache_dir / "runtime_generated_routes_cache.pickle"
     mp = pytest.MonkeyPatch()
     mp.setattr(
         "proxbox_api.routes.proxmox.runtime_generated.proxmox_generated_route_cache_path",
         lambda: cache_file,
     )
+    mp.setattr(
+        "proxbox_api.routes.proxmox.runtime_generated.proxmox_generated_model_package_root",
+        lambda: cache_dir / "runtime_models",
+    )
     yield
     mp.undo()
 
@@ -847,7 +855,7 @@ def test_every_generated_proxy_route_has_mock_based_schema_validated_coverage(
     )
     monkeypatch.setattr(
         "proxbox_api.routes.proxmox.runtime_generated.proxmox_generated_route_cache_path",
-        lambda: tmp_path / "runtime_generated_routes_cache.json",
+        lambda: tmp_path / "runtime_generated_routes_cache.pickle",
     )
     monkeypatch.setattr(
         "proxbox_api.app.factory.register_generated_proxmox_routes",
@@ -908,7 +916,7 @@ def test_generated_proxy_route_closes_target_on_response_validation_failure(monk
     )
     monkeypatch.setattr(
         "proxbox_api.routes.proxmox.runtime_generated.proxmox_generated_route_cache_path",
-        lambda: tmp_path / "runtime_generated_routes_cache.json",
+        lambda: tmp_path / "runtime_generated_routes_cache.pickle",
     )
     monkeypatch.setattr(
         "proxbox_api.app.factory.check_auth_header_with_session",
@@ -995,7 +1003,7 @@ def test_available_proxmox_sdk_versions_ignores_non_version_entries(tmp_path, mo
 
 def test_register_generated_routes_uses_persisted_cache_on_reload(tmp_path, monkeypatch):
     generated_root = tmp_path / "generated" / "proxmox"
-    cache_path = generated_root / "runtime_generated_routes_cache.json"
+    cache_path = generated_root / "runtime_generated_routes_cache.pickle"
     latest_dir = generated_root / "latest"
     latest_dir.mkdir(parents=True)
 
@@ -1033,7 +1041,7 @@ def test_register_generated_routes_uses_persisted_cache_on_reload(tmp_path, monk
 
 def test_register_generated_routes_writes_cache_manifest(tmp_path, monkeypatch):
     generated_root = tmp_path / "generated" / "proxmox"
-    cache_path = generated_root / "runtime_generated_routes_cache.json"
+    cache_path = generated_root / "runtime_generated_routes_cache.pickle"
 
     monkeypatch.setattr(
         "proxbox_api.proxmox_to_netbox.proxmox_schema.proxmox_generated_openapi_root",
@@ -1052,9 +1060,125 @@ def test_register_generated_routes_writes_cache_manifest(tmp_path, monkeypatch):
         },
     )
 
-    payload = json.loads(cache_path.read_text(encoding="utf-8"))
+    payload = pickle.loads(cache_path.read_bytes())
 
     assert result["cache_path"] == str(cache_path)
     assert payload["mounted_versions"] == ["latest", "8.3.0"]
     assert payload["documents"]["latest"]["info"]["version"] == "test-generated"
     assert payload["documents"]["8.3.0"]["info"]["version"] == "8.3.0-generated"
+
+
+def test_lazy_generated_routes_mount_version_on_first_request(monkeypatch):
+    fake_target = SchemaDrivenFakeTarget(
+        responses={("GET", "cluster/resources"): {"path": "/cluster/resources", "method": "GET"}}
+    )
+    loaded_versions: list[str] = []
+
+    def fake_load(version_tag="latest"):
+        loaded_versions.append(version_tag)
+        return TEST_GENERATED_OPENAPI if version_tag == "latest" else TEST_GENERATED_OPENAPI_V83
+
+    async def fake_resolve_proxmox_target_session(
+        database_session,
+        source="database",
+        name=None,
+        domain=None,
+        ip_address=None,
+    ):
+        return fake_target
+
+    monkeypatch.setattr(
+        "proxbox_api.routes.proxmox.runtime_generated.available_proxmox_sdk_versions",
+        lambda: ["8.3.0", "latest"],
+    )
+    monkeypatch.setattr(
+        "proxbox_api.routes.proxmox.runtime_generated.load_proxmox_generated_openapi",
+        fake_load,
+    )
+    monkeypatch.setattr(
+        "proxbox_api.routes.proxmox.runtime_generated.resolve_proxmox_target_session",
+        fake_resolve_proxmox_target_session,
+    )
+    monkeypatch.setattr(
+        "proxbox_api.app.factory.check_auth_header_with_session",
+        lambda _session, _api_key, _client_ip: (True, None),
+    )
+
+    clear_generated_proxmox_routes(app)
+    install_lazy_generated_proxmox_routes(app)
+    state = generated_proxmox_route_state()
+
+    assert loaded_versions == ["latest"]
+    assert state["mounted_versions"] == ["latest"]
+    assert state["pending_versions"] == ["8.3.0"]
+    assert not any(
+        getattr(route, "path", None) == "/proxmox/api2/8.3.0/cluster/resources"
+        for route in app.routes
+    )
+
+    with TestClient(app) as client:
+        response = client.get("/proxmox/api2/8.3.0/cluster/resources")
+        unknown = client.get("/proxmox/api2/7.4.0/cluster/resources")
+
+    assert response.status_code == 200, response.text
+    assert fake_target.closed == 1
+    assert loaded_versions == ["latest", "8.3.0"]
+    assert unknown.status_code == 404
+    state = generated_proxmox_route_state()
+    assert state["mounted_versions"] == ["latest", "8.3.0"]
+    assert state["pending_versions"] == []
+
+
+def test_eager_registration_replaces_lazy_loader(monkeypatch):
+    monkeypatch.setattr(
+        "proxbox_api.routes.proxmox.runtime_generated.available_proxmox_sdk_versions",
+        lambda: ["8.3.0", "latest"],
+    )
+    monkeypatch.setattr(
+        "proxbox_api.routes.proxmox.runtime_generated.load_proxmox_generated_openapi",
+        lambda version_tag="latest": (
+            TEST_GENERATED_OPENAPI if version_tag == "latest" else TEST_GENERATED_OPENAPI_V83
+        ),
+    )
+
+    clear_generated_proxmox_routes(app)
+    install_lazy_generated_proxmox_routes(app)
+    assert ensure_generated_proxmox_version(app, "8.3.0") is True
+    assert ensure_generated_proxmox_version(app, "7.4.0") is False
+
+    register_generated_proxmox_routes(
+        app,
+        openapi_documents={"latest": TEST_GENERATED_OPENAPI},
+    )
+
+    assert generated_proxmox_route_state()["pending_versions"] == []
+    assert not any(
+        getattr(route, "name", None) == "generated_proxmox_route__lazy_loader"
+        for route in app.router.routes
+    )
+
+
+def test_generated_models_are_persisted_and_reimported_from_disk(tmp_path, monkeypatch):
+    package_root = tmp_path / "runtime_models"
+    generator_calls: list[str] = []
+
+    def counting_generator(document):
+        generator_calls.append(document["info"]["version"])
+        return generate_pydantic_models_from_openapi(document)
+
+    monkeypatch.setattr(
+        runtime_generated, "proxmox_generated_model_package_root", lambda: package_root
+    )
+    monkeypatch.setattr(
+        runtime_generated, "generate_pydantic_models_from_openapi", counting_generator
+    )
+    monkeypatch.setattr(runtime_generated, "_MODEL_MODULE_CACHE", {})
+
+    first = runtime_generated._load_model_module(TEST_GENERATED_OPENAPI_V83, "8.3.0")
+    runtime_generated._MODEL_MODULE_CACHE.clear()
+    second = runtime_generated._load_model_module(TEST_GENERATED_OPENAPI_V83, "8.3.0")
+
+    assert generator_calls == ["8.3.0-generated"]
+    assert Path(second.__file__).parent.parent == package_root
+    assert second is not first
+    assert hasattr(second, "GetClusterResourcesResponse")
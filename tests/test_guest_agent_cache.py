@@ -0,0 +1,142 @@
+"""Tests for the guest-agent result cache and its boot markers."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from proxbox_api import runtime_settings
+from proxbox_api.services import guest_agent_cache as cache_module
+from proxbox_api.services.guest_agent_cache import guest_agent_boot_marker, guest_agent_cache
+from proxbox_api.services.proxmox_helpers import (
+    fetch_qemu_guest_agent_network_interfaces,
+    get_qemu_guest_agent_hostname,
+)
+
+
+class _Call:
+    def __init__(self, owner: _CountingSession, command: str) -> None:
+        self._owner = owner
+        self._command = command
+
+    def get(self, **kwargs):
+        self._owner.calls += 1
+        if self._owner.error is not None:
+            raise self._owner.error
+        return {"result": [{"name": "eth0", "ip-addresses": []}]}
+
+
+class _Agent:
+    def __init__(self, owner: _CountingSession) -> None:
+        self._owner = owner
+
+    def __call__(self, command: str) -> _Call:
+        return _Call(self._owner, command)
+
+    def get(self, **kwargs):
+        return _Call(self._owner, str(kwargs.get("command"))).get()
+
+
+class _CountingSession:
+    name = "lab"
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.calls = 0
+        self.error = error
+        self.session = self
+
+    def nodes(self, node):
+        return self
+
+    def qemu(self, vmid):
+        return self
+
+    @property
+    def agent(self) -> _Agent:
+        return _Agent(self)
+
+
+@pytest.fixture(autouse=True)
+def _default_settings(monkeypatch) -> None:
+    monkeypatch.setattr(runtime_settings, "_load_settings", lambda: None)
+
+
+def _marker(uptime: int = 1000, **resource: object) -> str | None:
+    return guest_agent_boot_marker({"status": "running", "uptime": uptime, **resource})
+
+
+def test_boot_marker_changes_with_reboot_config_and_power_state() -> None:
+    assert _marker(1000) == _marker(1001)
+    assert _marker(1000) != _marker(50)
+    assert guest_agent_boot_marker({"status": "running", "uptime": 10}, {"digest": "a"}) != (
+        guest_agent_boot_marker({"status": "running", "uptime": 10}, {"digest": "b"})
+    )
+    assert guest_agent_boot_marker({"status": "stopped"}) == "stopped:"
+    assert guest_agent_boot_marker({"status": "running"}) is None
+    assert guest_agent_boot_marker(None) is None
+
+
+def test_agent_failures_are_skipped_until_the_boot_marker_changes() -> None:
+    session = _CountingSession(error=RuntimeError("QEMU guest agent is not running"))
+
+    async def scenario():
+        first = await fetch_qemu_guest_agent_network_interfaces(
+            session, "pve1", 101, boot_marker="boot-1"
+        )
+        second = await fetch_qemu_guest_agent_network_interfaces(
+            session, "pve1", 101, boot_marker="boot-1"
+        )
+        calls_before_reboot = session.calls
+        await fetch_qemu_guest_agent_network_interfaces(session, "pve1", 101, boot_marker="boot-2")
+        return first, second, calls_before_reboot
+
+    first, second, calls_before_reboot = asyncio.run(scenario())
+
+    assert first.diagnostic == second.diagnostic == "QEMU guest agent is not running in the VM."
+    assert calls_before_reboot == 2
+    assert session.calls == 4
+    assert guest_agent_cache.stats()["skips"] == 1
+
+
+def test_successes_are_cached_for_their_ttl_only(monkeypatch) -> None:
+    session = _CountingSession()
+
+    async def fetch():
+        return await fetch_qemu_guest_agent_network_interfaces(
+            session, "pve1", 101, boot_marker="boot-1"
+        )
+
+    result = asyncio.run(fetch())
+    result.interfaces.append({"name": "mutated"})
+    cached = asyncio.run(fetch())
+    assert session.calls == 1
+    assert [iface["name"] for iface in cached.interfaces] == ["eth0"]
+
+    now = cache_module.time.monotonic()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now + 61)
+    asyncio.run(fetch())
+
+    assert session.calls == 2
+    assert guest_agent_cache.stats()["hits"] == 1
+
+
+def test_calls_without_a_boot_marker_are_not_cached() -> None:
+    session = _CountingSession()
+
+    fetch_qemu_guest_agent_network_interfaces(session, "pve1", 101)
+    fetch_qemu_guest_agent_network_interfaces(session, "pve1", 101)
+
+    assert session.calls == 2
+    assert guest_agent_cache.stats()["entries"] == 0
+
+
+def test_hostname_lookup_skips_known_agentless_vms() -> None:
+    session = _CountingSession(error=RuntimeError("QEMU guest agent is not running"))
+
+    async def scenario():
+        await fetch_qemu_guest_agent_network_interfaces(session, "pve1", 101, boot_marker="b")
+        return await get_qemu_guest_agent_hostname(session, "pve1", 101, boot_marker="b")
+
+    assert asyncio.run(scenario()) is None
+    assert session.calls == 2
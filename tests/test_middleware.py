@@ -0,0 +1,128 @@
+"""Tests for the pure ASGI middleware stack in proxbox_api.app.middleware."""
+
+from __future__ import annotations
+
+import ipaddress
+
+import pytest
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+
+from proxbox_api.app import middleware
+from proxbox_api.main import app
+
+
+def _scope(path: str, *, client: str = "192.0.2.10", headers: list | None = None) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": headers or [],
+        "client": (client, 40000),
+        "server": ("testserver", 80),
+        "scheme": "http",
+    }
+
+
+async def _run(asgi_app, scope: dict) -> list[dict]:
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    return messages
+
+
+async def _ok(scope, receive, send) -> None:
+    await JSONResponse({"ok": True})(scope, receive, send)
+
+
+def _headers(messages: list[dict]) -> dict[str, str]:
+    start = messages[0]
+    assert start["type"] == "http.response.start"
+    return {key.decode(): value.decode() for key, value in start["headers"]}
+
+
+def test_app_stack_has_no_base_http_middleware() -> None:
+    classes = [entry.cls for entry in app.user_middleware]
+
+    assert middleware.RateLimitMiddleware in classes
+    assert middleware.APIKeyAuthMiddleware in classes
+    assert middleware.SecurityHeadersMiddleware in classes
+    assert not any(isinstance(cls, type) and issubclass(cls, BaseHTTPMiddleware) for cls in classes)
+
+
+async def test_security_headers_reach_streamed_responses_unbuffered() -> None:
+    async def stream(scope, receive, send) -> None:
+        async def events():
+            for index in range(3):
+                yield f"data: {index}\n\n"
+
+        await StreamingResponse(events(), media_type="text/event-stream")(scope, receive, send)
+
+    messages = await _run(middleware.SecurityHeadersMiddleware(stream), _scope("/docs"))
+    headers = _headers(messages)
+    bodies = [message["body"] for message in messages[1:] if message["body"]]
+
+    assert headers["x-frame-options"] == "DENY"
+    assert headers["content-security-policy"] == middleware._DOCS_CSP
+    assert bodies == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+
+
+async def test_rate_limit_blocks_over_budget_and_skips_exempt_paths() -> None:
+    limiter = middleware.RateLimitMiddleware(_ok, requests_per_minute=2)
+
+    statuses = [(await _run(limiter, _scope("/cache")))[0]["status"] for _ in range(3)]
+    exempt = [(await _run(limiter, _scope("/health")))[0]["status"] for _ in range(3)]
+    other_client = await _run(limiter, _scope("/cache", client="192.0.2.11"))
+
+    assert statuses == [200, 200, 429]
+    assert exempt == [200, 200, 200]
+    assert other_client[0]["status"] == 200
+
+
+async def test_rate_limit_keys_on_forwarded_client_behind_trusted_proxy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(middleware, "_TRUSTED_PROXIES", (ipaddress.ip_network("10.0.0.0/8"),))
+    limiter = middleware.RateLimitMiddleware(_ok, requests_per_minute=1)
+
+    def forwarded(client_ip: str) -> dict:
+        return _scope(
+            "/cache", client="10.0.0.1", headers=[(b"x-forwarded-for", client_ip.encode())]
+        )
+
+    first = await _run(limiter, forwarded("198.51.100.1"))
+    second = await _run(limiter, forwarded("198.51.100.2"))
+    repeat = await _run(limiter, forwarded("198.51.100.1"))
+
+    assert [first[0]["status"], second[0]["status"], repeat[0]["status"]] == [200, 200, 429]
+
+
+async def test_non_http_scopes_pass_through() -> None:
+    seen: list[str] = []
+
+    async def inner(scope, receive, send) -> None:
+        seen.append(scope["type"])
+
+    for cls in (middleware.SecurityHeadersMiddleware, middleware.APIKeyAuthMiddleware):
+        await cls(inner)({"type": "websocket", "path": "/ws"}, None, None)
+    await middleware.RateLimitMiddleware(inner, 1)({"type": "lifespan"}, None, None)
+
+    assert seen == ["websocket", "websocket", "lifespan"]
+
+
+def test_auth_middleware_guards_app_routes_but_not_exempt_paths(test_client, test_api_key) -> None:
+    rejected = test_client.get("/cache")
+    exempt = test_client.get("/health")
+    accepted = test_client.get("/cache", headers={"X-Proxbox-API-Key": test_api_key})
+
+    assert rejected.status_code == 401
+    assert exempt.status_code != 401
+    assert accepted.status_code == 200
+    assert accepted.headers["x-content-type-options"] == "nosniff"
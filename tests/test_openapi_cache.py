@@ -0,0 +1,85 @@
+"""Tests for the cached, pre-serialized OpenAPI document responses."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import proxbox_api.routes.proxmox.viewer_codegen as viewer_module
+from proxbox_api.openapi_cache import SerializedDocument
+from proxbox_api.openapi_custom import (
+    invalidate_openapi_cache,
+    mount_openapi_route,
+    serialized_openapi_document,
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI(openapi_url=None)
+    mount_openapi_route(app)
+
+    @app.get("/items")
+    async def items() -> list[int]:
+        return []
+
+    return app
+
+
+def test_openapi_bytes_are_reused_until_invalidated():
+    app = _app()
+
+    first = serialized_openapi_document(app)
+    assert serialized_openapi_document(app) is first
+
+    @app.get("/more")
+    async def more() -> list[int]:
+        return []
+
+    invalidate_openapi_cache(app)
+    second = serialized_openapi_document(app)
+
+    assert second is not first
+    assert second.etag != first.etag
+    assert "/more" in json.loads(second.body)["paths"]
+
+
+def test_openapi_route_honours_etag_and_gzip():
+    app = _app()
+
+    with TestClient(app) as client:
+        plain = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+        compressed = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        not_modified = client.get("/openapi.json", headers={"If-None-Match": plain.headers["etag"]})
+
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert "/items" in plain.json()["paths"]
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.json() == plain.json()
+    assert compressed.headers["etag"] == plain.headers["etag"]
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_serialized_document_gzip_round_trips():
+    document = SerializedDocument.from_object({"openapi": "3.1.0", "info": {"title": "ção"}})
+
+    assert gzip.decompress(document.gzip_body) == document.body
+    assert document.etag.startswith('W/"')
+
+
+def test_viewer_openapi_cache_follows_artifact_changes(tmp_path):
+    artifact = tmp_path / "openapi.json"
+    artifact.write_text(json.dumps({"openapi": "3.1.0", "paths": {}}), encoding="utf-8")
+
+    first = viewer_module._serialized_viewer_openapi("test-tag", artifact)
+    assert viewer_module._serialized_viewer_openapi("test-tag", artifact) is first
+
+    artifact.write_text(json.dumps({"openapi": "3.1.0", "paths": {"/x": {}}}), encoding="utf-8")
+    second = viewer_module._serialized_viewer_openapi("test-tag", artifact)
+
+    assert second.etag != first.etag
+    viewer_module._VIEWER_OPENAPI_CACHE.pop("test-tag", None)
@@ -0,0 +1,132 @@
+"""Tests for the hierarchical per-node adaptive Proxmox request limiter."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from proxbox_api import runtime_settings
+from proxbox_api.services import proxmox_limiter
+from proxbox_api.services.proxmox_limiter import (
+    ProxmoxRequestLimiter,
+    get_proxmox_limiter_prometheus_metrics,
+    get_proxmox_request_limiter,
+)
+
+
+@pytest.fixture(autouse=True)
+def _default_settings(monkeypatch) -> None:
+    monkeypatch.setattr(runtime_settings, "_load_settings", lambda: None)
+
+
+def _node(limiter: ProxmoxRequestLimiter, node: str = "pve1") -> dict:
+    return next(entry for entry in limiter.stats()["nodes"] if entry["node"] == node)
+
+
+def test_timeouts_halve_the_node_limit_and_fast_responses_regrow_it() -> None:
+    limiter = ProxmoxRequestLimiter()
+
+    limiter.observe("lab", "pve1", 0.05, timed_out=True)
+    assert _node(limiter)["limit"] == 2
+    limiter.observe("lab", "pve1", 0.05, timed_out=True)
+    limiter.observe("lab", "pve1", 0.05, timed_out=True)
+    assert _node(limiter)["limit"] == 1
+
+    limiter.observe("lab", "pve1", 0.05)
+    assert _node(limiter)["limit"] == 2
+    limiter.observe("lab", "pve1", 0.05)
+    limiter.observe("lab", "pve1", 0.05)
+    assert _node(limiter)["limit"] == 3
+    assert _node(limiter)["timeouts_total"] == 3
+
+
+def test_slow_latency_shrinks_the_limit(monkeypatch) -> None:
+    monkeypatch.setattr(proxmox_limiter, "_resolve_node_slow_latency_ms", lambda: 100)
+    limiter = ProxmoxRequestLimiter()
+
+    limiter.observe("lab", "pve1", 0.5)
+    limiter.observe("lab", "pve1", 0.5)
+
+    assert _node(limiter)["limit"] == 2
+    assert _node(limiter)["ewma_latency_ms"] == 500.0
+
+
+def test_slow_node_cannot_starve_other_nodes() -> None:
+    async def scenario() -> tuple[int, int]:
+        limiter = ProxmoxRequestLimiter()
+        limiter.observe("lab", "slow", 1.0, timed_out=True)
+        limiter.observe("lab", "slow", 1.0, timed_out=True)
+        release = asyncio.Event()
+        peak_slow = 0
+        active_slow = 0
+
+        async def slow_call() -> None:
+            nonlocal peak_slow, active_slow
+            async with limiter.slot("lab", "slow", endpoint_limit=4):
+                active_slow += 1
+                peak_slow = max(peak_slow, active_slow)
+                await release.wait()
+                active_slow -= 1
+
+        slow_tasks = [asyncio.create_task(slow_call()) for _ in range(4)]
+        await asyncio.sleep(0)
+        async with limiter.slot("lab", "fast", endpoint_limit=4):
+            fast_ran = 1
+        release.set()
+        await asyncio.gather(*slow_tasks)
+        return peak_slow, fast_ran
+
+    peak_slow, fast_ran = asyncio.run(scenario())
+
+    assert peak_slow == 1
+    assert fast_ran == 1
+
+
+def test_endpoint_limit_bounds_concurrency_across_nodes() -> None:
+    async def scenario() -> int:
+        limiter = ProxmoxRequestLimiter()
+        active = 0
+        peak = 0
+
+        async def call(node: str) -> None:
+            nonlocal active, peak
+            async with limiter.slot("lab", node, endpoint_limit=2):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0)
+                active -= 1
+
+        await asyncio.gather(*(call(f"pve{index}") for index in range(6)))
+        return peak
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_slot_records_timeouts_raised_by_the_block() -> None:
+    async def scenario() -> ProxmoxRequestLimiter:
+        limiter = get_proxmox_request_limiter()
+        with pytest.raises(TimeoutError):
+            async with limiter.slot("lab", "pve1"):
+                raise TimeoutError("read timed out")
+        with pytest.raises(ValueError):
+            async with limiter.slot("lab", "pve1"):
+                raise ValueError("boom")
+        return limiter
+
+    limiter = asyncio.run(scenario())
+
+    assert _node(limiter)["timeouts_total"] == 1
+    assert _node(limiter)["limit"] == 2
+    assert _node(limiter)["active"] == 0
+
+
+def test_prometheus_output_labels_each_node() -> None:
+    async def scenario() -> str:
+        get_proxmox_request_limiter().observe("lab", "pve1", 0.01)
+        return get_proxmox_limiter_prometheus_metrics()
+
+    text = asyncio.run(scenario())
+
+    assert 'proxbox_proxmox_node_limit{endpoint="lab",node="pve1"} 4' in text
+    assert "# TYPE proxbox_proxmox_node_timeouts_total counter" in text
@@ -0,0 +1,172 @@
+"""Tests for the process-wide Proxmox session pool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from proxbox_api import runtime_settings
+from proxbox_api.schemas.proxmox import ProxmoxSessionSchema, ProxmoxTokenSchema
+from proxbox_api.session import proxmox_pool
+from proxbox_api.session.proxmox_core import ProxmoxSession
+from proxbox_api.session.proxmox_pool import (
+    ProxmoxSessionPool,
+    get_proxmox_session_pool,
+    invalidate_proxmox_sessions,
+    pool_key,
+)
+from proxbox_api.session.proxmox_providers import release_proxmox_session
+
+
+class _FakeSDK:
+    def __init__(self, *, healthy: bool = True) -> None:
+        self.healthy = healthy
+        self.closed = 0
+        self.version = self
+
+    async def get(self):
+        if not self.healthy:
+            raise RuntimeError("connection reset")
+        return {"version": "9.0"}
+
+    async def close(self) -> None:
+        self.closed += 1
+
+
+@pytest.fixture
+def created(monkeypatch) -> list[ProxmoxSession]:
+    monkeypatch.setattr(runtime_settings, "_load_settings", lambda: None)
+    sessions: list[ProxmoxSession] = []
+
+    async def fake_create(cls, schema):
+        session = ProxmoxSession()
+        session.CONNECTED = True
+        session.session = _FakeSDK()
+        session.name = schema.name
+        session.token_name = None
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(ProxmoxSession, "create", classmethod(fake_create))
+    return sessions
+
+
+def _schema(endpoint_id: int = 1, password: str = "secret") -> ProxmoxSessionSchema:
+    return ProxmoxSessionSchema(
+        name=f"pve{endpoint_id}",
+        ip_address="10.0.0.10",
+        http_port=8006,
+        user="root@pam",
+        password=password,
+        token=ProxmoxTokenSchema(name=None, value=None),
+        db_endpoint_id=endpoint_id,
+    )
+
+
+def test_pool_key_changes_with_credentials_but_not_identity() -> None:
+    first = pool_key(_schema(password="hunter2"))
+    second = pool_key(_schema(password="hunter3"))
+
+    assert first[0] == second[0] == 1
+    assert first[1] != second[1]
+    assert "hunter2" not in first[1]
+
+
+def test_acquire_reuses_the_session_across_borrows(created) -> None:
+    async def scenario():
+        pool = ProxmoxSessionPool()
+        first = await pool.acquire(_schema())
+        await pool.release(first)
+        second = await pool.acquire(_schema())
+        return pool, first, second
+
+    pool, first, second = asyncio.run(scenario())
+
+    assert first is second
+    assert len(created) == 1
+    assert first.pooled is True
+    assert pool.stats()["reused_total"] == 1
+
+
+def test_pooled_sessions_ignore_aclose(created) -> None:
+    async def scenario():
+        pool = ProxmoxSessionPool()
+        session = await pool.acquire(_schema())
+        await session.aclose()
+        return session
+
+    session = asyncio.run(scenario())
+
+    assert session.session is not None
+    assert session.session.closed == 0
+
+
+def test_failed_health_check_rebuilds_the_session(created, monkeypatch) -> None:
+    monkeypatch.setattr(proxmox_pool, "_resolve_health_check_seconds", lambda: 0)
+
+    async def scenario():
+        pool = ProxmoxSessionPool()
+        first = await pool.acquire(_schema())
+        await pool.release(first)
+        first.session.healthy = False
+        second = await pool.acquire(_schema())
+        return pool, first, second
+
+    pool, first, second = asyncio.run(scenario())
+
+    assert first is not second
+    assert created[0].session is None
+    assert pool.stats()["health_failures_total"] == 1
+
+
+def test_ticket_sessions_are_renewed_after_max_age(created, monkeypatch) -> None:
+    monkeypatch.setattr(proxmox_pool, "_resolve_ticket_max_age_seconds", lambda: 0)
+
+    async def scenario():
+        pool = ProxmoxSessionPool()
+        first = await pool.acquire(_schema())
+        await pool.release(first)
+        return first, await pool.acquire(_schema())
+
+    first, second = asyncio.run(scenario())
+
+    assert first is not second
+    assert len(created) == 2
+
+
+def test_idle_sessions_are_evicted_only_when_unborrowed(created, monkeypatch) -> None:
+    monkeypatch.setattr(proxmox_pool, "_resolve_idle_seconds", lambda: -1)
+
+    async def scenario():
+        pool = ProxmoxSessionPool()
+        session = await pool.acquire(_schema())
+        borrowed_evictions = await pool.evict_idle()
+        await pool.release(session)
+        return session, borrowed_evictions, await pool.evict_idle()
+
+    session, borrowed_evictions, idle_evictions = asyncio.run(scenario())
+
+    assert borrowed_evictions == 0
+    assert idle_evictions == 1
+    assert session.session is None
+
+
+def test_invalidation_closes_after_the_last_borrower_releases(created) -> None:
+    async def scenario():
+        pool = get_proxmox_session_pool()
+        session = await pool.acquire(_schema(endpoint_id=7))
+        other = await pool.acquire(_schema(endpoint_id=8))
+        retired = await invalidate_proxmox_sessions(7)
+        open_while_borrowed = session.session is not None
+        await release_proxmox_session(session)
+        replacement = await pool.acquire(_schema(endpoint_id=7))
+        return retired, open_while_borrowed, session, other, replacement
+
+    retired, open_while_borrowed, session, other, replacement = asyncio.run(scenario())
+
+    assert retired == 1
+    assert open_while_borrowed is True
+    assert session.session is None
+    assert other.session is not None
+    assert replacement is not session
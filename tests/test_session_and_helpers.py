@@ -14,10 +14,12 @@ from proxmox_sdk.sdk.exceptions import ResourceException
 from sqlmodel import Session
 
 from proxbox_api import netbox_rest as netbox_rest_module
+from proxbox_api import runtime_settings
 from proxbox_api.app.netbox_session import get_raw_netbox_session
 from proxbox_api.database import NetBoxEndpoint, ProxmoxEndpoint
 from proxbox_api.dependencies import proxbox_tag
 from proxbox_api.exception import ProxboxException, ProxmoxAPIError
+from proxbox_api.generated.proxmox.latest import pydantic_models as generated_models
 from proxbox_api.netbox_rest import (
     clear_rest_get_cache,
     ensure_tag_async,
@@ -43,6 +45,7 @@ from proxbox_api.routes.proxmox.cluster import cluster_resources, cluster_status
 from proxbox_api.routes.proxmox.nodes import get_node_network
 from proxbox_api.routes.proxmox.replication import cluster_replication
 from proxbox_api.services.proxmox.config import resolve_vm_config
+from proxbox_api.services.proxmox_helpers import dump_models
 from proxbox_api.services.proxmox_helpers import (
     get_cluster_resources as get_typed_cluster_resources,
 )
@@ -2890,6 +2893,37 @@ def test_typed_proxmox_helpers_validate_live_payloads():
     assert vm_config.digest == "abc123"
 
 
+def test_raw_proxmox_helpers_skip_validation_unless_enforced(monkeypatch):
+    session = FakeTypedProxmoxSession()
+    validated: list[object] = []
+    original_validate = generated_models.GetClusterResourcesResponse.model_validate
+
+    def _tracking_validate(payload, *args, **kwargs):
+        validated.append(payload)
+        return original_validate(payload, *args, **kwargs)
+
+    monkeypatch.setattr(
+        generated_models.GetClusterResourcesResponse, "model_validate", _tracking_validate
+    )
+    monkeypatch.delenv("PROXBOX_PROXMOX_VALIDATE_RESPONSES", raising=False)
+    monkeypatch.setattr(runtime_settings, "_load_settings", lambda: None)
+
+    typed = get_typed_cluster_resources(session)
+    raw = get_typed_cluster_resources(session, raw=True)
+    raw_config = get_typed_vm_config(session, node="pve01", vm_type="qemu", vmid=101, raw=True)
+
+    assert len(validated) == 1
+    assert raw == dump_models(typed)
+    assert raw_config["name"] == "vm01"
+    assert raw_config["digest"] == "abc123"
+
+    monkeypatch.setenv("PROXBOX_PROXMOX_VALIDATE_RESPONSES", "true")
+    enforced = get_typed_cluster_resources(session, raw=True)
+
+    assert len(validated) == 2
+    assert enforced == raw
+
+
 def test_proxmox_routes_use_typed_helpers_for_sync_dependencies():
     pxs = [FakeTypedProxmoxSession()]
 
@@ -2948,7 +2982,7 @@ def test_vm_config_resolves_without_cluster_status_preflight():
 
 
 def test_vm_config_resolution_preserves_session_error_details(monkeypatch):
-    async def _fake_get_vm_config(_px, *, node, vm_type, vmid):
+    async def _fake_get_vm_config(_px, *, node, vm_type, vmid, **_kwargs):
         raise ProxmoxAPIError(
             message="Error fetching Proxmox VM config",
             original_error=RuntimeError("HTTP 500 proxy loop detected: proxy loop detected"),
@@ -657,3 +657,75 @@ def test_complete_empty_snapshot_discovery_allows_owner_scoped_cleanup(monkeypat
 
     assert result["deleted"] == 1
     assert deleted_ids == [90]
+
+
+def test_snapshot_collection_resolves_nodes_from_one_index_and_skips_idle_storage_lookups(
+    monkeypatch,
+):
+    vms = [
+        _snapshot_vm(netbox_id=7, vmid=101),
+        _snapshot_vm(netbox_id=8, vmid=102),
+        _snapshot_vm(netbox_id=9, vmid=103),
+    ]
+    fetched: list[tuple[str, int]] = []
+    storage_lookups: list[int] = []
+    reconciled: dict[str, object] = {}
+
+    async def _vm_list(_nb, path, *, query=None):
+        return vms
+
+    async def _empty_storage(_nb):
+        return {}
+
+    async def _storage_record(_nb, *, vm_id, **_kwargs):
+        storage_lookups.append(vm_id)
+        return None
+
+    def _snapshots(*, node, vmid, **_kwargs):
+        fetched.append((node, vmid))
+        if vmid == 102:
+            return [{"name": "current"}]
+        return [{"name": f"snap-{vmid}"}, {"name": "current"}]
+
+    async def _bulk(_nb, _path, *, payloads, **_kwargs):
+        from proxbox_api.netbox_rest import BulkReconcileResult
+
+        reconciled["payloads"] = payloads
+        return BulkReconcileResult(
+            records=[], created=len(payloads), updated=0, unchanged=0, failed=0
+        )
+
+    def _per_vm_scan(*_args, **_kwargs):
+        raise AssertionError("cluster resources must be indexed once, not scanned per VM")
+
+    monkeypatch.setattr(snapshots_module, "rest_list_async", _vm_list)
+    monkeypatch.setattr(snapshots_module, "_load_storage_index", _empty_storage)
+    monkeypatch.setattr(snapshots_module, "_resolve_snapshot_storage_record", _storage_record)
+    monkeypatch.setattr(snapshots_module, "_snapshot_node_candidates_for_vmid", _per_vm_scan)
+    monkeypatch.setattr(snapshots_module, "get_vm_snapshots", _snapshots)
+    monkeypatch.setattr(snapshots_module, "rest_bulk_reconcile_async", _bulk)
+
+    result = asyncio.run(
+        create_virtual_machine_snapshots(
+            netbox_session=object(),
+            pxs=[SimpleNamespace(db_endpoint_id=1, name="cluster-a")],
+            cluster_status=[],
+            cluster_resources=[
+                {
+                    "cluster-a": [
+                        {"vmid": 101, "node": "pve01"},
+                        {"vmid": 102, "node": "pve02"},
+                        {"vmid": 103, "node": "pve01"},
+                    ]
+                }
+            ],
+        )
+    )
+
+    assert result["created"] == 2
+    assert sorted(fetched) == [("pve01", 101), ("pve01", 103), ("pve02", 102)]
+    assert sorted(storage_lookups) == [7, 9]
+    assert sorted(payload["name"] for payload in reconciled["payloads"]) == [
+        "snap-101",
+        "snap-103",
+    ]
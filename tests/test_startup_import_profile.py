@@ -0,0 +1,84 @@
+"""Pin the import cost of mounting routers for the minimal sync-only profile.
+
+Runs ``python -X importtime`` in a fresh interpreter so module caching in the
+test process cannot hide imports. With ``PROXBOX_FEATURES=sync`` no optional
+subsystem (cloud provisioning, Firecracker, image factory, SSH terminal, PBS,
+Ceph, PDM) may be imported, and the number of ``proxbox_api`` modules loaded
+must stay within budget.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from proxbox_api.app.router_manifest import (
+    CORE_FEATURE,
+    OPTIONAL_FEATURES,
+    SIDECAR_FEATURES,
+    enabled_features,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Raise deliberately when core sync grows; 215 modules when this was pinned.
+SYNC_PROFILE_MODULE_BUDGET = 240
+
+GATED_MODULE_PREFIXES = (
+    "proxbox_api.routes.cloud.",
+    "proxbox_api.routes.ssh_terminal",
+    "proxbox_api.pbs",
+    "proxbox_api.ceph",
+    "proxbox_api.pdm",
+)
+
+_MOUNT_ROUTERS = (
+    "from fastapi import FastAPI\n"
+    "from proxbox_api.app.router_manifest import enabled_features, include_manifest_routers\n"
+    "include_manifest_routers(FastAPI(), enabled_features())\n"
+)
+
+
+def _imported_modules(features: str) -> list[str]:
+    env = {**os.environ, "PROXBOX_FEATURES": features}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _MOUNT_ROUTERS],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+        check=False,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    return [
+        line.rsplit("|", 1)[1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    ]
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("", OPTIONAL_FEATURES | {CORE_FEATURE}),
+        ("pbs,ceph", {"pbs", "ceph"}),
+        ("sync", {CORE_FEATURE}),
+        ("core, Cloud, ssh", {CORE_FEATURE, "cloud", "ssh"}),
+    ],
+)
+def test_enabled_features_keeps_sidecar_only_mode(raw, expected):
+    assert enabled_features(raw) == expected
+    assert not (enabled_features("pdm") - SIDECAR_FEATURES)
+
+
+def test_sync_only_profile_skips_optional_subsystems_and_stays_in_budget():
+    modules = [name for name in _imported_modules("sync") if name.startswith("proxbox_api")]
+
+    gated = sorted(name for name in modules if name.startswith(GATED_MODULE_PREFIXES))
+    assert gated == []
+    assert len(set(modules)) <= SYNC_PROFILE_MODULE_BUDGET
@@ -2188,3 +2188,180 @@ def test_netbox_task_history_sync_state_truncates_at_2048():
     )
     assert len(model.exitstatus) == 2048
     assert len(model.status) == 2048
+
+
+def _incremental_vm(netbox_id: int, vmid: int) -> dict[str, object]:
+    return {
+        "id": netbox_id,
+        "cluster": {"name": "lab"},
+        "custom_fields": {
+            "proxmox_endpoint_id": 11,
+            "proxmox_vm_id": vmid,
+            "proxmox_vm_type": "qemu",
+        },
+    }
+
+
+def _install_incremental_archive(monkeypatch, vms, archive, *, fail_nodes=()):
+    """Wire a fake archive and an in-memory cursor store; return call logs."""
+    store: dict[tuple[str, str], object] = {}
+    fetch_calls: list[dict[str, object]] = []
+
+    async def _fake_list_vms(*_args, **_kwargs):
+        return list(vms)
+
+    async def _fake_get_node_tasks(_session, node, **kwargs):
+        fetch_calls.append({"node": node, **kwargs})
+        if node in fail_nodes:
+            raise RuntimeError("node unreachable")
+        rows = [task for task in archive if task["node"] == node]
+        if kwargs.get("vmid") is not None:
+            rows = [task for task in rows if int(task["id"]) == kwargs["vmid"]]
+        if kwargs.get("since") is not None:
+            rows = [task for task in rows if task["starttime"] >= kwargs["since"]]
+        return rows[kwargs["start"] : kwargs["start"] + kwargs["limit"]]
+
+    async def _fake_bulk(_nb, _path, **kwargs):
+        return SimpleNamespace(
+            created=len(kwargs["payloads"]), updated=0, unchanged=0, failed=0, records=[]
+        )
+
+    async def _load():
+        return dict(store)
+
+    async def _save(cursors):
+        store.update(cursors)
+
+    monkeypatch.setattr(task_history_service, "_resolve_incremental_archive", lambda: True)
+    monkeypatch.setattr(task_history_service, "_resolve_cursor_overlap_seconds", lambda: 100)
+    monkeypatch.setattr(task_history_service, "_load_archive_cursors", _load)
+    monkeypatch.setattr(task_history_service, "_save_archive_cursors", _save)
+    monkeypatch.setattr(task_history_service, "_list_all_vms_with_proxmox_id", _fake_list_vms)
+    monkeypatch.setattr(task_history_service, "get_node_tasks", _fake_get_node_tasks)
+    monkeypatch.setattr(task_history_service, "dump_models", lambda items: items)
+    monkeypatch.setattr(task_history_service, "rest_bulk_reconcile_async", _fake_bulk)
+    return store, fetch_calls
+
+
+def _archived_task(node: str, vmid: int, starttime: int) -> dict[str, object]:
+    return {
+        "upid": f"UPID:{node}:{vmid}:{starttime}",
+        "node": node,
+        "id": str(vmid),
+        "type": "qmstart",
+        "user": "root@pam",
+        "starttime": starttime,
+        "endtime": starttime + 10,
+        "status": "OK",
+    }
+
+
+def _run_all_task_history(nodes=("pve-a",), **kwargs):
+    return asyncio.run(
+        sync_all_virtual_machine_task_histories(
+            netbox_session=object(),
+            pxs=[SimpleNamespace(db_endpoint_id=11)],
+            cluster_status=[
+                SimpleNamespace(name="lab", node_list=[SimpleNamespace(name=n) for n in nodes])
+            ],
+            **kwargs,
+        )
+    )
+
+
+def test_incremental_task_history_reads_since_cursor_and_backfills_new_vms(monkeypatch):
+    vms = [_incremental_vm(501, 101)]
+    archive = [_archived_task("pve-a", 101, 1000), _archived_task("pve-a", 102, 2000)]
+    store, fetch_calls = _install_incremental_archive(monkeypatch, vms, archive)
+
+    first = _run_all_task_history()
+
+    assert first["created"] == 1
+    assert all("since" not in call for call in fetch_calls)
+    cursor = store[("endpoint:11", "pve-a")]
+    assert cursor.last_starttime == 2000
+    assert cursor.covered_vmids == frozenset({101})
+
+    vms.append(_incremental_vm(502, 102))
+    archive.append(_archived_task("pve-a", 101, 3000))
+    fetch_calls.clear()
+
+    second = _run_all_task_history()
+
+    assert {(call.get("since"), call["vmid"]) for call in fetch_calls} == {
+        (1900, None),
+        (None, 102),
+    }
+    # vmid 102's task at 2000 is in both the backfill and the overlap window.
+    assert second["created"] == 2
+    assert store[("endpoint:11", "pve-a")].last_starttime == 3000
+    assert store[("endpoint:11", "pve-a")].covered_vmids == frozenset({101, 102})
+
+
+def test_incremental_task_history_holds_cursor_of_failed_node(monkeypatch):
+    vms = [_incremental_vm(501, 101)]
+    archive = [_archived_task("pve-a", 101, 1000), _archived_task("pve-b", 101, 1500)]
+    store, _fetch_calls = _install_incremental_archive(
+        monkeypatch, vms, archive, fail_nodes={"pve-b"}
+    )
+
+    result = _run_all_task_history(nodes=("pve-a", "pve-b"))
+
+    assert result["degraded"] is True
+    assert set(store) == {("endpoint:11", "pve-a")}
+
+
+def test_selected_task_history_never_reads_or_moves_cursors(monkeypatch):
+    vms = [_incremental_vm(501, 101)]
+    store, fetch_calls = _install_incremental_archive(
+        monkeypatch, vms, [_archived_task("pve-a", 101, 1000)]
+    )
+    store[("endpoint:11", "pve-a")] = task_history_service._ArchiveCursor(
+        last_starttime=5000, last_upid=None, covered_vmids=frozenset({101})
+    )
+    monkeypatch.setattr(
+        task_history_service,
+        "require_selected_netbox_vm_coverage",
+        lambda vms, _ids, **_kwargs: vms,
+    )
+
+    result = _run_all_task_history(netbox_vm_ids=[501])
+
+    assert result["created"] == 1
+    assert all("since" not in call for call in fetch_calls)
+    assert store[("endpoint:11", "pve-a")].last_starttime == 5000
+
+
+def test_task_archive_cursor_upsert_round_trips(tmp_path):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlmodel import SQLModel
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from proxbox_api.database import TaskArchiveCursor
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cursor.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        for starttime, vmids in ((1000, [101]), (2000, [101, 102])):
+            async with factory() as session:
+                await TaskArchiveCursor.upsert_many_async(
+                    session,
+                    [
+                        TaskArchiveCursor(
+                            scope="endpoint:11",
+                            node="pve-a",
+                            last_starttime=starttime,
+                            covered_vmids=vmids,
+                        )
+                    ],
+                )
+        async with factory() as session:
+            rows = await TaskArchiveCursor.load_all_async(session)
+        await engine.dispose()
+        return rows
+
+    rows = asyncio.run(scenario())
+
+    assert [(row.last_starttime, row.covered_vmids) for row in rows] == [(2000, [101, 102])]
@@ -0,0 +1,124 @@
+"""Tests for the shared Proxmox task watcher."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from proxbox_api.exception import ProxmoxAPIError
+from proxbox_api.services import task_watcher as watcher_module
+from proxbox_api.services.task_watcher import TaskWatcher
+
+
+@pytest.fixture(autouse=True)
+def _fast_intervals(monkeypatch):
+    monkeypatch.setattr(watcher_module, "_resolve_min_interval_seconds", lambda: 0.001)
+    monkeypatch.setattr(watcher_module, "_resolve_max_interval_seconds", lambda: 0.004)
+
+
+class _ScriptedStatus:
+    """Status fetcher that replays a script and counts calls."""
+
+    def __init__(self, *payloads) -> None:
+        self._payloads = list(payloads)
+        self.calls = 0
+
+    async def __call__(self, session, node, upid):
+        self.calls += 1
+        payload = self._payloads[min(self.calls, len(self._payloads)) - 1]
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+
+
+async def test_two_subscribers_share_one_poller():
+    fetcher = _ScriptedStatus(
+        {"status": "running", "progress": 0.5},
+        {"status": "stopped", "exitstatus": "OK"},
+    )
+    watcher = TaskWatcher()
+    session = object()
+
+    async def follow():
+        async with watcher.subscribe(
+            session, "pve01", "UPID:1", endpoint_key=1, status_fetcher=fetcher
+        ) as subscription:
+            return [update async for update in subscription]
+
+    first, second = await asyncio.gather(follow(), follow())
+
+    assert fetcher.calls == 2
+    assert [update.status for update in first] == ["running", "stopped"]
+    assert [update.status for update in second] == ["running", "stopped"]
+    assert first[-1].succeeded
+    assert watcher.stats() == {"tasks": []}
+
+
+async def test_wait_returns_failed_exitstatus_and_status_errors():
+    watcher = TaskWatcher()
+    failed = await watcher.wait(
+        object(),
+        "pve01",
+        "UPID:2",
+        status_fetcher=_ScriptedStatus({"status": "stopped", "exitstatus": "migration aborted"}),
+    )
+    assert failed.finished and not failed.succeeded
+    assert failed.exitstatus == "migration aborted"
+
+    errored = await watcher.wait(
+        object(),
+        "pve01",
+        "UPID:3",
+        status_fetcher=_ScriptedStatus(ProxmoxAPIError(message="boom")),
+    )
+    assert isinstance(errored.error, ProxmoxAPIError)
+    assert not errored.succeeded
+
+
+async def test_log_lines_are_read_incrementally_by_offset(monkeypatch):
+    log = [{"n": index + 1, "t": f"line {index + 1}"} for index in range(3)]
+    starts: list[int] = []
+
+    async def fake_log(session, node, upid, *, start=None, limit=None):
+        starts.append(start)
+        visible = log[: 2 if len(starts) == 1 else 3]
+        return visible[start : start + limit]
+
+    monkeypatch.setattr(watcher_module, "get_node_task_log", fake_log)
+    fetcher = _ScriptedStatus(
+        {"status": "running"},
+        {"status": "stopped", "exitstatus": "OK"},
+    )
+
+    async with TaskWatcher().subscribe(
+        object(), "pve01", "UPID:4", include_log=True, status_fetcher=fetcher
+    ) as subscription:
+        updates = [update async for update in subscription]
+
+    assert starts == [0, 2]
+    assert [line["t"] for line in updates[0].log_lines] == ["line 1", "line 2"]
+    assert [line["t"] for line in updates[1].log_lines] == ["line 3"]
+
+
+async def test_interval_backs_off_while_unchanged_and_resets_on_change(monkeypatch):
+    sleeps: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def recording_sleep(delay, *args, **kwargs):
+        sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(watcher_module.asyncio, "sleep", recording_sleep)
+    fetcher = _ScriptedStatus(
+        {"status": "running", "progress": 0.1},
+        {"status": "running", "progress": 0.1},
+        {"status": "running", "progress": 0.1},
+        {"status": "running", "progress": 0.1},
+        {"status": "running", "progress": 0.2},
+        {"status": "stopped", "exitstatus": "OK"},
+    )
+
+    await TaskWatcher().wait(object(), "pve01", "UPID:5", status_fetcher=fetcher)
+
+    assert sleeps == pytest.approx([0.001, 0.0015, 0.00225, 0.003375, 0.001])
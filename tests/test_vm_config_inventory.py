@@ -0,0 +1,76 @@
+"""Tests for the incremental VM config fetch planner."""
+
+from __future__ import annotations
+
+from proxbox_api.services.proxmox import inventory
+from proxbox_api.services.proxmox.inventory import VmConfigCache
+
+
+def _resource(**overrides: object) -> dict[str, object]:
+    resource: dict[str, object] = {
+        "type": "qemu",
+        "node": "pve1",
+        "vmid": 101,
+        "name": "web01",
+        "status": "running",
+        "maxmem": 2048,
+    }
+    resource.update(overrides)
+    return resource
+
+
+def test_zero_max_age_never_reuses() -> None:
+    cache = VmConfigCache()
+    cache.store("lab", _resource(), {"net0": "virtio=AA"})
+
+    assert cache.lookup("lab", _resource(), max_age_seconds=0) is None
+
+
+def test_unchanged_resource_row_reuses_a_copy() -> None:
+    cache = VmConfigCache()
+    cache.store("lab", _resource(), {"net0": "virtio=AA"})
+
+    config = cache.lookup("lab", _resource(), max_age_seconds=60)
+    assert config == {"net0": "virtio=AA"}
+    config["net0"] = "mutated"
+
+    assert cache.lookup("lab", _resource(), max_age_seconds=60) == {"net0": "virtio=AA"}
+    assert cache.stats()["reused_total"] == 2
+
+
+def test_changed_resource_row_or_other_cluster_forces_a_fetch() -> None:
+    cache = VmConfigCache()
+    cache.store("lab", _resource(), {"net0": "virtio=AA"})
+
+    assert cache.lookup("lab", _resource(maxmem=4096), max_age_seconds=60) is None
+    assert cache.lookup("lab", _resource(status="stopped"), max_age_seconds=60) is None
+    assert cache.lookup("lab", _resource(node="pve2"), max_age_seconds=60) is None
+    assert cache.lookup("prod", _resource(), max_age_seconds=60) is None
+
+
+def test_expired_entries_are_refetched(monkeypatch) -> None:
+    cache = VmConfigCache()
+    cache.store("lab", _resource(), {"net0": "virtio=AA"})
+    stored_at = inventory.time.monotonic()
+    monkeypatch.setattr(inventory.time, "monotonic", lambda: stored_at + 61)
+
+    assert cache.lookup("lab", _resource(), max_age_seconds=60) is None
+
+
+def test_refetch_with_same_digest_is_counted() -> None:
+    cache = VmConfigCache()
+    cache.store("lab", _resource(), {"digest": "abc"})
+    cache.store("lab", _resource(), {"digest": "abc"})
+    cache.store("lab", _resource(), {"digest": "def"})
+
+    assert cache.stats()["unchanged_refetch_total"] == 1
+    assert cache.stats()["fetched_total"] == 3
+
+
+def test_cache_is_bounded() -> None:
+    cache = VmConfigCache(max_entries=2)
+    for vmid in (1, 2, 3):
+        cache.store("lab", _resource(vmid=vmid), {"vmid": vmid})
+
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("lab", _resource(vmid=1), max_age_seconds=60) is None
@@ -0,0 +1,87 @@
+"""Tests for the process-pool VM desired-payload preparation stage."""
+
+from __future__ import annotations
+
+import asyncio
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from proxbox_api.schemas.sync import SyncOverwriteFlags
+from proxbox_api.services.sync import vm_payload_pool
+from proxbox_api.services.sync.vm_payload_pool import (
+    VMPayloadJob,
+    prepare_vm_payload_batch,
+    run_vm_payload_jobs,
+    shutdown_vm_payload_pool,
+)
+from tests.fixtures import PROXMOX_VM_CONFIG, PROXMOX_VM_RESOURCE
+
+
+def _job(vmid: int = 101) -> VMPayloadJob:
+    return VMPayloadJob(
+        resource={**PROXMOX_VM_RESOURCE, "vmid": vmid, "name": f"vm-{vmid}"},
+        vm_config=dict(PROXMOX_VM_CONFIG),
+        payload_kwargs={
+            "cluster_id": 1,
+            "device_id": 2,
+            "role_id": 3,
+            "tag_ids": [5, 7],
+            "site_id": 4,
+            "last_updated": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "cluster_name": "lab",
+            "endpoint_id": 9,
+            "overwrite_flags": SyncOverwriteFlags(),
+        },
+    )
+
+
+def test_jobs_and_results_round_trip_through_pickle() -> None:
+    job = _job()
+    assert pickle.loads(pickle.dumps(job)) == job
+
+    [result] = prepare_vm_payload_batch([job])
+    assert result.error is None
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored.desired_payload == result.desired_payload
+    assert restored.vm_config_obj == result.vm_config_obj
+
+
+def test_prepare_batch_returns_errors_as_data() -> None:
+    bad = _job()
+    bad.payload_kwargs["cluster_id"] = "not-an-int"
+    bad.payload_kwargs["unexpected_kwarg"] = True
+
+    good, failed = prepare_vm_payload_batch([_job(), bad])
+
+    assert good.error is None
+    assert good.desired_payload is not None
+    assert failed.desired_payload is None
+    assert "TypeError" in str(failed.error)
+
+
+def test_disabled_pool_runs_in_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        vm_payload_pool,
+        "_get_pool",
+        lambda workers: pytest.fail("process pool must not start when disabled"),
+    )
+
+    results = asyncio.run(run_vm_payload_jobs([_job(101), _job(102)], workers=0))
+
+    assert [result.desired_payload["name"] for result in results] == ["vm-101", "vm-102"]
+
+
+def test_process_pool_matches_in_process_results() -> None:
+    jobs = [_job(vmid) for vmid in range(101, 106)]
+    expected = prepare_vm_payload_batch(jobs)
+    try:
+        results = asyncio.run(run_vm_payload_jobs(jobs, workers=2, batch_size=2))
+    finally:
+        shutdown_vm_payload_pool()
+
+    assert [result.desired_payload for result in results] == [
+        result.desired_payload for result in expected
+    ]
+    assert all(result.error is None for result in results)